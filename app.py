@@ -1,20 +1,66 @@
 import streamlit as st
 import requests
-import json
-import os
-import subprocess
-import tempfile
 from datetime import datetime
 import time
-import random
-import shutil
 import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import uuid
+
+from vlsi_core.cache import get_response_cache
+from vlsi_core.chunking import (
+    CHUNK_THRESHOLD, chunk_hdl, chunk_preamble, estimate_tokens, label_partials, map_chunks, reduce_partials
+)
+from vlsi_core.conversations import get_conversation_store
+from vlsi_core.hdl_index import DesignIndex, iter_zip_sources
+from vlsi_core.jobs import get_job_manager
+from vlsi_core.lint import format_findings, lint_descriptions, lint_report
+from vlsi_core.metrics import LLM_FIRST_TOKEN, get_metrics, span
+from vlsi_core.incremental import fingerprint_modules, get_report_store, incremental_run
+from vlsi_core.openrouter import OpenRouterError, build_chat_payload, build_payload, complete, request_completion
+from vlsi_core.parsing import extract_code_block, split_code_and_explanation
+from vlsi_core.prompts import (
+    BUGFIX_SYSTEM_MSG, COMMON_ERRORS, DEFAULT_REVIEW_FOCUS, DOCUMENTATION_SYSTEM_MSG, EXAMPLE_DESIGNS,
+    EXPLAIN_SYSTEM_MSG, REVIEW_FOCUS_AREAS, REVIEW_STRICTNESS, REVIEW_SYSTEM_MSG, RTL_SYSTEM_MSG, SUGGESTED_QUESTIONS,
+    TESTBENCH_SYSTEM_MSG, TESTBENCH_TYPES, build_bugfix_prompt,
+    build_documentation_prompt, build_documentation_reduce_prompt, build_explain_prompt, build_explain_reduce_prompt,
+    build_review_prompt, build_review_reduce_prompt, build_rtl_prompt, build_testbench_prompt
+)
+from vlsi_core.rate_limit import CircuitOpenError, get_breaker, get_limiter
+from vlsi_core.routing import get_router
+from vlsi_core.service import ServiceError, document_code, explain_messages, structured_answer
+from vlsi_core.simulation import SIM_TIMEOUT, SimulationError, get_simulation_runner, summarize
+from vlsi_core.singleflight import FlightAborted, flight_key, get_single_flight
+from vlsi_core.repair import generate_and_repair
+from vlsi_core.review import combine_review, review_aspects
+from vlsi_core.streaming import CodeFenceExtractor, StreamError, iter_sse_content
+from vlsi_core.structured import StructuredError
+from vlsi_core.triage import TRIAGE_THRESHOLD, LogTriage, text_lines, triage_report
+from vlsi_core.validation import LANGUAGE_EXTENSIONS, get_validation_service
+
+try:
+    from vlsi_core.waveform import Waveform, WaveformError, format_mismatches, open_waveform
+except ImportError:  # numpy not installed: the Debugging Assistant takes text logs only
+    open_waveform = None
+
+try:
+    from vlsi_core.library import get_design_library
+except ImportError:  # numpy not installed: the HDL Generator starts every design from scratch
+    get_design_library = None
 
 # Initialize session state
 if 'current_file' not in st.session_state:
     st.session_state.current_file = {}
-if 'conversation' not in st.session_state:
-    st.session_state.conversation = {}
+if 'projects' not in st.session_state:
+    st.session_state.projects = {}
+if 'jobs' not in st.session_state:
+    st.session_state.jobs = {}
+# Code Analysis threads live in the process-wide ConversationStore under this id
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'current_tab' not in st.session_state:
     st.session_state.current_tab = "Home"
 
@@ -27,457 +73,513 @@ try:
 except Exception:
     API_KEY = None
 
+# Surface intermediate failures while kimi_api_call retries (429s just wait in the shared limiter)
+def report_retry(attempt, error):
+    if error.status_code == 429:
+        return
+    if error.status_code is None:
+        st.error(f"Network Error (Attempt {attempt+1}): {str(error)}")
+    else:
+        st.error(f"Processing Error (Attempt {attempt+1}): {error.status_code}")
+
 # Kimi API call function
-def kimi_api_call(prompt, system_message="You are an expert VLSI engineer", model="moonshotai/kimi-k2:free", max_retries=5):
+# With tool set (and no explicit model) the request goes through that tool's model
+# route, failing over to the next model when one is throttled, slow or erroring.
+def kimi_api_call(prompt, system_message="You are an expert VLSI engineer", model=None, max_retries=5, use_cache=True, tool=None):
     if not API_KEY:
         st.error("API key not configured. Please configure your API key in secrets.toml.")
         return None
     
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
+    route = tool if tool and not model else None
+    payload = build_payload(prompt, system_message, model or get_router().primary_model(tool))
     
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.2,
-        "max_tokens": 2048
-    }
-    
-    for attempt in range(max_retries):
+    # Cached replies and identical requests already in flight are shared through complete()
+    try:
+        with span("llm.call", tool=tool, model=payload["model"]):
+            return complete(API_KEY, payload, use_cache=use_cache, route=route, max_retries=max_retries,
+                            on_retry=report_retry)
+    except CircuitOpenError as e:
+        st.error(f"The AI service is currently unavailable. {str(e)}")
+        return None
+    except (OpenRouterError, FlightAborted):
+        st.error("Processing failed after multiple attempts. Please try again later.")
+        return None
+
+# Streaming variant of kimi_api_call: yields content chunks as they arrive (SSE).
+# Retries only happen before the first token; closing the generator (or setting
+# cancel_event) aborts the upstream request. When another session is already
+# streaming the same request, this one replays and follows that stream instead.
+def kimi_api_stream(prompt, system_message="You are an expert VLSI engineer", model=None, max_retries=5, use_cache=True, cancel_event=None, max_tokens=2048, tool=None, messages=None):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return
+
+    route = tool if tool and not model else None
+    model = model or get_router().primary_model(tool)
+    if messages is not None:
+        payload = build_chat_payload(messages, model, max_tokens=max_tokens)
+    else:
+        payload = build_payload(prompt, system_message, model, max_tokens=max_tokens)
+
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(payload)
+        if cached is not None:
+            yield cached
+            return
+
+    key = flight_key(payload)
+    flight, leader = get_single_flight().begin(key)
+    if not leader:
         try:
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                return response.json()["choices"][0]["message"]["content"]
-            elif response.status_code == 429:
-                sleep_time = (2 ** attempt) + random.uniform(0, 1)
-                time.sleep(sleep_time)
-                continue
-            else:
-                st.error(f"Processing Error (Attempt {attempt+1}): {response.status_code}")
-                time.sleep(2)
-                
-        except requests.exceptions.RequestException as e:
-            st.error(f"Network Error (Attempt {attempt+1}): {str(e)}")
-            time.sleep(2)
-    
-    st.error("Processing failed after multiple attempts. Please try again later.")
-    return None
+            for chunk in flight.iter_chunks():
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield chunk
+        except CircuitOpenError as e:
+            st.error(f"The AI service is currently unavailable. {str(e)}")
+        except FlightAborted:
+            st.warning("The identical request this one was sharing was cancelled. Please try again.")
+        except (OpenRouterError, requests.exceptions.RequestException, StreamError):
+            st.error("Processing failed after multiple attempts. Please try again later.")
+        return
 
-# HDL Language Validation
-def validate_hdl_code(code, language):
-    if not code.strip():
-        return False, "Empty code provided"
-    
-    tool_name = "iverilog" if language in ["v", "sv"] else "ghdl" if language == "vhd" else None
-    if tool_name:
-        tool_path = shutil.which(tool_name)
-        if not tool_path:
-            return False, f"Validation tool not found. Install it to enable this feature."
-    
-    if os.name == 'nt' and language in ["v", "sv"]:
-        tool_name = "iverilog.exe"
-    
+    error = FlightAborted("Request was cancelled")
     try:
-        with tempfile.NamedTemporaryFile(mode='w+', suffix=f".{language}", delete=False) as tmpfile:
-            tmpfile.write(code)
-            tmpfile.flush()
-            tmp_path = tmpfile.name
-            
-            if language == "v" or language == "sv":
-                cmd = ["iverilog", "-t", "null", tmp_path] if os.name != 'nt' else ["iverilog.exe", "-t", "null", tmp_path]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                if result.returncode != 0:
-                    return False, result.stderr
-                
-            elif language == "vhd":
-                result = subprocess.run(["ghdl", "-s", tmp_path], capture_output=True, text=True, timeout=10)
-                if result.returncode != 0:
-                    return False, result.stderr
-            
-            return True, "Syntax is valid"
-        
-    except subprocess.TimeoutExpired:
-        return False, "Validation timed out"
-    except Exception as e:
-        return False, str(e)
-    finally:
         try:
-            os.unlink(tmp_path)
-        except:
-            pass
+            if route:
+                response = get_router().complete(API_KEY, payload, route, stream=True, max_retries=max_retries,
+                                                 on_retry=report_retry)
+            else:
+                response = request_completion(API_KEY, payload, max_retries=max_retries, stream=True, on_retry=report_retry)
+        except CircuitOpenError as e:
+            error = e
+            st.error(f"The AI service is currently unavailable. {str(e)}")
+            return
+        except OpenRouterError as e:
+            error = e
+            st.error("Processing failed after multiple attempts. Please try again later.")
+            return
 
-# File upload handler
-def handle_file_upload(feature_name, allowed_types=["v", "sv", "vhd", "txt"]):
-    uploaded_file = st.file_uploader(
-        f"Upload HDL file", 
-        type=allowed_types,
-        key=f"upload_{feature_name}",
-        help=f"Supported formats: {', '.join(allowed_types)}"
-    )
-    
-    if uploaded_file:
-        ext = uploaded_file.name.split('.')[-1].lower()
-        if ext == 'v':
-            language = "Verilog"
-        elif ext == 'sv':
-            language = "SystemVerilog"
-        elif ext == 'vhd':
-            language = "VHDL"
+        chunks = []
+        try:
+            for chunk in iter_sse_content(response.iter_lines()):
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                chunks.append(chunk)
+                flight.publish(chunk)
+                yield chunk
+        except (requests.exceptions.RequestException, StreamError) as e:
+            error = e
+            st.error(f"Network Error: {str(e)}")
+            return
+        finally:
+            response.close()
+
+        error = None
+        if cache is not None and chunks:
+            cache.put(payload, "".join(chunks))
+    finally:
+        get_single_flight().end(key, flight, error)
+
+# Render a streamed reply live, then clear the preview and return the full text.
+# With code_language set, the first fenced code block is previewed as code while
+# it is being generated; otherwise the reply is previewed as markdown.
+def render_stream(stream, status_text, code_language=None, key="stream", refresh_interval=0.05):
+    status = st.empty()
+    stop = st.empty()
+    preview = st.empty()
+    status.caption(f"⏳ {status_text}")
+    # Any widget interaction reruns the script, which closes the generator and
+    # with it the upstream HTTP stream.
+    stop.button("⏹ Stop generation", key=f"stop_{key}")
+    extractor = CodeFenceExtractor()
+    last_render = 0.0
+    started = time.monotonic()
+
+    def draw():
+        if code_language and extractor.code:
+            preview.code(extractor.code, language=code_language)
         else:
-            language = "Verilog"
-        
-        st.session_state.current_file[feature_name] = {
-            "name": uploaded_file.name,
-            "content": uploaded_file.read().decode("utf-8"),
-            "language": language
-        }
-        
-        return True
-    return False
+            preview.markdown(extractor.text)
 
-# Create download link
-def create_download_link(content, filename, text):
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}" style="color: #4dabf7; text-decoration: none; border: 1px solid #4dabf7; padding: 5px 15px; border-radius: 4px; display: inline-block; margin-top: 10px;">{text}</a>'
-    return href
+    with span("ui.render_stream", key=key):
+        for chunk in stream:
+            if not extractor.text:
+                LLM_FIRST_TOKEN.observe(time.monotonic() - started, view=key)
+            extractor.feed(chunk)
+            now = time.monotonic()
+            if now - last_render >= refresh_interval:
+                draw()
+                last_render = now
 
-# Custom CSS for dark theme
-def inject_custom_css():
-    st.markdown("""
-    <style>
-    /* Header styling */
-    .stApp .block-container {
-        padding-top: 1rem;
-    }
-    
-    .app-name {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #4dabf7;
-        letter-spacing: -0.5px;
-    }
-    
-    /* Tab styling */
-    div[role="radiogroup"] {
-        display: flex;
-        justify-content: flex-end;
-        gap: 0.5rem;
-        width: 100%;
-        margin-top: 12px;
-    }
-    
-    div[role="radiogroup"] > label {
-        background-color: #2a2a2a;
-        border: 1px solid #343a40;
-        padding: 0.5rem 1.2rem;
-        border-radius: 4px;
-        transition: all 0.3s ease;
-        margin: 0;
-        font-weight: 500;
-        font-size: 0.95rem;
-    }
-    
-    div[role="radiogroup"] > label:hover {
-        background-color: #3a3a3a;
-        color: #4dabf7;
-        transform: translateY(-2px);
-    }
-    
-    div[role="radiogroup"] > label[data-baseweb="radio"] {
-        background-color: #4dabf7 !important;
-        color: #121212 !important;
-        border-color: #4dabf7 !important;
-        box-shadow: 0 2px 8px rgba(77, 171, 247, 0.3);
-    }
-    
-    /* Remove Streamlit's default radio button circles */
-    div[role="radiogroup"] > label > div:first-child {
-        display: none;
-    }
-    
-    /* Add spacing between tabs and content */
-    .stRadio > div:first-child {
-        margin-bottom: 1.5rem;
-    }
-    
-    /* Improve feature cards */
-    .feature-card {
-        border-radius: 12px;
-        padding: 1.8rem;
-        margin-bottom: 2.5rem;
-        box-shadow: 0 6px 24px rgba(0,0,0,0.3);
-    }
-    
-    .section-title {
-        font-size: 1.9rem;
-        margin-bottom: 1.8rem;
-        padding-bottom: 1rem;
-    }
-    
-    /* Fix button styles */
-    .stButton > button {
-        border-radius: 8px !important;
-        padding: 0.6rem 1.8rem !important;
-        font-size: 1rem !important;
-    }
-    
-    /* Add gap between columns */
-    .stColumn {
-        padding: 0 15px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-        
-    # Keep the rest of your existing CSS
-    st.markdown("""
-    <style>
-    :root {
-        --primary: #4dabf7;
-        --secondary: #5c7cfa;
-        --background: #121212;
-        --surface: #1e1e1e;
-        --text-primary: #e9ecef;
-        --text-secondary: #adb5bd;
-        --success: #51cf66;
-        --warning: #ffd43b;
-        --danger: #ff6b6b;
-        --border: #343a40;
-    }
-    /* ... rest of your existing CSS ... */
-    </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    <style>
-    :root {
-        --primary: #4dabf7;
-        --secondary: #5c7cfa;
-        --background: #121212;
-        --surface: #1e1e1e;
-        --text-primary: #e9ecef;
-        --text-secondary: #adb5bd;
-        --success: #51cf66;
-        --warning: #ffd43b;
-        --danger: #ff6b6b;
-        --border: #343a40;
-    }
-    
-    body {
-        background-color: var(--background);
-        color: var(--text-primary);
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stApp {
-        background-color: var(--background);
-    }
-    
-    /* Header styling */
-    .header {
-        background-color: var(--surface);
-        padding: 0.5rem 2rem;
-        border-bottom: 1px solid var(--border);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    
-    .logo-container {
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-    }
-    
-    .logo {
-        height: 50px;
-    }
+    status.empty()
+    stop.empty()
+    preview.empty()
+    return extractor.text or None
+
+# Background jobs keep running when the script reruns (tab switch, any widget):
+# only the job id lives in session state, the work runs in the process-wide job
+# pool and finished results are kept in SQLite.
+def submit_background_job(feature_name, tool, **params):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return
+    st.session_state.jobs[feature_name] = get_job_manager().submit(tool, params, API_KEY)
+
+# Wait for this feature's background job (if any) and return its result dict.
+# The wait polls in short steps so switching tabs interrupts it, not the job.
+def background_job_result(feature_name, label):
+    job_id = st.session_state.jobs.get(feature_name)
+    if not job_id:
+        return None
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    status = st.empty()
+    while job is not None and job.active:
+        status.info(f"⏳ {label} ({job.status}, {job.elapsed:.0f}s). You can switch tabs; the result will be kept.")
+        job = manager.wait(job_id, timeout=1.0)
+    status.empty()
     
-    .app-name {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: var(--primary);
-        letter-spacing: -0.5px;
-    }
+    if job is None:
+        del st.session_state.jobs[feature_name]
+        return None
+    if job.error:
+        st.error(f"Background job failed: {job.error}")
+        del st.session_state.jobs[feature_name]
+        return None
+    if st.button("Dismiss result", key=f"dismiss_{feature_name}"):
+        del st.session_state.jobs[feature_name]
+        return None
+    return job.result
+
+# Large files are processed map-reduce style instead of in one oversized prompt
+def needs_chunking(code):
+    return estimate_tokens(code) > CHUNK_THRESHOLD
+
+# Map: run build_prompt over module/block-sized chunks concurrently (each chunk is
+# cached on its own, so editing one module only re-runs that chunk). Reduce: merge
+# the partial results, streaming the final pass like any other reply.
+def run_chunked(code, build_prompt, build_reduce_prompt, system_msg, status_text, key, language=None, tool=None):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return None
     
-    .tabs {
-        display: flex;
-        gap: 1.5rem;
-        overflow-x: auto;
-        padding-bottom: 5px;
-    }
+    chunks = chunk_hdl(code, language)
+    progress = st.progress(0.0, text=f"{status_text} Split into {len(chunks)} chunks")
     
-    .tab {
-        color: var(--text-secondary);
-        text-decoration: none;
-        font-weight: 500;
-        padding: 0.5rem 0;
-        position: relative;
-        transition: all 0.3s ease;
-        white-space: nowrap;
-    }
+    def on_progress(done, total, chunk):
+        progress.progress(done / total, text=f"{status_text} Finished {chunk.label()} ({done}/{total})")
     
-    .tab:hover {
-        color: var(--primary);
-    }
+    model = get_router().primary_model(tool)
+    try:
+        partials = map_chunks(API_KEY, chunks, lambda chunk: build_prompt(chunk_preamble(chunk) + chunk.prompt_text()),
+                              system_msg, model=model, on_progress=on_progress, route=tool)
+        if len(partials) == 1:
+            return partials[0]
+        progress.progress(1.0, text=f"{status_text} Merging {len(partials)} partial results")
+        partials = reduce_partials(API_KEY, label_partials(chunks, partials), build_reduce_prompt, system_msg,
+                                   model=model, route=tool)
+    except CircuitOpenError as e:
+        st.error(f"The AI service is currently unavailable. {str(e)}")
+        return None
+    except OpenRouterError:
+        st.error("Processing failed after multiple attempts. Please try again later.")
+        return None
+    finally:
+        progress.empty()
     
-    .tab.active {
-        color: var(--primary);
-    }
+    return render_stream(kimi_api_stream(build_reduce_prompt(partials), system_msg, max_tokens=4096, tool=tool),
+                         "Merging results...", key=key)
+
+# Multi-module files: only modules whose normalized source changed since the last run
+# of this tool on this document are analyzed; the rest of the report is reused.
+def run_incremental(code, tool, document, options, build_prompt, system_msg, status_text, language=None, route=None):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return None
     
-    .tab.active::after {
-        content: '';
-        position: absolute;
-        bottom: 0;
-        left: 0;
-        width: 100%;
-        height: 2px;
-        background-color: var(--primary);
-    }
+    progress = st.progress(0.0, text=status_text)
     
-    /* Main content */
-    .main-container {
-        max-width: 1200px;
-        margin: 2rem auto;
-        padding: 0 2rem;
-    }
+    def on_progress(done, total, chunk):
+        progress.progress(done / total, text=f"{status_text} Finished {chunk.label()} ({done}/{total})")
     
-    .section-title {
-        color: var(--primary);
-        border-bottom: 2px solid var(--border);
-        padding-bottom: 0.8rem;
-        margin-bottom: 1.5rem;
-        font-size: 1.8rem;
-        font-weight: 700;
-    }
+    try:
+        run = incremental_run(API_KEY, code, tool, document, options, build_prompt, system_msg,
+                              get_report_store(), language=language, model=get_router().primary_model(route),
+                              on_progress=on_progress, route=route)
+    except CircuitOpenError as e:
+        st.error(f"The AI service is currently unavailable. {str(e)}")
+        return None
+    except OpenRouterError:
+        st.error("Processing failed after multiple attempts. Please try again later.")
+        return None
+    finally:
+        progress.empty()
     
-    .feature-card {
-        background-color: var(--surface);
-        border-radius: 10px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.25);
-        margin-bottom: 2rem;
-        border: 1px solid var(--border);
-    }
+    diff = run.diff
+    details = ", ".join(f"{label}: {', '.join(names)}" for label, names in
+                        (("new", diff.added), ("changed", diff.changed), ("removed", diff.removed)) if names)
+    st.caption(f"Analyzed {run.analyzed} module(s), reused {run.reused} unchanged" + (f" ({details})" if details else ""))
+    return run.report
+
+# One prompt per focus area, all in flight at once; each area's findings are
+# shown as soon as it finishes, then merged into one deduplicated report
+def run_parallel_review(code, focus_areas, severity_level, linted, lint_result, language=None, structured=False):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return None
     
-    .card-title {
-        color: var(--text-primary);
-        font-size: 1.4rem;
-        margin-bottom: 1.2rem;
-        display: flex;
-        align-items: center;
-        gap: 0.8rem;
-    }
+    focus_areas = list(dict.fromkeys(focus_areas))
+    progress = st.progress(0.0, text=f"Reviewing {len(focus_areas)} focus areas in parallel...")
+    slots = {aspect: st.empty() for aspect in focus_areas}
+    for aspect in focus_areas:
+        slots[aspect].info(f"{aspect}: reviewing...")
+    aspects = []
+    try:
+        for aspect in review_aspects(API_KEY, code, focus_areas, severity_level, linted,
+                                     model=get_router().primary_model("review"), route="review", language=language,
+                                     structured=structured):
+            aspects.append(aspect)
+            progress.progress(len(aspects) / len(focus_areas),
+                              text=f"Finished {aspect.aspect} ({len(aspects)}/{len(focus_areas)})")
+            with slots[aspect.aspect].container():
+                if aspect.exception is not None:
+                    st.warning(f"{aspect.aspect} failed after {aspect.seconds:.1f}s: {aspect.error}")
+                    continue
+                st.markdown(f"**{aspect.aspect}** · {len(aspect.findings)} findings in {aspect.seconds:.1f}s")
+                if aspect.findings:
+                    st.table([{key: finding[key] for key in ("line", "severity", "rule", "message")}
+                              for finding in aspect.findings])
+                if aspect.summary:
+                    st.caption(aspect.summary)
+        review = combine_review(aspects, lint_result)
+    except StructuredError as e:
+        st.error(str(e))
+        return None
+    except CircuitOpenError as e:
+        st.error(f"The AI service is currently unavailable. {str(e)}")
+        return None
+    except OpenRouterError:
+        st.error("Processing failed after multiple attempts. Please try again later.")
+        return None
+    finally:
+        progress.empty()
     
-    /* Form elements */
-    .stTextInput>div>div>input, 
-    .stTextArea>div>div>textarea,
-    .stSelectbox>div>div>div,
-    .stSlider>div>div>div>div {
-        background-color: #2d2d2d !important;
-        color: var(--text-primary) !important;
-        border: 1px solid var(--border) !important;
-    }
+    # The merged report below repeats every finding; keep one line per area
+    for aspect in aspects:
+        slots[aspect.aspect].caption(
+            f"{aspect.aspect}: {'failed' if aspect.exception is not None else f'{len(aspect.findings)} findings'} "
+            f"in {aspect.seconds:.1f}s"
+        )
+    return review
+
+# Schema-checked JSON instead of a streamed reply: fields that come back missing
+# or malformed are re-asked one by one, and the parsed result is returned
+def run_structured(status_text, func, *args, **kwargs):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return None
     
-    .stButton>button {
-        background-color: var(--primary) !important;
-        color: #121212 !important;
-        border: none !important;
-        border-radius: 6px !important;
-        padding: 0.5rem 1.5rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-    }
+    try:
+        with st.spinner(status_text):
+            result = func(API_KEY, *args, **kwargs)
+    except ServiceError as e:
+        st.error(str(e))
+        return None
+    except CircuitOpenError as e:
+        st.error(f"The AI service is currently unavailable. {str(e)}")
+        return None
+    except OpenRouterError:
+        st.error("Processing failed after multiple attempts. Please try again later.")
+        return None
     
-    .stButton>button:hover {
-        background-color: #3b9ae1 !important;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(77, 171, 247, 0.3) !important;
-    }
+    if result["structured"]["repaired"]:
+        st.caption(f"Re-asked for: {', '.join(result['structured']['repaired'])}")
+    if result["structured"]["dropped"]:
+        st.caption(f"Dropped as invalid: {', '.join(result['structured']['dropped'])}")
+    return result
+
+# Findings of the local static checks, shown before the model's review
+def render_lint_findings(report):
+    counts = report["counts"]
+    st.subheader("Static Checks")
+    st.caption(f"{report['lines']} lines checked in {report['seconds'] * 1000:.1f} ms: "
+               f"{counts['critical']} critical, {counts['warning']} warnings, {counts['suggestion']} suggestions")
+    if report["findings"]:
+        st.table([{key: finding[key] for key in ("line", "severity", "rule", "message")} for finding in report["findings"]])
+    else:
+        st.success("No issues found by the static checks.")
+
+# Run the last generated testbench against its DUT: compile once, one process per
+# seed, results shown as each run finishes
+def simulation_panel(dut, testbench, language):
+    runner = get_simulation_runner()
+    st.subheader("Simulation")
+    if not runner.available(language):
+        st.info("Install Icarus Verilog (iverilog, vvp) or GHDL to run the testbench here.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        seeds = st.number_input("Random seeds:", min_value=1, max_value=256, value=min(8, os.cpu_count() or 1))
+    with col2:
+        timeout = st.number_input("Timeout per run (s):", min_value=1, max_value=3600, value=SIM_TIMEOUT)
+    if not st.button("Run Simulation", use_container_width=True, key="run_simulation"):
+        return
+
+    progress = st.progress(0.0)
+    table = st.empty()
+    runs = []
+    try:
+        for run in runner.run(dut, testbench, language, range(1, int(seeds) + 1), int(timeout)):
+            runs.append(run.as_dict())
+            progress.progress(len(runs) / seeds, text=f"{len(runs)}/{seeds} runs finished")
+            table.table([{"seed": r["seed"], "status": r["status"], "seconds": r["seconds"], "checks passed": r["passed"],
+                          "checks failed": r["failed"], "cached": r["cached"]}
+                         for r in sorted(runs, key=lambda r: r["seed"])])
+    except SimulationError as e:
+        progress.empty()
+        st.error(str(e))
+        if e.log:
+            st.code(e.log)
+        return
+    summary = summarize(runs)
+    if summary["pass"] == summary["runs"]:
+        st.success(f"All {summary['runs']} seeds passed")
+    else:
+        st.error(f"{summary['runs'] - summary['pass']} of {summary['runs']} seeds did not pass: "
+                 f"{', '.join(map(str, summary['failing_seeds']))}")
+    for run in runs:
+        if run["status"] != "pass":
+            with st.expander(f"Seed {run['seed']}: {run['status']}"):
+                st.code("\n".join(run["failures"] or run["tail"]) or "(no output)")
+
+# HDL Language Validation (tool lookup, worker pool and result cache live in vlsi_core.validation)
+def validate_hdl_code(code, language):
+    with span("ui.validate", language=language):
+        return get_validation_service().validate(code, language)
+
+# Multi-file project: parse every uploaded file (or zip member) into a module index.
+# The index is rebuilt only when the set of uploaded files changes.
+def load_project(feature_name, uploaded_files):
+    digest = hashlib.sha256("|".join(f"{f.name}:{f.size}" for f in uploaded_files).encode()).hexdigest()
+    cached = st.session_state.projects.get(feature_name)
+    if cached and cached["digest"] == digest:
+        return cached["index"]
     
-    .stDownloadButton>button {
-        background-color: var(--success) !important;
-        color: #121212 !important;
-    }
+    index = DesignIndex()
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith(".zip"):
+            for path, text in iter_zip_sources(uploaded_file):
+                index.add_file(path, text)
+        else:
+            index.add_file(uploaded_file.name, uploaded_file.read().decode("utf-8", errors="replace"))
+    st.session_state.projects[feature_name] = {"digest": digest, "index": index}
+    return index
+
+# Pick a module from the project and expose only it and its transitive dependencies to the tool
+def select_project_module(feature_name, index):
+    summary = index.summary()
+    if not summary["modules"]:
+        st.warning("No modules or entities were found in the uploaded files.")
+        return False
     
-    .stCheckbox>div>div {
-        color: var(--text-primary) !important;
-    }
+    st.markdown(f'<div class="info-box">Project: <span class="file-name">{summary["files"]} files</span>, '
+                f'{summary["modules"]} modules, {summary["edges"]} instantiation edges</div>', unsafe_allow_html=True)
     
-    /* Footer */
-    .footer {
-        background-color: var(--surface);
-        border-top: 1px solid var(--border);
-        padding: 1.5rem 0;
-        text-align: center;
-        margin-top: 3rem;
-    }
+    names = sorted(m.name for m in index.modules.values())
+    tops = summary["tops"]
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        selected = st.selectbox("Module under analysis:", names,
+                                index=names.index(tops[0]) if tops else 0, key=f"module_{feature_name}")
+    with col2:
+        detail = st.radio("Dependencies:", ["Full source", "Interfaces only", "None"], horizontal=True,
+                          key=f"deps_{feature_name}")
     
-    .copyright {
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-    }
+    closure = index.transitive_closure(selected)
+    content = index.context_for(selected, {"Full source": "full", "Interfaces only": "interface", "None": "none"}[detail])
+    sent_lines = content.count("\n") + 1
+    total_lines = sum(text.count("\n") + 1 for text in index.files.values())
+    external = index.external_dependencies(selected)
+    st.caption(
+        f"Sending {sent_lines} of {total_lines} project lines: {selected} + "
+        f"{len(closure) - 1} dependencies" + (f" (undefined: {', '.join(external)})" if external else "")
+    )
     
-    /* Status boxes */
-    .info-box {
-        background-color: rgba(77, 171, 247, 0.1);
-        border-left: 4px solid var(--primary);
-        padding: 1rem;
-        border-radius: 4px;
-        margin-bottom: 1rem;
-    }
+    with st.expander("Module index"):
+        st.table([
+            {
+                "Module": m.name,
+                "File": f"{m.path}:{m.start_line}",
+                "Ports": len(m.ports),
+                "Parameters": len(m.parameters),
+                "Instantiates": ", ".join(sorted({i.module for i in m.instances}))
+            }
+            for m in sorted(index.modules.values(), key=lambda m: m.name)
+        ])
     
-    .success-box {
-        background-color: rgba(81, 207, 102, 0.1);
-        border-left: 4px solid var(--success);
-        padding: 1rem;
-        border-radius: 4px;
-        margin-bottom: 1rem;
+    module = index.resolve(selected)
+    st.session_state.current_file[feature_name] = {
+        "name": f"{selected} ({module.path}, {len(closure)} module{'s' if len(closure) != 1 else ''})",
+        "content": content,
+        "language": module.language
     }
+    return True
+
+# File upload handler (several files or a .zip switch to project mode)
+def handle_file_upload(feature_name, allowed_types=["v", "sv", "vhd", "txt"]):
+    uploaded_files = st.file_uploader(
+        f"Upload HDL file(s) or a .zip project", 
+        type=allowed_types + ["vhdl", "zip"],
+        accept_multiple_files=True,
+        key=f"upload_{feature_name}",
+        help=f"Supported formats: {', '.join(allowed_types)}; upload several files or a .zip for project mode"
+    )
     
-    .error-box {
-        background-color: rgba(255, 107, 107, 0.1);
-        border-left: 4px solid var(--danger);
-        padding: 1rem;
-        border-radius: 4px;
-        margin-bottom: 1rem;
-    }
+    if not uploaded_files:
+        return False
     
-    .file-name {
-        font-weight: 600;
-        color: var(--primary);
-    }
+    if len(uploaded_files) > 1 or uploaded_files[0].name.lower().endswith(".zip"):
+        return select_project_module(feature_name, load_project(feature_name, uploaded_files))
     
-    /* Code blocks */
-    .stCodeBlock>div>div>div {
-        background-color: #1a1a1a !important;
-        border: 1px solid var(--border) !important;
-        border-radius: 6px !important;
-    }
+    uploaded_file = uploaded_files[0]
+    ext = uploaded_file.name.split('.')[-1].lower()
+    if ext == 'v':
+        language = "Verilog"
+    elif ext == 'sv':
+        language = "SystemVerilog"
+    elif ext in ('vhd', 'vhdl'):
+        language = "VHDL"
+    else:
+        language = "Verilog"
     
-    /* Feature icons */
-    .feature-icon {
-        font-size: 1.5rem;
-        margin-right: 10px;
-        color: var(--primary);
+    st.session_state.current_file[feature_name] = {
+        "name": uploaded_file.name,
+        "content": uploaded_file.read().decode("utf-8"),
+        "language": language
     }
     
-    /* Tab container */
-    .tab-content {
-        padding: 20px 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    return True
+
+# Create download link
+def create_download_link(content, filename, text):
+    b64 = base64.b64encode(content.encode()).decode()
+    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}" style="color: #4dabf7; text-decoration: none; border: 1px solid #4dabf7; padding: 5px 15px; border-radius: 4px; display: inline-block; margin-top: 10px;">{text}</a>'
+    return href
+
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "theme.css")
+
+# Read and minify the theme once per server process instead of rebuilding it on every rerun
+@st.cache_resource
+def load_theme_css():
+    with open(THEME_CSS_PATH, encoding="utf-8") as f:
+        css = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.DOTALL)
+    return "<style>" + re.sub(r"\s+", " ", css).strip() + "</style>"
+
+# Custom CSS for dark theme
+def inject_custom_css():
+    st.markdown(load_theme_css(), unsafe_allow_html=True)
 
 # Home Page
 def home_page():
@@ -534,6 +636,43 @@ def home_page():
     </pre>
     """, unsafe_allow_html=True)
 
+# Generate-validate-repair loop for the HDL Generator, with a per-round report
+def auto_repair_hdl(prompt, system_msg, lang_ext, candidates, rounds, budget, design_prompt):
+    if not API_KEY:
+        st.error("API key not configured. Please configure your API key in secrets.toml.")
+        return None
+    
+    progress = st.empty()
+    
+    def show_round(round_info):
+        progress.caption(
+            f"Round {round_info.number + 1} ({round_info.kind}): {round_info.completed}/{round_info.requested} "
+            f"candidates in {round_info.seconds:.1f}s{' - passed' if round_info.passed else ''}"
+        )
+    
+    with st.spinner(f"Generating {candidates} candidate(s) and repairing until valid..."):
+        repair = generate_and_repair(
+            API_KEY, prompt, system_msg, lang_ext,
+            candidates=candidates, max_rounds=rounds, budget_seconds=budget,
+            design_prompt=design_prompt, on_round=show_round
+        )
+    progress.empty()
+    
+    outcome = "valid" if repair.valid else "not validated" if not repair.validated else "still invalid"
+    with st.expander(f"Auto-repair: {outcome} after {repair.attempts} attempt(s) in {repair.seconds:.1f}s", expanded=not repair.valid):
+        for round_info in repair.rounds:
+            st.markdown(
+                f"- **Round {round_info.number + 1}** ({round_info.kind}): {round_info.requested} requested, "
+                f"{round_info.completed} returned, {round_info.seconds:.1f}s, {'✅ passed' if round_info.passed else '❌ failed'}"
+            )
+        if repair.timed_out:
+            st.caption(f"Stopped at the {budget}s time budget.")
+    
+    if repair.code is None:
+        st.error(repair.message)
+        return None
+    return repair
+
 # Feature 1: RTL Generator
 def rtl_generator():
     with st.container():
@@ -559,66 +698,121 @@ def rtl_generator():
                 validate = st.checkbox("Validate syntax", value=True)
                 add_comments = st.checkbox("Include comments", value=True)
                 optimize = st.checkbox("Optimization suggestions", value=False)
+                auto_repair = st.checkbox("Auto-repair until valid", value=False, disabled=not validate,
+                                          help="Sample several candidates in parallel and feed compiler errors back until one compiles")
+                structured = st.checkbox("Structured output (JSON)", value=False, key="rtl_structured",
+                                         disabled=auto_repair and validate,
+                                         help="Code and notes come back as schema-checked fields instead of Markdown")
+                use_library = st.checkbox("Use design library", value=get_design_library is not None,
+                                          disabled=get_design_library is None,
+                                          help="Reuse a verified module described the same way without a model call, "
+                                               "or show the model the most similar ones as examples")
+                if auto_repair and validate:
+                    repair_candidates = st.slider("Parallel candidates", 1, 4, 2)
+                    repair_rounds = st.slider("Repair rounds", 0, 4, 2)
+                    repair_budget = st.slider("Time budget (s)", 30, 300, 120, step=30)
         
-        example_prompts = {
-            "4-bit up-down counter": f"Design a 4-bit up-down counter in {language}",
-            "8-bit ALU": f"Design an 8-bit ALU in {language} with add, subtract, and, or, xor operations",
-            "FIFO buffer": f"Design a parameterized FIFO buffer in {language} with configurable depth",
-            "Shift register": f"Create an 8-bit shift register in {language} with parallel load"
-        }
+        example_prompts = {name: template.format(language=language) for name, template in EXAMPLE_DESIGNS.items()}
         
         selected_example = st.selectbox("Example designs:", list(example_prompts.keys()))
         design_prompt = st.text_area("Design specification:", example_prompts[selected_example], height=150)
         
+        background = st.checkbox("Run in background", value=False, key="rtl_background",
+                                 help="Keep generating while you use other tabs", disabled=auto_repair and validate)
+        lang_ext = LANGUAGE_EXTENSIONS[language]
+        result = None
+        code = None
+        data = None
+        reused = None
+        
         if st.button("Generate HDL Code", use_container_width=True):
-            enhanced_prompt = (
-                f"Generate strictly correct and synthesizable {language} code for: {design_prompt}\n"
-                f"Requirements:\n"
-                f"- Use efficient and synthesizable constructs\n"
-                f"- Follow industry best practices\n"
-                f"- Ensure no syntax errors\n"
-                f"- Avoid latch inference and timing issues\n"
-                f"{'- Include detailed comments' if add_comments else ''}\n"
-                f"{'- Suggest optimization opportunities at the end' if optimize else ''}\n"
-            )
+            library = get_design_library() if use_library else None
+            match = library.match(design_prompt, language) if library is not None else None
+            examples = library.examples(design_prompt, language) if library is not None and match is None else []
+            enhanced_prompt = build_rtl_prompt(design_prompt, language, add_comments, optimize,
+                                               [(entry.description, source) for entry, source in examples])
+            system_msg = RTL_SYSTEM_MSG
+            if examples:
+                st.caption("Examples from the design library: " + ", ".join(entry.name for entry, _ in examples))
             
-            with st.spinner("Generating HDL code..."):
-                system_msg = (
-                    "You are an expert hardware design engineer. Generate strictly correct HDL code only. "
-                    "Ensure the code follows all syntax rules and avoids common pitfalls."
-                )
-                
-                result = kimi_api_call(enhanced_prompt, system_msg)
+            if match is not None:
+                reused = match
+                code = library.source(reused.id)
+                result = code
+                st.markdown(f'<div class="success-box">♻️ Reused verified module <b>{reused.name}</b> from the design '
+                            f'library (same description); no model call made</div>', unsafe_allow_html=True)
+            elif background and not (auto_repair and validate):
+                submit_background_job("rtl", "generate", design_prompt=design_prompt, language=language,
+                                      add_comments=add_comments, optimize=optimize, validate=False,
+                                      structured=structured, library=use_library)
+            elif auto_repair and validate:
+                repair = auto_repair_hdl(enhanced_prompt, system_msg, lang_ext, repair_candidates,
+                                         repair_rounds, repair_budget, design_prompt)
+                result = repair.reply if repair else None
+                code = repair.code if repair else None
+            elif structured:
+                answer = run_structured("Generating HDL code...", structured_answer, "generate", enhanced_prompt, system_msg)
+                data = answer["data"] if answer else None
+                result = answer["reply"] if answer else None
+            else:
+                result = render_stream(kimi_api_stream(enhanced_prompt, system_msg, tool="generate"), "Generating HDL code...", code_language=language.lower(), key="rtl")
+        
+        if result is None:
+            job = background_job_result("rtl", "Generating HDL code")
+            result = job["reply"] if job else None
+            data = job.get("data") if job else None
+        
+        if result:
+            if data is not None:
+                code = data["code"]
+            elif code is None:
+                code = extract_code_block(result) or result
+            
+            st.subheader("Generated HDL Code")
+            st.code(code, language=language.lower())
+            
+            valid = None
+            if validate:
+                valid, message = validate_hdl_code(code, lang_ext)
                 
-                if result:
-                    code_start = result.find("```") + 3
-                    code_end = result.find("```", code_start)
-                    code = result[code_start:code_end].strip() if code_start > 2 and code_end > code_start else result
-                    
-                    if code.startswith("verilog") or code.startswith("vhdl"):
-                        code = code.split("\n", 1)[1]
-                    
-                    st.subheader("Generated HDL Code")
-                    st.code(code, language=language.lower())
-                    
-                    if validate:
-                        lang_ext = "v" if language == "Verilog" else "sv" if language == "SystemVerilog" else "vhd"
-                        valid, message = validate_hdl_code(code, lang_ext)
-                        
-                        if valid:
-                            st.markdown('<div class="success-box">✅ Syntax validation passed!</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown(f'<div class="error-box">❌ Syntax validation failed: {message}</div>', unsafe_allow_html=True)
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d")
-                    design_name = selected_example.replace(" ", "_").replace("-", "_").lower()
-                    filename = f"{design_name}_{timestamp}.{lang_ext if validate else 'v'}"
-                    
-                    st.markdown(create_download_link(code, filename, "Download HDL File"), unsafe_allow_html=True)
-                    
-                    if optimize and "```" not in result:
-                        st.subheader("Optimization Suggestions")
-                        st.markdown(result)
+                if valid:
+                    st.markdown('<div class="success-box">✅ Syntax validation passed!</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="error-box">❌ Syntax validation failed: {message}</div>', unsafe_allow_html=True)
+            if reused is None:
+                st.session_state.last_generated = {"spec": design_prompt, "code": code, "language": language,
+                                                   "valid": valid}
+            
+            timestamp = datetime.now().strftime("%Y%m%d")
+            design_name = selected_example.replace(" ", "_").replace("-", "_").lower()
+            filename = f"{design_name}_{timestamp}.{lang_ext if validate else 'v'}"
+            
+            st.markdown(create_download_link(code, filename, "Download HDL File"), unsafe_allow_html=True)
+            
+            if data is not None:
+                if data["explanation"]:
+                    st.markdown(data["explanation"])
+                if data.get("optimizations"):
+                    st.subheader("Optimization Suggestions")
+                    st.markdown("\n".join(f"- {item}" for item in data["optimizations"]))
+            elif optimize and reused is None and "```" not in result:
+                st.subheader("Optimization Suggestions")
+                st.markdown(result)
+        
+        last = st.session_state.get("last_generated")
+        if get_design_library is not None and last and last["spec"] == design_prompt:
+            if st.button("Add to design library", key="rtl_add_library",
+                         help="Index this module under the specification above. Code that passed syntax "
+                              "validation answers the same request next time; otherwise it is only an example"):
+                # Only code that passed validation is verified; the rest is kept as an example,
+                # never returned as is
+                entries = get_design_library().add_source(last["code"], language=last["language"],
+                                                          description=last["spec"], verified=last["valid"] is True)
+                if not entries:
+                    st.warning("No module or entity found in the generated code.")
+                else:
+                    st.success(f"Added {', '.join(entry.name for entry in entries)} to the design library"
+                               + ("" if entries[0].verified else " as an unverified example"))
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -632,8 +826,10 @@ def documentation_generator():
             file_info = st.session_state.current_file["doc"]
             st.markdown(f'<div class="info-box">Uploaded: <span class="file-name">{file_info["name"]}</span> ({file_info["language"]})</div>', unsafe_allow_html=True)
             code = st.text_area("HDL Code:", value=file_info["content"], height=300)
+            document, language = file_info["name"], file_info["language"]
         else:
             code = st.text_area("Paste HDL Code:", height=300, key="doc_code_input")
+            document, language = "pasted", None
         
         doc_options = st.columns(3)
         with doc_options[0]:
@@ -643,34 +839,49 @@ def documentation_generator():
         with doc_options[2]:
             include_behavior = st.checkbox("Functional behavior", value=True)
         
+        incremental = False
+        if code and len(fingerprint_modules(code, language)) > 1:
+            incremental = st.checkbox("Only re-document modules changed since the last run", value=True, key="doc_incremental")
+        structured = st.checkbox("Structured output (JSON)", value=False, key="doc_structured", disabled=incremental,
+                                 help="Port and signal tables come back as schema-checked data, downloadable as JSON")
+        
         if st.button("Generate Documentation", use_container_width=True) and code:
-            with st.spinner("Creating documentation..."):
-                prompt = (
-                    f"Generate comprehensive documentation for this HDL code:\n\n{code}\n\n"
-                    "Documentation should include:\n"
-                    f"{'- Module/entity description'}\n"
-                    f"{'- Port list with direction, width, and purpose' if include_ports else ''}\n"
-                    f"{'- Signal declarations and their roles' if include_signals else ''}\n"
-                    f"{'- Functional behavior description' if include_behavior else ''}\n"
-                    "- Timing characteristics if any\n"
-                    "- Implementation notes\n"
-                    "Format the output in Markdown with appropriate headings."
+            system_msg = DOCUMENTATION_SYSTEM_MSG
+            data = None
+            
+            if incremental:
+                result = run_incremental(
+                    code, "documentation", document, [include_ports, include_signals, include_behavior],
+                    lambda part: build_documentation_prompt(part, include_ports, include_signals, include_behavior),
+                    system_msg, "Creating documentation...", language=language, route="document"
                 )
-                
-                system_msg = (
-                    "You are a technical documentation expert. Generate accurate, detailed documentation for HDL code."
+            elif needs_chunking(code):
+                result = run_chunked(
+                    code,
+                    lambda part: build_documentation_prompt(part, include_ports, include_signals, include_behavior),
+                    build_documentation_reduce_prompt, system_msg, "Creating documentation...", key="doc",
+                    tool="document"
                 )
+            elif structured:
+                answer = run_structured("Creating documentation...", document_code, code, include_ports,
+                                        include_signals, include_behavior, language=language, structured=True)
+                data = answer["data"] if answer else None
+                result = answer["reply"] if answer else None
+            else:
+                prompt = build_documentation_prompt(code, include_ports, include_signals, include_behavior)
+                result = render_stream(kimi_api_stream(prompt, system_msg, tool="document"), "Creating documentation...", key="doc")
+            
+            if result:
+                st.subheader("Design Documentation")
+                st.markdown(result, unsafe_allow_html=True)
                 
-                result = kimi_api_call(prompt, system_msg)
+                timestamp = datetime.now().strftime("%Y%m%d")
+                filename = f"design_documentation_{timestamp}.md"
                 
-                if result:
-                    st.subheader("Design Documentation")
-                    st.markdown(result, unsafe_allow_html=True)
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d")
-                    filename = f"design_documentation_{timestamp}.md"
-                    
-                    st.markdown(create_download_link(result, filename, "Download Documentation"), unsafe_allow_html=True)
+                st.markdown(create_download_link(result, filename, "Download Documentation"), unsafe_allow_html=True)
+                if data is not None:
+                    st.markdown(create_download_link(json.dumps(data, indent=2), f"design_documentation_{timestamp}.json",
+                                                     "Download as JSON"), unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -687,18 +898,10 @@ def code_explainer():
         else:
             code = st.text_area("Paste HDL Code:", height=200, key="explainer_code")
         
-        if code:
-            code_hash = hash(code)
-            if code_hash not in st.session_state.conversation:
-                st.session_state.conversation[code_hash] = []
+        conversations = get_conversation_store()
+        session_id = st.session_state.session_id
         
-        suggested_questions = [
-            "Why is there an inferred latch?",
-            "Explain the functionality of this module",
-            "What does this always block do?",
-            "Are there any timing issues?",
-            "How could this code be optimized?"
-        ]
+        suggested_questions = SUGGESTED_QUESTIONS
         
         st.caption("Suggested questions:")
         cols = st.columns(3)
@@ -713,44 +916,47 @@ def code_explainer():
             question = st.text_input("Your question:", value="Explain this code")
         
         if st.button("Analyze Code", use_container_width=True) and code and question:
-            code_hash = hash(code)
-            with st.spinner("Analyzing..."):
-                prompt = (
-                    f"Analyze this HDL code:\n\n{code}\n\n"
-                    f"Question: {question}"
-                )
-                
-                system_msg = (
-                    "You are a hardware design expert. Analyze the provided code and answer questions technically. "
-                    "Identify potential issues and explain concepts clearly."
+            system_msg = EXPLAIN_SYSTEM_MSG
+            # Earlier turns on this code: a short summary plus the last few verbatim
+            summary, recent = conversations.context(session_id, code)
+            # The file (or its outline) leads every request unchanged, so follow-ups hit the prompt cache;
+            # a large file only sends the blocks relevant to the question
+            messages, selection = explain_messages(code, question, None, summary, recent,
+                                                   get_router().primary_model("explain"))
+            
+            if messages is None:
+                st.caption("No part of the file matches the question directly; analyzing the whole file.")
+                result = run_chunked(
+                    code,
+                    lambda part: build_explain_prompt(part, question),
+                    lambda partials: build_explain_reduce_prompt(partials, question, summary, recent),
+                    system_msg, "Analyzing...", key="explainer", tool="explain"
                 )
+            else:
+                if selection is not None:
+                    st.caption(f"Sending the module outline and the relevant blocks: {selection.summary()}")
+                result = render_stream(kimi_api_stream(None, messages=messages, tool="explain"), "Analyzing...", key="explainer")
+            
+            if result:
+                conversations.append(session_id, code, "user", question)
+                conversations.append(session_id, code, "assistant", result)
                 
-                result = kimi_api_call(prompt, system_msg)
-                
-                if result:
-                    if code_hash not in st.session_state.conversation:
-                        st.session_state.conversation[code_hash] = []
-                    
-                    st.session_state.conversation[code_hash].append(("user", question))
-                    st.session_state.conversation[code_hash].append(("assistant", result))
-                    
-                    st.markdown(f'<div class="info-box"><strong>Analysis:</strong></div>', unsafe_allow_html=True)
-                    st.markdown(result)
+                st.markdown(f'<div class="info-box"><strong>Analysis:</strong></div>', unsafe_allow_html=True)
+                st.markdown(result)
         
-        if code:
-            code_hash = hash(code)
-            if code_hash in st.session_state.conversation and st.session_state.conversation[code_hash]:
-                st.subheader("Conversation History")
-                for role, msg in st.session_state.conversation[code_hash]:
-                    if role == "user":
-                        st.markdown(f'**You:** {msg}')
-                    else:
-                        st.markdown(f'**Analysis:**')
-                        st.markdown(msg)
-                
-                if st.button("Clear History", use_container_width=True):
-                    st.session_state.conversation[code_hash] = []
-                    st.experimental_rerun()
+        history = conversations.history(session_id, code) if code else []
+        if history:
+            st.subheader("Conversation History")
+            for role, msg in history:
+                if role == "user":
+                    st.markdown(f'**You:** {msg}')
+                else:
+                    st.markdown(f'**Analysis:**')
+                    st.markdown(msg)
+            
+            if st.button("Clear History", use_container_width=True):
+                conversations.clear(session_id, code)
+                st.experimental_rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -764,18 +970,17 @@ def bug_fixer():
             file_info = st.session_state.current_file["bugfix"]
             st.markdown(f'<div class="info-box">Uploaded: <span class="file-name">{file_info["name"]}</span> ({file_info["language"]})</div>', unsafe_allow_html=True)
             code = st.text_area("HDL Code:", value=file_info["content"], height=200)
+            filename = file_info["name"]
         else:
             code = st.text_area("Paste HDL Code:", height=200, key="bugfix_code_input")
+            filename = None
         
         error_log = st.text_area("Error Logs:", height=100, 
-                               placeholder="Paste simulation/synthesis errors here", key="bugfix_code_input")
+                               placeholder="Paste simulation/synthesis errors here", key="bugfix_error_log")
+        log_file = st.file_uploader("Or upload a log file:", type=["log", "txt", "rpt", "out", "gz"], key="bugfix_log_file",
+                                    help="Long logs are triaged locally; only the top message groups are sent")
         
-        common_errors = {
-            "Latch Inference": "Warning: Inferring latch for variable",
-            "Blocking/Non-blocking": "Warning: Use of blocking assignment in sequential block",
-            "Syntax Error": "Syntax error near",
-            "Undefined Signal": "Error: Undefined signal"
-        }
+        common_errors = COMMON_ERRORS
         
         st.caption("Common error patterns:")
         cols = st.columns(4)
@@ -787,48 +992,132 @@ def bug_fixer():
         if 'error_log' in st.session_state:
             error_log = st.text_area(" ", value=st.session_state.error_log, height=100)
         
+        error_log = triage_panel(code, error_log, log_file, filename)
+        waveform = waveform_panel(code, error_log)
+        structured = st.checkbox("Structured output (JSON)", value=False, key="bugfix_structured",
+                                 help="Fixed code, explanation and the list of changes come back as schema-checked fields")
+        
         if st.button("Diagnose and Fix", use_container_width=True) and code:
-            with st.spinner("Analyzing issues..."):
-                prompt = (
-                    f"Analyze and fix this HDL code based on error logs:\n\n"
-                    f"Code:\n{code}\n\n"
-                    f"Errors:\n{error_log if error_log else 'No error logs provided'}\n\n"
-                    "Provide:\n"
-                    "1. Fixed code in a code block\n"
-                    "2. Explanation of the issues\n"
-                    "3. List of changes made\n"
-                    "4. Prevention suggestions"
-                )
+            prompt = build_bugfix_prompt(code, error_log, waveform)
+            system_msg = BUGFIX_SYSTEM_MSG
+            
+            if structured:
+                answer = run_structured("Analyzing issues...", structured_answer, "fix", prompt, system_msg)
+                result = answer["reply"] if answer else None
+            else:
+                result = render_stream(kimi_api_stream(prompt, system_msg, tool="fix"), "Analyzing issues...", code_language="verilog", key="bugfix")
+            
+            if result:
+                if structured:
+                    data = answer["data"]
+                    fixed_code = data["code"]
+                    explanation = "\n\n".join(
+                        [data["explanation"]]
+                        + [f"**{title}**\n\n" + "\n".join(f"- {item}" for item in data[key])
+                           for key, title in (("changes", "Changes"), ("prevention", "Prevention")) if data.get(key)]
+                    )
+                else:
+                    fixed_code, explanation = split_code_and_explanation(result)
+                if fixed_code is None:
+                    fixed_code = result
                 
-                system_msg = (
-                    "You are a hardware debugging expert. Identify and fix HDL code issues. "
-                    "Explain the root cause and how your solution addresses it."
-                )
+                st.subheader("Fixed Code")
+                st.code(fixed_code)
                 
-                result = kimi_api_call(prompt, system_msg)
+                st.subheader("Analysis")
+                st.markdown(explanation)
                 
-                if result:
-                    code_start = result.find("```") + 3
-                    code_end = result.find("```", code_start)
-                    fixed_code = result[code_start:code_end].strip() if code_start > 2 and code_end > code_start else result
-                    
-                    explanation = result
-                    if code_start > 2 and code_end > code_start:
-                        explanation = result[:code_start-3] + result[code_end+3:]
-                    
-                    st.subheader("Fixed Code")
-                    st.code(fixed_code)
-                    
-                    st.subheader("Analysis")
-                    st.markdown(explanation)
-                    
-                    if fixed_code and "```" not in fixed_code:
-                        timestamp = datetime.now().strftime("%Y%m%d")
-                        filename = f"fixed_design_{timestamp}.v"
-                        st.markdown(create_download_link(fixed_code, filename, "Download Fixed Code"), unsafe_allow_html=True)
+                if fixed_code and "```" not in fixed_code:
+                    timestamp = datetime.now().strftime("%Y%m%d")
+                    filename = f"fixed_design_{timestamp}.v"
+                    st.markdown(create_download_link(fixed_code, filename, "Download Fixed Code"), unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+# Long pasted or uploaded logs are streamed through the local triage: repeated
+# messages are grouped with counts and only the top groups go into the prompt
+def triage_panel(code, error_log, log_file, filename=None):
+    if log_file is None and len(error_log or "") <= TRIAGE_THRESHOLD:
+        return error_log
+    triages = st.session_state.setdefault("log_triages", {})
+    key = f"{log_file.name}:{log_file.size}" if log_file else hashlib.sha256(error_log.encode()).hexdigest()
+    if key not in triages:
+        with st.spinner("Triaging log..."):
+            source = text_lines(log_file) if log_file else error_log.splitlines()
+            triages[key] = LogTriage().feed_lines(source)
+    triage = triages[key]
+    report = triage_report(triage, code, filename)
+    summary = triage.summary()
+    counts = summary["counts"]
+    st.caption(f"Log triage: {summary['lines']:,} lines, {counts['fatal'] + counts['error']:,} errors, "
+               f"{counts['critical'] + counts['warning']:,} warnings in {summary['groups']:,} groups")
+    st.table([{"severity": g.severity, "category": g.category, "count": g.count, "first line": g.first_line,
+               "message": g.example[:120]} for g in triage.top()])
+    with st.expander("Log summary sent instead of the full log"):
+        st.code(report)
+    return report
+
+# Dumps are indexed once per upload (and reused across uploads of the same file
+# via the on-disk store); only a window around the failure reaches the prompt
+def load_waveform(upload):
+    stores = st.session_state.setdefault("waveform_stores", {})
+    key = f"{upload.name}:{upload.size}"
+    # A later ingest may have pruned the store from disk; index the upload again
+    if key not in stores or not os.path.exists(os.path.join(stores[key], "manifest.json")):
+        with tempfile.NamedTemporaryFile(suffix=os.path.splitext(upload.name)[1], delete=False) as f:
+            f.write(upload.getbuffer())
+        try:
+            with st.spinner(f"Indexing {upload.name}..."):
+                stores[key] = open_waveform(f.name).directory
+        finally:
+            os.unlink(f.name)
+    return Waveform(stores[key])
+
+
+def waveform_panel(code, error_log):
+    if open_waveform is None:
+        return None
+    upload = st.file_uploader("Waveform dump (optional):", type=["vcd", "fst"], key="bugfix_waveform")
+    if upload is None:
+        return None
+    reference_upload = st.file_uploader("Expected waveform (optional):", type=["vcd", "fst"], key="bugfix_reference",
+                                        help="A dump from a known-good run; the first mismatch sets the failure time")
+    try:
+        wave = load_waveform(upload)
+        reference = load_waveform(reference_upload) if reference_upload else None
+    except WaveformError as e:
+        st.error(str(e))
+        return None
+
+    summary = wave.summary()
+    st.caption(f"{summary['signals']} signals, {summary['changes']:,} changes, "
+               f"ends at {summary['end_time']} ({summary['timescale']} units)")
+    mismatches = []
+    if reference:
+        comparisons = st.session_state.setdefault("waveform_comparisons", {})
+        key = (wave.directory, reference.directory)
+        if key not in comparisons:
+            comparisons[key] = wave.compare(reference)
+        mismatches = comparisons[key]
+        if not mismatches:
+            st.info("No mismatches against the expected waveform")
+    center = mismatches[0]["time"] if mismatches else wave.time_from_log(error_log)
+    if center is None or center > wave.end_time:
+        center = wave.end_time
+
+    col1, col2 = st.columns(2)
+    with col1:
+        center = st.number_input("Failure time:", min_value=0, max_value=max(wave.end_time, 1), value=center)
+    with col2:
+        ticks = st.number_input("Time either side:", min_value=1, value=wave.default_span())
+    names = st.multiselect("Signals:", wave.names, default=wave.relevant(code, center, ticks, ticks))
+    text = wave.window(names, center, ticks, ticks)
+    if mismatches:
+        text += "\n" + format_mismatches(mismatches)
+    with st.expander("Waveform window sent with the code"):
+        st.code(text)
+    return text
+
 # Feature 5: Code Reviewer
 def code_reviewer():
     with st.container():
@@ -839,48 +1128,93 @@ def code_reviewer():
             file_info = st.session_state.current_file["review"]
             st.markdown(f'<div class="info-box">Uploaded: <span class="file-name">{file_info["name"]}</span> ({file_info["language"]})</div>', unsafe_allow_html=True)
             code = st.text_area("HDL Code:", value=file_info["content"], height=300)
+            document, language = file_info["name"], file_info["language"]
         else:
             code = st.text_area("Paste HDL Code:", height=300)
+            document, language = "pasted", None
         
         focus_areas = st.multiselect(
             "Review Focus:",
-            ["Linting", "Optimization", "Style", "Synthesis", "Testability", "CDC"],
-            ["Linting", "Optimization", "Style"]
+            REVIEW_FOCUS_AREAS,
+            DEFAULT_REVIEW_FOCUS
         )
         
         severity_level = st.select_slider(
             "Review Strictness:",
-            options=["Informational", "Moderate", "Strict"],
+            options=REVIEW_STRICTNESS,
             value="Moderate"
         )
         
+        incremental = False
+        if code and len(fingerprint_modules(code, language)) > 1:
+            incremental = st.checkbox("Only re-review modules changed since the last run", value=True, key="review_incremental")
+        background = st.checkbox("Run in background", value=False, key="review_background",
+                                 help="Keep reviewing while you use other tabs", disabled=incremental)
+        lint = st.checkbox("Pre-screen with static lint checks", value=True, key="review_lint",
+                           help="Blocking assignments, latches and undriven/unused signals are checked locally; "
+                                "the model only reviews design-level issues")
+        parallel = st.checkbox("Review each focus area in parallel", value=True, key="review_parallel",
+                               disabled=incremental,
+                               help="One specialized prompt per focus area, merged into a single findings table")
+        structured = st.checkbox("Structured output (JSON)", value=False, key="review_structured", disabled=incremental,
+                                 help="Findings come back as schema-checked JSON; malformed fields are re-asked")
+        result = None
+        lint_result = None
+        merged = False
+        
         if st.button("Perform Code Review", use_container_width=True) and code:
-            with st.spinner("Reviewing code..."):
-                prompt = (
-                    f"Review this HDL code with {severity_level.lower()} strictness:\n{code}\n\n"
-                    f"Focus on: {', '.join(focus_areas)}\n\n"
-                    "Provide a code review with:\n"
-                    "- Categorized findings (Critical, Warning, Suggestion)\n"
-                    "- Specific code locations\n"
-                    "- Explanation of issues\n"
-                    "- Suggested improvements\n"
-                    "- Overall quality assessment"
-                )
-                
-                system_msg = (
-                    "You are an experienced code reviewer. Provide professional, actionable suggestions. "
-                    "Use a structured format with clear severity levels."
-                )
-                
-                result = kimi_api_call(prompt, system_msg)
-                
-                if result:
-                    st.subheader("Code Review Report")
-                    st.markdown(result)
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d")
-                    filename = f"code_review_{timestamp}.md"
-                    st.markdown(create_download_link(result, filename, "Download Review Report"), unsafe_allow_html=True)
+            system_msg = REVIEW_SYSTEM_MSG
+            linted = None
+            
+            if background and not incremental:
+                submit_background_job("review", "review", code=code, focus_areas=focus_areas,
+                                      severity_level=severity_level, language=language, lint=lint,
+                                      parallel=parallel, structured=structured)
+            else:
+                if lint:
+                    lint_result = lint_report(code, language)
+                    linted = lint_descriptions(lint_result)
+                    render_lint_findings(lint_result)
+                if incremental:
+                    result = run_incremental(
+                        code, "review", document, [sorted(focus_areas), severity_level, bool(lint)],
+                        lambda part: build_review_prompt(part, focus_areas, severity_level, linted),
+                        system_msg, "Reviewing code...", language=language, route="review"
+                    )
+                elif structured or (parallel and focus_areas):
+                    areas = focus_areas if parallel and focus_areas else [", ".join(focus_areas) or "overall quality"]
+                    review = run_parallel_review(code, areas, severity_level, linted, lint_result, language, structured)
+                    result = review["reply"] if review else None
+                    merged = True
+                elif needs_chunking(code):
+                    result = run_chunked(
+                        code,
+                        lambda part: build_review_prompt(part, focus_areas, severity_level, linted),
+                        lambda partials: build_review_reduce_prompt(partials, severity_level),
+                        system_msg, "Reviewing code...", key="review", tool="review"
+                    )
+                else:
+                    prompt = build_review_prompt(code, focus_areas, severity_level, linted)
+                    result = render_stream(kimi_api_stream(prompt, system_msg, tool="review"), "Reviewing code...", key="review")
+        
+        if result is None:
+            job = background_job_result("review", "Reviewing code")
+            result = job["reply"] if job else None
+            lint_result = job.get("lint") if job else None
+            merged = bool(job) and "findings" in job
+            if lint_result:
+                render_lint_findings(lint_result)
+        
+        if result:
+            st.subheader("Code Review Report")
+            st.markdown(result)
+            
+            report = result
+            if lint_result and not merged:
+                report = f"## Static Checks\n\n{format_findings(lint_result['findings'])}\n\n{result}"
+            timestamp = datetime.now().strftime("%Y%m%d")
+            filename = f"code_review_{timestamp}.md"
+            st.markdown(create_download_link(report, filename, "Download Review Report"), unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -906,7 +1240,7 @@ def testbench_generator():
             col1, col2 = st.columns(2)
             with col1:
                 test_type = st.selectbox("Test Type:", 
-                                        ["Basic Functional", "Randomized", "Corner Case", "Assertion-Based"],
+                                        TESTBENCH_TYPES,
                                         index=0)
                 clock_period = st.slider("Clock Period (ns):", 1, 100, 10)
             with col2:
@@ -914,39 +1248,162 @@ def testbench_generator():
                 include_coverage = st.checkbox("Functional Coverage", value=False)
                 include_waves = st.checkbox("Waveform Dumping", value=True)
         
+        background = st.checkbox("Run in background", value=False, key="testbench_background",
+                                 help="Keep generating while you use other tabs")
+        structured = st.checkbox("Structured output (JSON)", value=False, key="testbench_structured",
+                                 help="The testbench comes back as a schema-checked code field instead of Markdown")
+        result = None
+        tb_code = None
+        
         if st.button("Generate Testbench", use_container_width=True) and code:
-            with st.spinner("Creating testbench..."):
-                prompt = (
-                    f"Write a comprehensive {language} testbench for this module:\n\n{code}\n\n"
-                    f"Requirements:\n"
-                    f"- Test Type: {test_type}\n"
-                    f"- Clock Period: {clock_period}ns\n"
-                    f"- Test Cases: {num_tests}\n"
-                    f"{'- Functional Coverage' if include_coverage else ''}\n"
-                    f"{'- Waveform Dumping' if include_waves else ''}\n"
-                    f"- Self-checking mechanisms\n"
-                    f"- Detailed comments\n"
-                    f"- Modern verification techniques"
-                )
-                
-                system_msg = (
-                    "You are a verification engineer. Create a professional testbench."
-                )
-                
-                result = kimi_api_call(prompt, system_msg)
+            if background:
+                submit_background_job("testbench", "testbench", code=code, language=language, test_type=test_type,
+                                      clock_period=clock_period, num_tests=num_tests,
+                                      include_coverage=include_coverage, include_waves=include_waves,
+                                      structured=structured)
+            else:
+                prompt = build_testbench_prompt(code, language, test_type, clock_period, num_tests,
+                                                include_coverage, include_waves)
+                system_msg = TESTBENCH_SYSTEM_MSG
                 
-                if result:
-                    code_start = result.find("```") + 3
-                    code_end = result.find("```", code_start)
-                    tb_code = result[code_start:code_end].strip() if code_start > 2 and code_end > code_start else result
-                    
-                    st.subheader("Testbench Code")
-                    st.code(tb_code, language=language.lower())
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d")
-                    ext = "sv" if language == "SystemVerilog" else "v"
-                    filename = f"testbench_{timestamp}.{ext}"
-                    st.markdown(create_download_link(tb_code, filename, "Download Testbench"), unsafe_allow_html=True)
+                if structured:
+                    answer = run_structured("Creating testbench...", structured_answer, "testbench", prompt, system_msg)
+                    result = answer["reply"] if answer else None
+                    tb_code = answer["data"]["code"] if answer else None
+                else:
+                    result = render_stream(kimi_api_stream(prompt, system_msg, tool="testbench"), "Creating testbench...", code_language=language.lower(), key="testbench")
+        
+        if result is None:
+            job = background_job_result("testbench", "Creating testbench")
+            result = job["reply"] if job else None
+            tb_code = job["code"] if job and "data" in job else None
+        
+        if result:
+            tb_code = tb_code or extract_code_block(result) or result
+            
+            st.subheader("Testbench Code")
+            st.code(tb_code, language=language.lower())
+            
+            timestamp = datetime.now().strftime("%Y%m%d")
+            ext = "sv" if language == "SystemVerilog" else "v"
+            filename = f"testbench_{timestamp}.{ext}"
+            st.markdown(create_download_link(tb_code, filename, "Download Testbench"), unsafe_allow_html=True)
+            st.session_state.last_testbench = {"dut": code, "testbench": tb_code, "language": language}
+        
+        last = st.session_state.get("last_testbench")
+        if last and code and last["dut"] == code:
+            simulation_panel(last["dut"], last["testbench"], last["language"])
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+# Verified designs the HDL Generator reuses or shows the model as examples
+def design_library_panel():
+    library = get_design_library()
+    with st.expander("Design library"):
+        uploads = st.file_uploader("Add verified HDL files or a .zip of them", type=["v", "sv", "vhd", "vhdl", "zip"],
+                                   accept_multiple_files=True, key="library_upload",
+                                   help="Each module is indexed under the comment block above it")
+        verified = st.checkbox("Verified (may be returned without a model call)", value=True, key="library_verified")
+        if uploads and st.button("Add to library", key="library_add"):
+            added = []
+            for upload in uploads:
+                if upload.name.lower().endswith(".zip"):
+                    sources = iter_zip_sources(upload)
+                else:
+                    sources = [(upload.name, upload.read().decode("utf-8", errors="replace"))]
+                for path, text in sources:
+                    added += library.add_source(text, path, verified=verified)
+            st.success(f"Added {len(added)} module{'s' if len(added) != 1 else ''}")
+        
+        entries = library.entries()
+        st.table([entry.summary() for entry in entries] or [{"name": "library is empty"}])
+        if entries:
+            names = {entry.id: entry.name for entry in entries}
+            remove = st.multiselect("Remove entries:", list(names), key="library_remove",
+                                    format_func=lambda entry_id: f"{entry_id}: {names[entry_id]}")
+            if remove and st.button("Remove", key="library_remove_button"):
+                st.success(f"Removed {library.remove(remove)} entries")
+
+# Live stats for this server process (shared by every session): upstream latency,
+# retries, throttling, cache hits, token usage and the most recent traced spans
+def admin_page():
+    with st.container():
+        st.markdown('<div class="feature-card">', unsafe_allow_html=True)
+        st.markdown('<h2 class="section-title"><span class="feature-icon">📊</span> Admin</h2>', unsafe_allow_html=True)
+        
+        metrics = get_metrics()
+        snapshot = metrics.snapshot()
+        
+        def total(name, **match):
+            return sum(value for labels, value in snapshot.get(name, {}).items()
+                       if all(dict(labels).get(k) == v for k, v in match.items()))
+        
+        cache_hits = total("vlsi_cache_lookups_total", cache="responses", result="memory_hits") + \
+            total("vlsi_cache_lookups_total", cache="responses", result="disk_hits")
+        cache_lookups = cache_hits + total("vlsi_cache_lookups_total", cache="responses", result="misses")
+        cols = st.columns(5)
+        cols[0].metric("LLM requests", int(total("vlsi_llm_requests_total")))
+        cols[1].metric("Retries", int(total("vlsi_llm_retries_total")))
+        cols[2].metric("429s", int(total("vlsi_llm_requests_total", status="429")))
+        cols[3].metric("Cache hit rate", f"{cache_hits / cache_lookups:.0%}" if cache_lookups else "–")
+        cols[4].metric("Tokens (prompt / completion)",
+                       f"{int(total('vlsi_llm_tokens_total', kind='prompt'))} / "
+                       f"{int(total('vlsi_llm_tokens_total', kind='completion'))}")
+        
+        def latency_rows(name):
+            return [
+                dict(labels) | {
+                    "count": stats["count"],
+                    "p50 (s)": round(stats["p50"], 3) if stats["p50"] is not None else None,
+                    "p95 (s)": round(stats["p95"], 3) if stats["p95"] is not None else None,
+                    "p99 (s)": round(stats["p99"], 3) if stats["p99"] is not None else None,
+                }
+                for labels, stats in sorted(snapshot.get(name, {}).items())
+            ]
+        
+        st.markdown("#### Upstream latency by model")
+        st.table(latency_rows("vlsi_llm_request_seconds") or [{"model": "no requests yet"}])
+        st.markdown("#### Time to first token")
+        st.table(latency_rows("vlsi_llm_first_token_seconds") or [{"view": "no streams yet"}])
+        st.markdown("#### Spans")
+        st.table(latency_rows("vlsi_span_seconds") or [{"span": "nothing traced yet"}])
+        
+        with st.expander("Recent spans"):
+            st.table([
+                {
+                    "trace": record["trace"],
+                    "span": record["name"],
+                    "status": record["status"],
+                    "seconds": round(record["seconds"], 3),
+                    "started": datetime.fromtimestamp(record["started"]).strftime("%H:%M:%S"),
+                    "attributes": ", ".join(f"{k}={v}" for k, v in record["attributes"].items())
+                }
+                for record in metrics.recent_spans(50)
+            ] or [{"span": "nothing traced yet"}])
+        
+        with st.expander("Components"):
+            st.json({
+                "cache": get_response_cache().stats(),
+                "limiter": get_limiter().stats(),
+                "breaker": get_breaker().stats(),
+                "router": get_router().stats(),
+                "single_flight": get_single_flight().stats(),
+                "conversations": get_conversation_store().stats(),
+                "validation": get_validation_service().stats(),
+                "simulation": get_simulation_runner().stats(),
+                "jobs": get_job_manager().stats(),
+                "library": get_design_library().stats() if get_design_library is not None else None
+            })
+        
+        if get_design_library is not None:
+            design_library_panel()
+        
+        col_refresh, col_export = st.columns(2)
+        with col_refresh:
+            st.button("Refresh", use_container_width=True)
+        with col_export:
+            st.download_button("Download Prometheus metrics", metrics.render_prometheus(),
+                                file_name="vlsi_metrics.prom", use_container_width=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -977,7 +1434,7 @@ def main():
     # Define tab names
     tab_names = [
         "Home", "HDL Generator", "Documentation", "Code Analysis",
-        "Debugging", "Code Review", "Testbench"
+        "Debugging", "Code Review", "Testbench", "Admin"
     ]
 
     # Create header container
@@ -1024,6 +1481,8 @@ def main():
         code_reviewer()
     elif selected_tab == "Testbench":
         testbench_generator()
+    elif selected_tab == "Admin":
+        admin_page()
 
     # Footer
     footer()
@@ -0,0 +1,2 @@
+# Performance benchmarks. Run from the repository root, e.g.
+#   python -m benchmarks.bench_http_pool
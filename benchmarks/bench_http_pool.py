@@ -0,0 +1,95 @@
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.mock_openrouter import start_mock_server
+from vlsi_core.http_client import get_session, reset_pool
+
+PAYLOAD = {
+    "model": "moonshotai/kimi-k2:free",
+    "messages": [
+        {"role": "system", "content": "You are an expert VLSI engineer"},
+        {"role": "user", "content": "Design a 4-bit up-down counter in Verilog"}
+    ],
+    "temperature": 0.2,
+    "max_tokens": 2048
+}
+HEADERS = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def call_fresh(url):
+    start = time.perf_counter()
+    response = requests.post(url, headers=HEADERS, data=json.dumps(PAYLOAD), timeout=60)
+    response.json()
+    return time.perf_counter() - start
+
+
+def call_pooled(url):
+    start = time.perf_counter()
+    response = get_session().post(url, headers=HEADERS, data=json.dumps(PAYLOAD), timeout=60)
+    response.json()
+    return time.perf_counter() - start
+
+
+def run(fn, url, n, concurrency):
+    start = time.perf_counter()
+    if concurrency <= 1:
+        samples = [fn(url) for _ in range(n)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(lambda _: fn(url), range(n)))
+    wall = time.perf_counter() - start
+    return {
+        "calls": n,
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "throughput_rps": round(n / wall, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fresh requests.post against the pooled session")
+    parser.add_argument("-n", "--calls", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency in seconds")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency)
+    results = {}
+    try:
+        for mode, concurrency in (("sequential", 1), ("concurrent", args.concurrency)):
+            for name, fn in (("fresh", call_fresh), ("pooled", call_pooled)):
+                reset_pool()
+                before = server.connections_seen
+                result = run(fn, server.url, args.calls, concurrency)
+                result["connections_opened"] = server.connections_seen - before
+                results[f"{mode}/{name}"] = result
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'case':<22}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}{'conns':>8}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['mean_ms']:>10}"
+              f"{r['throughput_rps']:>10}{r['connections_opened']:>8}")
+    print("Note: the mock server is plain HTTP; real OpenRouter calls also save a TLS handshake per reused socket.")
+
+
+if __name__ == "__main__":
+    main()
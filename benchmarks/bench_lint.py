@@ -0,0 +1,75 @@
+import argparse
+import json
+import re
+import time
+
+from benchmarks.corpus import load_hdl
+from vlsi_core.lint import lint_hdl, tokenize
+
+
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else float("inf")
+
+
+# One large file: the corpus repeated `scale` times, modules renamed so each copy is distinct
+def synthetic_file(files, scale):
+    parts = []
+    for i in range(scale):
+        for _, code, language in files:
+            if language != "VHDL":
+                parts.append(re.sub(r"\b(module\s+)(\w+)", rf"\g<1>\g<2>_{i}", code))
+    return "\n".join(parts)
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the static lint engine in lines/sec")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Passes over the corpus")
+    parser.add_argument("--scale", type=int, default=200, help="Corpus copies in the large-file case")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    files = load_hdl()
+    lines = sum(code.count("\n") + 1 for _, code, _ in files)
+    results = {"files": len(files), "lines": lines, "repeat": args.repeat}
+
+    elapsed, _ = timed(lambda: [lint_hdl(code, language) for _, code, language in files], args.repeat)
+    results["corpus"] = {"lines_per_sec": rate(lines * args.repeat, elapsed),
+                         "ms_per_file": round(elapsed / (len(files) * args.repeat) * 1000, 3)}
+    results["per_file"] = {
+        name: len(lint_hdl(code, language)) for name, code, language in files
+    }
+
+    big = synthetic_file(files, args.scale)
+    big_lines = big.count("\n") + 1
+    tokenize_seconds, tokens = timed(lambda: tokenize(big), 1)
+    elapsed, findings = timed(lambda: lint_hdl(big), 1)
+    results["large_file"] = {
+        "lines": big_lines,
+        "tokens": len(tokens),
+        "ms": round(elapsed * 1000, 1),
+        "tokenize_ms": round(tokenize_seconds * 1000, 1),
+        "lines_per_sec": rate(big_lines, elapsed),
+        "findings": len(findings)
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Corpus: {results['files']} files, {lines} lines x {args.repeat} passes")
+    print(f"{'corpus':<12}{results['corpus']['lines_per_sec']:>14} lines/s"
+          f"{results['corpus']['ms_per_file']:>10} ms/file")
+    large = results["large_file"]
+    print(f"{'large file':<12}{large['lines_per_sec']:>14} lines/s"
+          f"{large['ms']:>10} ms for {large['lines']} lines ({large['tokenize_ms']} ms tokenizing)")
+    print("findings per file: " + ", ".join(f"{name} {count}" for name, count in results["per_file"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_openrouter import start_mock_server
+
+PRIMARY = "mock/primary"
+BACKUP = "mock/backup"
+
+# name -> (per-model mock profiles, route, router options)
+SCENARIOS = {
+    "healthy": ({}, [PRIMARY, BACKUP], {}),
+    "throttled/no-fallback": ({PRIMARY: {"rate_429": 0.3}}, [PRIMARY], {}),
+    "throttled/failover": ({PRIMARY: {"rate_429": 0.3}}, [PRIMARY, BACKUP], {}),
+    "erroring/failover": ({PRIMARY: {"error_rate": 0.5}}, [PRIMARY, BACKUP], {}),
+    "slow-tail/no-hedge": ({PRIMARY: {"jitter": 0.6}}, [PRIMARY, BACKUP], {}),
+    "slow-tail/hedged": ({PRIMARY: {"jitter": 0.6}}, [PRIMARY, BACKUP], {"hedge_after": 0.15}),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_scenario(router_cls, limiter_cls, server, route, options, calls, concurrency):
+    from vlsi_core.openrouter import OpenRouterError, build_payload
+    from vlsi_core.rate_limit import CircuitOpenError
+
+    router = router_cls({"bench": route}, **options)
+    limiter = limiter_cls(1000.0, capacity=100)
+    before = dict(server.requests_by_model)
+
+    def one(i):
+        payload = build_payload(f"Design a {i}-bit counter", model=route[0])
+        start = time.perf_counter()
+        try:
+            router.complete("bench", payload, "bench", max_retries=len(route) + 1, limiter=limiter)
+        except (OpenRouterError, CircuitOpenError):
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(calls)))
+    wall = time.perf_counter() - start
+    ok = [s for s in samples if s is not None]
+    upstream = {model: count - before.get(model, 0) for model, count in server.requests_by_model.items()
+                if count - before.get(model, 0)}
+    return {
+        "calls": calls,
+        "failed": calls - len(ok),
+        "p50_ms": round(percentile(ok, 50) * 1000, 1) if ok else None,
+        "p95_ms": round(percentile(ok, 95) * 1000, 1) if ok else None,
+        "mean_ms": round(statistics.mean(ok) * 1000, 1) if ok else None,
+        "throughput_rps": round(calls / wall, 1),
+        "upstream_requests": upstream,
+        "router": router.stats()["models"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model routing, failover and hedging on a mock provider")
+    parser.add_argument("-n", "--calls", type=int, default=100)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Base mock latency in seconds")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Run only these scenarios")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency)
+    # The provider URL is read at import time, so point it at the mock first
+    os.environ["OPENROUTER_URL"] = server.url
+    from vlsi_core.rate_limit import AdaptiveRateLimiter
+    from vlsi_core.routing import ModelRouter
+
+    results = {}
+    try:
+        for name in args.scenario or SCENARIOS:
+            profiles, route, options = SCENARIOS[name]
+            server.config["models"] = profiles
+            results[name] = run_scenario(ModelRouter, AdaptiveRateLimiter, server, route, options,
+                                         args.calls, args.concurrency)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<24}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>8}  upstream")
+    for name, r in results.items():
+        upstream = ", ".join(f"{model.split('/')[-1]}={count}" for model, count in r["upstream_requests"].items())
+        print(f"{name:<24}{r['failed']:>8}{str(r['p50_ms']):>10}{str(r['p95_ms']):>10}"
+              f"{r['throughput_rps']:>8}  {upstream}")
+
+
+if __name__ == "__main__":
+    main()
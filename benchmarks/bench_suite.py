@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_openrouter import start_mock_server
+
+TOOL_ORDER = ["generate", "document", "explain", "fix", "review", "testbench"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples):
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(samples) * 1000, 2)
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def _span_totals(metrics, name):
+    for labels, stats in metrics.span_seconds.summary().items():
+        if dict(labels) == {"span": name, "status": "ok"}:
+            return stats["count"], (stats["mean"] or 0.0) * stats["count"]
+    return 0, 0.0
+
+
+# Run every case of one tool through the service layer, `concurrency` at a time.
+# Unless warm, the response cache is emptied before each pass so every call goes upstream.
+def run_tool(tool, cases, concurrency, repeat, trace_memory=True, warm=False):
+    from vlsi_core import service
+    from vlsi_core.cache import get_response_cache
+    from vlsi_core.metrics import get_metrics
+
+    metrics = get_metrics()
+    validations_before = _span_totals(metrics, "validation.compile")
+    errors = []
+
+    def one(case):
+        start = time.perf_counter()
+        try:
+            service.TOOLS[tool]("bench", **case["params"])
+        except Exception as e:
+            errors.append(f"{case['name']}: {type(e).__name__}: {e}")
+            return None
+        return time.perf_counter() - start
+
+    work = [case for _ in range(repeat) for case in cases]
+    samples = []
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(repeat):
+            if not warm:
+                get_response_cache().clear()
+            samples.extend(s for s in pool.map(one, cases) if s is not None)
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    tracemalloc.stop()
+
+    validations_after = _span_totals(metrics, "validation.compile")
+    validation_runs = validations_after[0] - validations_before[0]
+    validation_seconds = validations_after[1] - validations_before[1]
+    return dict(
+        {"calls": len(work), "errors": len(errors), "throughput_rps": round(len(work) / wall, 2) if wall else None},
+        **latency_summary(samples),
+        validation_runs=validation_runs,
+        validation_ms_per_run=round(validation_seconds / validation_runs * 1000, 2) if validation_runs else None,
+        peak_traced_kb=round(peak / 1024, 1) if trace_memory else None,
+        first_errors=errors[:3]
+    )
+
+
+# The Streamlit path: SSE stream parsed and fed to the live code-fence preview
+def run_stream(cases, concurrency, repeat, trace_memory=True):
+    from vlsi_core.openrouter import build_payload, request_completion
+    from vlsi_core.prompts import RTL_SYSTEM_MSG
+    from vlsi_core.streaming import CodeFenceExtractor, iter_sse_content
+
+    first_tokens, totals, chars = [], [], []
+
+    def one(case):
+        start = time.perf_counter()
+        payload = build_payload(case["params"]["design_prompt"], RTL_SYSTEM_MSG)
+        response = request_completion("bench", payload, stream=True)
+        extractor = CodeFenceExtractor()
+        try:
+            for chunk in iter_sse_content(response.iter_lines()):
+                if not extractor.text:
+                    first_tokens.append(time.perf_counter() - start)
+                extractor.feed(chunk)
+        finally:
+            response.close()
+        totals.append(time.perf_counter() - start)
+        chars.append(len(extractor.text))
+
+    work = [case for _ in range(repeat) for case in cases]
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, work))
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    tracemalloc.stop()
+    streamed = sum(totals)
+    return dict(
+        {"calls": len(work), "errors": len(work) - len(totals),
+         "throughput_rps": round(len(work) / wall, 2) if wall else None},
+        **latency_summary(totals),
+        first_token_p50_ms=round(percentile(first_tokens, 50) * 1000, 2) if first_tokens else None,
+        first_token_p95_ms=round(percentile(first_tokens, 95) * 1000, 2) if first_tokens else None,
+        chars_per_second=round(sum(chars) / streamed, 1) if streamed else None,
+        peak_traced_kb=round(peak / 1024, 1) if trace_memory else None
+    )
+
+
+# Relative change of the headline numbers against a previous --output file
+def compare(results, baseline):
+    rows = {}
+    for path, current in results["paths"].items():
+        before = baseline.get("paths", {}).get(path)
+        if not before:
+            continue
+        rows[path] = {
+            metric: round((current[metric] - before[metric]) / before[metric] * 100, 1)
+            for metric in ("throughput_rps", "p95_ms", "p99_ms", "peak_traced_kb")
+            if current.get(metric) and before.get(metric)
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every tool path against a mock OpenRouter server")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Passes over the corpus per tool")
+    parser.add_argument("--tools", default=",".join(TOOL_ORDER + ["stream"]),
+                        help="Comma-separated tool paths (the six tools and 'stream')")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random mock latency in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of mock requests answered with 429")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="Mock delay between streamed chunks")
+    parser.add_argument("--token-chars", type=int, default=4, help="Characters per streamed chunk")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc (it slows every allocation, inflating latencies)")
+    parser.add_argument("--warm", action="store_true", help="Keep the response cache between passes")
+    parser.add_argument("--corpus", help="Replay a JSONL corpus instead of building one")
+    parser.add_argument("--dump-corpus", metavar="PATH", help="Write the built corpus as JSONL and exit")
+    parser.add_argument("--output", metavar="PATH", help="Also write the JSON results here")
+    parser.add_argument("--compare", metavar="PATH", help="Report %% change against a previous --output file")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    from benchmarks.corpus import build_corpus, load_corpus, save_corpus
+
+    cases = load_corpus(args.corpus) if args.corpus else build_corpus()
+    if args.dump_corpus:
+        save_corpus(cases, args.dump_corpus)
+        print(f"Wrote {len(cases)} cases to {args.dump_corpus}")
+        return
+
+    server = start_mock_server(latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                               token_delay=args.token_delay, token_chars=args.token_chars)
+    # Settings are read at import time, so they must be in place before vlsi_core loads.
+    # Every tool pins one model (no routing) so runs stay comparable.
+    os.environ["OPENROUTER_URL"] = server.url
+    os.environ.setdefault("VLSI_CACHE_DISABLE_DISK", "1")
+    os.environ.setdefault("VLSI_RATE_LIMIT_RPM", "60000")
+    os.environ.setdefault("VLSI_RATE_LIMIT_BURST", "100")
+    from vlsi_core.openrouter import DEFAULT_MODEL
+    from vlsi_core.validation import get_validation_service
+
+    cases = [dict(case, params=dict(case["params"], model=case["params"].get("model", DEFAULT_MODEL)))
+             for case in cases]
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "validators": get_validation_service().tool_versions(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "output", "compare")},
+        "cases": len(cases),
+        "paths": {}
+    }
+    try:
+        for tool in [t.strip() for t in args.tools.split(",") if t.strip()]:
+            if tool == "stream":
+                generate = [case for case in cases if case["tool"] == "generate"]
+                results["paths"]["stream"] = run_stream(generate, args.concurrency, args.repeat,
+                                                         not args.no_memory)
+                continue
+            tool_cases = [case for case in cases if case["tool"] == tool]
+            if tool_cases:
+                results["paths"][tool] = run_tool(tool, tool_cases, args.concurrency, args.repeat,
+                                                         not args.no_memory, args.warm)
+        results["upstream_requests"] = server.requests_seen
+    finally:
+        server.shutdown()
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            results["change_pct"] = compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{len(cases)} cases, revision {results['revision']}, validators: "
+          f"{', '.join(results['validators'].values()) or 'none installed'}")
+    print(f"{'path':<11}{'calls':>7}{'errs':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'valid. ms':>11}{'peak KB':>10}")
+    for path, r in results["paths"].items():
+        validation = r.get("validation_ms_per_run")
+        print(f"{path:<11}{r['calls']:>7}{r['errors']:>6}{str(r['throughput_rps']):>9}{str(r['p50_ms']):>10}"
+              f"{str(r['p95_ms']):>10}{str(r['p99_ms']):>10}{str(validation if validation is not None else '-'):>11}"
+              f"{str(r['peak_traced_kb'] or '-'):>10}")
+    if "stream" in results["paths"]:
+        s = results["paths"]["stream"]
+        print(f"stream: first token p50 {s['first_token_p50_ms']} ms / p95 {s['first_token_p95_ms']} ms, "
+              f"{s['chars_per_second']} chars/s")
+    for path, change in results.get("change_pct", {}).items():
+        print(f"{path:<11}" + ", ".join(f"{metric} {delta:+}%" for metric, delta in change.items()))
+    print(f"max RSS {results['max_rss_kb']} KB, {results['upstream_requests']} upstream requests")
+
+
+if __name__ == "__main__":
+    main()
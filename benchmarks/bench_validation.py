@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from vlsi_core.validation import ValidationService
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "hdl")
+EXTENSIONS = {".v": "v", ".sv": "sv", ".vhd": "vhd"}
+
+
+def load_corpus(path=CORPUS_DIR):
+    items = []
+    for name in sorted(os.listdir(path)):
+        ext = os.path.splitext(name)[1]
+        if ext in EXTENSIONS:
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                items.append((name, f.read(), EXTENSIONS[ext]))
+    return items
+
+
+# The original per-call path: shutil.which + NamedTemporaryFile + fresh process every time
+def validate_legacy(code, language):
+    tool = "ghdl" if language == "vhd" else "iverilog"
+    if not shutil.which(tool):
+        return False, "tool missing"
+    with tempfile.NamedTemporaryFile(mode="w", suffix=f".{language}", delete=False) as f:
+        f.write(code)
+        path = f.name
+    try:
+        cmd = [tool, "-s", path] if language == "vhd" else [tool, "-t", "null", path]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return result.returncode == 0, result.stderr
+    finally:
+        os.unlink(path)
+
+
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HDL validation throughput")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Passes over the corpus")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    service = ValidationService(max_workers=args.workers)
+    corpus = [(name, code, lang) for name, code, lang in load_corpus() if service.available(lang)]
+    if not corpus:
+        print("Neither iverilog nor ghdl is installed; nothing to benchmark.")
+        return
+
+    results = {"tools": service.tool_versions(), "files": len(corpus), "repeat": args.repeat}
+
+    # Legacy: sequential, no reuse. Each pass mutates the source so nothing is cached.
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        for _, code, lang in corpus:
+            validate_legacy(f"{code}\n// pass {i}\n", lang)
+    elapsed = time.perf_counter() - start
+    results["legacy_sequential"] = {"validations_per_sec": rate(len(corpus) * args.repeat, elapsed)}
+
+    # Pool, cold cache: unique sources so every validation compiles
+    start = time.perf_counter()
+    service.validate_many([(f"{code}\n// cold {i}\n", lang) for i in range(args.repeat) for _, code, lang in corpus])
+    elapsed = time.perf_counter() - start
+    results["pool_cold"] = {"validations_per_sec": rate(len(corpus) * args.repeat, elapsed),
+                            "workers": args.workers}
+
+    # Pool, warm cache: identical sources resubmitted
+    service.validate_many([(code, lang) for _, code, lang in corpus])
+    start = time.perf_counter()
+    service.validate_many([(code, lang) for _ in range(args.repeat) for _, code, lang in corpus])
+    elapsed = time.perf_counter() - start
+    results["pool_warm"] = {"validations_per_sec": rate(len(corpus) * args.repeat, elapsed)}
+    results["service"] = service.stats()
+    service.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Corpus: {results['files']} files x {args.repeat} passes, tools: {results['tools']}")
+    for case in ("legacy_sequential", "pool_cold", "pool_warm"):
+        print(f"{case:<20}{results[case]['validations_per_sec']:>12} validations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from vlsi_core.waveform import open_waveform
+
+
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else float("inf")
+
+
+# A counter design's dump: clock, reset, `signals` 8/32/100-bit buses; the
+# second copy flips one bit of bus0 from `bug_at` on
+def synthetic_dump(path, cycles, signals, bug_at=None, seed=1):
+    rng = random.Random(seed)
+    widths = [(8, 32, 100)[i % 3] for i in range(signals)]
+    codes = [chr(40 + i) for i in range(signals)]
+    with open(path, "w") as f:
+        f.write("$timescale 1ps $end\n$scope module tb $end\n$var wire 1 ! clk $end\n$var wire 1 \" rst $end\n")
+        f.write("$scope module dut $end\n")
+        for i, (width, code) in enumerate(zip(widths, codes)):
+            f.write(f"$var wire {width} {code} bus{i} [{width - 1}:0] $end\n")
+        f.write("$upscope $end\n$upscope $end\n$enddefinitions $end\n#0\n$dumpvars\n0!\n1\"\n")
+        f.write("".join(f"bx {code}\n" for code in codes) + "$end\n")
+        for cycle in range(1, cycles):
+            t = cycle * 5000
+            f.write(f"#{t}\n{cycle % 2}!\n")
+            if cycle == 4:
+                f.write("0\"\n")
+            if cycle % 2 == 0:
+                for i, (width, code) in enumerate(zip(widths, codes)):
+                    if i and rng.random() < 0.5:
+                        continue
+                    value = (cycle * (i + 1)) % (1 << width)
+                    if i == 0 and bug_at is not None and t >= bug_at:
+                        value ^= 1
+                    f.write(f"b{value:b} {code}\n")
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VCD ingestion and waveform queries")
+    parser.add_argument("--cycles", type=int, default=400000, help="Half clock periods in the dump")
+    parser.add_argument("--signals", type=int, default=16, help="Buses besides clock and reset")
+    parser.add_argument("--queries", type=int, default=10000, help="Random value-at-time lookups")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="bench_waveform_")
+    try:
+        good, bad = os.path.join(work, "good.vcd"), os.path.join(work, "bad.vcd")
+        synthetic_dump(good, args.cycles, args.signals)
+        synthetic_dump(bad, args.cycles, args.signals, bug_at=args.cycles * 5000 * 3 // 4)
+        size = os.path.getsize(good)
+        store = os.path.join(work, "store")
+
+        ingest_seconds, wave = timed(lambda: open_waveform(good, store_dir=store))
+        reopen_seconds, _ = timed(lambda: open_waveform(good, store_dir=store))
+        failing = open_waveform(bad, store_dir=store)
+        summary = wave.summary()
+
+        rng = random.Random(2)
+        lookups = [(rng.choice(wave.names), rng.randrange(wave.end_time)) for _ in range(args.queries)]
+        query_seconds, _ = timed(lambda: [wave.value_at(name, t) for name, t in lookups])
+        compare_seconds, mismatches = timed(lambda: failing.compare(wave))
+        center = mismatches[0]["time"] if mismatches else wave.end_time
+        window_seconds, text = timed(lambda: failing.window(failing.relevant(None, center), center))
+
+        results = {
+            "dump_mb": round(size / 1e6, 1),
+            "changes": summary["changes"],
+            "ingest": {"seconds": round(ingest_seconds, 3), "mb_per_sec": rate(size / 1e6, ingest_seconds),
+                       "changes_per_sec": rate(summary["changes"], ingest_seconds)},
+            "reopen_ms": round(reopen_seconds * 1000, 1),
+            "value_at_us": round(query_seconds / args.queries * 1e6, 1),
+            "compare": {"ms": round(compare_seconds * 1000, 1), "first_mismatch": mismatches[0] if mismatches else None},
+            "window": {"ms": round(window_seconds * 1000, 1), "chars": len(text)}
+        }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    ingest = results["ingest"]
+    print(f"Dump: {results['dump_mb']} MB, {results['changes']} changes")
+    print(f"{'ingest':<10}{ingest['mb_per_sec']:>10} MB/s{ingest['changes_per_sec']:>14} changes/s"
+          f"  (reopen {results['reopen_ms']} ms)")
+    print(f"{'value_at':<10}{results['value_at_us']:>10} us/query")
+    print(f"{'compare':<10}{results['compare']['ms']:>10} ms  first mismatch {results['compare']['first_mismatch']}")
+    print(f"{'window':<10}{results['window']['ms']:>10} ms  {results['window']['chars']} chars for the prompt")
+
+
+if __name__ == "__main__":
+    main()
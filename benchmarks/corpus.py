@@ -0,0 +1,52 @@
+import json
+import os
+
+from vlsi_core.prompts import COMMON_ERRORS, EXAMPLE_DESIGNS, SUGGESTED_QUESTIONS, TESTBENCH_TYPES
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "hdl")
+LANGUAGES = {".v": "Verilog", ".sv": "SystemVerilog", ".vhd": "VHDL"}
+
+
+def load_hdl(path=CORPUS_DIR):
+    files = []
+    for name in sorted(os.listdir(path)):
+        language = LANGUAGES.get(os.path.splitext(name)[1])
+        if language:
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                files.append((name, f.read(), language))
+    return files
+
+
+# One case per (tool, input) built from the sets the UI offers: example designs,
+# suggested questions and common error patterns, crossed with the sample HDL.
+# Each case is {"tool", "name", "params"} where params are service keyword args.
+def build_corpus(hdl_dir=CORPUS_DIR, languages=("Verilog", "VHDL")):
+    files = load_hdl(hdl_dir)
+    cases = []
+    for language in languages:
+        for name, template in EXAMPLE_DESIGNS.items():
+            cases.append({"tool": "generate", "name": f"{name} ({language})",
+                          "params": {"design_prompt": template.format(language=language), "language": language}})
+    for name, code, language in files:
+        cases.append({"tool": "document", "name": name, "params": {"code": code, "language": language}})
+        cases.append({"tool": "review", "name": name, "params": {"code": code, "language": language}})
+        cases.append({"tool": "testbench", "name": name,
+                      "params": {"code": code, "language": language,
+                                 "test_type": TESTBENCH_TYPES[len(cases) % len(TESTBENCH_TYPES)]}})
+        for question in SUGGESTED_QUESTIONS:
+            cases.append({"tool": "explain", "name": f"{name}: {question}",
+                          "params": {"code": code, "question": question, "language": language}})
+        for error_name, pattern in COMMON_ERRORS.items():
+            cases.append({"tool": "fix", "name": f"{name}: {error_name}", "params": {"code": code, "error_log": pattern}})
+    return cases
+
+
+def save_corpus(cases, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for case in cases:
+            f.write(json.dumps(case) + "\n")
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,25 @@
+// 8-bit ALU: add, subtract, and, or, xor
+module alu_8bit (
+    input  wire [7:0] a,
+    input  wire [7:0] b,
+    input  wire [2:0] op,
+    output reg  [7:0] y,
+    output reg        carry,
+    output wire       zero
+);
+    localparam OP_ADD = 3'd0, OP_SUB = 3'd1, OP_AND = 3'd2, OP_OR = 3'd3, OP_XOR = 3'd4;
+
+    always @(*) begin
+        carry = 1'b0;
+        case (op)
+            OP_ADD: {carry, y} = a + b;
+            OP_SUB: {carry, y} = a - b;
+            OP_AND: y = a & b;
+            OP_OR:  y = a | b;
+            OP_XOR: y = a ^ b;
+            default: y = 8'd0;
+        endcase
+    end
+
+    assign zero = (y == 8'd0);
+endmodule
@@ -0,0 +1,19 @@
+// 4-bit up/down counter with synchronous reset
+module counter_4bit (
+    input  wire       clk,
+    input  wire       rst,
+    input  wire       en,
+    input  wire       up,
+    output reg  [3:0] count
+);
+    always @(posedge clk) begin
+        if (rst)
+            count <= 4'd0;
+        else if (en) begin
+            if (up)
+                count <= count + 4'd1;
+            else
+                count <= count - 4'd1;
+        end
+    end
+endmodule
@@ -0,0 +1,20 @@
+// Rising/falling edge detector (SystemVerilog)
+module edge_detect (
+    input  logic clk,
+    input  logic rst_n,
+    input  logic sig,
+    output logic rise,
+    output logic fall
+);
+    logic sig_d;
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n)
+            sig_d <= 1'b0;
+        else
+            sig_d <= sig;
+    end
+
+    assign rise = sig & ~sig_d;
+    assign fall = ~sig & sig_d;
+endmodule
@@ -0,0 +1,41 @@
+// Parameterized synchronous FIFO
+module fifo_sync #(
+    parameter WIDTH = 8,
+    parameter DEPTH = 16,
+    parameter ADDR_W = 4
+) (
+    input  wire             clk,
+    input  wire             rst_n,
+    input  wire             wr_en,
+    input  wire [WIDTH-1:0] din,
+    input  wire             rd_en,
+    output reg  [WIDTH-1:0] dout,
+    output wire             full,
+    output wire             empty
+);
+    reg [WIDTH-1:0] mem [0:DEPTH-1];
+    reg [ADDR_W:0]  wr_ptr;
+    reg [ADDR_W:0]  rd_ptr;
+
+    assign empty = (wr_ptr == rd_ptr);
+    assign full  = (wr_ptr[ADDR_W] != rd_ptr[ADDR_W]) && (wr_ptr[ADDR_W-1:0] == rd_ptr[ADDR_W-1:0]);
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            wr_ptr <= 0;
+        end else if (wr_en && !full) begin
+            mem[wr_ptr[ADDR_W-1:0]] <= din;
+            wr_ptr <= wr_ptr + 1'b1;
+        end
+    end
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            rd_ptr <= 0;
+            dout   <= {WIDTH{1'b0}};
+        end else if (rd_en && !empty) begin
+            dout   <= mem[rd_ptr[ADDR_W-1:0]];
+            rd_ptr <= rd_ptr + 1'b1;
+        end
+    end
+endmodule
@@ -0,0 +1,25 @@
+// Contains common mistakes: latch inference and blocking assignments in a clocked block
+module latch_bug (
+    input  wire       clk,
+    input  wire       sel,
+    input  wire [1:0] mode,
+    input  wire [3:0] d,
+    output reg  [3:0] q,
+    output reg  [3:0] y
+);
+    reg [3:0] stage;
+
+    always @(posedge clk) begin
+        stage = d;
+        q = stage;
+    end
+
+    always @(*) begin
+        if (sel)
+            y = d;
+        case (mode)
+            2'b00: y = 4'h0;
+            2'b01: y = 4'h1;
+        endcase
+    end
+endmodule
@@ -0,0 +1,22 @@
+// 8-bit shift register with parallel load
+module shift_register (
+    input  wire       clk,
+    input  wire       rst,
+    input  wire       load,
+    input  wire       shift_en,
+    input  wire       serial_in,
+    input  wire [7:0] parallel_in,
+    output wire       serial_out,
+    output reg  [7:0] q
+);
+    always @(posedge clk) begin
+        if (rst)
+            q <= 8'h00;
+        else if (load)
+            q <= parallel_in;
+        else if (shift_en)
+            q <= {q[6:0], serial_in};
+    end
+
+    assign serial_out = q[7];
+endmodule
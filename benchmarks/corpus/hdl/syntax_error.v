@@ -0,0 +1,8 @@
+// Deliberately broken: missing semicolon and endmodule typo
+module syntax_error (
+    input  wire a,
+    input  wire b,
+    output wire y
+);
+    assign y = a & b
+endmodul
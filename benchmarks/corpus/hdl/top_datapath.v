@@ -0,0 +1,29 @@
+// Small datapath that instantiates the ALU and a register stage
+module top_datapath (
+    input  wire       clk,
+    input  wire       rst,
+    input  wire [7:0] a,
+    input  wire [7:0] b,
+    input  wire [2:0] op,
+    output reg  [7:0] result,
+    output wire       zero
+);
+    wire [7:0] alu_y;
+    wire       alu_carry;
+
+    alu_8bit u_alu (
+        .a(a),
+        .b(b),
+        .op(op),
+        .y(alu_y),
+        .carry(alu_carry),
+        .zero(zero)
+    );
+
+    always @(posedge clk) begin
+        if (rst)
+            result <= 8'd0;
+        else
+            result <= alu_y;
+    end
+endmodule
@@ -0,0 +1,157 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Minimal OpenRouter-compatible chat completions endpoint for benchmarks.
+# Speaks HTTP/1.1 with Content-Length so clients can keep connections alive.
+class MockOpenRouterHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get("Content-Length", "0"))
+        body = self.rfile.read(length) if length else b"{}"
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            payload = {}
+
+        model = payload.get("model", "mock")
+        with self.server.stats_lock:
+            self.server.requests_seen += 1
+            self.server.requests_by_model[model] = self.server.requests_by_model.get(model, 0) + 1
+        # Per-model profiles override the server-wide latency and failure rates
+        config = dict(config, **config["models"].get(model, {}))
+
+        if config["latency"]:
+            time.sleep(config["latency"] + random.uniform(0, config["jitter"]))
+
+        if config["rate_429"] and random.random() < config["rate_429"]:
+            self._send_json(429, {"error": {"message": "rate limited"}}, {"Retry-After": "1"})
+            return
+        if config["error_rate"] and random.random() < config["error_rate"]:
+            self._send_json(503, {"error": {"message": "upstream unavailable"}})
+            return
+
+        prompt = ""
+        for message in payload.get("messages", []):
+            if message.get("role") == "user":
+                prompt = message.get("content", "")
+        content = config["reply"] or f"```verilog\nmodule mock();\nendmodule\n```\n\nEcho: {prompt[:64]}"
+        if payload.get("stream"):
+            self._send_stream(content, model, len(prompt) // 4)
+            return
+        self._send_json(200, {
+            "id": "mock-1",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4}
+        })
+
+    # Server-sent events over chunked transfer encoding, one delta per ~token_chars
+    def _send_stream(self, content, model, prompt_tokens=0):
+        config = dict(self.server.config, **self.server.config["models"].get(model, {}))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        step = max(1, config["token_chars"])
+        for i in range(0, len(content), step):
+            event = {"id": "mock-1", "model": model,
+                     "choices": [{"index": 0, "delta": {"content": content[i:i + step]}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            if config["token_delay"]:
+                time.sleep(config["token_delay"])
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                 "total_tokens": prompt_tokens + len(content) // 4}
+        self._write_chunk(f"data: {json.dumps({'id': 'mock-1', 'model': model, 'choices': [], 'usage': usage})}\n\n"
+                          .encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _send_json(self, status, obj, extra_headers=None):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockOpenRouterServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.0, jitter=0.0, rate_429=0.0, reply=None,
+                 token_delay=0.0, token_chars=4, error_rate=0.0, models=None):
+        super().__init__(address, MockOpenRouterHandler)
+        # models maps a model name to overrides of latency/jitter/rate_429/error_rate/token_delay
+        self.config = {"latency": latency, "jitter": jitter, "rate_429": rate_429, "reply": reply,
+                       "token_delay": token_delay, "token_chars": token_chars, "error_rate": error_rate,
+                       "models": models or {}}
+        self.stats_lock = threading.Lock()
+        self.requests_seen = 0
+        self.requests_by_model = {}
+        self.connections_seen = 0
+
+    def get_request(self):
+        conn = super().get_request()
+        with self.stats_lock:
+            self.connections_seen += 1
+        return conn
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1/chat/completions"
+
+
+# Start a server on a background thread; returns it (call .shutdown() when done)
+def start_mock_server(**kwargs):
+    server = MockOpenRouterServer(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock OpenRouter chat completions server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Base response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Delay between streamed chunks in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--model-profile", action="append", default=[], metavar="MODEL:KEY=VALUE[,KEY=VALUE]",
+                        help="Per-model overrides, e.g. 'moonshotai/kimi-k2:free:latency=3,rate_429=0.5'")
+    args = parser.parse_args()
+
+    models = {}
+    for profile in args.model_profile:
+        model, _, settings = profile.rpartition(":")
+        models[model] = {key: float(value) for key, value in (item.split("=", 1) for item in settings.split(","))}
+    server = MockOpenRouterServer(("127.0.0.1", args.port), args.latency, args.jitter, args.rate_429,
+                                  token_delay=args.token_delay, error_rate=args.error_rate, models=models)
+    print(f"Mock OpenRouter listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
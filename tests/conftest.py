@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Keep every store in memory and out of the user's cache directory
+os.environ["VLSI_CACHE_DISABLE_DISK"] = "1"
+os.environ.pop("VLSI_LIBRARY_PATH", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import zipfile
+
+from benchmarks.mock_openrouter import start_mock_server
+from vlsi_core import openrouter
+from vlsi_core.batch import BatchJob, collect_sources, run_batch, write_result
+from vlsi_core.rate_limit import CircuitBreaker
+
+
+def jobs():
+    return [BatchJob(f"m{i}.v", f"module m{i}; endmodule", "verilog") for i in range(3)]
+
+
+def test_batch_writes_every_result(monkeypatch, tmp_path):
+    server = start_mock_server(reply="Looks fine.")
+    try:
+        monkeypatch.setattr(openrouter, "OPENROUTER_URL", server.url)
+        batch = jobs()
+        summary = asyncio.run(run_batch(batch, "review", str(tmp_path), "key", concurrency=2,
+                                        requests_per_minute=6000, use_cache=False))
+        assert summary["succeeded"] == 3
+        assert all(job.attempts == 1 for job in batch)
+        assert os.path.exists(tmp_path / "m0.v.review.md")
+    finally:
+        server.shutdown()
+
+
+# 429s are retried through request_completion and never strand the shared breaker
+def test_batch_retries_throttled_requests(monkeypatch, tmp_path):
+    server = start_mock_server(rate_429=1.0)
+    breaker = CircuitBreaker()
+    monkeypatch.setattr("vlsi_core.batch.get_breaker", lambda: breaker)
+    try:
+        monkeypatch.setattr(openrouter, "OPENROUTER_URL", server.url)
+        monkeypatch.setattr(openrouter.random, "uniform", lambda a, b: 0.0)
+        batch = jobs()[:1]
+        summary = asyncio.run(run_batch(batch, "review", str(tmp_path), "key", requests_per_minute=60000,
+                                        options={"max_retries": 2}, use_cache=False))
+        assert summary["failed"] == 1
+        assert batch[0].attempts == 2
+        assert "429" in batch[0].error
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    finally:
+        server.shutdown()
+
+
+def test_archive_members_cannot_escape_the_output_directory(tmp_path):
+    source = tmp_path / "design.zip"
+    with zipfile.ZipFile(source, "w") as archive:
+        archive.writestr("rtl/ok.v", "module ok; endmodule")
+        archive.writestr("rtl/../../up.v", "module up; endmodule")
+        archive.writestr("/abs/root.v", "module root; endmodule")
+        archive.writestr("C:/win/drive.v", "module drive; endmodule")
+    assert [job.path for job in collect_sources(str(source))] == ["rtl/ok.v"]
+
+
+def test_result_outside_the_output_directory_is_not_written(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    job = BatchJob("../escape.v", "module m; endmodule", "verilog")
+    write_result(job, "review", str(out), "text")
+    assert job.status == "failed"
+    assert not (tmp_path / "escape.v.review.md").exists()
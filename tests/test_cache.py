@@ -0,0 +1,76 @@
+import time
+
+from vlsi_core import cache
+from vlsi_core.cache import DiskCache, LRUCache, ResponseCache, payload_key
+
+
+def test_payload_key_ignores_dict_order():
+    assert payload_key({"a": 1, "b": [1, 2]}) == payload_key({"b": [1, 2], "a": 1})
+    assert payload_key({"a": 1}) != payload_key({"a": 2})
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2)
+    lru.put("a", "1")
+    lru.put("b", "2")
+    lru.get("a")
+    lru.put("c", "3")
+    assert lru.get("b") is None
+    assert lru.get("a") == "1" and lru.get("c") == "3"
+    assert lru.evictions == 1
+
+
+def test_lru_entries_expire(monkeypatch):
+    lru = LRUCache(ttl=10)
+    lru.put("a", "1")
+    lru.put("b", "2", ttl=0)
+    now = time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 20)
+    assert lru.get("a") is None
+    assert lru.get("b") == "2"
+
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    DiskCache(path).put("k", "value")
+    assert DiskCache(path).get("k") == "value"
+
+
+def test_disk_cache_evicts_by_size(tmp_path):
+    disk = DiskCache(str(tmp_path / "responses.sqlite3"), max_bytes=10)
+    disk.put("a", "12345")
+    time.sleep(0.01)
+    disk.put("b", "12345")
+    time.sleep(0.01)
+    disk.put("c", "12345")
+    assert disk.get("a") is None
+    assert disk.get("c") == "12345"
+    assert disk.size_bytes() <= 10
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    payload = {"model": "m", "messages": [{"role": "user", "content": "counter"}]}
+    disk = DiskCache(str(tmp_path / "responses.sqlite3"))
+    ResponseCache(LRUCache(), disk).put(payload, "reply")
+    responses = ResponseCache(LRUCache(), disk)
+    assert responses.get(payload) == "reply"
+    assert responses.get(payload) == "reply"
+    stats = responses.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    assert stats["hit_rate"] == 1.0
+
+
+def test_empty_replies_are_not_cached():
+    responses = ResponseCache(LRUCache())
+    responses.put({"q": 1}, "")
+    assert responses.get({"q": 1}) is None
+    assert responses.stats()["writes"] == 0
+
+
+def test_invalidate_removes_both_tiers(tmp_path):
+    payload = {"q": 1}
+    responses = ResponseCache(LRUCache(), DiskCache(str(tmp_path / "responses.sqlite3")))
+    responses.put(payload, "reply")
+    responses.invalidate(payload)
+    assert responses.get(payload) is None
+    assert responses.stats()["misses"] == 1
@@ -0,0 +1,94 @@
+from vlsi_core.chunking import chunk_hdl, estimate_tokens, group_partials, hdl_blocks
+
+
+def module(name, blocks=3, statements=6):
+    lines = [f"module {name} (input clk, input [7:0] d, output reg [7:0] q);\n", "    reg [7:0] r0;\n"]
+    for b in range(blocks):
+        lines.append("    always @(posedge clk) begin\n")
+        lines += [f"        r{b} <= d + {b * statements + s};\n" for s in range(statements)]
+        lines.append("    end\n")
+    lines.append("endmodule\n")
+    return "".join(lines)
+
+
+CODE = "`timescale 1ns/1ps\n" + "\n".join(module(f"m{i}") for i in range(4))
+LINES = CODE.splitlines(keepends=True)
+
+
+# Lines a chunk may start on without cutting through a module or block
+def boundaries(code):
+    lines = code.splitlines()
+    starts = {1}
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if stripped.startswith(("module ", "always")):
+            starts.add(number)
+        if stripped == "endmodule":
+            starts.add(number + 1)
+    return starts
+
+
+def test_chunks_reproduce_the_source():
+    for max_tokens in (40, 120, 400, 10000):
+        chunks = chunk_hdl(CODE, max_tokens=max_tokens)
+        assert "".join(c.text for c in chunks) == CODE
+        assert [c.index for c in chunks] == list(range(len(chunks)))
+
+
+def test_chunks_are_contiguous_and_do_not_overlap():
+    chunks = chunk_hdl(CODE, max_tokens=120)
+    assert chunks[0].start_line == 1 and chunks[-1].end_line == len(LINES)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_line == previous.end_line + 1
+    for chunk in chunks:
+        assert chunk.text == "".join(LINES[chunk.start_line - 1:chunk.end_line])
+
+
+def test_chunks_stay_within_the_token_budget():
+    for max_tokens in (60, 120, 400):
+        assert all(estimate_tokens(c.text) <= max_tokens for c in chunk_hdl(CODE, max_tokens=max_tokens))
+
+
+def test_chunks_only_start_at_module_or_block_boundaries():
+    chunks = chunk_hdl(CODE, max_tokens=120)
+    assert len(chunks) > 4
+    assert {c.start_line for c in chunks} <= boundaries(CODE)
+
+
+def test_small_file_is_one_chunk():
+    chunks = chunk_hdl(CODE, max_tokens=10000)
+    assert len(chunks) == 1
+    assert chunks[0].modules == ["m0", "m1", "m2", "m3"]
+    assert chunks[0].context == ""
+
+
+def test_chunk_inside_a_module_carries_its_header():
+    chunks = chunk_hdl(module("big", blocks=4), max_tokens=80)
+    inner = [c for c in chunks if not c.text.startswith("module")]
+    assert inner
+    for chunk in inner:
+        assert chunk.modules == ["big"]
+        assert chunk.context.startswith("module big (input clk")
+        assert "always" not in chunk.context
+        assert chunk.prompt_text().endswith(chunk.text)
+
+
+def test_oversized_block_is_split_by_lines():
+    code = module("huge", blocks=1, statements=200)
+    chunks = chunk_hdl(code, max_tokens=100)
+    assert "".join(c.text for c in chunks) == code
+    assert all(estimate_tokens(c.text) <= 100 for c in chunks)
+    assert len(chunks) > 2
+
+
+def test_blocks_follow_module_and_always_boundaries():
+    blocks = hdl_blocks(module("m", blocks=2))
+    assert [b.text.split("\n", 1)[0].strip()[:6] for b in blocks] == ["module", "always", "always"]
+    assert all(b.modules == ["m"] for b in blocks)
+
+
+def test_partials_are_grouped_within_budget():
+    partials = ["x" * 70] * 5
+    groups = group_partials(partials, max_tokens=45)
+    assert sum(groups, []) == partials
+    assert all(sum(estimate_tokens(p) for p in group) <= 45 or len(group) == 1 for group in groups)
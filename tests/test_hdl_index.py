@@ -0,0 +1,118 @@
+from vlsi_core.hdl_index import DesignIndex, guess_language, parse_source
+
+TOP = """// module fake_in_comment(input a);
+/* module also_fake;
+   endmodule */
+module top #(parameter WIDTH = 8, parameter DEPTH = 4) (
+    input clk,
+    input [WIDTH-1:0] d,
+    output reg [WIDTH-1:0] q
+);
+    wire [WIDTH-1:0] mid;
+    initial $display("module not_a_module;");
+    fifo #(.WIDTH(WIDTH), .DEPTH(DEPTH)) u_fifo (.clk(clk), .d(d), .q(mid));
+    stage u_stage [1:0] (.clk(clk), .d(mid), .q(q));
+    vendor_ram #(16) u_ram (.clk(clk));
+    always @(posedge clk) begin : seq
+        q <= mid;
+    end
+endmodule
+"""
+
+FIFO = """module fifo #(parameter WIDTH = 8, DEPTH = 16) (clk, d, q);
+    input clk;
+    input [WIDTH-1:0] d;
+    output [WIDTH-1:0] q;
+    stage u_stage (.clk(clk), .d(d), .q(q));
+endmodule
+"""
+
+STAGE = """module stage (input clk, input [7:0] d, output [7:0] q);
+    assign q = d;
+endmodule
+"""
+
+VHDL = """-- entity commented_out is
+entity counter is
+    generic (WIDTH : integer := 8);
+    port (clk : in std_logic; q : out std_logic_vector(WIDTH-1 downto 0));
+end entity counter;
+
+architecture rtl of counter is
+begin
+    u_reg : entity work.reg_bank port map (clk => clk);
+    gen : process (clk) begin end process;
+end architecture rtl;
+"""
+
+
+def index():
+    design = DesignIndex()
+    design.add_file("rtl/top.v", TOP)
+    design.add_file("rtl/fifo.v", FIFO)
+    design.add_file("rtl/stage.v", STAGE)
+    return design
+
+
+def test_modules_in_comments_and_strings_are_ignored():
+    assert [m.name for m in parse_source(TOP, "top.v")] == ["top"]
+
+
+def test_ansi_header_ports_and_parameters():
+    top = parse_source(TOP, "top.v")[0]
+    assert top.parameters == [("WIDTH", "8"), ("DEPTH", "4")]
+    assert [(p.name, p.direction, p.width) for p in top.ports] == [
+        ("clk", "input", "1"), ("d", "input", "[WIDTH-1:0]"), ("q", "output", "[WIDTH-1:0]")
+    ]
+    assert (top.start_line, top.end_line) == (4, 17)
+
+
+def test_non_ansi_ports_take_their_body_declarations():
+    fifo = parse_source(FIFO, "fifo.v")[0]
+    assert [(p.name, p.direction, p.width) for p in fifo.ports] == [
+        ("clk", "input", "1"), ("d", "input", "[WIDTH-1:0]"), ("q", "output", "[WIDTH-1:0]")
+    ]
+    assert fifo.parameters == [("WIDTH", "8"), ("DEPTH", "16")]
+
+
+def test_instances_including_parameterized_and_arrays():
+    top = parse_source(TOP, "top.v")[0]
+    assert [(i.module, i.name, i.line) for i in top.instances] == [
+        ("fifo", "u_fifo", 11), ("stage", "u_stage", 12), ("vendor_ram", "u_ram", 13)
+    ]
+
+
+def test_instances_resolve_to_definitions():
+    design = index()
+    assert [m.name for m in design.children("top")] == ["fifo", "stage"]
+    assert design.external_dependencies("top") == ["vendor_ram"]
+    assert sorted(m.name for m in design.parents("stage")) == ["fifo", "top"]
+    assert [m.name for m in design.top_modules()] == ["top"]
+    assert design.edge_count() == 3
+
+
+def test_dependency_order_is_depth_first_without_repeats():
+    design = index()
+    assert [m.name for m in design.transitive_closure("top")] == ["top", "fifo", "stage"]
+    context = design.context_for("top", dependencies="interface")
+    assert context.startswith(TOP[TOP.index("module top"):].rstrip())
+    assert "// ---- dependency: fifo (rtl/fifo.v) ----" in context
+    assert context.index("dependency: fifo") < context.index("dependency: stage")
+
+
+def test_replacing_a_file_drops_its_old_modules():
+    design = index()
+    design.add_file("rtl/stage.v", STAGE.replace("module stage", "module stage2"))
+    assert design.resolve("stage") is None
+    assert design.external_dependencies("fifo") == ["stage"]
+
+
+def test_vhdl_entities_and_instances():
+    design = DesignIndex()
+    [counter] = design.add_file("counter.vhd", VHDL)
+    assert counter.name == "counter" and counter.kind == "entity"
+    assert counter.parameters == [("WIDTH", "8")]
+    assert [(p.name, p.direction) for p in counter.ports] == [("clk", "input"), ("q", "output")]
+    assert [(i.module, i.name) for i in counter.instances] == [("reg_bank", "u_reg")]
+    assert design.resolve("COUNTER") is counter
+    assert guess_language(VHDL) == "VHDL" and guess_language(STAGE) == "Verilog"
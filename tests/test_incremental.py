@@ -0,0 +1,105 @@
+import re
+
+import pytest
+
+from vlsi_core import chunking
+from vlsi_core.cache import LRUCache, ResponseCache
+from vlsi_core.incremental import diff_modules, fingerprint_modules, incremental_run, normalize_source
+
+ALU = """module alu (input [7:0] a, input [7:0] b, output [7:0] y);
+    assign y = a + b;
+endmodule
+"""
+REG = """module reg8 (input clk, input [7:0] d, output reg [7:0] q);
+    always @(posedge clk) q <= d;
+endmodule
+"""
+MUX = """module mux (input s, input a, input b, output y);
+    assign y = s ? b : a;
+endmodule
+"""
+
+
+def _module_name(prompt):
+    return re.search(r"module (\w+)", prompt).group(1)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    prompts = []
+
+    def complete(api_key, payload, **kwargs):
+        prompt = payload["messages"][-1]["content"]
+        prompts.append(prompt)
+        return "Notes on " + _module_name(prompt)
+
+    monkeypatch.setattr(chunking, "complete", complete)
+    return prompts
+
+
+def run(code, store):
+    return incremental_run("key", code, "explain", "design.v", {"detail": "short"}, lambda text: text,
+                           "system", store)
+
+
+def modules_in(prompts):
+    return sorted(_module_name(p) for p in prompts)
+
+
+def test_formatting_and_comments_do_not_change_the_fingerprint():
+    edited = ALU.replace("assign y = a + b;", "// adder\n    assign   y=a+b ;")
+    assert normalize_source(ALU) == normalize_source(edited)
+    assert fingerprint_modules(ALU)["alu"][0] == fingerprint_modules(edited)["alu"][0]
+    assert fingerprint_modules(ALU)["alu"][0] != fingerprint_modules(ALU.replace("+", "-"))["alu"][0]
+
+
+def test_diff_classifies_modules():
+    diff = diff_modules({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "9", "d": "4"})
+    assert diff.summary() == {"added": ["d"], "changed": ["b"], "removed": ["c"], "unchanged": ["a"]}
+    assert diff.stale == ["d", "b"]
+
+
+def test_first_run_analyzes_every_module(sent):
+    result = run(ALU + REG, ResponseCache(LRUCache()))
+    assert modules_in(sent) == ["alu", "reg8"]
+    assert result.analyzed == 2 and result.reused == 0
+    assert result.report.index("Module `alu`") < result.report.index("Module `reg8`")
+
+
+def test_unchanged_file_makes_no_call(sent):
+    store = ResponseCache(LRUCache())
+    first = run(ALU + REG, store)
+    sent.clear()
+    second = run(ALU + REG, store)
+    assert sent == []
+    assert second.analyzed == 0 and second.reused == 2
+    assert second.report == first.report
+
+
+def test_single_module_edit_resends_only_that_module(sent):
+    store = ResponseCache(LRUCache())
+    run(ALU + REG, store)
+    sent.clear()
+    result = run(ALU + REG.replace("q <= d", "q <= ~d"), store)
+    assert modules_in(sent) == ["reg8"]
+    assert result.diff.changed == ["reg8"] and result.diff.unchanged == ["alu"]
+    assert "Notes on alu" in result.report and "Notes on reg8" in result.report
+
+
+def test_added_and_removed_modules(sent):
+    store = ResponseCache(LRUCache())
+    run(ALU + REG, store)
+    sent.clear()
+    result = run(ALU + MUX, store)
+    assert modules_in(sent) == ["mux"]
+    assert result.diff.added == ["mux"] and result.diff.removed == ["reg8"]
+    assert "reg8" not in result.report and "Module `mux`" in result.report
+    assert set(result.sections) == {"alu", "mux"}
+
+
+def test_reports_are_kept_per_options(sent):
+    store = ResponseCache(LRUCache())
+    run(ALU, store)
+    sent.clear()
+    incremental_run("key", ALU, "explain", "design.v", {"detail": "long"}, lambda text: text, "system", store)
+    assert modules_in(sent) == ["alu"]
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+from vlsi_core import jobs, service
+from vlsi_core.jobs import DONE, FAILED, RUNNING, Job, JobManager, JobStore
+
+
+def test_store_round_trip(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = Job("a", "generate", "k", {"description": "counter"}, status=DONE, result={"code": "x"}, finished=time.time())
+    store.save(job)
+    loaded = store.load("a")
+    assert loaded.params == {"description": "counter"}
+    assert loaded.result == {"code": "x"}
+    assert loaded.status == DONE
+    assert store.load("missing") is None
+
+
+def test_store_purges_old_finished_jobs(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"), retention=100)
+    now = time.time()
+    store.save(Job("old", "generate", "k", {}, status=DONE, finished=now - 200))
+    store.save(Job("new", "generate", "k", {}, status=DONE, finished=now - 50))
+    store.save(Job("running", "generate", "k", {}, status=RUNNING))
+    store.purge(now)
+    assert store.load("old") is None
+    assert store.load("new") is not None
+    assert store.load("running") is not None
+
+
+def test_store_fails_jobs_of_exited_processes(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.sqlite3")
+    JobStore(path).save(Job("a", "generate", "k", {}, status=RUNNING))
+    pid = os.getpid()
+    monkeypatch.setattr(jobs.os, "getpid", lambda: pid + 1)
+    monkeypatch.setattr(jobs, "_process_alive", lambda pid: False)
+    job = JobStore(path).load("a")
+    assert job.status == FAILED
+    assert job.error == "Interrupted by a server restart"
+
+
+def _manager(monkeypatch, tool, store=None, memory_retention=60):
+    monkeypatch.setitem(service.TOOLS, "generate", tool)
+    return JobManager(max_workers=2, store=store, memory_retention=memory_retention)
+
+
+def test_identical_jobs_share_an_id(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def tool(api_key, **params):
+        calls.append(params)
+        release.wait(5)
+        return {"ok": True}
+
+    manager = _manager(monkeypatch, tool)
+    first = manager.submit("generate", {"description": "counter"}, "key")
+    assert manager.submit("generate", {"description": "counter"}, "key") == first
+    release.set()
+    assert manager.wait(first, timeout=5).result == {"ok": True}
+    assert len(calls) == 1
+    assert manager.deduplicated == 1
+    manager.shutdown()
+
+
+def test_failed_tool_marks_the_job_failed(monkeypatch):
+    def tool(api_key, **params):
+        raise service.ServiceError("bad input")
+
+    manager = _manager(monkeypatch, tool)
+    job = manager.wait(manager.submit("generate", {}, "key"), timeout=5)
+    assert job.status == FAILED and job.error == "bad input"
+    manager.shutdown()
+
+
+def test_finished_jobs_leave_memory_but_stay_readable(monkeypatch, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    manager = _manager(monkeypatch, lambda api_key, **params: {"n": params["n"]}, store=store)
+    job_id = manager.submit("generate", {"n": 1}, "key")
+    manager.wait(job_id, timeout=5)
+    manager._sweep(time.time() + 120)
+    assert job_id not in manager._jobs
+    assert manager.get(job_id).result == {"n": 1}
+    manager.shutdown()
+
+
+def test_without_a_store_finished_jobs_use_the_full_retention(monkeypatch):
+    manager = _manager(monkeypatch, lambda api_key, **params: {}, memory_retention=1)
+    job_id = manager.submit("generate", {}, "key")
+    manager.wait(job_id, timeout=5)
+    manager._sweep(time.time() + 120)
+    assert manager.get(job_id) is not None
+    manager._sweep(time.time() + jobs.JOB_RETENTION + 1)
+    assert manager.get(job_id) is None
+    manager.shutdown()
+
+
+def test_store_is_purged_periodically(monkeypatch, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"), retention=100)
+    manager = _manager(monkeypatch, lambda api_key, **params: {}, store=store)
+    store.save(Job("old", "generate", "k", {}, status=DONE, finished=time.time() - 200))
+    manager._sweep(time.time() + 1)
+    assert store.load("old") is not None
+    manager._sweep(time.time() + jobs.PURGE_INTERVAL + 1)
+    assert store.load("old") is None
+    manager.shutdown()
@@ -0,0 +1,115 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from vlsi_core.library import DesignLibrary, description_key  # noqa: E402
+
+COUNTER = """// 8-bit up counter with synchronous active-low reset, enable and parallel load
+module counter8 (input clk, input rst_n, input en, input load, input [7:0] d, output reg [7:0] q);
+    always @(posedge clk)
+        if (!rst_n) q <= 0;
+        else if (load) q <= d;
+        else if (en) q <= q + 1;
+endmodule
+"""
+FIFO = """// Synchronous FIFO, 16 entries deep and 8 bits wide, with full and empty flags
+module sync_fifo (input clk, input wr, input rd, output full, output empty);
+endmodule
+"""
+MUX = """-- 4-to-1 multiplexer
+library ieee;
+use ieee.std_logic_1164.all;
+entity mux4 is
+  port (s : in std_logic_vector(1 downto 0); a, b, c, d : in std_logic; y : out std_logic);
+end entity;
+architecture rtl of mux4 is
+begin
+end architecture;
+"""
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = DesignLibrary(str(tmp_path / "library.sqlite3"))
+    library.add_source(COUNTER, "counter.v")
+    library.add_source(FIFO, "fifo.v")
+    library.add_source(MUX, "mux.vhd")
+    return library
+
+
+def test_description_defaults_to_leading_comment(library):
+    names = {entry.name: entry.description for entry in library.entries()}
+    assert names["counter8"] == "8-bit up counter with synchronous active-low reset, enable and parallel load"
+    assert names["mux4"] == "4-to-1 multiplexer"
+
+
+def test_exact_description_is_reused(library):
+    entry = library.match("Create an 8-bit up counter with synchronous active-low reset, enable and parallel load.",
+                          "Verilog")
+    assert entry is not None and entry.name == "counter8"
+    assert "module counter8" in library.source(entry.id)
+
+
+@pytest.mark.parametrize("request_text", [
+    "8-bit down counter with synchronous active-low reset, enable and parallel load",
+    "8-bit up counter with synchronous active-high reset, enable and parallel load",
+    "8-bit up counter with asynchronous active-low reset, enable and parallel load",
+    "16-bit up counter with synchronous active-low reset, enable and parallel load",
+    "8-bit up counter with synchronous active-low reset, enable and parallel load and overflow flag",
+    "8-bit up counter with synchronous active-low reset and enable",
+])
+def test_one_word_difference_is_not_reused(library, request_text):
+    assert library.match(request_text, "Verilog") is None
+    assert [entry.name for entry, _ in library.examples(request_text, "Verilog")][0] == "counter8"
+
+
+def test_description_key_ignores_case_punctuation_and_filler():
+    assert description_key("Please design a 4-to-1 MUX.") == description_key("4 to 1 mux")
+    assert description_key("4-to-1 mux") != description_key("1-to-4 mux")
+
+
+def test_unverified_entry_is_only_an_example(tmp_path):
+    library = DesignLibrary(str(tmp_path / "library.sqlite3"))
+    library.add_source(COUNTER, "counter.v", verified=False)
+    spec = "8-bit up counter with synchronous active-low reset, enable and parallel load"
+    assert library.match(spec, "Verilog") is None
+    assert library.examples(spec, "Verilog")
+
+
+def test_language_compatibility(library):
+    assert library.match("4-to-1 multiplexer", "VHDL").name == "mux4"
+    assert library.match("4-to-1 multiplexer", "Verilog") is None
+    spec = "8-bit up counter with synchronous active-low reset, enable and parallel load"
+    assert library.match(spec, "SystemVerilog").name == "counter8"
+    assert library.match(spec, "VHDL") is None
+
+
+def test_search_ranks_by_relevance(library):
+    results = library.search("fifo with full and empty flags", "Verilog")
+    assert results[0][1].name == "sync_fifo"
+    assert all(score > 0 for score, _ in results)
+
+
+def test_remove_and_readd_update_the_index(library):
+    assert library.remove(name="sync_fifo") == 1
+    assert not library.search("fifo", "Verilog")
+    library.add_source(FIFO.replace("16 entries", "32 entries"), "fifo.v")
+    library.add_source(FIFO.replace("16 entries", "64 entries"), "fifo.v")
+    fifos = [entry for entry in library.entries() if entry.name == "sync_fifo"]
+    assert [entry.description for entry in fifos] == [
+        "Synchronous FIFO, 64 entries deep and 8 bits wide, with full and empty flags"
+    ]
+
+
+def test_same_code_is_stored_once(library):
+    before = len(library.entries())
+    library.add_source(COUNTER, "copy/counter.v")
+    assert len(library.entries()) == before
+
+
+def test_other_instances_see_changes(library, tmp_path):
+    other = DesignLibrary(library.path)
+    assert len(other.entries()) == 3
+    library.remove(path="mux.vhd")
+    assert other.match("4-to-1 multiplexer", "VHDL") is None
+    assert other.stats()["entries"] == 2
@@ -0,0 +1,45 @@
+from vlsi_core.lint import RULES, lint_descriptions, lint_hdl, lint_report
+from vlsi_core.prompts import build_review_prompt
+
+VHDL = """library ieee;
+use ieee.std_logic_1164.all;
+entity top is
+  port (a : in std_logic; y : out std_logic);
+end entity;
+architecture rtl of top is
+  signal t : std_logic;
+begin
+  y <= t;
+end architecture;
+"""
+LATCH = """module top(input en, input d, output reg q);
+    always @(*) begin
+        if (en) q = d;
+    end
+endmodule
+"""
+
+
+def test_pasted_vhdl_is_detected():
+    report = lint_report(VHDL)
+    assert report["language"] == "VHDL"
+    assert {f["rule"] for f in report["findings"]} == {"undriven", "unused"}
+
+
+def test_vhdl_review_is_told_only_about_vhdl_rules():
+    linted = lint_descriptions(lint_report(VHDL))
+    assert linted == [RULES["undriven"][1], RULES["unused"][1]]
+    prompt = build_review_prompt(VHDL, ["Linting"], linted=linted)
+    assert "latch" not in prompt and "blocking" not in prompt
+
+
+def test_verilog_gets_every_rule():
+    report = lint_report(LATCH)
+    assert report["language"] == "Verilog"
+    assert report["rules"] == list(RULES)
+    assert [f.rule for f in lint_hdl(LATCH)] == ["latch"]
+
+
+def test_undeclared_check_skipped_with_includes():
+    code = '`include "defs.vh"\n' + LATCH
+    assert "undeclared" not in lint_report(code)["rules"]
@@ -0,0 +1,178 @@
+import time
+
+import pytest
+
+from vlsi_core import openrouter
+from vlsi_core.openrouter import OpenRouterError, request_completion
+from vlsi_core.rate_limit import AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, TokenBucket, _reset_delay
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, content="ok"):
+        self.content = content
+
+    def json(self):
+        return {"model": "m", "choices": [{"message": {"content": self.content}}]}
+
+
+# _send stand-in answering with each outcome in turn: an int is an HTTP error status
+def scripted_send(monkeypatch, outcomes):
+    calls = []
+
+    def send(api_key, payload, timeout, stream, limiter):
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, int):
+            raise OpenRouterError(f"HTTP {outcome}", status_code=outcome, retry_after=0)
+        return FakeResponse(outcome)
+
+    monkeypatch.setattr(openrouter, "_send", send)
+    return calls
+
+
+def open_breaker(threshold=1, reset=0.05):
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout=reset)
+    for _ in range(threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def fast_limiter():
+    return AdaptiveRateLimiter(1000.0, capacity=100)
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_half_open_failure_reopens():
+    breaker = open_breaker(threshold=3)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    assert not breaker.allow()
+
+
+def test_neutral_outcome_releases_trial():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_neutral()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_429_during_trial_does_not_strand_breaker(monkeypatch):
+    breaker = open_breaker()
+    time.sleep(0.06)
+    calls = scripted_send(monkeypatch, [429, "done"])
+    assert request_completion("key", {"model": "m"}, max_retries=2, limiter=fast_limiter(), breaker=breaker) == "done"
+    assert calls == [429, "done"]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_queue_timeout_during_trial_releases_breaker(monkeypatch):
+    breaker = open_breaker()
+    time.sleep(0.06)
+    limiter = fast_limiter()
+    limiter.penalize(60)
+    scripted_send(monkeypatch, ["done"])
+    with pytest.raises(OpenRouterError):
+        request_completion("key", {"model": "m"}, limiter=limiter, breaker=breaker, max_queue_wait=0.01)
+    assert breaker.allow()
+
+
+def test_server_errors_open_breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    limiter = fast_limiter()
+    monkeypatch.setattr(limiter, "penalize", lambda seconds: None)
+    scripted_send(monkeypatch, [503, 503, "never sent"])
+    with pytest.raises(CircuitOpenError):
+        request_completion("key", {"model": "m"}, max_retries=3, limiter=limiter, breaker=breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_client_error_is_not_retried(monkeypatch):
+    breaker = CircuitBreaker()
+    calls = scripted_send(monkeypatch, [400, "never sent"])
+    with pytest.raises(OpenRouterError):
+        request_completion("key", {"model": "m"}, limiter=fast_limiter(), breaker=breaker)
+    assert calls == [400]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_bucket_burst_then_wait():
+    bucket = TokenBucket(10.0, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert 0 < bucket.try_acquire() <= 0.1
+
+
+def test_bucket_acquire_times_out_while_paused():
+    bucket = TokenBucket(100.0, capacity=1)
+    bucket.penalize(5)
+    assert not bucket.acquire(timeout=0.01)
+    assert bucket.stats()["timeouts"] == 1
+
+
+def test_throttle_halves_rate_and_success_recovers():
+    limiter = AdaptiveRateLimiter(10.0, capacity=1)
+    limiter.record_throttle(retry_after=0)
+    assert limiter.rate == 5.0
+    limiter.record_success()
+    assert limiter.rate == 5.5
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.rate == limiter.max_rate
+
+
+def test_exhausted_quota_header_pauses():
+    limiter = AdaptiveRateLimiter(10.0, capacity=1)
+    limiter.update_from_headers({"X-RateLimit-Limit": "20", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"})
+    assert limiter.try_acquire() > 4
+
+
+def test_reset_delay_formats():
+    assert _reset_delay("5") == 5.0
+    assert _reset_delay(str(1000 + 7), now=0) == 1007.0
+    assert _reset_delay(str((2e9 + 3) * 1000), now=2e9) == pytest.approx(3.0)
+    assert _reset_delay("soon") is None
@@ -0,0 +1,70 @@
+from concurrent.futures import Future
+
+from vlsi_core import repair
+from vlsi_core.repair import REPAIR_SYSTEM_MSG, generate_and_repair
+
+BROKEN = "```verilog\nmodule m(input a, output b)\n  assign b = a\nendmodule\n```"
+FIXED = "```verilog\nmodule m(input a, output b);\n  assign b = a;\nendmodule\n```"
+DIAGNOSTIC = "m.v:2: syntax error, unexpected assign, expecting ';'"
+
+
+# Rejects any code without a ';' after the port list, as a compiler would
+class FakeValidator:
+    def __init__(self):
+        self.checked = []
+
+    def available(self, language):
+        return True
+
+    def submit(self, code, language):
+        self.checked.append(code)
+        future = Future()
+        future.set_result((True, "Syntax is valid") if ");" in code else (False, DIAGNOSTIC))
+        return future
+
+
+def test_empty_replies_are_failed_candidates(monkeypatch):
+    replies = iter([None, "   "])
+    monkeypatch.setattr(repair, "complete", lambda api_key, payload, **kwargs: next(replies))
+    result = generate_and_repair("key", "counter", "system", "v", candidates=2, max_rounds=0, budget_seconds=5)
+    assert result.code is None and not result.valid
+    assert result.message == "Generation failed: Empty response from model"
+    assert result.rounds[0].errors == ["Empty response from model"] * 2
+    assert result.rounds[0].completed == 0
+
+
+def test_no_repair_rounds_without_a_candidate(monkeypatch):
+    calls = []
+    monkeypatch.setattr(repair, "complete", lambda api_key, payload, **kwargs: calls.append(payload) or "")
+    result = generate_and_repair("key", "counter", "system", "v", candidates=2, max_rounds=2, budget_seconds=5)
+    assert [r.kind for r in result.rounds] == ["generate"]
+    assert len(calls) == 2
+    assert result.message == "Generation failed: Empty response from model"
+
+
+def test_rejected_candidate_is_repaired_with_its_diagnostics(monkeypatch):
+    sent = []
+
+    def complete(api_key, payload, **kwargs):
+        sent.append(payload)
+        return FIXED if payload["messages"][0]["content"] == REPAIR_SYSTEM_MSG else BROKEN
+
+    validator = FakeValidator()
+    monkeypatch.setattr(repair, "complete", complete)
+    monkeypatch.setattr(repair, "get_validation_service", lambda: validator)
+    result = generate_and_repair("key", "counter", "system", "v", candidates=1, max_rounds=2, budget_seconds=5)
+    assert result.valid and result.message == "Syntax is valid"
+    assert ");" in result.code
+    assert [(r.kind, r.passed) for r in result.rounds] == [("generate", False), ("repair", True)]
+    assert result.rounds[0].errors == [DIAGNOSTIC]
+    repair_prompt = sent[1]["messages"][-1]["content"]
+    assert DIAGNOSTIC in repair_prompt
+    assert "assign b = a\nendmodule" in repair_prompt
+
+
+def test_reply_code_is_extracted(monkeypatch):
+    monkeypatch.setattr(repair, "complete", lambda api_key, payload, **kwargs: "```verilog\nmodule m;\nendmodule\n```")
+    monkeypatch.setattr(repair.get_validation_service(), "available", lambda ext: False)
+    result = generate_and_repair("key", "counter", "system", "v", candidates=1, max_rounds=0, budget_seconds=5)
+    assert result.code == "module m;\nendmodule"
+    assert not result.validated
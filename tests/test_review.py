@@ -0,0 +1,37 @@
+import pytest
+
+from vlsi_core import review, service, structured
+from vlsi_core.review import combine_review, parse_findings, review_aspects
+from vlsi_core.structured import StructuredError
+
+CODE = "module m(input a, output b);\n  assign b = a;\nendmodule\n"
+AREAS = ["Timing", "Style"]
+
+
+def test_finding_lines_are_parsed():
+    reply = "FINDING | Warning | line 2 | Inferred Latch | latch on q | add a default\nSUMMARY: ok"
+    findings = parse_findings(reply, "Timing")
+    assert findings == [{"severity": "warning", "line": 2, "rule": "inferred-latch", "message": "latch on q",
+                         "fix": "add a default", "aspects": ["Timing"]}]
+
+
+def test_same_issue_from_two_aspects_is_merged(monkeypatch):
+    reply = "FINDING | critical | 2 | width-mismatch | b is narrower than a |\nSUMMARY: one issue"
+    monkeypatch.setattr(review, "complete", lambda api_key, payload, **kwargs: reply)
+    result = combine_review(list(review_aspects("key", CODE, AREAS)))
+    assert len(result["findings"]) == 1
+    assert sorted(result["findings"][0]["aspects"]) == sorted(AREAS)
+
+
+def test_every_aspect_failing_on_a_non_json_reply_raises(monkeypatch):
+    monkeypatch.setattr(structured, "complete", lambda api_key, payload, **kwargs: "I cannot answer in JSON.")
+    aspects = list(review_aspects("key", CODE, AREAS, structured=True))
+    assert all(isinstance(a.exception, StructuredError) for a in aspects)
+    with pytest.raises(StructuredError):
+        combine_review(aspects)
+
+
+def test_service_reports_a_non_json_review_as_a_service_error(monkeypatch):
+    monkeypatch.setattr(structured, "complete", lambda api_key, payload, **kwargs: "I cannot answer in JSON.")
+    with pytest.raises(service.ServiceError):
+        service.review_code("key", CODE, AREAS, lint=False, structured=True)
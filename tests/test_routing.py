@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_openrouter import start_mock_server
+from vlsi_core import openrouter, routing
+from vlsi_core.openrouter import OpenRouterError, request_completion
+from vlsi_core.rate_limit import AdaptiveRateLimiter, CircuitBreaker
+from vlsi_core.routing import ModelRouter
+
+ROUTES = {"generate": ["model/a", "model/b", "model/c"]}
+
+
+# Transport stand-in: behaviors maps a model to a list of outcomes used in turn
+# (the last one repeats). An int is an HTTP error status, a float a delay before
+# answering, anything else the reply.
+class FakeTransport:
+    def __init__(self, behaviors):
+        self.behaviors = {model: list(outcomes) for model, outcomes in behaviors.items()}
+        self.calls = []
+        self.kwargs = []
+        self._lock = threading.Lock()
+
+    def __call__(self, api_key, payload, **kwargs):
+        model = payload["model"]
+        with self._lock:
+            self.calls.append(model)
+            self.kwargs.append(kwargs)
+            outcomes = self.behaviors[model]
+            outcome = outcomes.pop(0) if len(outcomes) > 1 else outcomes[0]
+        if isinstance(outcome, float):
+            time.sleep(outcome)
+            return f"{model} (slow)"
+        if isinstance(outcome, int):
+            raise OpenRouterError(f"HTTP {outcome}", status_code=outcome, retry_after=5 if outcome == 429 else None)
+        return outcome
+
+
+def router(behaviors, **kwargs):
+    transport = FakeTransport(behaviors)
+    return ModelRouter(routes=ROUTES, transport=transport, **kwargs), transport
+
+
+def test_first_healthy_model_answers():
+    r, transport = router({"model/a": ["a"], "model/b": ["b"], "model/c": ["c"]})
+    assert r.complete("key", {"model": None}, "generate") == "a"
+    assert transport.calls == ["model/a"]
+    assert transport.kwargs[0]["max_retries"] == 1
+    assert transport.kwargs[0]["share_throttle"] is False
+
+
+def test_fails_over_on_server_error():
+    r, transport = router({"model/a": [503], "model/b": ["b"], "model/c": ["c"]})
+    assert r.complete("key", {}, "generate") == "b"
+    assert transport.calls == ["model/a", "model/b"]
+    assert r.stats()["models"]["model/a"]["failures"] == 1
+
+
+def test_client_error_is_raised_without_failover():
+    r, transport = router({"model/a": [400], "model/b": ["b"], "model/c": ["c"]})
+    with pytest.raises(OpenRouterError):
+        r.complete("key", {}, "generate")
+    assert transport.calls == ["model/a"]
+
+
+def test_throttled_model_cools_down_alone():
+    r, transport = router({"model/a": [429, "a"], "model/b": ["b"], "model/c": ["c"]})
+    assert r.complete("key", {}, "generate") == "b"
+    assert r.candidates("generate") == ["model/b", "model/c", "model/a"]
+    assert r.stats()["models"]["model/a"]["cooling_down_for"] > 4
+    assert r.complete("key", {}, "generate") == "b"
+    assert transport.calls == ["model/a", "model/b", "model/b"]
+
+
+def test_all_models_failing_raises_last_error():
+    r, transport = router({"model/a": [503], "model/b": [502], "model/c": [500]}, max_attempts=3)
+    with pytest.raises(OpenRouterError) as error:
+        r.complete("key", {}, "generate")
+    assert error.value.status_code == 500
+    assert transport.calls == ["model/a", "model/b", "model/c"]
+
+
+def test_cooling_models_are_skipped_not_retried_at_once():
+    r, transport = router({"model/a": [429], "model/b": [429], "model/c": [429]}, max_wait=1.0)
+    with pytest.raises(OpenRouterError) as error:
+        r.complete("key", {}, "generate")
+    assert error.value.status_code == 429
+    assert transport.calls == ["model/a", "model/b", "model/c"]
+
+
+def test_waits_for_the_first_model_to_cool_down(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(routing.time, "sleep", sleeps.append)
+    r, transport = router({"model/a": [429, "a"], "model/b": [429], "model/c": [429]})
+    assert r.complete("key", {}, "generate") == "a"
+    assert transport.calls == ["model/a", "model/b", "model/c", "model/a"]
+    assert len(sleeps) == 1 and 4 < sleeps[0] <= 5
+
+
+def test_preferred_model_goes_first():
+    r, transport = router({"model/a": ["a"], "model/b": ["b"], "model/c": ["c"]})
+    assert r.complete("key", {"model": "model/c"}, "generate") == "c"
+
+
+def test_hedge_fires_backup_for_slow_primary():
+    r, transport = router({"model/a": [0.5], "model/b": ["b"], "model/c": ["c"]}, hedge_after=0.05)
+    start = time.monotonic()
+    assert r.complete("key", {}, "generate") == "b"
+    assert time.monotonic() - start < 0.4
+    assert r.stats()["models"]["model/b"]["hedges"] == 1
+
+
+def test_no_hedge_when_primary_is_fast():
+    r, transport = router({"model/a": ["a"], "model/b": ["b"], "model/c": ["c"]}, hedge_after=0.5)
+    assert r.complete("key", {}, "generate") == "a"
+    assert transport.calls == ["model/a"]
+
+
+def test_hedge_survives_failing_primary():
+    r, transport = router({"model/a": [503], "model/b": ["b"], "model/c": ["c"]}, hedge_after=0.05)
+    assert r.complete("key", {}, "generate") == "b"
+
+
+# The real transport: a 429 from one model cools down that model, leaves the
+# shared limiter untouched and does not strand the model's half-open breaker
+def test_429_does_not_throttle_shared_limiter(monkeypatch):
+    server = start_mock_server(models={"model/a": {"rate_429": 1.0}})
+    try:
+        monkeypatch.setattr(openrouter, "OPENROUTER_URL", server.url)
+        limiter = AdaptiveRateLimiter(1000.0, capacity=100)
+        r = ModelRouter(routes=ROUTES, transport=request_completion)
+        reply = r.complete("key", {"messages": []}, "generate", limiter=limiter)
+        assert "Echo" in reply
+        assert server.requests_by_model == {"model/a": 1, "model/b": 1}
+        assert limiter.throttled == 0 and limiter.try_acquire() == 0.0
+        assert r.stats()["models"]["model/a"]["cooling_down_for"] > 0
+    finally:
+        server.shutdown()
+
+
+def test_429_releases_model_breaker_trial(monkeypatch):
+    server = start_mock_server(models={"model/a": {"rate_429": 1.0}})
+    try:
+        monkeypatch.setattr(openrouter, "OPENROUTER_URL", server.url)
+        r = ModelRouter(routes=ROUTES, transport=request_completion)
+        with r._lock:
+            stats = r._model_stats("model/a")
+        stats.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        stats.breaker.record_failure()
+        time.sleep(0.02)
+        r.complete("key", {"messages": []}, "generate", limiter=AdaptiveRateLimiter(1000.0, capacity=100))
+        assert stats.breaker.state == CircuitBreaker.HALF_OPEN
+        assert stats.breaker.allow()
+    finally:
+        server.shutdown()
@@ -0,0 +1,29 @@
+import shutil
+
+import pytest
+
+from vlsi_core.simulation import SimulationError, SimulationRunner
+
+DUT = "module dut; endmodule\n"
+TB = "module tb; dut u(); initial $finish; endmodule\n"
+
+
+def runner(**tools):
+    runner = SimulationRunner(max_workers=2)
+    runner.tools = dict(runner.tools, **tools)
+    return runner
+
+
+def test_missing_compiler_binary_is_a_simulation_error(tmp_path):
+    r = runner(iverilog=str(tmp_path / "iverilog"), vvp=str(tmp_path / "vvp"))
+    with pytest.raises(SimulationError, match="Could not run iverilog"):
+        list(r.run(DUT, TB, "Verilog", seeds=[1]))
+    r.shutdown()
+
+
+@pytest.mark.skipif(shutil.which("true") is None, reason="needs a no-op executable")
+def test_missing_simulator_binary_is_a_simulation_error(tmp_path):
+    r = runner(iverilog=shutil.which("true"), vvp=str(tmp_path / "vvp"))
+    with pytest.raises(SimulationError, match="Could not run vvp"):
+        list(r.run(DUT, TB, "Verilog", seeds=[1, 2]))
+    r.shutdown()
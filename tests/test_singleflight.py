@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from vlsi_core.openrouter import OpenRouterError, _content
+from vlsi_core.singleflight import SingleFlight, flight_key
+
+
+class NullContent:
+    status_code = 200
+
+    def json(self):
+        return {"model": "m", "choices": [{"message": {"content": None}}]}
+
+
+def follow(flights, key, fn, results, errors):
+    try:
+        results.append(flights.do(key, fn))
+    except Exception as e:
+        errors.append(e)
+
+
+def run_concurrently(flights, fn, callers=5):
+    results, errors = [], []
+    threads = [threading.Thread(target=follow, args=(flights, "k", fn, results, errors)) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flights, calls = SingleFlight(), []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "reply"
+
+    results, errors = run_concurrently(flights, fn)
+    assert results == ["reply"] * 5 and not errors
+    assert len(calls) == 1
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_leader_error_reaches_followers():
+    flights = SingleFlight()
+
+    def fn():
+        time.sleep(0.1)
+        raise OpenRouterError("HTTP 503", status_code=503)
+
+    results, errors = run_concurrently(flights, fn)
+    assert not results and len(errors) == 5
+    assert all(isinstance(e, OpenRouterError) for e in errors)
+
+
+def test_later_calls_start_a_new_flight():
+    flights, calls = SingleFlight(), []
+    for _ in range(2):
+        flights.do("k", lambda: calls.append(1) or "reply")
+    assert len(calls) == 2
+
+
+def test_null_content_is_an_error_not_a_none_reply():
+    with pytest.raises(OpenRouterError):
+        _content(NullContent())
+
+
+def test_flight_key_ignores_line_endings_and_trailing_space():
+    a = {"model": "m", "messages": [{"role": "user", "content": "module m;\r\nendmodule  \r\n"}]}
+    b = {"model": "m", "messages": [{"role": "user", "content": "module m;\nendmodule"}]}
+    assert flight_key(a) == flight_key(b)
+    assert flight_key(a) != flight_key(dict(b, model="other"))
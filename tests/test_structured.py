@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from vlsi_core import structured
+from vlsi_core.structured import StructuredError, parse_json, structured_complete, validate
+
+
+def _replies(monkeypatch, *replies):
+    replies = iter(replies)
+    sent = []
+
+    def complete(api_key, payload, **kwargs):
+        sent.append(payload)
+        return next(replies)
+
+    monkeypatch.setattr(structured, "complete", complete)
+    return sent
+
+
+def _finding(severity="warning", line=3):
+    return {"severity": severity, "line": line, "rule": "inferred-latch", "message": "latch on q"}
+
+
+def test_validate_coerces_cheap_mistakes():
+    data, errors = validate({"findings": [_finding("WARNING", "line 7")], "summary": 1}, structured.SCHEMAS["review"])
+    assert errors == []
+    assert data["findings"][0]["severity"] == "warning"
+    assert data["findings"][0]["line"] == 7
+    assert data["summary"] == "1"
+
+
+def test_parse_json_tolerates_fences_and_trailing_commas():
+    assert parse_json('```json\n{"a": [1, 2,],}\n```') == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        parse_json("no json here")
+
+
+def test_invalid_field_is_repaired_on_its_own(monkeypatch):
+    reply = {"findings": [_finding(), _finding(severity="bad")], "summary": "ok"}
+    sent = _replies(monkeypatch, json.dumps(reply), json.dumps({"findings[1].severity": "critical"}))
+    result = structured_complete("key", "review", "review this", "system", "model")
+    assert result["data"]["findings"][1]["severity"] == "critical"
+    assert result["repaired"] == ["findings[1].severity"]
+    assert result["dropped"] == []
+    assert "findings[1].severity" in sent[1]["messages"][-1]["content"]
+
+
+def test_failed_repair_is_dropped_not_reported_as_repaired(monkeypatch):
+    reply = {"findings": [_finding(), _finding(severity="bad")], "summary": "ok"}
+    fix = json.dumps({"findings[1].severity": "still bad"})
+    _replies(monkeypatch, json.dumps(reply), fix, fix)
+    result = structured_complete("key", "review", "review this", "system", "model", repairs=2)
+    assert result["repaired"] == []
+    assert result["dropped"] == ["findings[1]"]
+    assert len(result["data"]["findings"]) == 1
+
+
+def test_missing_module_description_is_left_empty(monkeypatch):
+    reply = {"modules": [{"name": "counter", "ports": []}]}
+    _replies(monkeypatch, json.dumps(reply))
+    result = structured_complete("key", "document", "document this", "system", "model", repairs=0)
+    assert result["data"]["modules"] == [{"name": "counter", "ports": [], "description": ""}]
+    assert result["dropped"] == ["modules[0].description"]
+
+
+def test_invalid_optional_field_is_removed(monkeypatch):
+    reply = {"code": "module m;\nendmodule", "explanation": "", "optimizations": {"a": 1}}
+    _replies(monkeypatch, json.dumps(reply))
+    result = structured_complete("key", "generate", "counter", "system", "model", repairs=0)
+    assert "optimizations" not in result["data"]
+    assert result["dropped"] == ["optimizations"]
+
+
+def test_missing_code_fails(monkeypatch):
+    _replies(monkeypatch, json.dumps({"explanation": "sorry"}))
+    with pytest.raises(StructuredError):
+        structured_complete("key", "generate", "counter", "system", "model", repairs=0)
+
+
+def test_code_is_salvaged_from_a_plain_reply(monkeypatch):
+    _replies(monkeypatch, "Here it is:\n```verilog\nmodule m;\nendmodule\n```")
+    result = structured_complete("key", "generate", "counter", "system", "model", repairs=0)
+    assert result["data"]["code"] == "module m;\nendmodule"
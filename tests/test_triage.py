@@ -0,0 +1,106 @@
+from vlsi_core.triage import LogTriage, condense_log, triage_log
+
+SIM_LOG = """VCD info: dumpfile tb.vcd opened for output.
+Running test 1
+[12:00:01] ERROR: mismatch at time 105 ns: expected 8'h05, got 8'h04
+[12:00:01] ERROR: mismatch at time 215 ns: expected 8'h0a, got 8'h09
+[12:00:02] ERROR: mismatch at time 325 ns: expected 8'h0f, got 8'h0e
+WARNING: counter.v:14: implicit wire 'carry' has no driver
+Test FAILED: 3 of 50 checks failed
+Simulation finished with 3 errors, 1 warnings
+"""
+
+LINT_LOG = """%Warning-WIDTH: counter.v:21:13: Operator ASSIGN expects 8 bits on the Assign RHS, but Assign RHS's ADD generates 9 bits.
+%Warning-WIDTH: counter.v:35:13: Operator ASSIGN expects 4 bits on the Assign RHS, but Assign RHS's ADD generates 5 bits.
+%Error: counter.v:8:5: syntax error, unexpected always, expecting ';'
+%Warning-UNUSED: counter.v:3:18: Signal is not used: 'debug'
+%Error: Exiting due to 1 error(s)
+"""
+
+VIVADO_LOG = """INFO: [Synth 8-6157] synthesizing module 'top'
+WARNING: [Synth 8-327] inferring latch for variable 'state_reg' [/proj/top.v:40]
+WARNING: [Synth 8-327] inferring latch for variable 'next_reg' [/proj/top.v:52]
+CRITICAL WARNING: [Synth 8-3352] multi-driven net 'bus[0]' with 2nd driver pin 'u1/q' [/proj/top.v:61]
+ERROR: [VRFC 10-2989] 'rst_n' is not declared [/proj/top.v:70]
+Synthesis finished with 1 errors, 1 critical warnings and 2 warnings.
+"""
+
+
+def groups(text):
+    return LogTriage().feed_lines(text.splitlines())
+
+
+def test_severities_are_counted_and_tallies_ignored():
+    summary = groups(SIM_LOG).summary()
+    assert summary["counts"] == {"fatal": 0, "error": 4, "critical": 0, "warning": 1}
+    assert summary["lines"] == 8
+    assert summary["groups"] == 3
+
+
+def test_repeats_with_other_times_and_values_form_one_group():
+    triage = groups(SIM_LOG)
+    first = triage.top()[0]
+    assert first.severity == "error" and first.category == "Simulation Failure"
+    assert first.count == 3
+    assert first.first_line == 3
+    assert first.example.startswith("ERROR: mismatch at time 105 ns")
+
+
+def test_repeats_at_other_lines_share_a_message_id():
+    triage = groups(LINT_LOG)
+    width = next(g for g in triage.groups.values() if g.message_id == "WIDTH")
+    assert width.count == 2
+    assert width.category == "Width Mismatch"
+    assert width.locations == [("counter.v", 21), ("counter.v", 35)]
+    assert triage.summary()["counts"]["error"] == 1
+
+
+def test_vivado_ids_locations_and_categories():
+    triage = groups(VIVADO_LOG)
+    by_id = {g.message_id: g for g in triage.groups.values()}
+    assert by_id["Synth 8-327"].count == 2
+    assert by_id["Synth 8-327"].category == "Latch Inference"
+    assert by_id["Synth 8-327"].names == ["state_reg", "next_reg"]
+    assert by_id["Synth 8-327"].locations == [("top.v", 40), ("top.v", 52)]
+    assert by_id["Synth 8-3352"].severity == "critical"
+    assert by_id["Synth 8-3352"].category == "Multiple Drivers"
+    assert by_id["VRFC 10-2989"].category == "Undefined Signal"
+    assert "Synth 8-6157" not in by_id
+
+
+def test_errors_come_first_then_earliest():
+    order = [(g.severity, g.first_line) for g in groups(VIVADO_LOG).top()]
+    assert order == [("error", 5), ("critical", 4), ("warning", 2)]
+    order = [(g.severity, g.first_line) for g in groups(LINT_LOG).top()]
+    assert order == [("error", 3), ("warning", 1), ("warning", 4)]
+
+
+def test_report_points_at_the_source():
+    code = "\n".join(f"// line {n}" for n in range(1, 80))
+    result = triage_log(VIVADO_LOG.splitlines(), code=code, filename="top.v", limit=2)
+    report = result["report"]
+    assert report.startswith("Log triage: 6 lines, 1 errors, 1 critical warnings, 2 warnings in 3 distinct groups")
+    assert "1. [error] Undefined Signal, first at log line 5" in report
+    assert "   source lines: 70" in report
+    assert "   70 | // line 70" in report
+    assert len(result["groups"]) == 2
+
+
+def test_group_cap_drops_new_groups():
+    triage = LogTriage(max_groups=2)
+    triage.feed_lines(["ERROR: alpha broke", "ERROR: beta broke", "ERROR: gamma broke", "ERROR: alpha broke"])
+    assert len(triage.groups) == 2
+    assert triage.dropped == 1
+
+
+def test_short_logs_are_sent_unchanged():
+    assert condense_log("ERROR: x", threshold=100) == ("ERROR: x", None)
+    text, result = condense_log(SIM_LOG * 20, threshold=100)
+    assert text.startswith("Log triage:")
+    assert result["groups"][0]["count"] == 60
+
+
+def test_quoted_names_and_sized_literals_are_both_blanked():
+    triage = groups("ERROR: 'dead' expected 8'h0a\nERROR: 'beef' expected 4'b10x0\n")
+    assert len(triage.groups) == 1
+    assert triage.top()[0].names == ["dead", "beef"]
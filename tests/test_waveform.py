@@ -0,0 +1,174 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vlsi_core import waveform  # noqa: E402
+from vlsi_core.waveform import Signal, first_difference, open_waveform, parse_header, parse_value  # noqa: E402
+
+WIDE_HIGH = "1" + "0" * 69
+WIDE_MIXED = "x" + "0" * 59 + "1z" + "0" * 8
+
+VCD = f"""$date today $end
+$timescale 1ns $end
+$scope module tb $end
+$var wire 1 ! clk $end
+$var wire 8 " count [7:0] $end
+$var wire 70 # wide [69:0] $end
+$var wire 1 $ bus [3] $end
+$var wire 1 & bus [2] $end
+$var real 64 % temp $end
+$scope module dut $end
+$var wire 1 ! clk $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+$dumpvars
+0!
+bx "
+b0 #
+0$
+1&
+r1.5 %
+$end
+#5
+1!
+b101 "
+b{WIDE_HIGH} #
+#10
+0!
+$comment a comment with 1! and b1111 " that
+spans lines $end
+b{WIDE_MIXED} #
+r2.25 %
+#15
+1!
+bx1 "
+1$
+#20
+0!
+"""
+
+
+def _dump(tmp_path, text=VCD, name="dump.vcd"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.fixture
+def wave(tmp_path):
+    return open_waveform(_dump(tmp_path), store_dir=str(tmp_path / "store"))
+
+
+def test_header_names_scopes_and_bit_selects():
+    header = VCD[:VCD.index("$dumpvars")].encode()
+    timescale, codes, widths, kinds, signals = parse_header(header)
+    assert timescale == "1ns"
+    assert "tb.count" in signals and "tb.count[7:0]" not in signals
+    assert {"tb.bus[3]", "tb.bus[2]"} <= set(signals)
+    assert signals["tb.clk"] == signals["tb.dut.clk"]
+    assert widths[signals["tb.wide"]] == 70
+    assert kinds[signals["tb.temp"]] == "real"
+
+
+def test_ingest_round_trip(wave):
+    assert wave.summary()["end_time"] == 20
+    assert wave.changes("tb.clk") == [(0, "0"), (5, "1"), (10, "0"), (15, "1"), (20, "0")]
+    assert wave.changes("tb.bus[3]") == [(0, "0"), (15, "1")]
+    assert wave.value_at("tb.bus[2]", 20) == "1"
+
+
+def test_value_at_pads_short_unknown_vectors(wave):
+    assert wave.value_at("count", 0) == "8'bxxxxxxxx"
+    assert wave.value_at("count", 7) == "8'h5"
+    assert wave.value_at("count", 15) == "8'bxxxxxxx1"
+    assert wave.value_at("tb.temp", 12) == "2.25"
+
+
+def test_value_before_the_first_change_is_unknown(tmp_path):
+    text = VCD.replace("$dumpvars\n0!\n", "$dumpvars\n", 1)
+    wave = open_waveform(_dump(tmp_path, text), store_dir=str(tmp_path / "store"))
+    assert wave.value_at("tb.clk", 0) == "x"
+
+
+def test_multi_word_vector_with_x_and_z(wave):
+    assert wave.value_at("tb.wide", 0) == "70'h0"
+    assert wave.value_at("tb.wide", 5) == f"70'h{1 << 69:x}"
+    assert wave.value_at("tb.wide", 10) == f"70'b{WIDE_MIXED}"
+    assert wave.signal("tb.wide").unknown(10, 10)
+    assert not wave.signal("tb.wide").unknown(5, 9)
+
+
+def test_comment_spanning_blocks_is_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(waveform, "BLOCK_BYTES", 16)
+    wave = open_waveform(_dump(tmp_path), store_dir=str(tmp_path / "store"))
+    assert wave.changes("tb.count") == [(0, "8'bxxxxxxxx"), (5, "8'h5"), (15, "8'bxxxxxxx1")]
+    assert wave.changes("tb.clk")[2] == (10, "0")
+
+
+def test_scalar_fast_path_keeps_per_signal_values(tmp_path):
+    body = "".join(f"#{t}\n{t % 2}!\n{(t // 2) % 2}$\n" for t in range(1, 200))
+    text = VCD[:VCD.index("$dumpvars")] + body
+    wave = open_waveform(_dump(tmp_path, text), store_dir=str(tmp_path / "store"))
+    assert len(wave.signal("tb.clk")) == 199
+    assert wave.value_at("tb.clk", 150) == "0"
+    assert wave.value_at("tb.bus[3]", 150) == "1"
+    assert wave.value_at("tb.bus[3]", 152) == "0"
+
+
+def test_reopening_uses_the_stored_columns(tmp_path):
+    path = _dump(tmp_path)
+    first = open_waveform(path, store_dir=str(tmp_path / "store"))
+    second = open_waveform(path, store_dir=str(tmp_path / "store"))
+    assert first.directory == second.directory
+
+
+def test_parse_value_literals():
+    assert parse_value("8'hff", 8) == (0xff, 0)
+    assert parse_value("4'b10x0", 4) == (0b1010, 0b0010)
+    assert parse_value("x", 4) == (0b1111, 0b1111)
+    assert parse_value(5, 2) == (1, 0)
+
+
+def _signal(changes, width=8):
+    _, dtype, count = waveform._column(width)
+    times = np.array([t for t, _ in changes], dtype=np.uint64)
+    values = [parse_value(v, width) for _, v in changes]
+    aval = np.array([waveform._words(a, count) for a, _ in values], dtype=dtype)
+    bval = np.array([waveform._words(b, count) for _, b in values], dtype=dtype)
+    return Signal("s", width, "wire", times, aval, bval)
+
+
+def test_first_difference_without_a_mismatch():
+    a = _signal([(0, 1), (10, 2), (20, 3)])
+    b = _signal([(0, 1), (5, 1), (10, 2), (20, 3)])
+    assert first_difference(a, b) is None
+
+
+def test_first_difference_finds_value_and_unknown_mismatches():
+    assert first_difference(_signal([(0, 1), (10, 2)]), _signal([(0, 1), (10, 3)])) == 10
+    assert first_difference(_signal([(0, 1), (7, "x")]), _signal([(0, 1)]), end=20) == 7
+    assert first_difference(_signal([(3, 1)]), _signal([(0, 1)])) == 0
+
+
+def test_first_difference_across_compare_chunks(monkeypatch):
+    monkeypatch.setattr(waveform, "COMPARE_CHUNK", 4)
+    changes = [(t, t) for t in range(0, 40, 2)]
+    assert first_difference(_signal(changes), _signal(changes)) is None
+    changed = changes[:15] + [(30, 99)] + changes[16:]
+    assert first_difference(_signal(changes), _signal(changed)) == 30
+    sparse = [(0, 0), (29, 14), (31, 15)]
+    assert first_difference(_signal(changes), _signal(sparse)) == 2
+
+
+def test_first_difference_of_multi_word_vectors():
+    wide = 1 << 69
+    a = _signal([(0, 0), (5, wide)], width=70)
+    b = _signal([(0, 0), (5, wide), (9, wide | 1)], width=70)
+    assert first_difference(a, b) == 9
+    assert first_difference(a, _signal([(0, 0), (5, wide)], width=70)) is None
+
+
+def test_first_mismatch_against_a_constant(wave):
+    mismatch = wave.first_mismatch("tb.count", "8'h5", start=5, end=20)
+    assert mismatch == {"time": 15, "signal": "tb.count", "actual": "8'bxxxxxxx1", "expected": "8'h5"}
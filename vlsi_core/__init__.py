@@ -0,0 +1,3 @@
+# Shared, Streamlit-independent building blocks for VLSI Design Suite.
+# Modules here are imported once per process, so anything that must survive
+# Streamlit script reruns (caches, connection pools, limiters) lives here.
@@ -0,0 +1,283 @@
+# Async HTTP API over vlsi_core.service. Requires fastapi and uvicorn:
+#   pip install fastapi uvicorn
+#   python -m vlsi_core.api --workers 4 --port 8000
+import argparse
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from vlsi_core import service
+from vlsi_core.cache import get_response_cache
+from vlsi_core.jobs import get_job_manager
+from vlsi_core.metrics import get_metrics, span
+from vlsi_core.openrouter import OpenRouterError, load_api_key
+from vlsi_core.prompts import DEFAULT_REVIEW_FOCUS
+from vlsi_core.rate_limit import CircuitOpenError, get_breaker, get_limiter
+from vlsi_core.routing import get_router
+from vlsi_core.simulation import get_simulation_runner
+from vlsi_core.singleflight import get_single_flight
+from vlsi_core.validation import get_validation_service
+
+app = FastAPI(title="VLSI Design Suite API", version="1.0")
+
+
+class GenerateRequest(BaseModel):
+    design_prompt: str
+    language: str = "Verilog"
+    add_comments: bool = True
+    optimize: bool = False
+    validate_syntax: bool = True
+    model: Optional[str] = None
+    structured: bool = False
+    library: bool = True
+
+
+class DocumentRequest(BaseModel):
+    code: str
+    include_ports: bool = True
+    include_signals: bool = True
+    include_behavior: bool = True
+    language: Optional[str] = None
+    model: Optional[str] = None
+    structured: bool = False
+
+
+class ExplainTurn(BaseModel):
+    role: str
+    content: str
+
+
+class ExplainRequest(BaseModel):
+    code: str
+    question: str = "Explain this code"
+    language: Optional[str] = None
+    model: Optional[str] = None
+    history: List[ExplainTurn] = []
+
+
+class FixRequest(BaseModel):
+    code: str
+    error_log: Optional[str] = None
+    model: Optional[str] = None
+    structured: bool = False
+
+
+class ReviewRequest(BaseModel):
+    code: str
+    focus_areas: List[str] = DEFAULT_REVIEW_FOCUS
+    severity_level: str = "Moderate"
+    language: Optional[str] = None
+    model: Optional[str] = None
+    lint: bool = True
+    parallel: bool = True
+    structured: bool = False
+
+
+class TestbenchRequest(BaseModel):
+    code: str
+    language: str = "Verilog"
+    test_type: str = "Basic Functional"
+    clock_period: int = 10
+    num_tests: int = 50
+    include_coverage: bool = False
+    include_waves: bool = True
+    model: Optional[str] = None
+    seeds: int = 0
+    structured: bool = False
+
+
+class ValidateRequest(BaseModel):
+    code: str
+    language: str = "Verilog"
+
+
+class LintRequest(BaseModel):
+    code: str
+    language: Optional[str] = None
+
+
+class SimulateRequest(BaseModel):
+    code: str
+    testbench: str
+    language: str = "Verilog"
+    seeds: int = 8
+    timeout: Optional[int] = None
+
+
+class JobRequest(BaseModel):
+    tool: str
+    params: Dict[str, Any] = {}
+
+
+# Service calls block on the network or a compiler, so they run in worker
+# threads; the event loop only schedules them.
+async def _call(func, *args, **kwargs):
+    api_key = load_api_key()
+    if not api_key:
+        raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY is not configured")
+    def traced():
+        with span(f"api.{func.__name__}"):
+            return func(api_key, *args, **kwargs)
+
+    try:
+        return await asyncio.to_thread(traced)
+    except service.ServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except OpenRouterError as e:
+        if e.status_code == 429:
+            headers = {"Retry-After": str(int(e.retry_after or 1))}
+            raise HTTPException(status_code=429, detail=str(e), headers=headers)
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@app.post("/v1/generate")
+async def generate(request: GenerateRequest):
+    return await _call(service.generate_rtl, request.design_prompt, request.language, request.add_comments,
+                       request.optimize, request.validate_syntax, model=request.model, structured=request.structured,
+                       library=request.library)
+
+
+@app.post("/v1/document")
+async def document(request: DocumentRequest):
+    return await _call(service.document_code, request.code, request.include_ports, request.include_signals,
+                       request.include_behavior, language=request.language, model=request.model,
+                       structured=request.structured)
+
+
+@app.post("/v1/explain")
+async def explain(request: ExplainRequest):
+    return await _call(service.explain_code, request.code, request.question, language=request.language,
+                       model=request.model, history=[(turn.role, turn.content) for turn in request.history])
+
+
+@app.post("/v1/fix")
+async def fix(request: FixRequest):
+    return await _call(service.fix_code, request.code, request.error_log, model=request.model,
+                       structured=request.structured)
+
+
+@app.post("/v1/review")
+async def review(request: ReviewRequest):
+    return await _call(service.review_code, request.code, request.focus_areas, request.severity_level,
+                       language=request.language, model=request.model, lint=request.lint,
+                       parallel=request.parallel, structured=request.structured)
+
+
+@app.post("/v1/testbench")
+async def testbench(request: TestbenchRequest):
+    return await _call(service.generate_testbench, request.code, request.language, request.test_type,
+                       request.clock_period, request.num_tests, request.include_coverage, request.include_waves,
+                       model=request.model, seeds=request.seeds, structured=request.structured)
+
+
+@app.post("/v1/validate")
+async def validate(request: ValidateRequest):
+    if not request.code.strip():
+        raise HTTPException(status_code=400, detail="No HDL code provided")
+    return await asyncio.to_thread(service.validate_code, request.code, request.language)
+
+
+@app.post("/v1/lint")
+async def lint(request: LintRequest):
+    if not request.code.strip():
+        raise HTTPException(status_code=400, detail="No HDL code provided")
+    return await asyncio.to_thread(service.lint_code, request.code, request.language)
+
+
+@app.post("/v1/simulate")
+async def simulate(request: SimulateRequest):
+    if not 1 <= request.seeds <= 1024:
+        raise HTTPException(status_code=400, detail="seeds must be between 1 and 1024")
+    try:
+        return await asyncio.to_thread(service.simulate_testbench, request.code, request.testbench,
+                                       request.language, request.seeds, request.timeout)
+    except service.ServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Background jobs: submit returns immediately with an id; identical in-flight
+# submissions share that id. Poll GET /v1/jobs/{id} (optionally long-polling with
+# ?wait=seconds) or stream state changes from /v1/jobs/{id}/events.
+@app.post("/v1/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    api_key = load_api_key()
+    if not api_key:
+        raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY is not configured")
+    try:
+        job_id = get_job_manager().submit(request.tool, request.params, api_key)
+    except service.ServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return get_job_manager().get(job_id).summary()
+
+
+@app.get("/v1/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0.0):
+    manager = get_job_manager()
+    job = await asyncio.to_thread(manager.wait, job_id, min(wait, 60.0)) if wait > 0 else manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.summary()
+
+
+@app.get("/v1/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    manager = get_job_manager()
+    if manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+
+    async def events():
+        updates = manager.subscribe(job_id, timeout=600)
+        while True:
+            update = await asyncio.to_thread(next, updates, None)
+            if update is None:
+                break
+            yield f"data: {json.dumps(update)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+# Per-process state: with several workers each reports its own caches and limiter
+@app.get("/v1/health")
+async def health():
+    library = service.design_library()
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "cache": get_response_cache().stats(),
+        "limiter": get_limiter().stats(),
+        "breaker": get_breaker().stats(),
+        "router": get_router().stats(),
+        "single_flight": get_single_flight().stats(),
+        "validation": get_validation_service().stats(),
+        "simulation": get_simulation_runner().stats(),
+        "jobs": get_job_manager().stats(),
+        "library": library.stats() if library is not None else None
+    }
+
+
+# Prometheus text exposition of this worker's counters and histograms
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return get_metrics().render_prometheus()
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m vlsi_core.api", description="Serve the VLSI Design Suite API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    args = parser.parse_args(argv)
+    uvicorn.run("vlsi_core.api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import json
+import os
+import posixpath
+import sys
+import time
+import zipfile
+from datetime import datetime
+
+from vlsi_core.cache import get_response_cache
+from vlsi_core.hdl_index import HDL_EXTENSIONS
+from vlsi_core.openrouter import DEFAULT_MODEL, OpenRouterError, build_payload, load_api_key, request_completion
+from vlsi_core.prompts import (
+    DEFAULT_REVIEW_FOCUS, DOCUMENTATION_SYSTEM_MSG, REVIEW_FOCUS_AREAS, REVIEW_STRICTNESS, REVIEW_SYSTEM_MSG,
+    build_documentation_prompt, build_review_prompt
+)
+from vlsi_core.rate_limit import AdaptiveRateLimiter, CircuitOpenError, get_breaker, get_limiter
+
+MODES = {
+    "review": ("review", "Code Review"),
+    "doc": ("doc", "Documentation"),
+}
+
+
+class BatchJob:
+    def __init__(self, path, code, language):
+        self.path = path
+        self.code = code
+        self.language = language
+        self.status = "pending"
+        self.attempts = 0
+        self.seconds = 0.0
+        self.queue_wait = 0.0
+        self.output = None
+        self.error = None
+        self.cached = False
+
+    def summary(self):
+        return {
+            "path": self.path,
+            "language": self.language,
+            "status": self.status,
+            "attempts": self.attempts,
+            "cached": self.cached,
+            "seconds": round(self.seconds, 3),
+            "queue_wait": round(self.queue_wait, 3),
+            "output": self.output,
+            "error": self.error
+        }
+
+
+# An archive member name as a clean relative path, or None when it would leave
+# the output directory (absolute, drive-qualified or climbing out with "..")
+def archive_path(name):
+    path = posixpath.normpath(name.replace("\\", "/"))
+    if path.startswith("/") or path == ".." or path.startswith("../") or (len(path) > 1 and path[1] == ":"):
+        return None
+    return path
+
+
+# Collect HDL sources from a directory tree or a .zip archive; archive members
+# whose names point outside the archive root are skipped
+def collect_sources(path):
+    jobs = []
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                ext = os.path.splitext(info.filename)[1].lower()
+                rel = archive_path(info.filename)
+                if info.is_dir() or ext not in HDL_EXTENSIONS or rel is None:
+                    continue
+                code = archive.read(info).decode("utf-8", errors="replace")
+                jobs.append(BatchJob(rel, code, HDL_EXTENSIONS[ext]))
+    elif os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                ext = os.path.splitext(name)[1].lower()
+                if ext not in HDL_EXTENSIONS:
+                    continue
+                full = os.path.join(root, name)
+                with open(full, encoding="utf-8", errors="replace") as f:
+                    code = f.read()
+                jobs.append(BatchJob(os.path.relpath(full, path).replace(os.sep, "/"), code, HDL_EXTENSIONS[ext]))
+    else:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in HDL_EXTENSIONS:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                jobs.append(BatchJob(os.path.basename(path), f.read(), HDL_EXTENSIONS[ext]))
+    return jobs
+
+
+def build_job_payload(job, mode, options):
+    if mode == "review":
+        prompt = build_review_prompt(job.code, options.get("focus_areas"), options.get("severity_level", "Moderate"))
+        system_msg = REVIEW_SYSTEM_MSG
+    else:
+        prompt = build_documentation_prompt(job.code)
+        system_msg = DOCUMENTATION_SYSTEM_MSG
+    return build_payload(prompt, system_msg, model=options.get("model", DEFAULT_MODEL))
+
+
+# The shared limiter as seen by one job: every attempt takes one token, so this
+# counts the job's attempts and how long it queued for them
+class _JobLimiter:
+    def __init__(self, limiter, job):
+        self._limiter = limiter
+        self._job = job
+
+    def acquire(self, tokens=1.0, timeout=None):
+        start = time.monotonic()
+        granted = self._limiter.acquire(tokens, timeout)
+        self._job.queue_wait += time.monotonic() - start
+        if granted:
+            self._job.attempts += 1
+        return granted
+
+    def __getattr__(self, name):
+        return getattr(self._limiter, name)
+
+
+# Retries, 429 backoff and the breaker are request_completion's, run on a worker
+# thread so the event loop keeps the other jobs going
+async def run_job(job, mode, options, api_key, semaphore, bucket, breaker, cache):
+    payload = build_job_payload(job, mode, options)
+    max_retries = options.get("max_retries", 5)
+    start = time.monotonic()
+    async with semaphore:
+        job.status = "running"
+        cached = cache.get(payload) if cache is not None else None
+        if cached is not None:
+            job.cached = True
+            job.status = "ok"
+            job.seconds = time.monotonic() - start
+            return cached
+
+        def on_retry(attempt, error):
+            job.error = str(error)
+
+        try:
+            result = await asyncio.to_thread(
+                request_completion, api_key, payload, max_retries, 60, limiter=_JobLimiter(bucket, job),
+                breaker=breaker, max_queue_wait=None, on_retry=on_retry
+            )
+        except CircuitOpenError as e:
+            job.error = f"Provider unavailable (circuit open): {e}"
+        except OpenRouterError as e:
+            job.error = str(e)
+        else:
+            if cache is not None:
+                cache.put(payload, result)
+            job.error = None
+            job.status = "ok"
+            job.seconds = time.monotonic() - start
+            return result
+
+    job.status = "failed"
+    job.seconds = time.monotonic() - start
+    return None
+
+
+def write_result(job, mode, out_dir, text):
+    suffix, title = MODES[mode]
+    rel = f"{job.path}.{suffix}.md"
+    dest = os.path.join(out_dir, *rel.split("/"))
+    root = os.path.realpath(out_dir)
+    if os.path.commonpath([root, os.path.realpath(dest)]) != root:
+        job.status = "failed"
+        job.error = f"{job.path} would be written outside {out_dir}"
+        return
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, "w", encoding="utf-8") as f:
+        f.write(f"# {title}: {job.path}\n\n{text}\n")
+    job.output = rel
+
+
+def write_index(jobs, mode, out_dir, elapsed, limiter_stats=None):
+    summary = {
+        "mode": mode,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "elapsed_seconds": round(elapsed, 3),
+        "total": len(jobs),
+        "succeeded": sum(1 for j in jobs if j.status == "ok"),
+        "failed": sum(1 for j in jobs if j.status == "failed"),
+        "cached": sum(1 for j in jobs if j.cached),
+        "rate_limiter": limiter_stats,
+        "files": [j.summary() for j in jobs]
+    }
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    lines = [
+        f"# Batch {MODES[mode][1]} Summary",
+        "",
+        f"- Files: {summary['total']} ({summary['succeeded']} ok, {summary['failed']} failed, {summary['cached']} cached)",
+        f"- Elapsed: {summary['elapsed_seconds']} s",
+        "",
+        "| File | Status | Attempts | Seconds | Result |",
+        "|---|---|---|---|---|"
+    ]
+    for j in jobs:
+        result = f"[{j.output}]({j.output})" if j.output else (j.error or "")
+        lines.append(f"| {j.path} | {j.status} | {j.attempts} | {j.seconds:.2f} | {result} |")
+    with open(os.path.join(out_dir, "index.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return summary
+
+
+# Fan jobs out with at most `concurrency` requests in flight, writing each result
+# as it completes. Starts are throttled by the process-wide adaptive limiter, or
+# by a private one capped at `requests_per_minute` when given.
+async def run_batch(jobs, mode, out_dir, api_key, concurrency=4, requests_per_minute=None, options=None,
+                    use_cache=True, progress=None):
+    options = options or {}
+    os.makedirs(out_dir, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    if requests_per_minute:
+        bucket = AdaptiveRateLimiter(requests_per_minute / 60.0, capacity=concurrency)
+    else:
+        bucket = get_limiter()
+    breaker = get_breaker()
+    cache = get_response_cache() if use_cache else None
+    start = time.monotonic()
+
+    async def worker(job):
+        text = await run_job(job, mode, options, api_key, semaphore, bucket, breaker, cache)
+        if text is not None:
+            write_result(job, mode, out_dir, text)
+        if progress is not None:
+            progress(job)
+
+    await asyncio.gather(*(worker(job) for job in jobs))
+    return write_index(jobs, mode, out_dir, time.monotonic() - start, bucket.stats())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m vlsi_core.batch",
+        description="Review or document every HDL file in a directory or zip archive"
+    )
+    parser.add_argument("source", help="Directory, .zip archive or single HDL file")
+    parser.add_argument("--mode", choices=sorted(MODES), default="review")
+    parser.add_argument("-o", "--out", default="batch_results", help="Output directory")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="Max requests in flight")
+    parser.add_argument("--rpm", type=float, default=None,
+                        help="Max requests started per minute (default: VLSI_RATE_LIMIT_RPM, 20)")
+    parser.add_argument("--focus", default=",".join(DEFAULT_REVIEW_FOCUS),
+                        help=f"Comma-separated review focus areas ({', '.join(REVIEW_FOCUS_AREAS)})")
+    parser.add_argument("--strictness", choices=REVIEW_STRICTNESS, default="Moderate")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the response cache")
+    args = parser.parse_args(argv)
+
+    api_key = load_api_key()
+    if not api_key:
+        print("OPENROUTER_API_KEY is not set (environment or .streamlit/secrets.toml).", file=sys.stderr)
+        return 2
+
+    jobs = collect_sources(args.source)
+    if not jobs:
+        print(f"No HDL files found in {args.source}", file=sys.stderr)
+        return 2
+
+    options = {
+        "focus_areas": [a.strip() for a in args.focus.split(",") if a.strip()],
+        "severity_level": args.strictness,
+        "model": args.model
+    }
+
+    def progress(job):
+        print(f"[{job.status:>6}] {job.path} ({job.seconds:.1f}s, {job.attempts} attempt(s))", flush=True)
+
+    summary = asyncio.run(run_batch(jobs, args.mode, args.out, api_key, args.concurrency, args.rpm,
+                                    options, use_cache=not args.no_cache, progress=progress))
+    print(f"{summary['succeeded']}/{summary['total']} succeeded; index written to "
+          f"{os.path.join(args.out, 'index.md')}")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from vlsi_core.metrics import CACHE_LOOKUPS
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "VLSI_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "vlsi_design_suite")
+)
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get("VLSI_CACHE_MEMORY_ENTRIES", "256"))
+DEFAULT_DISK_BYTES = int(os.environ.get("VLSI_CACHE_DISK_MB", "64")) * 1024 * 1024
+DEFAULT_TTL = int(os.environ.get("VLSI_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+# Stable digest of a request payload (dict key order does not matter)
+def payload_key(payload):
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# In-memory tier: bounded LRU with per-entry expiry
+class LRUCache:
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires and expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else 0
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Persistent tier: SQLite file with TTL and total-size eviction (least recently used first)
+class DiskCache:
+    def __init__(self, path, max_bytes=DEFAULT_DISK_BYTES, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires and expires < now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else 0
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, expires, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        cur = self._conn.execute("DELETE FROM entries WHERE expires > 0 AND expires < ?", (now,))
+        self.evictions += max(cur.rowcount, 0)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def size_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+# Two-tier cache keyed on the full request payload
+class ResponseCache:
+    def __init__(self, memory=None, disk=None, name="responses"):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        self.name = name
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get(self, payload):
+        key = payload_key(payload)
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error:
+                value = None
+            if value is not None:
+                self.memory.put(key, value)
+                self._count("disk_hits")
+                return value
+        self._count("misses")
+        return None
+
+    def put(self, payload, value):
+        if not value:
+            return
+        key = payload_key(payload)
+        self.memory.put(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, value)
+            except sqlite3.Error:
+                pass
+        self._count("writes")
+
+    def invalidate(self, payload):
+        key = payload_key(payload)
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        if name != "writes":
+            CACHE_LOOKUPS.inc(cache=self.name, result=name)
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "disk_bytes": self.disk.size_bytes() if self.disk is not None else 0,
+            "disk_evictions": self.disk.evictions if self.disk is not None else 0,
+        }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+# Process-wide cache shared by every Streamlit session
+def get_response_cache():
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            disk = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    disk = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "responses.sqlite3"))
+                except (OSError, sqlite3.Error):
+                    disk = None
+            _response_cache = ResponseCache(LRUCache(), disk)
+        return _response_cache
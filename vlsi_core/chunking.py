@@ -0,0 +1,243 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from vlsi_core.hdl_index import guess_language, parse_source
+from vlsi_core.openrouter import DEFAULT_MODEL, build_payload, complete
+
+CHUNK_TOKENS = int(os.environ.get("VLSI_CHUNK_TOKENS", "3000"))
+CHUNK_THRESHOLD = int(os.environ.get("VLSI_CHUNK_THRESHOLD", "6000"))
+CHUNK_CONCURRENCY = int(os.environ.get("VLSI_CHUNK_CONCURRENCY", "4"))
+
+_BLOCK_START_RE = re.compile(
+    r"^\s*(?:always(?:_comb|_ff|_latch)?\b|initial\b|generate\b|function\b|task\b|"
+    r"(?:\w+\s*:\s*)?process\b|(?:\w+\s*:\s*)?(?:for|if)\b.*\bgenerate\b)",
+    re.IGNORECASE
+)
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+
+# Token estimate; exact with tiktoken installed, otherwise ~3.5 characters per
+# token, which is close for HDL (lots of short identifiers and punctuation)
+def estimate_tokens(text):
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return int(len(text) / 3.5) + 1
+
+
+class Chunk:
+    def __init__(self, index, text, start_line, end_line, modules, context=""):
+        self.index = index
+        self.text = text
+        self.start_line = start_line
+        self.end_line = end_line
+        self.modules = modules
+        self.context = context
+        self.tokens = estimate_tokens(context + text)
+
+    @property
+    def digest(self):
+        return hashlib.sha256((self.context + self.text).encode("utf-8")).hexdigest()
+
+    # Chunk text with its module-header context, ready to drop into a prompt
+    def prompt_text(self):
+        if not self.context:
+            return self.text
+        return f"{self.context}\n    // ... (earlier part of this module omitted) ...\n{self.text}"
+
+    def label(self):
+        names = ", ".join(self.modules) if self.modules else "top level"
+        return f"lines {self.start_line}-{self.end_line} ({names})"
+
+
+# Segments of the file split at module and always/initial/process/generate boundaries:
+# [(start_idx, end_idx, module_name, is_module_start)] over 0-based line indices
+def _segments(lines, modules):
+    boundaries = {0: (None, False)}
+    spans = []
+    for module in modules:
+        start, end = module.start_line - 1, min(module.end_line, len(lines))
+        spans.append((start, end, module.name))
+        boundaries[start] = (module.name, True)
+        if end < len(lines):
+            boundaries.setdefault(end, (None, False))
+    for start, end, name in spans:
+        for i in range(start + 1, end):
+            if _BLOCK_START_RE.match(lines[i]):
+                boundaries.setdefault(i, (name, False))
+
+    def owner(i):
+        for start, end, name in spans:
+            if start <= i < end:
+                return name
+        return None
+
+    points = sorted(boundaries)
+    segments = []
+    for n, start in enumerate(points):
+        end = points[n + 1] if n + 1 < len(points) else len(lines)
+        if start < end:
+            segments.append((start, end, owner(start), boundaries[start][1]))
+    return segments, spans
+
+
+def _header_context(lines, span, limit_lines=40):
+    start, end, _ = span
+    header = []
+    for i in range(start, end):
+        if i > start and _BLOCK_START_RE.match(lines[i]):
+            break
+        header.append(lines[i])
+        if len(header) >= limit_lines:
+            break
+    return "".join(header).rstrip()
+
+
+# Split HDL into chunks of at most max_tokens, cutting only at module/block
+# boundaries where possible. Chunks that start inside a module carry that
+# module's header (ports, declarations) as context.
+def chunk_hdl(code, language=None, max_tokens=CHUNK_TOKENS, path=""):
+    lines = code.splitlines(keepends=True)
+    if not lines:
+        return []
+    try:
+        modules = parse_source(code, path, language or (None if path else guess_language(code)))
+    except Exception:
+        modules = []
+    segments, spans = _segments(lines, modules)
+    span_by_name = {name: (s, e, name) for s, e, name in spans}
+
+    # Segments larger than the budget on their own are split by lines
+    pieces = []
+    for start, end, owner, is_start in segments:
+        text = "".join(lines[start:end])
+        if estimate_tokens(text) <= max_tokens:
+            pieces.append((start, end, owner, is_start))
+            continue
+        cursor = start
+        while cursor < end:
+            size, stop = 0, cursor
+            while stop < end and (stop == cursor or size + estimate_tokens(lines[stop]) <= max_tokens * 0.9):
+                size += estimate_tokens(lines[stop])
+                stop += 1
+            pieces.append((cursor, stop, owner, is_start and cursor == start))
+            cursor = stop
+
+    chunks = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens("".join(lines[piece[0]:piece[1]]))
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append(current)
+
+    result = []
+    for n, group in enumerate(chunks):
+        start, end = group[0][0], group[-1][1]
+        owners = []
+        for _, _, owner, _ in group:
+            if owner and owner not in owners:
+                owners.append(owner)
+        first_owner, first_is_start = group[0][2], group[0][3]
+        context = ""
+        if first_owner and not first_is_start and first_owner in span_by_name:
+            context = _header_context(lines, span_by_name[first_owner])
+        result.append(Chunk(n, "".join(lines[start:end]), start + 1, end, owners, context))
+    return result
+
+
+# One Chunk per module/always/process block, without merging or size limits;
+# blocks inside a module carry its header as context. Used to pick excerpts.
+def hdl_blocks(code, language=None, path=""):
+    lines = code.splitlines(keepends=True)
+    if not lines:
+        return []
+    try:
+        modules = parse_source(code, path, language or (None if path else guess_language(code)))
+    except Exception:
+        modules = []
+    segments, spans = _segments(lines, modules)
+    span_by_name = {name: (s, e, name) for s, e, name in spans}
+    blocks = []
+    for start, end, owner, is_start in segments:
+        context = ""
+        if owner and not is_start and owner in span_by_name:
+            context = _header_context(lines, span_by_name[owner])
+        blocks.append(Chunk(len(blocks), "".join(lines[start:end]), start + 1, end, [owner] if owner else [], context))
+    return blocks
+
+
+# Prefix that tells the model it is looking at one part of a larger file. It is
+# deliberately position-free (no part number or line range) so an edit that
+# shifts the rest of the file does not change, and re-run, every later chunk.
+def chunk_preamble(chunk):
+    names = ", ".join(chunk.modules) if chunk.modules else "top-level declarations"
+    return (
+        f"This is an excerpt of a larger HDL file ({names}). Analyze only this excerpt and "
+        "refer to locations by module, block and signal names.\n\n"
+    )
+
+
+# Tag partial results with the part of the file they cover before reducing
+def label_partials(chunks, partials):
+    return [f"[{chunk.label()}]\n{partial}" for chunk, partial in zip(chunks, partials)]
+
+
+# Map step: run build_prompt(chunk) for every chunk concurrently. Results go
+# through the response cache, so unchanged chunks are free on re-runs.
+# on_progress(done, total, chunk) is called from the caller's thread.
+def map_chunks(api_key, chunks, build_prompt, system_message, model=DEFAULT_MODEL,
+               concurrency=CHUNK_CONCURRENCY, on_progress=None, route=None):
+    results = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        futures = {
+            pool.submit(complete, api_key, build_payload(build_prompt(chunk), system_message, model), route=route): chunk
+            for chunk in chunks
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            chunk = futures[future]
+            results[chunk.index] = future.result()
+            if on_progress is not None:
+                on_progress(done, len(chunks), chunk)
+    return results
+
+
+# Group partial results so each reduce prompt stays within max_tokens
+def group_partials(partials, max_tokens=CHUNK_THRESHOLD):
+    groups, current, size = [], [], 0
+    for partial in partials:
+        tokens = estimate_tokens(partial)
+        if current and size + tokens > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(partial)
+        size += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+# Collapse partial results until they fit in one reduce prompt (hierarchical reduce)
+def reduce_partials(api_key, partials, build_reduce_prompt, system_message, model=DEFAULT_MODEL,
+                    max_tokens=CHUNK_THRESHOLD, concurrency=CHUNK_CONCURRENCY, route=None):
+    while len(partials) > 1:
+        groups = group_partials(partials, max_tokens)
+        if len(groups) == 1:
+            break
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(groups)))) as pool:
+            partials = list(pool.map(
+                lambda group: complete(api_key, build_payload(build_reduce_prompt(group), system_message, model,
+                                                              max_tokens=4096), route=route),
+                groups
+            ))
+    return partials
@@ -0,0 +1,268 @@
+import argparse
+import json
+import sys
+
+from vlsi_core import service
+from vlsi_core.hdl_index import iter_zip_sources, language_for
+from vlsi_core.lint import format_findings
+from vlsi_core.openrouter import OpenRouterError, load_api_key
+from vlsi_core.prompts import DEFAULT_REVIEW_FOCUS, REVIEW_FOCUS_AREAS, REVIEW_STRICTNESS, TESTBENCH_TYPES
+from vlsi_core.rate_limit import CircuitOpenError
+from vlsi_core.triage import open_log
+
+LANGUAGES = ["Verilog", "SystemVerilog", "VHDL"]
+
+
+def read_source(path):
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m vlsi_core.cli", description="Run a VLSI Design Suite tool")
+    parser.add_argument("--model", help="Use this model only (default: the tool's routed model list)")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    parser.add_argument("--structured", action="store_true",
+                        help="Ask for schema-checked JSON (generate, document, review, fix, testbench) "
+                             "and print the parsed fields")
+    tools = parser.add_subparsers(dest="tool", required=True)
+
+    generate = tools.add_parser("generate", help="Generate HDL from a specification")
+    generate.add_argument("spec", help="Design specification")
+    generate.add_argument("--language", choices=LANGUAGES, default="Verilog")
+    generate.add_argument("--no-comments", action="store_true")
+    generate.add_argument("--optimize", action="store_true", help="Ask for optimization suggestions")
+    generate.add_argument("--no-validate", action="store_true")
+    generate.add_argument("--no-library", action="store_true",
+                          help="Do not reuse or show the model similar modules from the design library")
+
+    for name, help_text in (("document", "Document HDL code"), ("explain", "Answer a question about HDL code"),
+                            ("review", "Review HDL code"), ("fix", "Diagnose and fix HDL code"),
+                            ("testbench", "Generate a testbench"), ("validate", "Check HDL syntax locally"),
+                            ("lint", "Run the static lint checks locally"),
+                            ("simulate", "Run a testbench against HDL code with several seeds")):
+        sub = tools.add_parser(name, help=help_text)
+        sub.add_argument("source", help="HDL file, or - for stdin")
+        sub.add_argument("--language", choices=LANGUAGES, default=None, help="Default: from the file extension")
+        if name == "document":
+            sub.add_argument("--no-ports", action="store_true")
+            sub.add_argument("--no-signals", action="store_true")
+            sub.add_argument("--no-behavior", action="store_true")
+        elif name == "explain":
+            sub.add_argument("-q", "--question", default="Explain this code")
+        elif name == "review":
+            sub.add_argument("--focus", default=",".join(DEFAULT_REVIEW_FOCUS),
+                             help=f"Comma-separated focus areas ({', '.join(REVIEW_FOCUS_AREAS)})")
+            sub.add_argument("--strictness", choices=REVIEW_STRICTNESS, default="Moderate")
+            sub.add_argument("--no-lint", action="store_true", help="Let the model review the mechanical issues too")
+            sub.add_argument("--single-pass", action="store_true",
+                             help="One prompt for all focus areas instead of one per area in parallel")
+        elif name == "fix":
+            sub.add_argument("--log", help="File with simulation/synthesis errors (long logs are triaged; .gz read)")
+            sub.add_argument("--wave", help="VCD/FST dump; a window around the failure is sent with the code")
+            sub.add_argument("--at", type=int, help="Failure time in dump ticks (default: from the log, or the end)")
+        elif name == "testbench":
+            sub.add_argument("--test-type", choices=TESTBENCH_TYPES, default="Basic Functional")
+            sub.add_argument("--clock-period", type=int, default=10)
+            sub.add_argument("--tests", type=int, default=50)
+            sub.add_argument("--coverage", action="store_true")
+            sub.add_argument("--no-waves", action="store_true")
+            sub.add_argument("--simulate", type=int, default=0, metavar="SEEDS",
+                             help="Also run the generated testbench with this many seeds")
+        elif name == "simulate":
+            sub.add_argument("--testbench", required=True, help="Testbench file")
+            sub.add_argument("--seeds", type=int, default=8)
+            sub.add_argument("--timeout", type=int, default=None, help="Seconds per run")
+
+    wave = tools.add_parser("wave", help="Show a waveform dump around a failure")
+    wave.add_argument("dump", help="VCD or FST file")
+    wave.add_argument("--at", type=int, help="Failure time in dump ticks (default: first mismatch, --log, or the end)")
+    wave.add_argument("--signals", help="Comma-separated names or glob patterns (default: picked from --code)")
+    wave.add_argument("--expect", help="Reference dump to find the first mismatches against")
+    wave.add_argument("--log", help="Simulation log naming the failure time")
+    wave.add_argument("--code", help="HDL file whose signals are preferred")
+
+    library = tools.add_parser("library", help="Manage the local library of verified designs")
+    actions = library.add_subparsers(dest="action", required=True)
+    add = actions.add_parser("add", help="Index HDL files or .zip archives of them")
+    add.add_argument("paths", nargs="+")
+    add.add_argument("--language", choices=LANGUAGES, default=None, help="Default: from the file extension")
+    add.add_argument("--description", help="What the design does (default: the comment above each module)")
+    add.add_argument("--unverified", action="store_true", help="Use only as an example, never reuse as is")
+    remove = actions.add_parser("remove", help="Remove entries by id, file path or module name")
+    remove.add_argument("--id", type=int, action="append", default=[])
+    remove.add_argument("--path")
+    remove.add_argument("--name")
+    search = actions.add_parser("search", help="Show the entries most similar to a specification")
+    search.add_argument("query")
+    search.add_argument("--language", choices=LANGUAGES, default=None)
+    search.add_argument("-k", type=int, default=5)
+    actions.add_parser("list", help="List every entry")
+    return parser
+
+
+def print_run(run):
+    detail = run["failures"][0] if run["failures"] else f"{run['passed']} passed"
+    print(f"seed {run['seed']:>4}  {run['status']:<8}{run['seconds']:>8.2f}s  {detail}"
+          f"{'  (cached)' if run['cached'] else ''}", file=sys.stderr)
+
+
+def print_aspect(aspect):
+    detail = f"failed: {aspect['error']}" if aspect["error"] else f"{len(aspect['findings'])} findings"
+    print(f"{aspect['aspect']:<14}{aspect['seconds']:>8.2f}s  {detail}", file=sys.stderr)
+
+
+def print_entry(entry):
+    score = f"{entry['score']:>7.2f}  " if "score" in entry else ""
+    print(f"{entry['id']:>5}  {score}{entry['name']:<24}{entry['language']:<15}{entry['description']}"
+          f"{'' if entry['verified'] else '  (unverified)'}")
+
+
+def add_to_library(args):
+    added = []
+    for path in args.paths:
+        if path.lower().endswith(".zip"):
+            sources = iter_zip_sources(path)
+        else:
+            sources = [(path, read_source(path))]
+        for name, text in sources:
+            added += service.add_to_library(text, name, args.language, args.description,
+                                            not args.unverified)["added"]
+    return {"added": added}
+
+
+def run_library(args):
+    if args.action == "add":
+        return add_to_library(args)
+    if args.action == "remove":
+        return service.remove_from_library(args.id, args.path, args.name)
+    if args.action == "search":
+        return service.search_library(args.query, args.language, args.k)
+    return service.library_entries()
+
+
+def run(args, api_key):
+    if args.tool == "generate":
+        return service.generate_rtl(api_key, args.spec, args.language, not args.no_comments, args.optimize,
+                                    not args.no_validate, model=args.model, structured=args.structured,
+                                    library=not args.no_library)
+    if args.tool == "library":
+        return run_library(args)
+
+    if args.tool == "wave":
+        signals = [s.strip() for s in args.signals.split(",") if s.strip()] if args.signals else None
+        return service.waveform_window(args.dump, read_source(args.code) if args.code else None,
+                                       read_source(args.log) if args.log else None, args.at, signals, args.expect)
+
+    code = read_source(args.source)
+    language = args.language or (language_for(args.source) if args.source != "-" else None)
+    if args.tool == "validate":
+        return service.validate_code(code, language or "Verilog")
+    if args.tool == "lint":
+        return service.lint_code(code, language)
+    if args.tool == "simulate":
+        return service.simulate_testbench(code, read_source(args.testbench), language or "Verilog", args.seeds,
+                                          args.timeout, on_result=None if args.json else print_run)
+    if args.tool == "document":
+        return service.document_code(api_key, code, not args.no_ports, not args.no_signals, not args.no_behavior,
+                                     language=language, model=args.model, structured=args.structured)
+    if args.tool == "explain":
+        return service.explain_code(api_key, code, args.question, language=language, model=args.model)
+    if args.tool == "review":
+        focus = [a.strip() for a in args.focus.split(",") if a.strip()]
+        return service.review_code(api_key, code, focus, args.strictness, language=language, model=args.model,
+                                   lint=not args.no_lint, parallel=not args.single_pass,
+                                   on_aspect=None if args.json else print_aspect, structured=args.structured)
+    if args.tool == "fix":
+        if not args.log or args.log == "-":
+            error_log = sys.stdin if args.log else None
+            return service.fix_code(api_key, code, error_log, model=args.model, waveform=args.wave, at=args.at,
+                                    structured=args.structured)
+        with open_log(args.log) as error_log:
+            return service.fix_code(api_key, code, error_log, model=args.model, waveform=args.wave, at=args.at,
+                                    structured=args.structured)
+    return service.generate_testbench(api_key, code, language or "Verilog", args.test_type, args.clock_period,
+                                      args.tests, args.coverage, not args.no_waves, model=args.model,
+                                      seeds=args.simulate, structured=args.structured)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    api_key = load_api_key()
+    if not api_key and args.tool not in ("validate", "lint", "simulate", "wave", "library"):
+        print("OPENROUTER_API_KEY is not set (environment or .streamlit/secrets.toml).", file=sys.stderr)
+        return 2
+
+    try:
+        result = run(args, api_key)
+    except (service.ServiceError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    except (OpenRouterError, CircuitOpenError) as e:
+        print(f"Request failed: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif args.tool == "validate":
+        print(result["message"].strip())
+    elif args.tool == "lint":
+        print(format_findings(result["findings"]))
+    elif args.tool == "wave":
+        summary = result["summary"]
+        print(f"{summary['source']}: {summary['signals']} signals, {summary['changes']} changes, "
+              f"ends at {summary['end_time']} ({summary['timescale']} units)\n")
+        print(result["text"])
+    elif args.tool == "library":
+        if "removed" in result:
+            print(f"Removed {result['removed']} entries")
+        for entry in result.get("added", result.get("results", result.get("entries", []))):
+            print_entry(entry)
+    elif args.tool == "simulate":
+        summary = result["summary"]
+        print(f"{summary['pass']}/{summary['runs']} seeds passed"
+              + (f", failing seeds: {', '.join(map(str, summary['failing_seeds']))}" if summary["failing_seeds"] else ""))
+    elif "data" in result:
+        print(json.dumps(result["data"], indent=2))
+        for key in ("repaired", "dropped"):
+            if result["structured"][key]:
+                print(f"{key.capitalize()} fields: {', '.join(result['structured'][key])}", file=sys.stderr)
+    else:
+        if "lint" in result and "findings" not in result:
+            print(f"## Static checks\n\n{format_findings(result['lint']['findings'])}\n\n## Review\n")
+        print(result.get("code") if args.tool in ("generate", "testbench") else result["reply"])
+    if not args.json and args.tool not in ("validate", "lint", "wave", "simulate", "library"):
+        if result.get("library", {}).get("match"):
+            match = result["library"]["match"]
+            print(f"Reused {match['name']} from the design library (same description); no model call made",
+                  file=sys.stderr)
+        elif result.get("library", {}).get("examples"):
+            print("Examples from the design library: "
+                  + ", ".join(entry["name"] for entry in result["library"]["examples"]), file=sys.stderr)
+        if "validation" in result:
+            print(result["validation"]["message"].strip(), file=sys.stderr)
+        if "simulation" in result:
+            simulation = result["simulation"]
+            if "error" in simulation:
+                print(f"Simulation: {simulation['error']}", file=sys.stderr)
+            else:
+                for entry in simulation["runs"]:
+                    print_run(entry)
+
+    if args.tool == "lint":
+        counts = result["counts"]
+        return 1 if counts["critical"] or counts["warning"] else 0
+    if args.tool == "wave":
+        return 1 if result["mismatches"] else 0
+    if args.tool == "simulate":
+        return 0 if result["summary"]["pass"] == result["summary"]["runs"] else 1
+    if args.tool == "validate" or "validation" in result:
+        valid = result["valid"] if args.tool == "validate" else result["validation"]["valid"]
+        return 0 if valid else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR, DiskCache
+
+SESSION_BYTES = int(os.environ.get("VLSI_CONVERSATION_SESSION_KB", "256")) * 1024
+GLOBAL_BYTES = int(os.environ.get("VLSI_CONVERSATION_GLOBAL_MB", "32")) * 1024 * 1024
+HISTORY_TURNS = int(os.environ.get("VLSI_CONVERSATION_WINDOW", "4"))
+HISTORY_CHARS = int(os.environ.get("VLSI_CONVERSATION_CONTEXT_CHARS", "4000"))
+COMPRESS_OVER = 256
+SUMMARY_CHARS = 160
+
+
+# Stable across processes (unlike hash()) and insensitive to line endings and
+# trailing whitespace, so re-pasting the same file finds the same thread
+def thread_digest(code):
+    text = "\n".join(line.rstrip() for line in code.replace("\r\n", "\n").split("\n")).strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(text):
+    data = text.encode("utf-8")
+    if len(data) > COMPRESS_OVER:
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return packed, True
+    return data, False
+
+
+def _unpack(data, compressed):
+    return (zlib.decompress(data) if compressed else data).decode("utf-8")
+
+
+def _first_sentence(text, limit=SUMMARY_CHARS):
+    line = next((line.strip(" #*-") for line in text.splitlines() if line.strip(" #*-`")), "")
+    end = line.find(". ")
+    line = line[:end + 1] if 0 < end < limit else line
+    return line if len(line) <= limit else line[:limit - 1].rstrip() + "…"
+
+
+# One code variant's question/answer turns, stored compressed when that helps
+class Thread:
+    __slots__ = ("turns", "size", "updated")
+
+    def __init__(self, turns=None):
+        self.turns = []
+        self.size = 0
+        self.updated = time.time()
+        for role, text in turns or []:
+            self.append(role, text)
+
+    def append(self, role, text):
+        data, compressed = _pack(text)
+        self.turns.append((role, data, compressed))
+        self.size += len(data) + len(role)
+        self.updated = time.time()
+
+    def messages(self):
+        return [(role, _unpack(data, compressed)) for role, data, compressed in self.turns]
+
+
+# Conversation threads for every session in the process, keyed by
+# (session id, code digest). Threads are created on the first answer, not on
+# every edit of the code box. Per-session and global byte caps evict the least
+# recently used threads; with a spill store they are compressed to disk and
+# come back transparently when that code is pasted again.
+class ConversationStore:
+    def __init__(self, session_bytes=SESSION_BYTES, global_bytes=GLOBAL_BYTES, spill=None):
+        self.session_bytes = session_bytes
+        self.global_bytes = global_bytes
+        self.spill = spill
+        self._threads = OrderedDict()
+        self._session_sizes = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.spilled = 0
+        self.restored = 0
+
+    @staticmethod
+    def _spill_key(key):
+        return f"{key[0]}:{key[1]}"
+
+    # Caller must hold self._lock
+    def _thread(self, key, create=False):
+        thread = self._threads.get(key)
+        if thread is None and self.spill is not None:
+            try:
+                stored = self.spill.get(self._spill_key(key))
+            except sqlite3.Error:
+                stored = None
+            if stored is not None:
+                thread = Thread(json.loads(zlib.decompress(base64.b64decode(stored)).decode("utf-8")))
+                self._add(key, thread)
+                self.restored += 1
+                self._enforce_caps(key[0], key)
+        if thread is None and create:
+            thread = Thread()
+            self._add(key, thread)
+        if thread is not None:
+            self._threads.move_to_end(key)
+        return thread
+
+    def _add(self, key, thread):
+        self._threads[key] = thread
+        self._resize(key, thread.size)
+
+    def _resize(self, key, delta):
+        self._size += delta
+        self._session_sizes[key[0]] = self._session_sizes.get(key[0], 0) + delta
+
+    def _evict(self, key, keep):
+        thread = self._threads.pop(key)
+        self._resize(key, -thread.size)
+        if not self._session_sizes[key[0]]:
+            del self._session_sizes[key[0]]
+        self.evictions += 1
+        if keep and self.spill is not None and thread.turns:
+            blob = zlib.compress(json.dumps(thread.messages()).encode("utf-8"), 6)
+            try:
+                self.spill.put(self._spill_key(key), base64.b64encode(blob).decode("ascii"))
+                self.spilled += 1
+            except sqlite3.Error:
+                pass
+
+    def _enforce_caps(self, session, current):
+        for key in [k for k in self._threads if k[0] == session]:
+            if self._session_sizes.get(session, 0) <= self.session_bytes:
+                break
+            if key != current:
+                self._evict(key, keep=True)
+        for key in list(self._threads):
+            if self._size <= self.global_bytes:
+                break
+            if key != current:
+                self._evict(key, keep=True)
+
+    def append(self, session, code, role, text):
+        key = (session, thread_digest(code))
+        with self._lock:
+            thread = self._thread(key, create=True)
+            before = thread.size
+            thread.append(role, text)
+            self._resize(key, thread.size - before)
+            self._enforce_caps(session, key)
+
+    def history(self, session, code):
+        with self._lock:
+            thread = self._thread((session, thread_digest(code)))
+            return thread.messages() if thread is not None else []
+
+    def clear(self, session, code):
+        key = (session, thread_digest(code))
+        with self._lock:
+            if key in self._threads:
+                self._evict(key, keep=False)
+        if self.spill is not None:
+            try:
+                self.spill.delete(self._spill_key(key))
+            except sqlite3.Error:
+                pass
+
+    # Bounded context for a follow-up: the last `turns` messages verbatim (older
+    # ones first to be cut when over max_chars) and a one-line-per-exchange
+    # summary of everything before them. Returns (summary or None, recent turns).
+    def context(self, session, code, turns=HISTORY_TURNS, max_chars=HISTORY_CHARS):
+        messages = self.history(session, code)
+        recent = messages[-turns:] if turns > 0 else []
+        older = messages[:len(messages) - len(recent)]
+        while recent and sum(len(text) for _, text in recent) > max_chars:
+            older.extend(recent[:2])
+            recent = recent[2:]
+        summary = []
+        for i in range(0, len(older) - 1, 2):
+            (_, question), (_, answer) = older[i], older[i + 1]
+            summary.append(f"- Q: {_first_sentence(question)} A: {_first_sentence(answer)}")
+        return ("\n".join(summary) or None), recent
+
+    def stats(self):
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "sessions": len(self._session_sizes),
+                "bytes": self._size,
+                "evictions": self.evictions,
+                "spilled": self.spilled,
+                "restored": self.restored
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            spill = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    spill = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "conversations.sqlite3"),
+                                      max_bytes=64 * 1024 * 1024)
+                except (OSError, sqlite3.Error):
+                    spill = None
+            _store = ConversationStore(spill=spill)
+        return _store
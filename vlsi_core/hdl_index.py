@@ -0,0 +1,466 @@
+import io
+import os
+import re
+import zipfile
+
+HDL_EXTENSIONS = {".v": "Verilog", ".sv": "SystemVerilog", ".vhd": "VHDL", ".vhdl": "VHDL"}
+
+VERILOG_KEYWORDS = {
+    "always", "always_comb", "always_ff", "always_latch", "and", "assert", "assign", "assume", "automatic",
+    "begin", "bit", "buf", "bufif0", "bufif1", "case", "casex", "casez", "class", "cmos", "const", "cover",
+    "deassign", "default", "defparam", "disable", "do", "else", "end", "endcase", "endclass", "endfunction",
+    "endgenerate", "endinterface", "endmodule", "endpackage", "endprogram", "endproperty", "endsequence",
+    "endspecify", "endtask", "enum", "event", "final", "for", "force", "forever", "fork", "function",
+    "generate", "genvar", "if", "import", "initial", "inout", "input", "int", "integer", "interface", "join",
+    "join_any", "join_none", "localparam", "logic", "longint", "module", "nand", "negedge", "nmos", "nor",
+    "not", "notif0", "notif1", "or", "output", "package", "parameter", "pmos", "posedge", "property",
+    "pulldown", "pullup", "rcmos", "real", "realtime", "reg", "release", "repeat", "return", "rnmos",
+    "rpmos", "rtran", "rtranif0", "rtranif1", "sequence", "shortint", "signed", "specify", "string",
+    "struct", "supply0", "supply1", "task", "time", "tran", "tranif0", "tranif1", "tri", "tri0", "tri1",
+    "triand", "trior", "typedef", "union", "unique", "unsigned", "var", "void", "wait", "wand", "while",
+    "wire", "wor", "xnor", "xor"
+}
+DIRECTIONS = {"input", "output", "inout"}
+NET_TYPES = {"wire", "reg", "logic", "bit", "signed", "unsigned", "tri", "var", "integer", "int"}
+
+_TOKEN_RE = re.compile(r"\\\S+|[A-Za-z_][\w$]*|`[A-Za-z_]\w*|\d[\w.']*|'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+|\S")
+_VHDL_ENTITY_RE = re.compile(r"\bentity\s+(\w+)\s+is\b", re.IGNORECASE)
+_VHDL_ARCH_RE = re.compile(r"\barchitecture\s+(\w+)\s+of\s+(\w+)\s+is\b", re.IGNORECASE)
+_VHDL_INSTANCE_RE = re.compile(
+    r"\b(\w+)\s*:\s*(?:entity\s+(?:\w+\.)?(\w+)(?:\s*\(\s*\w+\s*\))?|component\s+(\w+)|(\w+))\s*"
+    r"(?:generic|port)\s+map\b",
+    re.IGNORECASE
+)
+
+
+class Port:
+    def __init__(self, name, direction=None, width="1"):
+        self.name = name
+        self.direction = direction
+        self.width = width
+
+    def as_dict(self):
+        return {"name": self.name, "direction": self.direction, "width": self.width}
+
+
+class Instance:
+    def __init__(self, module, name, line):
+        self.module = module
+        self.name = name
+        self.line = line
+
+
+class ModuleInfo:
+    def __init__(self, name, kind, language, path, start_line, end_line, source):
+        self.name = name
+        self.kind = kind
+        self.language = language
+        self.path = path
+        self.start_line = start_line
+        self.end_line = end_line
+        self.source = source
+        self.ports = []
+        self.parameters = []
+        self.instances = []
+
+    @property
+    def key(self):
+        return self.name.lower() if self.language == "VHDL" else self.name
+
+    # Declaration-only view (ports and parameters) for context that only needs the interface
+    def interface(self):
+        if self.language == "VHDL":
+            lines = [f"entity {self.name} is"]
+            if self.parameters:
+                lines.append("    generic (" + "; ".join(f"{n} := {v}" if v else n for n, v in self.parameters) + ");")
+            lines.append("    port (" + "; ".join(f"{p.name} : {p.direction or ''} {p.width}".rstrip()
+                                                 for p in self.ports) + ");")
+            lines.append(f"end entity {self.name};")
+            return "\n".join(lines)
+        params = ""
+        if self.parameters:
+            params = " #(" + ", ".join(f"parameter {n} = {v}" if v else f"parameter {n}" for n, v in self.parameters) + ")"
+        ports = ",\n".join(
+            f"    {p.direction or ''} {'' if p.width == '1' else p.width + ' '}{p.name}".replace("  ", " ")
+            for p in self.ports
+        )
+        return f"module {self.name}{params} (\n{ports}\n);\n    // ... implementation omitted ...\nendmodule"
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "language": self.language,
+            "path": self.path,
+            "lines": [self.start_line, self.end_line],
+            "ports": [p.as_dict() for p in self.ports],
+            "parameters": [{"name": n, "default": v} for n, v in self.parameters],
+            "instances": [{"module": i.module, "name": i.name, "line": i.line} for i in self.instances]
+        }
+
+
+# Blank out comments (and Verilog strings) while keeping offsets and line numbers intact
+def strip_comments(text, language):
+    def blank(match):
+        return re.sub(r"[^\n]", " ", match.group(0))
+
+    if language == "VHDL":
+        return re.sub(r"--[^\n]*", blank, text)
+    return re.sub(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\])*\"", blank, text, flags=re.DOTALL)
+
+
+def _line_of(text, offset):
+    return text.count("\n", 0, offset) + 1
+
+
+# Index of the character after the paren group opening at `start` (text[start] == "(")
+def _match_paren(text, start):
+    depth = 0
+    for i in range(start, len(text)):
+        c = text[i]
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(text)
+
+
+def _split_top(text, sep):
+    parts, depth, current = [], 0, []
+    for c in text:
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        if c == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(c)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_verilog_params(text):
+    params = []
+    for item in _split_top(text, ","):
+        item = re.sub(r"^\s*(parameter|localparam)\b", "", item).strip()
+        name, _, default = item.partition("=")
+        words = name.split()
+        if words:
+            params.append((re.sub(r"\[.*?\]", "", words[-1]).strip(), default.strip() or None))
+    return params
+
+
+def _parse_verilog_port_decl(decl, direction=None):
+    ports = []
+    width = "1"
+    for item in _split_top(decl, ","):
+        item = item.split("=")[0].strip()
+        words = re.findall(r"\[[^\]]*\]|[\w$\\]+", item)
+        names = []
+        for word in words:
+            if word in DIRECTIONS:
+                direction = word
+                width = "1"
+            elif word.startswith("["):
+                width = word.replace(" ", "")
+            elif word not in NET_TYPES:
+                names.append(word)
+        if names:
+            ports.append(Port(names[-1], direction, width))
+    return ports
+
+
+def _verilog_instances(body, body_offset, clean):
+    instances = []
+    tokens = [(m.group(0), m.start()) for m in _TOKEN_RE.finditer(body)]
+    boundary = {";", "begin", "end", "generate", "endgenerate", "else", None}
+    prev = prev2 = prev_tok = None
+    i = 0
+    while i < len(tokens):
+        tok, pos = tokens[i]
+        if prev in boundary and re.match(r"[A-Za-z_\\]", tok) and tok not in VERILOG_KEYWORDS:
+            j = i + 1
+            if j < len(tokens) and tokens[j][0] == "#":
+                j += 1
+                if j < len(tokens) and tokens[j][0] == "(":
+                    close = _match_paren(body, tokens[j][1])
+                    while j < len(tokens) and tokens[j][1] < close:
+                        j += 1
+                else:
+                    j += 1
+            if j + 1 < len(tokens) and re.match(r"[A-Za-z_\\]", tokens[j][0]) and tokens[j][0] not in VERILOG_KEYWORDS:
+                k = j + 1
+                while k < len(tokens) and tokens[k][0] == "[":
+                    while k < len(tokens) and tokens[k][0] != "]":
+                        k += 1
+                    k += 1
+                if k < len(tokens) and tokens[k][0] == "(":
+                    instances.append(Instance(tok, tokens[j][0], _line_of(clean, body_offset + pos)))
+        if tok == ":" and prev is not None and prev not in boundary:
+            # "label: begin" ends a statement too
+            prev = ";"
+        elif prev == ":" and prev2 in boundary:
+            # Named block ("begin : name"): the name is not a statement start
+            prev = ";"
+        else:
+            prev = tok
+        prev2 = prev_tok
+        prev_tok = tok
+        i += 1
+    return instances
+
+
+def parse_verilog(text, path="", language="Verilog"):
+    clean = strip_comments(text, language)
+    modules = []
+    for match in re.finditer(r"\b(module|macromodule|interface)\s+(?:automatic\s+)?([A-Za-z_][\w$]*)", clean):
+        kind, name = match.group(1), match.group(2)
+        end_kw = "endinterface" if kind == "interface" else "endmodule"
+        end_match = re.compile(rf"\b{end_kw}\b").search(clean, match.end())
+        end = end_match.end() if end_match else len(clean)
+        module = ModuleInfo(name, "module" if kind != "interface" else "interface", language, path,
+                            _line_of(clean, match.start()), _line_of(clean, end), text[match.start():end])
+
+        pos = match.end()
+        rest = clean[pos:end]
+        header_end = 0
+        m = re.match(r"\s*(?:import\s+[^;]+;\s*)*#\s*\(", rest)
+        if m:
+            close = _match_paren(rest, m.end() - 1)
+            module.parameters.extend(_parse_verilog_params(rest[m.end():close - 1]))
+            header_end = close
+        m = re.compile(r"\s*\(").match(rest, header_end)
+        port_names = []
+        if m:
+            close = _match_paren(rest, m.end() - 1)
+            port_text = rest[m.end():close - 1]
+            if re.search(r"\b(input|output|inout)\b", port_text):
+                module.ports.extend(_parse_verilog_port_decl(port_text))
+            else:
+                port_names = [p.strip().lstrip(".") for p in _split_top(port_text, ",")]
+            header_end = close
+        semi = rest.find(";", header_end)
+        body_start = semi + 1 if semi >= 0 else header_end
+        body = rest[body_start:]
+
+        # Non-ANSI port declarations and body parameters
+        declared = {}
+        for decl in re.finditer(r"\b(input|output|inout)\b([^;]*);", body):
+            for port in _parse_verilog_port_decl(decl.group(0)[:-1]):
+                declared[port.name] = port
+        for name in port_names:
+            module.ports.append(declared.get(name, Port(name)))
+        for decl in re.finditer(r"\bparameter\b([^;]*);", body):
+            module.parameters.extend(_parse_verilog_params(decl.group(1)))
+
+        module.instances = _verilog_instances(body, pos + body_start, clean)
+        modules.append(module)
+    return modules
+
+
+def _parse_vhdl_list(text, is_port):
+    items = []
+    for decl in _split_top(text, ";"):
+        names, _, spec = decl.partition(":")
+        spec = spec.strip()
+        default = None
+        if ":=" in spec:
+            spec, _, default = spec.partition(":=")
+            spec, default = spec.strip(), default.strip()
+        for name in [n.strip() for n in names.split(",") if n.strip()]:
+            name = re.sub(r"^(signal|constant)\s+", "", name, flags=re.IGNORECASE)
+            if is_port:
+                m = re.match(r"(in|out|inout|buffer|linkage)\b\s*(.*)", spec, re.IGNORECASE | re.DOTALL)
+                direction, ptype = (m.group(1).lower(), m.group(2).strip()) if m else (None, spec)
+                items.append(Port(name, {"in": "input", "out": "output"}.get(direction, direction),
+                                  " ".join(ptype.split())))
+            else:
+                items.append((name, default))
+    return items
+
+
+def _vhdl_clause(text, keyword):
+    m = re.search(rf"\b{keyword}\s*\(", text, re.IGNORECASE)
+    if not m:
+        return None
+    close = _match_paren(text, m.end() - 1)
+    return text[m.end():close - 1]
+
+
+def parse_vhdl(text, path=""):
+    clean = strip_comments(text, "VHDL")
+    modules = {}
+    boundaries = sorted(
+        [m.start() for m in _VHDL_ENTITY_RE.finditer(clean)] +
+        [m.start() for m in _VHDL_ARCH_RE.finditer(clean)] +
+        [m.start() for m in re.finditer(r"\bpackage\s+(?:body\s+)?\w+\s+is\b", clean, re.IGNORECASE)] +
+        [len(clean)]
+    )
+
+    def unit_end(start):
+        return next(b for b in boundaries if b > start)
+
+    for match in _VHDL_ENTITY_RE.finditer(clean):
+        end = unit_end(match.start())
+        unit = clean[match.end():end]
+        module = ModuleInfo(match.group(1), "entity", "VHDL", path, _line_of(clean, match.start()),
+                            _line_of(clean, end), text[match.start():end].rstrip())
+        generics = _vhdl_clause(unit, "generic")
+        if generics:
+            module.parameters = _parse_vhdl_list(generics, False)
+        ports = _vhdl_clause(unit, "port")
+        if ports:
+            module.ports = _parse_vhdl_list(ports, True)
+        modules[module.key] = module
+
+    for match in _VHDL_ARCH_RE.finditer(clean):
+        end = unit_end(match.start())
+        entity = match.group(2).lower()
+        module = modules.get(entity)
+        if module is None:
+            module = ModuleInfo(match.group(2), "entity", "VHDL", path, _line_of(clean, match.start()),
+                                _line_of(clean, end), "")
+            modules[entity] = module
+        module.source = (module.source + "\n\n" + text[match.start():end].rstrip()).strip()
+        module.end_line = max(module.end_line, _line_of(clean, end))
+        arch = clean[match.start():end]
+        for inst in _VHDL_INSTANCE_RE.finditer(arch):
+            target = inst.group(2) or inst.group(3) or inst.group(4)
+            if target.lower() in ("process", "block", "generate"):
+                continue
+            module.instances.append(Instance(target, inst.group(1), _line_of(clean, match.start() + inst.start())))
+    return list(modules.values())
+
+
+def language_for(path):
+    return HDL_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+# Pasted code has no file name; VHDL is recognisable by its entity declarations
+def guess_language(code):
+    return "VHDL" if _VHDL_ENTITY_RE.search(code) else "Verilog"
+
+
+def parse_source(text, path="", language=None):
+    language = language or language_for(path) or "Verilog"
+    if language == "VHDL":
+        return parse_vhdl(text, path)
+    return parse_verilog(text, path, language)
+
+
+# HDL members of a zip archive as (path, text) pairs
+def iter_zip_sources(fileobj):
+    data = fileobj if isinstance(fileobj, (str, os.PathLike)) else io.BytesIO(fileobj.read() if hasattr(fileobj, "read") else fileobj)
+    with zipfile.ZipFile(data) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or language_for(info.filename) is None:
+                continue
+            yield info.filename, archive.read(info).decode("utf-8", errors="replace")
+
+
+# In-memory index of a multi-file design: modules/entities, their ports and
+# parameters, and instantiation edges between them.
+class DesignIndex:
+    def __init__(self):
+        self.files = {}
+        self.modules = {}
+        self._by_file = {}
+
+    def add_file(self, path, text, language=None):
+        self.remove_file(path)
+        self.files[path] = text
+        parsed = parse_source(text, path, language)
+        self._by_file[path] = [m.key for m in parsed]
+        for module in parsed:
+            self.modules[module.key] = module
+        return parsed
+
+    def remove_file(self, path):
+        for key in self._by_file.pop(path, []):
+            if key in self.modules and self.modules[key].path == path:
+                del self.modules[key]
+        self.files.pop(path, None)
+
+    def resolve(self, name):
+        return self.modules.get(name) or self.modules.get(name.lower())
+
+    def children(self, name):
+        module = self.resolve(name)
+        if module is None:
+            return []
+        seen, result = set(), []
+        for inst in module.instances:
+            child = self.resolve(inst.module)
+            if child is not None and child.key not in seen:
+                seen.add(child.key)
+                result.append(child)
+        return result
+
+    # Instantiated module types that are not defined anywhere in the project
+    def external_dependencies(self, name):
+        module = self.resolve(name)
+        if module is None:
+            return []
+        return sorted({i.module for i in module.instances if self.resolve(i.module) is None})
+
+    # The module plus everything it instantiates, directly or indirectly (depth-first, no repeats)
+    def transitive_closure(self, name):
+        root = self.resolve(name)
+        if root is None:
+            return []
+        order, seen, stack = [], {root.key}, [root]
+        while stack:
+            module = stack.pop()
+            order.append(module)
+            for child in reversed(self.children(module.key)):
+                if child.key not in seen:
+                    seen.add(child.key)
+                    stack.append(child)
+        return order
+
+    def parents(self, name):
+        module = self.resolve(name)
+        if module is None:
+            return []
+        return [m for m in self.modules.values()
+                if any(self.resolve(i.module) is module for i in m.instances)]
+
+    def top_modules(self):
+        instantiated = set()
+        for module in self.modules.values():
+            for inst in module.instances:
+                child = self.resolve(inst.module)
+                if child is not None and child is not module:
+                    instantiated.add(child.key)
+        return [m for m in self.modules.values() if m.key not in instantiated]
+
+    def edge_count(self):
+        return sum(len(self.children(m.key)) for m in self.modules.values())
+
+    # Source text for reviewing `name`: the module itself plus its transitive
+    # dependencies, either in full or as interface-only stubs.
+    def context_for(self, name, dependencies="full"):
+        closure = self.transitive_closure(name)
+        if not closure:
+            return ""
+        parts = [closure[0].source]
+        for module in closure[1:]:
+            if dependencies == "none":
+                break
+            body = module.source if dependencies == "full" else module.interface()
+            parts.append(f"// ---- dependency: {module.name} ({module.path}) ----\n{body}"
+                         if module.language != "VHDL" else
+                         f"-- ---- dependency: {module.name} ({module.path}) ----\n{body}")
+        return "\n\n".join(parts)
+
+    def summary(self):
+        return {
+            "files": len(self.files),
+            "modules": len(self.modules),
+            "edges": self.edge_count(),
+            "tops": [m.name for m in self.top_modules()]
+        }
@@ -0,0 +1,55 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OPENROUTER_URL = os.environ.get("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
+
+# Pool sizing: pool_connections is the number of per-host pools kept alive,
+# pool_maxsize is the number of keep-alive sockets per host.
+POOL_CONNECTIONS = int(os.environ.get("VLSI_HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.environ.get("VLSI_HTTP_POOL_MAXSIZE", "16"))
+POOL_BLOCK = os.environ.get("VLSI_HTTP_POOL_BLOCK", "0") == "1"
+
+_adapter = None
+_adapter_lock = threading.Lock()
+_local = threading.local()
+
+
+# One adapter (and therefore one urllib3 connection pool) per process
+def get_adapter():
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                pool_block=POOL_BLOCK,
+                max_retries=0
+            )
+        return _adapter
+
+
+# Sessions are not documented as thread-safe (cookies, hooks), so every thread
+# gets its own Session, all mounted on the shared adapter so sockets are reused.
+def get_session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = get_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        _local.session = session
+    return session
+
+
+# Drop all pooled sockets (e.g. after changing the endpoint)
+def reset_pool():
+    global _adapter
+    with _adapter_lock:
+        if _adapter is not None:
+            _adapter.close()
+        _adapter = None
+    _local.session = None
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR, DiskCache, LRUCache, ResponseCache
+from vlsi_core.chunking import Chunk, chunk_preamble, guess_language, map_chunks
+from vlsi_core.hdl_index import parse_source
+from vlsi_core.openrouter import DEFAULT_MODEL
+
+_VERILOG_NOISE_RE = re.compile(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\])*\"", re.DOTALL)
+_VHDL_COMMENT_RE = re.compile(r"--[^\n]*")
+_SPACE_AROUND_PUNCT_RE = re.compile(r" ?([^\w\s$`']) ?")
+
+
+# Source with comments removed and whitespace canonicalized, so re-indenting or
+# re-commenting a module does not count as a change (string literals are kept)
+def normalize_source(text, language="Verilog"):
+    if language == "VHDL":
+        text = _VHDL_COMMENT_RE.sub(" ", text).lower()
+    else:
+        text = _VERILOG_NOISE_RE.sub(lambda m: m.group(0) if m.group(0).startswith('"') else " ", text)
+    text = " ".join(text.split())
+    return _SPACE_AROUND_PUNCT_RE.sub(r"\1", text)
+
+
+def module_fingerprint(module):
+    return hashlib.sha256(normalize_source(module.source, module.language).encode("utf-8")).hexdigest()
+
+
+# Modules of a file in source order as {key: (fingerprint, ModuleInfo)}
+def fingerprint_modules(code, language=None, path=""):
+    language = language or (None if path else guess_language(code))
+    return {module.key: (module_fingerprint(module), module) for module in parse_source(code, path, language)}
+
+
+class ModuleDiff:
+    def __init__(self, added, changed, removed, unchanged):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+
+    @property
+    def stale(self):
+        return self.added + self.changed
+
+    def summary(self):
+        return {
+            "added": self.added,
+            "changed": self.changed,
+            "removed": self.removed,
+            "unchanged": self.unchanged
+        }
+
+
+def diff_modules(previous, current):
+    previous = previous or {}
+    added = [key for key in current if key not in previous]
+    changed = [key for key in current if key in previous and previous[key] != current[key]]
+    unchanged = [key for key in current if key in previous and previous[key] == current[key]]
+    removed = [key for key in previous if key not in current]
+    return ModuleDiff(added, changed, removed, unchanged)
+
+
+class IncrementalResult:
+    def __init__(self, report, diff, sections):
+        self.report = report
+        self.diff = diff
+        self.sections = sections
+
+    @property
+    def analyzed(self):
+        return len(self.diff.stale)
+
+    @property
+    def reused(self):
+        return len(self.diff.unchanged)
+
+
+# One report per (tool, document, options): previous fingerprints plus the
+# per-module section each produced. Stored as JSON in a two-tier cache.
+def _report_id(tool, document, options):
+    return {"tool": tool, "document": document, "options": options}
+
+
+def load_report_state(store, tool, document, options):
+    stored = store.get(_report_id(tool, document, options))
+    return json.loads(stored) if stored else None
+
+
+def save_report_state(store, tool, document, options, state):
+    store.put(_report_id(tool, document, options), json.dumps(state))
+
+
+def assemble_report(modules, sections):
+    return "\n\n".join(
+        f"## {module.kind.capitalize()} `{module.name}`\n\n{sections[key].strip()}"
+        for key, (_, module) in modules.items() if key in sections
+    )
+
+
+# Re-analyze only the modules whose fingerprint changed since the last run of
+# this tool on this document, and splice their sections into the stored report.
+# build_prompt(module_source) builds the tool's prompt for a single module.
+def incremental_run(api_key, code, tool, document, options, build_prompt, system_message, store,
+                    language=None, model=DEFAULT_MODEL, on_progress=None, route=None):
+    modules = fingerprint_modules(code, language)
+    state = load_report_state(store, tool, document, options) or {}
+    previous = state.get("fingerprints", {})
+    sections = state.get("sections", {})
+    current = {key: fingerprint for key, (fingerprint, _) in modules.items()}
+    diff = diff_modules(previous, current)
+
+    chunks = []
+    for key in diff.stale:
+        module = modules[key][1]
+        chunks.append(Chunk(len(chunks), module.source, module.start_line, module.end_line, [module.name]))
+    if chunks:
+        results = map_chunks(
+            api_key, chunks, lambda chunk: build_prompt(chunk_preamble(chunk) + chunk.prompt_text()),
+            system_message, model=model, on_progress=on_progress, route=route
+        )
+        for key, result in zip(diff.stale, results):
+            sections[key] = result
+
+    sections = {key: sections[key] for key in current if key in sections}
+    save_report_state(store, tool, document, options, {"fingerprints": current, "sections": sections})
+    return IncrementalResult(assemble_report(modules, sections), diff, sections)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_report_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            disk = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    disk = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "reports.sqlite3"), max_bytes=16 * 1024 * 1024)
+                except (OSError, sqlite3.Error):
+                    disk = None
+            _store = ResponseCache(LRUCache(max_entries=64), disk, name="reports")
+        return _store
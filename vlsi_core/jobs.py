@@ -0,0 +1,303 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from vlsi_core import service
+from vlsi_core.cache import DEFAULT_CACHE_DIR, payload_key
+from vlsi_core.metrics import span
+from vlsi_core.openrouter import OpenRouterError
+from vlsi_core.rate_limit import CircuitOpenError
+
+JOB_WORKERS = int(os.environ.get("VLSI_JOB_WORKERS", "4"))
+JOB_RETENTION = int(os.environ.get("VLSI_JOB_RETENTION", str(24 * 3600)))
+JOB_MEMORY_RETENTION = int(os.environ.get("VLSI_JOB_MEMORY_RETENTION", "600"))
+PURGE_INTERVAL = 3600
+STORE_POLL_INTERVAL = 0.5
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+ACTIVE_STATES = (PENDING, RUNNING)
+
+
+class Job:
+    def __init__(self, job_id, tool, key, params, status=PENDING, result=None, error=None,
+                 created=None, started=None, finished=None):
+        self.id = job_id
+        self.tool = tool
+        self.key = key
+        self.params = params
+        self.status = status
+        self.result = result
+        self.error = error
+        self.created = created or time.time()
+        self.started = started
+        self.finished = finished
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATES
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "tool": self.tool,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "queued_for": round((self.started or time.time()) - self.created, 3),
+            "elapsed": round(self.elapsed, 3)
+        }
+
+
+def _process_alive(pid):
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+# Finished jobs are kept in SQLite so results outlive the session (and the
+# process) that submitted them
+class JobStore:
+    def __init__(self, path, retention=JOB_RETENTION):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, tool TEXT NOT NULL, key TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, result TEXT, error TEXT, created REAL NOT NULL, started REAL, finished REAL, "
+            "owner INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs(key)")
+        self._fail_orphans()
+
+    # Several processes (API workers, Streamlit) can share the file; only jobs
+    # whose owning process has exited are marked as interrupted
+    def _fail_orphans(self):
+        rows = self._conn.execute(
+            "SELECT id, owner FROM jobs WHERE status IN (?, ?)", (PENDING, RUNNING)
+        ).fetchall()
+        for job_id, owner in rows:
+            if owner == os.getpid() or not _process_alive(owner):
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                    (FAILED, "Interrupted by a server restart", time.time(), job_id)
+                )
+
+    def save(self, job):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(id, tool, key, params, status, result, error, created, started, finished, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.tool, job.key, json.dumps(job.params), job.status,
+                 json.dumps(job.result) if job.result is not None else None, job.error,
+                 job.created, job.started, job.finished, os.getpid())
+            )
+
+    def load(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, tool, key, params, status, result, error, created, started, finished FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, tool, key, params, status, result, error, created, started, finished = row
+        return Job(job_id, tool, key, json.loads(params), status, json.loads(result) if result else None, error,
+                   created, started, finished)
+
+    def purge(self, now=None):
+        cutoff = (now or time.time()) - self.retention
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?", (cutoff,))
+
+
+# Runs service tools on a worker pool. Identical in-flight jobs (same tool and
+# parameters) share one job id; callers poll get() or block in wait().
+# Finished jobs leave memory after memory_retention seconds and are then read
+# back from the store; without a store they are kept for JOB_RETENTION.
+class JobManager:
+    def __init__(self, max_workers=JOB_WORKERS, store=None, memory_retention=JOB_MEMORY_RETENTION):
+        self.store = store
+        self.memory_retention = memory_retention if store is not None else JOB_RETENTION
+        self._last_purge = time.time()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vlsi-job")
+        self._jobs = {}
+        self._inflight = {}
+        self._changed = threading.Condition()
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def submit(self, tool, params, api_key):
+        if tool not in service.TOOLS:
+            raise service.ServiceError(f"Unknown tool: {tool}")
+        key = payload_key({"tool": tool, "params": params})
+        self._sweep()
+        with self._changed:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self.deduplicated += 1
+                return existing
+            job = Job(uuid.uuid4().hex, tool, key, params)
+            self._jobs[job.id] = job
+            self._inflight[key] = job.id
+            self.submitted += 1
+        self._persist(job)
+        self._pool.submit(self._run, job, api_key)
+        return job.id
+
+    def _sweep(self, now=None):
+        now = now or time.time()
+        cutoff = now - self.memory_retention
+        with self._changed:
+            expired = [job.id for job in self._jobs.values()
+                       if not job.active and job.finished is not None and job.finished < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            purge = self.store is not None and now - self._last_purge >= PURGE_INTERVAL
+            if purge:
+                self._last_purge = now
+        if purge:
+            try:
+                self.store.purge(now)
+            except sqlite3.Error:
+                pass
+
+    def _persist(self, job):
+        if self.store is not None:
+            try:
+                self.store.save(job)
+            except sqlite3.Error:
+                pass
+
+    def _update(self, job, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(job, name, value)
+            if not job.active:
+                self._inflight.pop(job.key, None)
+            self._changed.notify_all()
+        self._persist(job)
+
+    def _run(self, job, api_key):
+        self._update(job, status=RUNNING, started=time.time())
+        try:
+            with span(f"job.{job.tool}", job=job.id):
+                result = service.TOOLS[job.tool](api_key, **job.params)
+        except (service.ServiceError, OpenRouterError, CircuitOpenError) as e:
+            self._update(job, status=FAILED, error=str(e), finished=time.time())
+        except Exception as e:
+            self._update(job, status=FAILED, error=f"{type(e).__name__}: {e}", finished=time.time())
+        else:
+            self._update(job, status=DONE, result=result, finished=time.time())
+
+    def get(self, job_id):
+        with self._changed:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            try:
+                job = self.store.load(job_id)
+            except sqlite3.Error:
+                job = None
+        return job
+
+    # Sleep until a local job changes state; jobs owned by another process are
+    # only visible through the store, so those are re-read periodically
+    def _wait_for_change(self, job_id, status, remaining):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                timeout = STORE_POLL_INTERVAL if remaining is None else min(remaining, STORE_POLL_INTERVAL)
+            elif job.status != status:
+                return
+            else:
+                timeout = remaining
+            self._changed.wait(timeout)
+
+    # Yield a snapshot on every state change until the job finishes or timeout passes
+    def subscribe(self, job_id, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last = None
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            if job.status != last:
+                last = job.status
+                yield job.summary()
+            if not job.active:
+                return
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+            self._wait_for_change(job_id, last, remaining)
+
+    # Block until the job leaves the active states or timeout passes
+    def wait(self, job_id, timeout=None):
+        for _ in self.subscribe(job_id, timeout):
+            pass
+        return self.get(job_id)
+
+    # Drop finished jobs from memory (they stay in the store until purged)
+    def forget(self, job_id):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.active:
+                del self._jobs[job_id]
+
+    def stats(self):
+        with self._changed:
+            states = [job.status for job in self._jobs.values()]
+        return {
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "pending": states.count(PENDING),
+            "running": states.count(RUNNING),
+            "done": states.count(DONE),
+            "failed": states.count(FAILED)
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    store = JobStore(os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3"))
+                    store.purge()
+                except (OSError, sqlite3.Error):
+                    store = None
+            _manager = JobManager(store=store)
+        return _manager
@@ -0,0 +1,425 @@
+# Local library of verified designs for retrieval-augmented generation. Modules
+# are indexed in a SQLite file next to the response cache and searched with
+# BM25 over their descriptions, names and identifiers, or, when
+# VLSI_LIBRARY_EMBEDDINGS names a sentence-transformers model (a local
+# directory works offline), by brute-force cosine over CPU embeddings. No
+# network is needed for the BM25 path. Requires numpy:
+#   pip install numpy
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR
+from vlsi_core.chunking import estimate_tokens
+from vlsi_core.hdl_index import language_for, parse_source
+from vlsi_core.metrics import span
+from vlsi_core.snippets import index_terms
+
+LIBRARY_PATH = os.environ.get("VLSI_LIBRARY_PATH", os.path.join(DEFAULT_CACHE_DIR, "library.sqlite3"))
+LIBRARY_EMBEDDINGS = os.environ.get("VLSI_LIBRARY_EMBEDDINGS", "")
+LIBRARY_K = int(os.environ.get("VLSI_LIBRARY_K", "3"))
+LIBRARY_TOKENS = int(os.environ.get("VLSI_LIBRARY_TOKENS", "3000"))
+# Minimum cosine for an embedding hit to count as similar at all
+EMBEDDING_FLOOR = 0.3
+EXAMPLE_CUTOFF = 0.5
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+_DIGITS_RE = re.compile(r"_?\d+$")
+# A comment line, whose text is group 1
+_COMMENT_RE = re.compile(r"^\s*(?://+|--+|/\*+|\*+/?)\s?(.*?)\s*(?:\*+/)?\s*$")
+# Words of a request that never change which design it asks for. Kept short on
+# purpose: every other word, in order, has to match for a module to be reused.
+_FILLER = frozenset("a an the please create design implement write generate make build module code".split())
+
+# Code that may be used for a request in this language
+COMPATIBLE = {"Verilog": ("Verilog",), "SystemVerilog": ("SystemVerilog", "Verilog"), "VHDL": ("VHDL",)}
+
+
+# The comment block right above lines[before] (the module's first line), with
+# the comment markers removed
+def _leading_comment(lines, before):
+    block = []
+    for line in reversed(lines[:before]):
+        if not line.strip():
+            if block:
+                break
+            continue
+        match = _COMMENT_RE.match(line)
+        if not match:
+            break
+        block.append(match.group(1))
+    return " ".join(text for text in reversed(block) if text).strip()
+
+
+# The comment block at the top of a file, above any library/use or include lines
+def _file_comment(lines):
+    start = next((i for i, line in enumerate(lines) if line.strip() and not _COMMENT_RE.match(line)), len(lines))
+    return _leading_comment(lines, start)
+
+
+# Index terms plus each identifier without its trailing width or count, so
+# "mux4" and "counter8" are also found as "mux" and "counter"
+def _terms(text):
+    terms = index_terms(text)
+    stems = [_DIGITS_RE.sub("", term) for term in terms]
+    return terms + [stem for stem, term in zip(stems, terms) if stem != term and len(stem) > 1]
+
+
+# What a request or description must equal for a stored module to be reused:
+# its words in order, without filler, case or punctuation. "up" vs "down" or
+# "synchronous" vs "asynchronous" is one word, so no similarity score is safe.
+def description_key(text):
+    return " ".join(word for word in _WORD_RE.findall(text.lower()) if word not in _FILLER)
+
+
+def load_embedder(name=LIBRARY_EMBEDDINGS):
+    if not name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return SentenceTransformer(name, device="cpu")
+
+
+class LibraryEntry:
+    __slots__ = ("id", "name", "language", "path", "description", "verified", "added", "tokens")
+
+    def __init__(self, id, name, language, path, description, verified, added, tokens):
+        self.id = id
+        self.name = name
+        self.language = language
+        self.path = path
+        self.description = description
+        self.verified = bool(verified)
+        self.added = added
+        self.tokens = tokens
+
+    # What the entry is indexed and embedded by
+    def text(self):
+        return f"{self.name} {self.description}"
+
+    def summary(self):
+        return {"id": self.id, "name": self.name, "language": self.language, "path": self.path,
+                "description": self.description, "verified": self.verified, "tokens": self.tokens}
+
+
+# BM25 postings (term -> {row: tf}) and, with an embedder, one unit vector per
+# row. Rows of removed entries are left empty and reused only on reload.
+class DesignLibrary:
+    def __init__(self, path, embedder=None, k1=1.2, b=0.75):
+        self.path = path
+        self.embedder = embedder
+        self.embedding_model = LIBRARY_EMBEDDINGS if embedder is not None else None
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.exact_hits = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS designs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, digest TEXT UNIQUE NOT NULL, name TEXT NOT NULL, "
+            "language TEXT NOT NULL, path TEXT NOT NULL, description TEXT NOT NULL, source TEXT NOT NULL, "
+            "terms TEXT NOT NULL, tokens INTEGER NOT NULL, verified INTEGER NOT NULL, added REAL NOT NULL, "
+            "embedding BLOB, embedding_model TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS designs_path ON designs(path)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._generation = None
+        self._load()
+
+    # Bumped on every change so other processes sharing the file reload
+    def _stored_generation(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def _bump(self):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+        self._generation = self._stored_generation()
+
+    def _load(self):
+        self._entries = {}
+        self._rows = []
+        self._row_of = {}
+        self._lengths = []
+        self._row_terms = []
+        self._postings = {}
+        self._df = Counter()
+        self._vectors = []
+        self._matrix = None
+        self._by_description = {}
+        missing = []
+        with span("library.load"):
+            for row in self._conn.execute(
+                "SELECT id, name, language, path, description, terms, verified, added, tokens, "
+                "embedding, embedding_model FROM designs ORDER BY id"
+            ):
+                entry = LibraryEntry(*row[:5], row[6], row[7], row[8])
+                vector = None
+                if self.embedder is not None:
+                    if row[9] is not None and row[10] == self.embedding_model:
+                        vector = np.frombuffer(row[9], dtype=np.float32)
+                    else:
+                        missing.append(entry)
+                self._index(entry, Counter(dict(_unpack_terms(row[5]))), vector)
+            if missing:
+                self._embed(missing)
+        self._generation = self._stored_generation()
+
+    def _sync(self):
+        if self._stored_generation() != self._generation:
+            self._load()
+
+    def _index(self, entry, terms, vector=None):
+        row = len(self._rows)
+        self._rows.append(entry.id)
+        self._row_of[entry.id] = row
+        self._entries[entry.id] = entry
+        self._lengths.append(sum(terms.values()) or 1)
+        self._row_terms.append(list(terms))
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[row] = count
+            self._df[term] += 1
+        self._vectors.append(vector)
+        self._matrix = None
+        self._by_description.setdefault(description_key(entry.description), []).append(entry.id)
+
+    def _unindex(self, entry_id):
+        row = self._row_of.pop(entry_id)
+        entry = self._entries.pop(entry_id)
+        self._rows[row] = None
+        self._lengths[row] = 0
+        for term in self._row_terms[row]:
+            del self._postings[term][row]
+            self._df[term] -= 1
+            if not self._postings[term]:
+                del self._postings[term]
+                del self._df[term]
+        self._row_terms[row] = []
+        self._vectors[row] = None
+        self._matrix = None
+        ids = self._by_description.get(description_key(entry.description), [])
+        if entry_id in ids:
+            ids.remove(entry_id)
+
+    def _embed(self, entries):
+        vectors = self.embedder.encode([entry.text() for entry in entries], normalize_embeddings=True,
+                                       convert_to_numpy=True).astype(np.float32)
+        for entry, vector in zip(entries, vectors):
+            self._vectors[self._row_of[entry.id]] = vector
+            self._conn.execute("UPDATE designs SET embedding = ?, embedding_model = ? WHERE id = ?",
+                               (vector.tobytes(), self.embedding_model, entry.id))
+        self._matrix = None
+
+    # Every module in `text` becomes an entry. A file holding a single design
+    # is stored whole (library and use clauses included); description defaults
+    # to the comment block above each module.
+    def add_source(self, text, path="", language=None, description=None, verified=True):
+        language = language or language_for(path) or "Verilog"
+        modules = parse_source(text, path, language)
+        lines = text.split("\n")
+        added = []
+        with self._lock:
+            self._sync()
+            for module in modules:
+                source = text.strip() if len(modules) == 1 else module.source
+                about = (description or _leading_comment(lines, module.start_line - 1)
+                         or (_file_comment(lines) if len(modules) == 1 else "")
+                         or " ".join(part for part in module.name.split("_") if part))
+                digest = hashlib.sha256(f"{language}\0{_normalize(source)}".encode("utf-8")).hexdigest()
+                # The same code, or an earlier version of this module from the same file, is replaced
+                for (existing,) in self._conn.execute(
+                    "SELECT id FROM designs WHERE digest = ? OR (path = ? AND path != '' AND name = ?)",
+                    (digest, path, module.name)
+                ).fetchall():
+                    self._conn.execute("DELETE FROM designs WHERE id = ?", (existing,))
+                    if existing in self._entries:
+                        self._unindex(existing)
+                terms = Counter(_terms(f"{module.name} {about} {about} {source}"))
+                entry = LibraryEntry(None, module.name, language, path, about, verified, time.time(),
+                                     estimate_tokens(source))
+                entry.id = self._conn.execute(
+                    "INSERT INTO designs (digest, name, language, path, description, source, terms, tokens, verified, "
+                    "added) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (digest, entry.name, language, path, about, source, _pack_terms(terms), entry.tokens,
+                     int(verified), entry.added)
+                ).lastrowid
+                self._index(entry, terms)
+                added.append(entry)
+            if added and self.embedder is not None:
+                self._embed(added)
+            if added:
+                self._bump()
+        return added
+
+    def add_file(self, path, description=None, verified=True):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return self.add_source(f.read(), path, description=description, verified=verified)
+
+    # Remove by entry id, source path or module name; returns how many went
+    def remove(self, ids=(), path=None, name=None):
+        with self._lock:
+            self._sync()
+            targets = set(ids)
+            if path is not None:
+                targets |= {e.id for e in self._entries.values() if e.path == path}
+            if name is not None:
+                targets |= {e.id for e in self._entries.values() if e.name == name}
+            targets &= set(self._entries)
+            for entry_id in targets:
+                self._conn.execute("DELETE FROM designs WHERE id = ?", (entry_id,))
+                self._unindex(entry_id)
+            if targets:
+                self._bump()
+        return len(targets)
+
+    def source(self, entry_id):
+        row = self._conn.execute("SELECT source FROM designs WHERE id = ?", (entry_id,)).fetchone()
+        return row[0] if row else None
+
+    def _allowed(self, language):
+        languages = COMPATIBLE.get(language, (language,)) if language else None
+        return np.array([entry_id is not None and (languages is None or self._entries[entry_id].language in languages)
+                         for entry_id in self._rows], dtype=bool)
+
+    def _bm25(self, query):
+        scores = np.zeros(len(self._rows), dtype=np.float64)
+        count = len(self._entries)
+        if not count:
+            return scores
+        lengths = np.asarray(self._lengths, dtype=np.float64)
+        average = lengths.sum() / count
+        for term, weight in Counter(_terms(query)).items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            rows = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            tf = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            df = self._df[term]
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            scores[rows] += weight * idf * tf * (self.k1 + 1) / (
+                tf + self.k1 * (1 - self.b + self.b * lengths[rows] / average))
+        return scores
+
+    def _cosine(self, query):
+        if self._matrix is None:
+            width = next((v.shape[0] for v in self._vectors if v is not None), 0)
+            self._matrix = np.stack([v if v is not None else np.zeros(width, dtype=np.float32)
+                                     for v in self._vectors]) if width else np.zeros((len(self._rows), 0), np.float32)
+        if not self._matrix.shape[1]:
+            return np.zeros(len(self._rows))
+        vector = self.embedder.encode([query], normalize_embeddings=True, convert_to_numpy=True)[0]
+        scores = self._matrix @ vector.astype(np.float32)
+        return np.where(scores >= EMBEDDING_FLOOR, scores, 0.0)
+
+    # Top-k (score, entry) for a request, best first; only entries usable for
+    # `language` and with some similarity are returned
+    def search(self, query, language=None, k=LIBRARY_K):
+        with self._lock:
+            self._sync()
+            self.searches += 1
+            if not self._entries or k <= 0:
+                return []
+            with span("library.search", entries=len(self._entries)):
+                scores = self._cosine(query) if self.embedder is not None else self._bm25(query)
+                scores = np.where(self._allowed(language), scores, 0.0)
+                k = min(k, len(scores))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+            return [(float(scores[row]), self._entries[self._rows[row]]) for row in top if scores[row] > 0]
+
+    # The newest verified entry described exactly as the request (same
+    # description_key), usable for language, or None
+    def match(self, query, language=None):
+        key = description_key(query)
+        if not key:
+            return None
+        languages = COMPATIBLE.get(language, (language,)) if language else None
+        with self._lock:
+            self._sync()
+            for entry_id in reversed(self._by_description.get(key, [])):
+                entry = self._entries[entry_id]
+                if entry.verified and (languages is None or entry.language in languages):
+                    self.exact_hits += 1
+                    return entry
+        return None
+
+    # Few-shot examples for a generation request: (entry, source) for the top
+    # matches that fit max_tokens together. Matches scoring under half the best
+    # one share a word or two with the request and would only cost tokens.
+    def examples(self, query, language=None, k=LIBRARY_K, max_tokens=LIBRARY_TOKENS):
+        chosen, used = [], 0
+        results = self.search(query, language, k)
+        for score, entry in results:
+            if score < results[0][0] * EXAMPLE_CUTOFF or used + entry.tokens > max_tokens:
+                continue
+            source = self.source(entry.id)
+            if source is not None:
+                chosen.append((entry, source))
+                used += entry.tokens
+        return chosen
+
+    def entries(self):
+        with self._lock:
+            self._sync()
+            return sorted(self._entries.values(), key=lambda entry: entry.id)
+
+    def stats(self):
+        with self._lock:
+            self._sync()
+            languages = Counter(entry.language for entry in self._entries.values())
+            return {
+                "entries": len(self._entries),
+                "verified": sum(entry.verified for entry in self._entries.values()),
+                "languages": dict(languages),
+                "terms": len(self._postings),
+                "search": "embeddings" if self.embedder is not None else "bm25",
+                "searches": self.searches,
+                "exact_hits": self.exact_hits
+            }
+
+
+def _normalize(text):
+    return " ".join(text.split()).lower()
+
+
+# Term counts are stored as "term count" lines: compact and cheap to parse on load
+def _pack_terms(terms):
+    return "\n".join(f"{term} {count}" for term, count in terms.items())
+
+
+def _unpack_terms(text):
+    for line in text.split("\n"):
+        if line:
+            term, _, count = line.rpartition(" ")
+            yield term, int(count)
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def get_design_library():
+    global _library
+    with _library_lock:
+        if _library is None:
+            # With the disk cache disabled only an explicitly configured library is opened
+            path = LIBRARY_PATH
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") == "1" and "VLSI_LIBRARY_PATH" not in os.environ:
+                path = ":memory:"
+            _library = DesignLibrary(path, embedder=load_embedder())
+        return _library
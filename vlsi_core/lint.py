@@ -0,0 +1,728 @@
+import re
+import time
+
+from vlsi_core.hdl_index import VERILOG_KEYWORDS, guess_language, parse_vhdl, strip_comments
+from vlsi_core.metrics import span
+
+SEVERITIES = ("critical", "warning", "suggestion")
+
+# Rule id -> (severity, what it checks). The descriptions double as the list of
+# checks the LLM review is told to leave to the linter.
+RULES = {
+    "undriven": ("critical", "signals or outputs that are read but never driven"),
+    "undeclared": ("critical", "identifiers used without a declaration"),
+    "multi-driven": ("critical", "signals driven from more than one always block or assign"),
+    "latch": ("warning", "combinational blocks that do not assign a signal on every path (inferred latches)"),
+    "blocking-in-clocked": ("warning", "blocking assignments in clocked always blocks"),
+    "nonblocking-in-combinational": ("suggestion", "non-blocking assignments in combinational always blocks"),
+    "unused": ("suggestion", "declared signals and inputs that are never used"),
+}
+
+_TOKEN_RE = re.compile(
+    r"`(?:define|undef|include|timescale|ifdef|ifndef|elsif|else|endif|default_nettype|resetall|celldefine"
+    r"|endcelldefine)\b[^\n]*"
+    r"|\\\S+|[A-Za-z_][\w$]*|\$[A-Za-z_][\w$]*|`[A-Za-z_]\w*|\d[\w.']*|'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+|'[01xXzZ]"
+    r"|<<<=|>>>=|<<<|>>>|===|!==|<<=|>>=|<=|>=|==|!=|&&|\|\||<<|>>|->|\+:|-:|::|\+=|-=|\*=|/=|\+\+|--|\S"
+)
+_IDENT_START = re.compile(r"[A-Za-z_\\]")
+_DIRECTIVES = {"define", "undef", "include", "timescale", "ifdef", "ifndef", "elsif", "else", "endif",
+               "default_nettype", "resetall", "celldefine", "endcelldefine"}
+
+DATA_TYPES = {
+    "wire", "reg", "logic", "bit", "byte", "shortint", "int", "longint", "integer", "time", "real", "realtime",
+    "tri", "tri0", "tri1", "triand", "trior", "wand", "wor", "supply0", "supply1", "var", "string"
+}
+NET_TYPES = {"wire", "tri", "tri0", "tri1", "triand", "trior", "wand", "wor", "supply0", "supply1"}
+ASSIGN_OPS = {"=", "<=", "+=", "-=", "*=", "/=", "<<=", ">>=", "<<<=", ">>>="}
+_OPEN, _CLOSE = "([{", ")]}"
+
+
+class Finding:
+    def __init__(self, rule, line, message, module=None):
+        self.rule = rule
+        self.severity = RULES[rule][0]
+        self.line = line
+        self.message = message
+        self.module = module
+
+    def as_dict(self):
+        return {"rule": self.rule, "severity": self.severity, "line": self.line, "message": self.message,
+                "module": self.module}
+
+
+# (token, line) pairs with comments and strings removed. No token spans a line,
+# so lines are tokenized one at a time and findall does the scanning in C.
+def tokenize(text, language="Verilog"):
+    clean = strip_comments(text, language)
+    tokens = [(tok, number) for number, line in enumerate(clean.split("\n"), 1) for tok in _TOKEN_RE.findall(line)]
+    if "`" in clean:
+        tokens = [(tok, line) for tok, line in tokens
+                  if not (tok[0] == "`" and tok[1:].split(None, 1)[0] in _DIRECTIVES)]
+    return tokens
+
+
+def _is_ident(tok):
+    return bool(_IDENT_START.match(tok)) and tok not in VERILOG_KEYWORDS
+
+
+# What one procedural statement does to each variable: assigned on every path
+# (definite), assigned at all (name -> first line), and where an if/case without
+# else/default lets a variable through unassigned (name -> line)
+class _Flow:
+    __slots__ = ("definite", "assigned", "open")
+
+    def __init__(self, definite=None, assigned=None, open_=None):
+        self.definite = definite or set()
+        self.assigned = assigned or {}
+        self.open = open_ or {}
+
+    def then(self, other):
+        self.definite |= other.definite
+        for name, line in other.assigned.items():
+            self.assigned.setdefault(name, line)
+        for name, line in other.open.items():
+            if name not in self.definite:
+                self.open.setdefault(name, line)
+        return self
+
+
+def _branches(flows, complete, line):
+    merged = _Flow()
+    for flow in flows:
+        for name, at in flow.assigned.items():
+            merged.assigned.setdefault(name, at)
+        for name, at in flow.open.items():
+            merged.open.setdefault(name, at)
+    if complete and flows:
+        merged.definite = set.intersection(*(flow.definite for flow in flows))
+    for name in merged.assigned:
+        if name not in merged.definite:
+            merged.open.setdefault(name, line)
+    return merged
+
+
+# One Verilog/SystemVerilog module: declarations, drivers and reads are collected
+# in a single pass over its tokens; the signal-level rules run at the end.
+class _ModuleLinter:
+    def __init__(self, tokens, name, check_undeclared=True):
+        self.tokens = tokens
+        self.name = name
+        self.check_undeclared = check_undeclared
+        self.findings = []
+        self.ports = {}
+        self.signals = {}
+        self.known = {name}
+        self.drivers = {}
+        self.maybe_driven = set()
+        self.reads = set()
+        self.uses = {}
+        self.kind = None
+        self.locals = set()
+
+    def add(self, rule, line, message):
+        self.findings.append(Finding(rule, line, message, self.name))
+
+    # --- token helpers
+
+    def skip_group(self, i, read=True):
+        depth = 0
+        while i < len(self.tokens):
+            tok = self.tokens[i][0]
+            if tok in _OPEN:
+                depth += 1
+            elif tok in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            elif read:
+                self.read(i)
+            i += 1
+        return i
+
+    def read(self, i):
+        tok, line = self.tokens[i]
+        if _is_ident(tok) and (i == 0 or self.tokens[i - 1][0] not in (".", "::", "'")) and \
+                (i + 1 >= len(self.tokens) or self.tokens[i + 1][0] != "::"):
+            self.reads.add(tok)
+            self.uses.setdefault(tok, line)
+
+    def statement_end(self, i):
+        depth = 0
+        while i < len(self.tokens):
+            tok = self.tokens[i][0]
+            if tok in _OPEN:
+                depth += 1
+            elif tok in _CLOSE:
+                depth -= 1
+            elif tok == ";" and depth <= 0:
+                return i
+            i += 1
+        return i
+
+    def split_items(self, start, end):
+        items, depth, item_start = [], 0, start
+        for j in range(start, end):
+            tok = self.tokens[j][0]
+            if tok in _OPEN:
+                depth += 1
+            elif tok in _CLOSE:
+                depth -= 1
+            elif tok == "," and depth == 0:
+                items.append((item_start, j))
+                item_start = j + 1
+        if item_start < end:
+            items.append((item_start, end))
+        return items
+
+    # Names on the left of an assignment: identifiers outside brackets; indices are reads
+    def lhs_names(self, start, end):
+        names, depth = [], 0
+        for j in range(start, end):
+            tok = self.tokens[j][0]
+            if tok == "[":
+                depth += 1
+            elif tok == "]":
+                depth -= 1
+            elif depth:
+                self.read(j)
+            elif _is_ident(tok) and self.tokens[j - 1][0] not in (".", "::"):
+                names.append(tok)
+                self.uses.setdefault(tok, self.tokens[j][1])
+        return names
+
+    def declare(self, start, end, kind, direction=None, net=False):
+        for item_start, item_end in self.split_items(start, end):
+            depth, name, line, init = 0, None, None, None
+            for j in range(item_start, item_end):
+                tok = self.tokens[j][0]
+                if tok == "[":
+                    depth += 1
+                elif tok == "]":
+                    depth -= 1
+                elif tok == "=" and depth == 0:
+                    init = j
+                    break
+                elif depth == 0 and _is_ident(tok) and tok not in DATA_TYPES:
+                    name, line = tok, self.tokens[j][1]
+                elif depth:
+                    self.read(j)
+            if name is None:
+                continue
+            self.known.add(name)
+            if kind == "port":
+                self.ports[name] = (direction or self.ports.get(name, (None, line))[0], line)
+            elif kind == "local":
+                self.locals.add(name)
+            elif kind == "signal" and name not in self.ports:
+                self.signals[name] = line
+            # A net declaration assignment is a continuous driver; a variable
+            # initialiser is only a power-up value
+            if init is not None:
+                self.drive(name, line, ("assign" if net else "initial", name))
+                for j in range(init + 1, item_end):
+                    self.read(j)
+
+    def drive(self, name, line, source):
+        sources = self.drivers.setdefault(name, {})
+        sources.setdefault(source, line)
+
+    # --- module items
+
+    def run(self, start):
+        i = self.header(start)
+        while i < len(self.tokens):
+            i = self.item(i)
+        self.finish()
+        return self.findings
+
+    def header(self, i):
+        toks = self.tokens
+        while i < len(toks) and toks[i][0] == "import":
+            i = self.statement_end(i) + 1
+        if i < len(toks) and toks[i][0] == "#":
+            close = self.skip_group(i + 1, read=False)
+            self.parameters(i + 2, close - 1)
+            i = close
+        if i < len(toks) and toks[i][0] == "(":
+            close = self.skip_group(i, read=False)
+            if any(toks[j][0] in ("input", "output", "inout") for j in range(i + 1, close - 1)):
+                direction = None
+                for start, end in self.split_items(i + 1, close - 1):
+                    if toks[start][0] in ("input", "output", "inout"):
+                        direction = toks[start][0]
+                    self.declare(start, end, "port", direction)
+            else:
+                for start, end in self.split_items(i + 1, close - 1):
+                    for j in range(start, end):
+                        if _is_ident(toks[j][0]):
+                            self.ports.setdefault(toks[j][0], (None, toks[j][1]))
+                            self.known.add(toks[j][0])
+            i = close
+        return self.statement_end(i) + 1
+
+    def parameters(self, start, end):
+        for item_start, item_end in self.split_items(start, end):
+            for j in range(item_start, item_end):
+                tok = self.tokens[j][0]
+                if tok == "=":
+                    break
+                if _is_ident(tok) and tok not in DATA_TYPES:
+                    self.known.add(tok)
+
+    def item(self, i):
+        toks = self.tokens
+        tok = toks[i][0]
+        if tok in ("always", "always_ff", "always_comb", "always_latch", "initial", "final"):
+            return self.process(i)
+        if tok in ("function", "task"):
+            return self.subroutine(i)
+        end = self.statement_end(i)
+        if tok in ("input", "output", "inout"):
+            self.declare(i + 1, end, "port", tok)
+            return end + 1
+        if tok in DATA_TYPES:
+            if tok in ("supply0", "supply1"):
+                self.declare(i, end, "signal")
+                for j in range(i, end):
+                    if _is_ident(toks[j][0]):
+                        self.drive(toks[j][0], toks[j][1], ("assign", j))
+                return end + 1
+            self.declare(i, end, "signal", net=tok in NET_TYPES)
+            return end + 1
+        if tok == "enum":
+            self.declare(self.enum_members(i, end), end, "signal")
+            return end + 1
+        if tok in ("parameter", "localparam", "genvar", "defparam"):
+            self.parameters(i + 1, end)
+            return end + 1
+        if tok == "typedef":
+            self.typedef(i, end)
+            return end + 1
+        if tok == "assign":
+            for start, item_end in self.split_items(i + 1, end):
+                self.assignment(start, item_end, ("assign", start))
+            return end + 1
+        if tok in ("generate", "endgenerate", "begin", "end", "else", "endmodule"):
+            i += 1
+            if i + 1 < len(toks) and toks[i][0] == ":":
+                self.known.add(toks[i + 1][0])
+                i += 2
+            return i
+        if tok in ("for", "if") and i + 1 < len(toks) and toks[i + 1][0] == "(":
+            close = self.skip_group(i + 1)
+            for j in range(i + 2, close - 1):
+                if toks[j][0] == "=" and _is_ident(toks[j - 1][0]):
+                    self.known.add(toks[j - 1][0])
+            return close
+        if tok == "case":
+            # Generate case: not analysed, but its names count as used
+            j = i
+            while j < len(toks) and toks[j][0] != "endcase":
+                self.read(j)
+                j += 1
+            return j + 1
+        if _is_ident(tok):
+            return self.instance_or_declaration(i, end)
+        for j in range(i, end):
+            self.read(j)
+        return end + 1
+
+    def typedef(self, i, end):
+        toks = self.tokens
+        if toks[i + 1][0] == "enum":
+            self.enum_members(i + 1, end)
+        if _is_ident(toks[end - 1][0]):
+            self.known.add(toks[end - 1][0])
+
+    # Registers the members of "enum ... { A, B = 2 }"; returns the index after the brace
+    def enum_members(self, i, end):
+        toks = self.tokens
+        brace = next((k for k in range(i, end) if toks[k][0] == "{"), None)
+        if brace is None:
+            return end
+        close = self.skip_group(brace, read=False)
+        for start, _ in self.split_items(brace + 1, close - 1):
+            if _is_ident(toks[start][0]):
+                self.known.add(toks[start][0])
+        return close
+
+    # "type #(...) name (...);" is an instance; "type name;" a user-typed declaration
+    def instance_or_declaration(self, i, end):
+        toks = self.tokens
+        j = i + 1
+        if j < end and toks[j][0] == "#":
+            j = self.skip_group(j + 1) if j + 1 < end and toks[j + 1][0] == "(" else j + 2
+        if j < end and _is_ident(toks[j][0]):
+            self.known.add(toks[i][0])
+            k = j + 1
+            while k < end and toks[k][0] == "[":
+                k = self.skip_group(k)
+            if k < end and toks[k][0] == "(":
+                # Port directions of the child are unknown here, so every connected
+                # signal counts as both read and (possibly) driven
+                for start, _ in self.split_items(j, end):
+                    if _is_ident(toks[start][0]):
+                        self.known.add(toks[start][0])
+                for m in range(k, end):
+                    tok = toks[m][0]
+                    if _is_ident(tok) and toks[m - 1][0] != ".":
+                        self.read(m)
+                        self.maybe_driven.add(tok)
+                return end + 1
+            self.declare(j, end, "signal")
+            return end + 1
+        for m in range(i, end):
+            self.read(m)
+        return end + 1
+
+    def subroutine(self, i):
+        toks = self.tokens
+        closing = "endfunction" if toks[i][0] == "function" else "endtask"
+        j = i + 1
+        header_end = self.statement_end(j)
+        names = [toks[m][0] for m in range(j, header_end) if _is_ident(toks[m][0]) and toks[m][0] not in DATA_TYPES]
+        if names:
+            self.known.add(names[0])
+        while j < len(toks) and toks[j][0] != closing:
+            tok = toks[j][0]
+            # Locals and arguments are not module signals; module signals it touches count as read
+            if tok in self.signals or tok in self.ports:
+                self.reads.add(tok)
+                if closing == "endtask":
+                    self.maybe_driven.add(tok)
+            j += 1
+        j += 1
+        if j + 1 < len(toks) and toks[j][0] == ":":
+            j += 2
+        return j
+
+    # --- procedural code
+
+    def process(self, i):
+        toks = self.tokens
+        keyword, line = toks[i]
+        i += 1
+        kind = {"always_ff": "clocked", "always_comb": "comb", "always_latch": "latch"}.get(keyword, "other")
+        if i + 1 < len(toks) and toks[i][0] == "@":
+            edges = False
+            if toks[i + 1][0] == "(":
+                close = self.skip_group(i + 1)
+                edges = any(toks[j][0] in ("posedge", "negedge") for j in range(i + 2, close))
+                i = close
+            else:
+                self.read(i + 1)
+                i += 2
+            if keyword == "always":
+                kind = "clocked" if edges else "comb"
+        self.kind, self.locals = kind, set()
+        i, flow = self.statement(i)
+        source = ("initial" if keyword in ("initial", "final") else "process", line)
+        for name, at in flow.assigned.items():
+            if name not in self.locals:
+                self.drive(name, at, source)
+        if kind == "comb":
+            for name in sorted(set(flow.assigned) - flow.definite - self.locals, key=flow.assigned.get):
+                self.add("latch", flow.open.get(name, flow.assigned[name]),
+                         f"'{name}' is not assigned on every path through the combinational block at line "
+                         f"{line}; a latch will be inferred")
+        self.kind = None
+        return i
+
+    def statement(self, i):
+        toks = self.tokens
+        if i >= len(toks):
+            return i, _Flow()
+        tok, line = toks[i]
+        if tok in ("begin", "fork"):
+            closing = ("end",) if tok == "begin" else ("join", "join_any", "join_none")
+            i += 1
+            if i < len(toks) and toks[i][0] == ":":
+                i += 2
+            flow = _Flow()
+            while i < len(toks) and toks[i][0] not in closing:
+                i, child = self.statement(i)
+                flow.then(child)
+            i += 1
+            if i < len(toks) and toks[i][0] == ":":
+                i += 2
+            return i, flow
+        if tok in ("unique", "unique0", "priority"):
+            return self.statement_full(i + 1)
+        if tok == "if":
+            return self.conditional(i)
+        if tok in ("case", "casex", "casez"):
+            return self.case(i, full=False)
+        if tok == "for" and i + 1 < len(toks) and toks[i + 1][0] == "(":
+            close = self.skip_group(i + 1, read=False)
+            for j in range(i + 2, close - 1):
+                name = toks[j][0]
+                if name in DATA_TYPES or not _is_ident(name):
+                    continue
+                if toks[j - 1][0] in DATA_TYPES:
+                    self.locals.add(name)
+                    self.known.add(name)
+                elif toks[j + 1][0] == "=":
+                    self.maybe_driven.add(name)
+                self.read(j)
+            return self.statement(close)
+        if tok in ("while", "repeat", "wait") and i + 1 < len(toks) and toks[i + 1][0] == "(":
+            return self.statement(self.skip_group(i + 1))
+        if tok == "forever":
+            return self.statement(i + 1)
+        if tok == "@":
+            if i + 1 < len(toks) and toks[i + 1][0] == "(":
+                return self.statement(self.skip_group(i + 1))
+            self.read(i + 1)
+            return self.statement(i + 2)
+        if tok == "#":
+            if i + 1 < len(toks) and toks[i + 1][0] == "(":
+                return self.statement(self.skip_group(i + 1))
+            return self.statement(i + 2)
+        if tok == ";":
+            return i + 1, _Flow()
+        end = self.statement_end(i)
+        if tok in DATA_TYPES or tok == "automatic":
+            self.declare(i, end, "local")
+            return end + 1, _Flow()
+        if tok in ("assign", "deassign", "force", "release"):
+            i += 1
+        if tok in ("disable", "return", "break", "continue", "->") or tok.startswith("$"):
+            for j in range(i, end):
+                self.read(j)
+            return end + 1, _Flow()
+        return end + 1, self.assignment(i, end, None, line)
+
+    def statement_full(self, i):
+        if i < len(self.tokens) and self.tokens[i][0] in ("case", "casex", "casez"):
+            return self.case(i, full=True)
+        return self.statement(i)
+
+    def conditional(self, i):
+        toks = self.tokens
+        line = toks[i][1]
+        i = self.skip_group(i + 1)
+        i, then_flow = self.statement(i)
+        if i < len(toks) and toks[i][0] == "else":
+            i, else_flow = self.statement(i + 1)
+            return i, _branches([then_flow, else_flow], True, line)
+        return i, _branches([then_flow], False, line)
+
+    def case(self, i, full):
+        toks = self.tokens
+        line = toks[i][1]
+        i = self.skip_group(i + 1)
+        if i < len(toks) and toks[i][0] == "inside":
+            i += 1
+        flows, has_default = [], False
+        while i < len(toks) and toks[i][0] != "endcase":
+            if toks[i][0] == "default":
+                has_default = True
+                i += 1
+                if i < len(toks) and toks[i][0] == ":":
+                    i += 1
+            else:
+                depth = 0
+                while i < len(toks) and toks[i][0] != "endcase" and not (toks[i][0] == ":" and depth == 0):
+                    tok = toks[i][0]
+                    if tok in _OPEN:
+                        depth += 1
+                    elif tok in _CLOSE:
+                        depth -= 1
+                    else:
+                        self.read(i)
+                    i += 1
+                i += 1
+            i, flow = self.statement(i)
+            flows.append(flow)
+        return i + 1, _branches(flows, full or has_default, line)
+
+    def assignment(self, start, end, source, line=None):
+        toks = self.tokens
+        depth, op = 0, None
+        for j in range(start, end):
+            tok = toks[j][0]
+            if tok in _OPEN:
+                depth += 1
+            elif tok in _CLOSE:
+                depth -= 1
+            elif depth == 0 and tok in ASSIGN_OPS:
+                op = j
+                break
+        if op is None:
+            for j in range(start, end):
+                self.read(j)
+                if toks[j][0] in ("++", "--") and j > start and _is_ident(toks[j - 1][0]):
+                    return _Flow({toks[j - 1][0]}, {toks[j - 1][0]: toks[j][1]})
+            return _Flow()
+        names = self.lhs_names(start, op)
+        for j in range(op + 1, end):
+            self.read(j)
+        if toks[op][0] != "=" and toks[op][0] != "<=":
+            self.reads.update(names)
+        if source is not None:
+            for name in names:
+                self.drive(name, toks[op][1], source)
+            return _Flow()
+        line = line or toks[start][1]
+        shared = [name for name in names if name not in self.locals]
+        if shared and self.kind == "clocked" and toks[op][0] != "<=":
+            self.add("blocking-in-clocked", line,
+                     f"Blocking assignment to '{', '.join(shared)}' in a clocked always block; use '<='")
+        elif shared and self.kind == "comb" and toks[op][0] == "<=":
+            self.add("nonblocking-in-combinational", line,
+                     f"Non-blocking assignment to '{', '.join(shared)}' in a combinational always block; use '='")
+        return _Flow(set(names), {name: line for name in names})
+
+    # --- signal-level rules
+
+    def finish(self):
+        for name, sources in self.drivers.items():
+            processes = {source for source in sources if source[0] in ("process", "assign")}
+            if len(processes) > 1 and name not in self.locals:
+                lines = sorted(sources.values())
+                self.add("multi-driven", lines[1],
+                         f"'{name}' is driven from {len(processes)} places (lines "
+                         f"{', '.join(str(l) for l in lines)})")
+        for name, (direction, line) in self.ports.items():
+            if direction == "output" and name not in self.drivers and name not in self.maybe_driven:
+                self.add("undriven", line, f"Output '{name}' is never driven")
+            elif direction == "input" and name not in self.reads:
+                self.add("unused", line, f"Input '{name}' is never used")
+        for name, line in self.signals.items():
+            driven = name in self.drivers or name in self.maybe_driven
+            if not driven and name in self.reads:
+                self.add("undriven", line, f"'{name}' is read but never driven")
+            elif not driven:
+                self.add("unused", line, f"'{name}' is declared but never used")
+            elif name not in self.reads:
+                self.add("unused", line, f"'{name}' is assigned but never read")
+        if self.check_undeclared:
+            for name, line in self.uses.items():
+                if name not in self.known and not name.startswith("\\"):
+                    self.add("undeclared", line, f"'{name}' is used but not declared")
+
+
+# Packages and include files can declare names this pass cannot see
+def _sees_all_declarations(text):
+    return not re.search(r"`include\b|\bimport\b|\bpackage\b", text)
+
+
+def lint_verilog(text, language="Verilog"):
+    tokens = tokenize(text, language)
+    check_undeclared = _sees_all_declarations(text)
+    findings, i = [], 0
+    while i < len(tokens):
+        if tokens[i][0] in ("module", "macromodule") and i + 2 < len(tokens):
+            end = next((j for j in range(i, len(tokens)) if tokens[j][0] == "endmodule"), len(tokens))
+            start = 2 if tokens[i + 1][0] != "automatic" else 3
+            module_tokens = tokens[i:end]
+            findings.extend(_ModuleLinter(module_tokens, module_tokens[start - 1][0], check_undeclared).run(start))
+            i = end + 1
+        else:
+            i += 1
+    return findings
+
+
+_VHDL_SIGNAL_RE = re.compile(r"\bsignal\s+([\w\s,]+?)\s*:", re.IGNORECASE)
+_VHDL_WORD_RE = re.compile(r"[A-Za-z]\w*")
+_VHDL_TARGET_RE = re.compile(r"\b(\w+)\s*(?:\([^;]*?\))?\s*<=")
+
+
+# VHDL gets the signal-level rules only: architecture signals and entity ports
+# that are never driven or never read. Port-map connections count as both.
+def lint_vhdl(text):
+    clean = strip_comments(text, "VHDL")
+    lower = clean.lower()
+    findings = []
+    for entity in parse_vhdl(text):
+        arch = re.search(rf"\barchitecture\s+\w+\s+of\s+{re.escape(entity.key)}\s+is\b", lower)
+        if not arch:
+            continue
+        start = arch.start()
+        stop = re.compile(r"\b(?:entity|architecture|package)\s+\w+").search(lower, arch.end())
+        body = lower[start:stop.start() if stop else len(lower)]
+        begin = re.search(r"\bbegin\b", body)
+        declarations, statements = (body[:begin.start()], body[begin.end():]) if begin else (body, "")
+        base_line = clean.count("\n", 0, start) + 1
+
+        signals = {}
+        for match in _VHDL_SIGNAL_RE.finditer(declarations):
+            line = base_line + declarations.count("\n", 0, match.start())
+            for name in match.group(1).split(","):
+                if name.strip():
+                    signals[name.strip()] = line
+        initialised = {name for name in signals
+                       if re.search(rf"\bsignal\s+[\w\s,]*\b{name}\b[^;]*:=", declarations)}
+
+        driven = initialised | {match.group(1) for match in _VHDL_TARGET_RE.finditer(statements)}
+        mapped = set()
+        for match in re.finditer(r"\bport\s+map\s*\(", statements):
+            close = statements.find(";", match.end())
+            mapped.update(_VHDL_WORD_RE.findall(statements[match.end():close]))
+        reads = set(_VHDL_WORD_RE.findall(_VHDL_TARGET_RE.sub(" ", statements)))
+        for name, line in signals.items():
+            if name not in driven and name not in mapped and name in reads:
+                findings.append(Finding("undriven", line, f"'{name}' is read but never driven", entity.name))
+            elif name not in reads and name not in mapped:
+                message = f"'{name}' is assigned but never read" if name in driven else \
+                    f"'{name}' is declared but never used"
+                findings.append(Finding("unused", line, message, entity.name))
+        for port in entity.ports:
+            name = port.name.lower()
+            if port.direction == "output" and name not in driven and name not in mapped:
+                findings.append(Finding("undriven", entity.start_line, f"Output '{port.name}' is never driven",
+                                        entity.name))
+            elif port.direction == "input" and name not in reads and name not in mapped:
+                findings.append(Finding("unused", entity.start_line, f"Input '{port.name}' is never used",
+                                        entity.name))
+    return findings
+
+
+# Rule ids actually checked for this text: VHDL gets the signal-level rules only,
+# and Verilog skips undeclared names when a package or include may declare them
+def applied_rules(text, language=None):
+    language = language or guess_language(text)
+    if language == "VHDL":
+        return ["undriven", "unused"]
+    return [rule for rule in RULES if rule != "undeclared" or _sees_all_declarations(text)]
+
+
+# What the review prompt is told the linter already covered, from lint_report()
+def lint_descriptions(report):
+    return [RULES[rule][1] for rule in report["rules"]]
+
+
+# Local, deterministic checks: milliseconds even on large files, so they run
+# before every review and the model only gets the higher-level questions.
+# Pasted code without a language is recognised as VHDL by its entities.
+def lint_hdl(text, language=None):
+    language = language or guess_language(text)
+    findings = lint_vhdl(text) if language == "VHDL" else lint_verilog(text, language)
+    findings.sort(key=lambda f: (f.line, SEVERITIES.index(f.severity), f.rule))
+    return findings
+
+
+def lint_report(text, language=None):
+    start = time.perf_counter()
+    language = language or guess_language(text)
+    with span("lint.run", language=language):
+        findings = lint_hdl(text, language)
+    counts = {severity: 0 for severity in SEVERITIES}
+    for finding in findings:
+        counts[finding.severity] += 1
+    return {
+        "findings": [finding.as_dict() for finding in findings],
+        "counts": counts,
+        "language": language,
+        "rules": applied_rules(text, language),
+        "lines": text.count("\n") + 1,
+        "seconds": round(time.perf_counter() - start, 6)
+    }
+
+
+# Markdown list of findings (Finding objects or their dicts)
+def format_findings(findings):
+    if not findings:
+        return "No issues found by the static checks."
+    rows = [f if isinstance(f, dict) else f.as_dict() for f in findings]
+    return "\n".join(f"- Line {f['line']}: **{f['severity'].capitalize()}** ({f['rule']}) {f['message']}" for f in rows)
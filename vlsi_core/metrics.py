@@ -0,0 +1,237 @@
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+RECENT_SPANS = 200
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+# Monotonic counter with optional labels, e.g. retries by reason
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def total(self):
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_number(value)}")
+        return lines
+
+
+# Cumulative-bucket histogram (Prometheus layout); quantiles are interpolated
+# within the bucket, which is plenty for p50/p95 on a dashboard
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def _quantile(self, series, fraction):
+        if not series["count"]:
+            return None
+        rank = fraction * series["count"]
+        seen = 0
+        for i, count in enumerate(series["counts"]):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def summary(self):
+        with self._lock:
+            series = {key: dict(s, counts=list(s["counts"])) for key, s in self._series.items()}
+        return {
+            key: {
+                "count": s["count"],
+                "mean": s["sum"] / s["count"] if s["count"] else None,
+                "p50": self._quantile(s, 0.5),
+                "p95": self._quantile(s, 0.95),
+                "p99": self._quantile(s, 0.99),
+            }
+            for key, s in series.items()
+        }
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(s["counts"]), s["sum"], s["count"]) for key, s in self._series.items())
+        for key, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+# Process-wide metrics plus a ring buffer of recently finished spans. Spans nest
+# per thread, so a request's retries and validations share its trace id.
+class MetricsRegistry:
+    def __init__(self, recent_spans=RECENT_SPANS):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self.recent = deque(maxlen=recent_spans)
+        self.span_seconds = self.histogram("vlsi_span_seconds", "Duration of traced operations")
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._get(Counter, name, help_text)
+
+    def histogram(self, name, help_text="", buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    # Times the block into vlsi_span_seconds{span=name,status=ok|error}; extra
+    # attributes are kept on the trace record only (not as metric labels)
+    @contextmanager
+    def span(self, name, **attributes):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        record = {
+            "id": next(self._ids),
+            "trace": parent["trace"] if parent else None,
+            "parent": parent["id"] if parent else None,
+            "name": name,
+            "attributes": attributes,
+            "started": time.time(),
+        }
+        record["trace"] = record["trace"] or record["id"]
+        stack.append(record)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield record
+        except BaseException as e:
+            status = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            record["seconds"] = time.perf_counter() - start
+            record["status"] = status
+            self.span_seconds.observe(record["seconds"], span=name, status=status)
+            self.recent.append(record)
+
+    def recent_spans(self, limit=50):
+        return list(self.recent)[-limit:][::-1]
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: metric.summary() if metric.kind == "histogram" else metric.samples()
+            for metric in metrics
+        }
+
+    def render_prometheus(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    return _registry
+
+
+def span(name, **attributes):
+    return _registry.span(name, **attributes)
+
+
+LLM_REQUESTS = _registry.counter("vlsi_llm_requests_total", "Upstream LLM requests by model and outcome")
+LLM_SECONDS = _registry.histogram("vlsi_llm_request_seconds", "Upstream LLM request latency (headers for streams)")
+LLM_FIRST_TOKEN = _registry.histogram("vlsi_llm_first_token_seconds", "Time to the first streamed token")
+LLM_RETRIES = _registry.counter("vlsi_llm_retries_total", "Retried LLM requests by reason")
+LLM_TOKENS = _registry.counter("vlsi_llm_tokens_total", "Tokens reported in the usage field, by model and kind")
+CACHE_LOOKUPS = _registry.counter("vlsi_cache_lookups_total", "Response cache lookups by result")
+VALIDATIONS = _registry.counter("vlsi_validations_total", "HDL compiler runs by language and result")
+SIMULATIONS = _registry.counter("vlsi_simulations_total", "Testbench simulation runs by language and status")
+REVIEW_ASPECT_SECONDS = _registry.histogram("vlsi_review_aspect_seconds", "Wall time of each parallel review focus area")
+
+
+def record_usage(model, usage):
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if isinstance(tokens, (int, float)) and tokens > 0:
+            LLM_TOKENS.inc(tokens, model=model or "unknown", kind=kind)
+    # Prompt tokens served from the provider's prompt cache (a subset of "prompt")
+    details = usage.get("prompt_tokens_details")
+    cached = details.get("cached_tokens") if isinstance(details, dict) else None
+    if isinstance(cached, (int, float)) and cached > 0:
+        LLM_TOKENS.inc(cached, model=model or "unknown", kind="cached")
@@ -0,0 +1,196 @@
+import json
+import os
+import random
+import time
+
+import requests
+
+from vlsi_core.cache import get_response_cache
+from vlsi_core.http_client import OPENROUTER_URL, get_session
+from vlsi_core.metrics import LLM_REQUESTS, LLM_RETRIES, LLM_SECONDS, record_usage, span
+from vlsi_core.rate_limit import get_breaker, get_limiter
+from vlsi_core.singleflight import flight_key, get_single_flight
+
+DEFAULT_MODEL = "moonshotai/kimi-k2:free"
+
+
+class OpenRouterError(Exception):
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+# API key for headless callers: environment first, then the Streamlit secrets file
+def load_api_key(secrets_path=os.path.join(".streamlit", "secrets.toml")):
+    key = os.environ.get("OPENROUTER_API_KEY")
+    if key:
+        return key
+    try:
+        import tomllib
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f).get("OPENROUTER_API_KEY")
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+# Providers whose prompt cache needs explicit cache_control breakpoints; the
+# others served through OpenRouter cache an identical message prefix on their own
+CACHE_CONTROL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def supports_cache_control(model):
+    return bool(model) and model.startswith(CACHE_CONTROL_PREFIXES)
+
+
+def build_payload(prompt, system_message="You are an expert VLSI engineer", model=DEFAULT_MODEL,
+                  temperature=0.2, max_tokens=2048):
+    return build_chat_payload([
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": prompt}
+    ], model, temperature, max_tokens)
+
+
+# Multi-turn variant: messages is the full OpenAI-style list, system message first
+def build_chat_payload(messages, model=DEFAULT_MODEL, temperature=0.2, max_tokens=2048):
+    return {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+
+
+# Seconds to wait as advertised by the provider, if any
+def parse_retry_after(headers):
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _send(api_key, payload, timeout, stream, limiter):
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    if stream:
+        headers["Accept"] = "text/event-stream"
+        payload = dict(payload, stream=True)
+    model = payload.get("model", "unknown")
+    start = time.perf_counter()
+    try:
+        with span("openrouter.request", model=model, stream=stream):
+            response = get_session().post(OPENROUTER_URL, headers=headers, data=json.dumps(payload),
+                                          timeout=timeout, stream=stream)
+    except requests.exceptions.RequestException as e:
+        LLM_REQUESTS.inc(model=model, status="network")
+        raise OpenRouterError(f"Network error: {e}") from e
+    LLM_REQUESTS.inc(model=model, status=response.status_code)
+    LLM_SECONDS.observe(time.perf_counter() - start, model=model)
+
+    if limiter is not None:
+        limiter.update_from_headers(response.headers)
+    if response.status_code != 200:
+        response.close()
+        raise OpenRouterError(
+            f"HTTP {response.status_code}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers)
+        )
+    return response
+
+
+def _content(response):
+    try:
+        data = response.json()
+        content = data["choices"][0]["message"]["content"]
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise OpenRouterError(f"Malformed response: {e}", status_code=response.status_code) from e
+    record_usage(data.get("model"), data.get("usage"))
+    # Some providers answer 200 with null content (e.g. a filtered completion)
+    if content is None:
+        raise OpenRouterError("Empty response from model", status_code=response.status_code)
+    return content
+
+
+# Single attempt, no retries and no UI: returns the completion text or raises OpenRouterError
+def post_completion(api_key, payload, timeout=60, limiter=None):
+    return _content(_send(api_key, payload, timeout, False, limiter))
+
+
+# Retrying request through the process-wide limiter and circuit breaker.
+# 429s shrink the shared rate and pause every caller (honouring Retry-After)
+# instead of each thread sleeping on its own; 5xx and network errors count
+# towards the breaker, which then fails fast until the provider recovers.
+# Returns the completion text, or the open streaming response when stream=True.
+# on_retry(attempt, error) lets callers surface intermediate failures.
+# share_throttle=False leaves the shared rate alone on a 429, for callers that
+# back off per model themselves (the model router).
+def request_completion(api_key, payload, max_retries=5, timeout=60, stream=False,
+                       limiter=None, breaker=None, max_queue_wait=60.0, on_retry=None, share_throttle=True):
+    limiter = limiter if limiter is not None else get_limiter()
+    breaker = breaker if breaker is not None else get_breaker()
+    last_error = None
+    for attempt in range(max_retries):
+        breaker.check()
+        if not limiter.acquire(timeout=max_queue_wait):
+            breaker.record_neutral()
+            raise OpenRouterError("Rate limit queue is full; please try again shortly", status_code=429)
+        try:
+            response = _send(api_key, payload, timeout, stream, limiter)
+            result = response if stream else _content(response)
+        except OpenRouterError as e:
+            last_error = e
+            if e.status_code == 429:
+                breaker.record_neutral()
+                if share_throttle:
+                    limiter.record_throttle(e.retry_after, fallback=min(30.0, 2 ** attempt) + random.uniform(0, 1))
+            elif e.retryable:
+                breaker.record_failure()
+                limiter.penalize(min(10.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+            else:
+                # The provider answered, so it is up even though the request was rejected
+                breaker.record_success()
+                raise
+            LLM_RETRIES.inc(reason="429" if e.status_code == 429 else "network" if e.status_code is None else "5xx")
+            if on_retry is not None:
+                on_retry(attempt, e)
+            continue
+        breaker.record_success()
+        limiter.record_success()
+        return result
+    raise last_error or OpenRouterError("Processing failed after multiple attempts")
+
+
+# request_completion behind the shared response cache. Concurrent identical
+# requests are coalesced into one upstream call (coalesce=False opts out).
+# With route set to a tool name, the model router picks and fails over between
+# that tool's models; payload["model"] is then only the preferred first choice.
+def complete(api_key, payload, use_cache=True, coalesce=True, route=None, **kwargs):
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(payload)
+        if cached is not None:
+            return cached
+
+    def call():
+        if route is not None:
+            from vlsi_core.routing import get_router  # routing builds on this module
+            content = get_router().complete(api_key, payload, route, **kwargs)
+        else:
+            content = request_completion(api_key, payload, **kwargs)
+        if cache is not None:
+            cache.put(payload, content)
+        return content
+
+    if not coalesce:
+        return call()
+    return get_single_flight().do(flight_key(payload), call)
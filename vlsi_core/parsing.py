@@ -0,0 +1,54 @@
+# Helpers for pulling structured pieces out of free-form model replies
+import re
+
+# An opening or closing fence on its own line: ``` or ~~~ (or longer), with an
+# optional info string ("verilog", "vhdl", ...) on the opening one
+_FENCE_RE = re.compile(r"^[ \t]{0,3}(`{3,}|~{3,})[ \t]*([\w+#.-]*)[^\n`]*$", re.MULTILINE)
+HDL_INFO = {"verilog", "v", "systemverilog", "sv", "vhdl", "vhd", "hdl"}
+
+
+# Complete fenced blocks as (info, code, start, end) offsets into text. A fence
+# closes only on a line of the same character at least as long, so a ``` inside
+# a ```` block or a string literal does not end it.
+def code_blocks(text):
+    blocks = []
+    opening = None
+    for match in _FENCE_RE.finditer(text):
+        fence, info = match.group(1), match.group(2)
+        if opening is None:
+            opening = (match, fence, info.lower())
+            continue
+        start_match, start_fence, start_info = opening
+        if fence[0] == start_fence[0] and len(fence) >= len(start_fence) and not info:
+            code = text[start_match.end() + 1:match.start()]
+            blocks.append((start_info, code.strip("\n").rstrip(), start_match.start(), match.end()))
+            opening = None
+    return blocks
+
+
+# The block holding the code: the first one tagged with an HDL language, else the
+# longest untagged-or-other one (short blocks are usually shell commands or
+# examples in the explanation)
+def _main_block(text):
+    blocks = code_blocks(text)
+    if not blocks:
+        return None
+    tagged = [block for block in blocks if block[0] in HDL_INFO]
+    return tagged[0] if tagged else max(blocks, key=lambda block: len(block[1]))
+
+
+# Code of the reply's main fenced block, without the fence or its info string.
+# Returns None when the reply has no complete block.
+def extract_code_block(text):
+    block = _main_block(text)
+    return block[1] if block is not None else None
+
+
+# Split a reply into its main code block and the surrounding prose. Returns
+# (None, text) when there is no complete code block.
+def split_code_and_explanation(text):
+    block = _main_block(text)
+    if block is None:
+        return None, text
+    _, code, start, end = block
+    return code, (text[:start] + text[end:]).strip()
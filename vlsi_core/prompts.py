@@ -0,0 +1,296 @@
+# Prompt builders shared by the Streamlit tools and the headless batch engine
+
+REVIEW_FOCUS_AREAS = ["Linting", "Optimization", "Style", "Synthesis", "Testability", "CDC"]
+DEFAULT_REVIEW_FOCUS = ["Linting", "Optimization", "Style"]
+REVIEW_STRICTNESS = ["Informational", "Moderate", "Strict"]
+
+RTL_SYSTEM_MSG = (
+    "You are an expert hardware design engineer. Generate strictly correct HDL code only. "
+    "Ensure the code follows all syntax rules and avoids common pitfalls."
+)
+
+BUGFIX_SYSTEM_MSG = (
+    "You are a hardware debugging expert. Identify and fix HDL code issues. "
+    "Explain the root cause and how your solution addresses it."
+)
+
+TESTBENCH_SYSTEM_MSG = "You are a verification engineer. Create a professional testbench."
+
+TESTBENCH_TYPES = ["Basic Functional", "Randomized", "Corner Case", "Assertion-Based"]
+
+# Canned inputs offered by the UI; the benchmark corpus replays the same sets.
+# Example designs are templates with a {language} placeholder.
+EXAMPLE_DESIGNS = {
+    "4-bit up-down counter": "Design a 4-bit up-down counter in {language}",
+    "8-bit ALU": "Design an 8-bit ALU in {language} with add, subtract, and, or, xor operations",
+    "FIFO buffer": "Design a parameterized FIFO buffer in {language} with configurable depth",
+    "Shift register": "Create an 8-bit shift register in {language} with parallel load"
+}
+
+SUGGESTED_QUESTIONS = [
+    "Why is there an inferred latch?",
+    "Explain the functionality of this module",
+    "What does this always block do?",
+    "Are there any timing issues?",
+    "How could this code be optimized?"
+]
+
+COMMON_ERRORS = {
+    "Latch Inference": "Warning: Inferring latch for variable",
+    "Blocking/Non-blocking": "Warning: Use of blocking assignment in sequential block",
+    "Syntax Error": "Syntax error near",
+    "Undefined Signal": "Error: Undefined signal"
+}
+
+DOCUMENTATION_SYSTEM_MSG = (
+    "You are a technical documentation expert. Generate accurate, detailed documentation for HDL code."
+)
+
+REVIEW_SYSTEM_MSG = (
+    "You are an experienced code reviewer. Provide professional, actionable suggestions. "
+    "Use a structured format with clear severity levels."
+)
+
+
+# HDL Generator prompt
+# examples: (description, source) of verified modules from the design library
+# that are similar to the request, given as reference implementations
+def build_rtl_prompt(design_prompt, language="Verilog", add_comments=True, optimize=False, examples=None):
+    prompt = (
+        f"Generate strictly correct and synthesizable {language} code for: {design_prompt}\n"
+        f"Requirements:\n"
+        f"- Use efficient and synthesizable constructs\n"
+        f"- Follow industry best practices\n"
+        f"- Ensure no syntax errors\n"
+        f"- Avoid latch inference and timing issues\n"
+        f"{'- Include detailed comments' if add_comments else ''}\n"
+        f"{'- Suggest optimization opportunities at the end' if optimize else ''}\n"
+    )
+    if examples:
+        prompt += (
+            "\nVerified modules from our design library that solve similar problems. Reuse their structure, "
+            "naming and coding style where they fit, but implement exactly the specification above:\n"
+        )
+        for number, (description, source) in enumerate(examples, 1):
+            prompt += f"\nExample {number}: {description}\n```\n{source}\n```\n"
+    return prompt
+
+
+# Documentation Generator prompt
+def build_documentation_prompt(code, include_ports=True, include_signals=True, include_behavior=True):
+    return (
+        f"Generate comprehensive documentation for this HDL code:\n\n{code}\n\n"
+        "Documentation should include:\n"
+        f"{'- Module/entity description'}\n"
+        f"{'- Port list with direction, width, and purpose' if include_ports else ''}\n"
+        f"{'- Signal declarations and their roles' if include_signals else ''}\n"
+        f"{'- Functional behavior description' if include_behavior else ''}\n"
+        "- Timing characteristics if any\n"
+        "- Implementation notes\n"
+        "Format the output in Markdown with appropriate headings."
+    )
+
+
+# Code Review prompt
+# linted: descriptions of the checks a static linter has already run; the model
+# is asked to leave those to it. Independent of the code, so cached prompts for
+# unchanged modules stay valid.
+def build_review_prompt(code, focus_areas=None, severity_level="Moderate", linted=None):
+    focus_areas = DEFAULT_REVIEW_FOCUS if focus_areas is None else focus_areas
+    return (
+        f"Review this HDL code with {severity_level.lower()} strictness:\n{code}\n\n"
+        f"Focus on: {', '.join(focus_areas)}\n\n"
+        f"{_lint_note(linted)}"
+        "Provide a code review with:\n"
+        "- Categorized findings (Critical, Warning, Suggestion)\n"
+        "- Specific code locations\n"
+        "- Explanation of issues\n"
+        "- Suggested improvements\n"
+        "- Overall quality assessment"
+    )
+
+
+def _lint_note(linted):
+    if not linted:
+        return ""
+    return (
+        f"A static linter already reports {'; '.join(linted)}. "
+        "Do not repeat those; concentrate on design-level issues.\n\n"
+    )
+
+
+# What each focus area's reviewer looks for when the areas are reviewed separately
+REVIEW_ASPECT_CHECKS = {
+    "Linting": "coding errors a careful linter would flag: undeclared or unused signals, implicit nets, "
+               "blocking/non-blocking misuse, missing defaults and incomplete assignments",
+    "Optimization": "area, timing and power: redundant or duplicated logic, long combinational paths, "
+                    "missed resource sharing, unnecessary registers and wide arithmetic that could be narrower",
+    "Style": "readability and maintainability: naming, consistent formatting, comments, "
+             "parameterization and hard-coded constants",
+    "Synthesis": "constructs that do not synthesize or synthesize differently than they simulate: delays, "
+                 "initial blocks, incomplete sensitivity lists, inferred latches, internal tri-states",
+    "Testability": "reset coverage, observability and controllability of state, scan friendliness, "
+                   "and where assertions would catch bugs early",
+    "CDC": "clock domain crossings: signals crossing without synchronizers, multi-bit crossings, "
+           "reset synchronization and handshake or FIFO protocols"
+}
+
+
+# One focus area of a parallel review. The code arrives with numbered lines
+# ("12 | ...") and the answer is one pipe-separated FINDING line per issue, so
+# the findings of all areas can be merged by line and rule without another call.
+# structured: the answer format is left to the JSON instructions appended by
+# vlsi_core.structured.
+def build_aspect_review_prompt(code, aspect, severity_level="Moderate", linted=None, structured=False):
+    checks = REVIEW_ASPECT_CHECKS.get(aspect, aspect.lower())
+    request = (
+        f"Review this HDL code for {aspect} only, with {severity_level.lower()} strictness. "
+        f"Look for {checks}. Lines are numbered as `N | code`.\n\n{code}\n\n"
+        f"{_lint_note(linted)}"
+    )
+    if structured:
+        return f"{request}List every issue as a finding and give an overall assessment of this aspect as the summary."
+    return (
+        f"{request}"
+        "Report each issue on its own line, exactly in this form:\n"
+        "FINDING | <Critical, Warning or Suggestion> | <line number> | <short-rule-id> | <what is wrong> | <how to fix it>\n"
+        "Then one line starting with SUMMARY: giving an overall assessment of this aspect. "
+        "Write nothing else; if there are no issues, write only the SUMMARY line."
+    )
+
+# Bug Fixer prompt
+def build_bugfix_prompt(code, error_log=None, waveform=None):
+    # A window of the simulation dump around the failure, never the whole trace
+    waveform_note = f"Waveform around the failure (x = unknown, z = undriven):\n{waveform}\n\n" if waveform else ""
+    return (
+        f"Analyze and fix this HDL code based on error logs:\n\n"
+        f"Code:\n{code}\n\n"
+        f"Errors:\n{error_log if error_log else 'No error logs provided'}\n\n"
+        f"{waveform_note}"
+        "Provide:\n"
+        "1. Fixed code in a code block\n"
+        "2. Explanation of the issues\n"
+        "3. List of changes made\n"
+        "4. Prevention suggestions"
+    )
+
+
+# Testbench Generator prompt
+def build_testbench_prompt(code, language="Verilog", test_type="Basic Functional", clock_period=10, num_tests=50,
+                           include_coverage=False, include_waves=True):
+    # The simulation runner passes a different seed to each parallel run
+    seed_note = (
+        "Take the random seed from an integer generic named SEED" if language == "VHDL" else
+        'Read the random seed with $value$plusargs("seed=%d", seed) and use it for all randomization'
+    )
+    return (
+        f"Write a comprehensive {language} testbench for this module:\n\n{code}\n\n"
+        f"Requirements:\n"
+        f"- Test Type: {test_type}\n"
+        f"- Clock Period: {clock_period}ns\n"
+        f"- Test Cases: {num_tests}\n"
+        f"{'- Functional Coverage' if include_coverage else ''}\n"
+        f"{'- Waveform Dumping' if include_waves else ''}\n"
+        f"- Self-checking mechanisms\n"
+        f"- {seed_note}\n"
+        f"- Print one line containing PASS or FAIL for every check, then end the simulation\n"
+        f"- Detailed comments\n"
+        f"- Modern verification techniques"
+    )
+
+
+EXPLAIN_SYSTEM_MSG = (
+    "You are a hardware design expert. Analyze the provided code and answer questions technically. "
+    "Identify potential issues and explain concepts clearly."
+)
+
+
+# Code Explainer prompt
+# summary/recent come from ConversationStore.context(): earlier exchanges on the
+# same code, condensed, so follow-up questions have bounded context
+def build_explain_prompt(code, question, summary=None, recent=None):
+    return (
+        f"Analyze this HDL code:\n\n{code}\n\n"
+        f"{format_history(summary, recent)}"
+        f"Question: {question}"
+    )
+
+
+def format_history(summary=None, recent=None):
+    if not summary and not recent:
+        return ""
+    parts = ["Earlier in this conversation:"]
+    if summary:
+        parts.append(summary)
+    for role, text in recent or []:
+        parts.append(f"{'User' if role == 'user' else 'Assistant'}: {text}")
+    return "\n\n".join(parts) + "\n\n"
+
+
+# Multi-turn Code Explainer. The context (the whole file, or the outline of a
+# large one) opens the first user message and is identical for every question
+# about that file, so providers can serve it from their prompt cache; earlier
+# turns follow as ordinary chat messages, then the new question with any
+# excerpts selected for it.
+def build_explain_context(code, outline=None):
+    if outline is None:
+        return f"Here is the HDL code we are discussing:\n\n{code}"
+    return (
+        "The HDL file we are discussing is too large to include in full. Its modules and interfaces:\n\n"
+        f"{outline}\n\n"
+        "Each question comes with the parts of the file relevant to it, labelled with their line numbers."
+    )
+
+
+def build_explain_messages(context, question, system_message=EXPLAIN_SYSTEM_MSG, summary=None, recent=None,
+                           excerpts=None, cache_control=False):
+    turns = list(recent or [])
+    while turns and turns[0][0] != "user":
+        turns.pop(0)
+    final = f"Relevant excerpts:\n\n{excerpts}\n\nQuestion: {question}" if excerpts else f"Question: {question}"
+    turns.append(("user", final))
+
+    context_part = {"type": "text", "text": context}
+    if cache_control:
+        context_part["cache_control"] = {"type": "ephemeral"}
+    first = turns[0][1]
+    if summary:
+        first = f"Earlier in this conversation:\n{summary}\n\n{first}"
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": [context_part, {"type": "text", "text": first}]}
+    ]
+    messages.extend({"role": role, "content": text} for role, text in turns[1:])
+    return messages
+
+
+# Reduce prompts: merge per-chunk results from a large file into one answer
+def build_documentation_reduce_prompt(partials):
+    sections = "\n\n---\n\n".join(partials)
+    return (
+        "The following are documentation fragments for consecutive parts of one large HDL file.\n\n"
+        f"{sections}\n\n"
+        "Merge them into a single coherent Markdown document: one description per module, "
+        "a single port table per module, no repeated headings, and keep every technical detail."
+    )
+
+
+def build_review_reduce_prompt(partials, severity_level="Moderate"):
+    sections = "\n\n---\n\n".join(partials)
+    return (
+        f"The following are {severity_level.lower()}-strictness review reports for consecutive parts "
+        f"of one large HDL file.\n\n{sections}\n\n"
+        "Merge them into a single review: group findings by category (Critical, Warning, Suggestion), "
+        "remove duplicates, keep the original line numbers, and end with one overall quality assessment."
+    )
+
+
+def build_explain_reduce_prompt(partials, question, summary=None, recent=None):
+    sections = "\n\n---\n\n".join(partials)
+    return (
+        f"{format_history(summary, recent)}"
+        f"Question: {question}\n\n"
+        "The following are answers based on consecutive parts of one large HDL file.\n\n"
+        f"{sections}\n\n"
+        "Combine them into one complete answer to the question. Drop parts that found nothing relevant."
+    )
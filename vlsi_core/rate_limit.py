@@ -0,0 +1,278 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+
+# Thread-safe token bucket usable from both threads and asyncio tasks.
+# rate is tokens per second, capacity is the allowed burst. A 429 response
+# can pause the whole bucket via penalize(), so every caller backs off together.
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1024)
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    # Take tokens if available; otherwise return how long to wait before retrying
+    def try_acquire(self, tokens=1.0):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    def _record_wait(self, waited, granted):
+        with self._lock:
+            if not granted:
+                self.timeouts += 1
+                return
+            self.acquired += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._waits.append(waited)
+
+    def acquire(self, tokens=1.0, timeout=None):
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                self._record_wait(time.monotonic() - start, True)
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self._record_wait(time.monotonic() - start, False)
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1.0, timeout=None):
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                self._record_wait(time.monotonic() - start, True)
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self._record_wait(time.monotonic() - start, False)
+                return False
+            await asyncio.sleep(wait)
+
+    # Stop handing out tokens for `seconds` and drain the burst allowance
+    def penalize(self, seconds):
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            paused_for = max(0.0, self._paused_until - time.monotonic())
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "paused_for": round(paused_for, 3),
+            "queue_wait_avg": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "queue_wait_p50": round(waits[len(waits) // 2], 4) if waits else 0.0,
+            "queue_wait_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 4) if waits else 0.0,
+            "queue_wait_max": round(self.max_wait, 4)
+        }
+
+
+# Parse X-RateLimit-Reset, which may be an epoch in ms, an epoch in s or a delta in s
+def _reset_delay(value, now=None):
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    if reset > 1e12:
+        return max(0.0, reset / 1000.0 - now)
+    if reset > 1e9:
+        return max(0.0, reset - now)
+    return max(0.0, reset)
+
+
+# Token bucket whose rate follows the provider: halves on every 429, creeps back
+# up on success (AIMD) and pauses entirely when the rate-limit headers say the
+# quota is exhausted.
+class AdaptiveRateLimiter(TokenBucket):
+    def __init__(self, max_rate, capacity=None, min_rate=None, increase_step=None, decrease_factor=0.5):
+        super().__init__(max_rate, capacity)
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate if min_rate is not None else max_rate / 16.0)
+        self.increase_step = float(increase_step if increase_step is not None else max_rate / 20.0)
+        self.decrease_factor = decrease_factor
+        self.throttled = 0
+        self.header_limit = None
+        self.header_remaining = None
+
+    def set_max_rate(self, max_rate):
+        with self._lock:
+            self.max_rate = float(max_rate)
+            self.min_rate = min(self.min_rate, self.max_rate)
+            self.increase_step = self.max_rate / 20.0
+            self.rate = min(self.rate, self.max_rate) if self.rate else self.max_rate
+
+    def record_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def record_throttle(self, retry_after=None, fallback=1.0):
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.penalize(retry_after if retry_after is not None else fallback)
+
+    def update_from_headers(self, headers):
+        if headers is None:
+            return
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        try:
+            self.header_limit = int(float(limit)) if limit is not None else self.header_limit
+            self.header_remaining = int(float(remaining)) if remaining is not None else self.header_remaining
+        except ValueError:
+            return
+        if remaining is not None and self.header_remaining <= 0:
+            delay = _reset_delay(headers.get("X-RateLimit-Reset"))
+            if delay:
+                self.penalize(min(delay, 300.0))
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({
+            "max_rate_per_minute": round(self.max_rate * 60, 2),
+            "throttled": self.throttled,
+            "header_limit": self.header_limit,
+            "header_remaining": self.header_remaining
+        })
+        return stats
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+# Classic three-state breaker: after `failure_threshold` consecutive failures the
+# circuit opens and calls fail fast for `reset_timeout` seconds, then a single
+# trial call is let through (half-open) to decide whether to close again.
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at >= self.reset_timeout:
+                    self.state = self.HALF_OPEN
+                    self._trial_in_flight = False
+                else:
+                    self.rejected += 1
+                    return False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(
+                f"Provider unavailable; retrying in {self.retry_in():.0f}s"
+            )
+
+    def retry_in(self):
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    # The call ended without saying anything about the provider's health (a 429,
+    # or no call made at all): a half-open trial is released for the next caller
+    def record_neutral(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1) if self.state == self.OPEN else 0.0
+        }
+
+
+_limiter = None
+_breaker = None
+_singleton_lock = threading.Lock()
+
+
+# Process-wide limiter shared by every Streamlit session and batch worker
+def get_limiter():
+    global _limiter
+    with _singleton_lock:
+        if _limiter is None:
+            rpm = float(os.environ.get("VLSI_RATE_LIMIT_RPM", "20"))
+            burst = float(os.environ.get("VLSI_RATE_LIMIT_BURST", "4"))
+            _limiter = AdaptiveRateLimiter(rpm / 60.0, capacity=burst)
+        return _limiter
+
+
+def get_breaker():
+    global _breaker
+    with _singleton_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                failure_threshold=int(os.environ.get("VLSI_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.environ.get("VLSI_BREAKER_RESET", "30"))
+            )
+        return _breaker
@@ -0,0 +1,182 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from vlsi_core.openrouter import DEFAULT_MODEL, OpenRouterError, build_payload, complete
+from vlsi_core.parsing import extract_code_block
+from vlsi_core.rate_limit import CircuitOpenError
+from vlsi_core.validation import get_validation_service
+
+LANGUAGE_NAMES = {"v": "Verilog", "sv": "SystemVerilog", "vhd": "VHDL"}
+
+REPAIR_SYSTEM_MSG = (
+    "You are an expert hardware design engineer. Fix HDL compilation errors. "
+    "Return the complete corrected code in a single code block."
+)
+
+
+def build_repair_prompt(code, errors, language_ext, design_prompt=None):
+    language = LANGUAGE_NAMES.get(language_ext, "HDL")
+    spec = f"Original specification: {design_prompt}\n\n" if design_prompt else ""
+    return (
+        f"The following {language} code fails compilation.\n\n"
+        f"{spec}"
+        f"Code:\n```\n{code}\n```\n\n"
+        f"Compiler output:\n```\n{errors.strip()[:4000]}\n```\n\n"
+        "Fix every reported error without changing the intended behavior. "
+        "Return the full corrected module in one code block."
+    )
+
+
+# Spread candidates over temperatures so parallel samples actually differ
+def candidate_temperature(index):
+    return min(1.0, 0.2 + 0.3 * index)
+
+
+class RepairRound:
+    def __init__(self, number, kind):
+        self.number = number
+        self.kind = kind
+        self.requested = 0
+        self.completed = 0
+        self.passed = False
+        self.seconds = 0.0
+        self.errors = []
+
+    def summary(self):
+        return {
+            "round": self.number,
+            "kind": self.kind,
+            "requested": self.requested,
+            "completed": self.completed,
+            "passed": self.passed,
+            "seconds": round(self.seconds, 2),
+            "errors": self.errors
+        }
+
+
+class RepairResult:
+    def __init__(self):
+        self.code = None
+        self.reply = None
+        self.valid = False
+        self.validated = True
+        self.message = ""
+        self.rounds = []
+        self.seconds = 0.0
+        self.timed_out = False
+
+    @property
+    def attempts(self):
+        return sum(r.requested for r in self.rounds)
+
+    def summary(self):
+        return {
+            "valid": self.valid,
+            "validated": self.validated,
+            "message": self.message,
+            "attempts": self.attempts,
+            "seconds": round(self.seconds, 2),
+            "timed_out": self.timed_out,
+            "rounds": [r.summary() for r in self.rounds]
+        }
+
+
+# Run one round: K completions in parallel, each validated as soon as it arrives.
+# Returns (passing (code, reply) or None, failing [(code, reply, errors)]).
+def _run_round(api_key, payloads, language_ext, round_info, deadline, pool, validator):
+    round_start = time.monotonic()
+    pending = {pool.submit(complete, api_key, payload, max_retries=2): None for payload in payloads}
+    round_info.requested = len(payloads)
+    failures = []
+    validations = {}
+    try:
+        while pending or validations:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, failures
+            done, _ = wait(list(pending) + list(validations), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in pending:
+                    pending.pop(future)
+                    try:
+                        reply = future.result()
+                    except (OpenRouterError, CircuitOpenError) as e:
+                        round_info.errors.append(str(e))
+                        continue
+                    # An empty reply is a failed candidate, not something to validate
+                    if not reply or not reply.strip():
+                        round_info.errors.append("Empty response from model")
+                        continue
+                    round_info.completed += 1
+                    code = extract_code_block(reply) or reply.strip()
+                    validations[validator.submit(code, language_ext)] = (code, reply)
+                else:
+                    code, reply = validations.pop(future)
+                    valid, message = future.result()
+                    if valid:
+                        round_info.passed = True
+                        return (code, reply), failures
+                    round_info.errors.append(message.strip().splitlines()[0] if message.strip() else "invalid")
+                    failures.append((code, reply, message))
+        return None, failures
+    finally:
+        round_info.seconds = time.monotonic() - round_start
+
+
+# Generate K candidates, keep the first that compiles, otherwise feed compiler
+# output back for up to max_rounds repair rounds, all within budget_seconds.
+# on_round(RepairRound) is called from the caller's thread after every round.
+def generate_and_repair(api_key, prompt, system_message, language_ext, candidates=2, max_rounds=2,
+                        budget_seconds=120.0, model=DEFAULT_MODEL, design_prompt=None, on_round=None):
+    result = RepairResult()
+    start = time.monotonic()
+    deadline = start + budget_seconds
+    validator = get_validation_service()
+    if not validator.available(language_ext):
+        result.validated = False
+
+    pool = ThreadPoolExecutor(max_workers=max(1, candidates), thread_name_prefix="hdl-repair")
+    try:
+        payloads = [build_payload(prompt, system_message, model, temperature=candidate_temperature(i))
+                    for i in range(candidates)]
+        best_failure = None
+        for number in range(max_rounds + 1):
+            round_info = RepairRound(number, "generate" if number == 0 else "repair")
+            result.rounds.append(round_info)
+            passing, failures = _run_round(api_key, payloads, language_ext, round_info, deadline, pool, validator)
+            if on_round is not None:
+                on_round(round_info)
+            if passing is not None:
+                result.code, result.reply = passing
+                result.valid = True
+                result.message = "Syntax is valid"
+                break
+            if failures and not result.validated:
+                # Nothing can judge the candidates, so repairing would be guesswork
+                result.code, result.reply, result.message = failures[0]
+                break
+            if failures:
+                # Repair the candidate with the shortest compiler output (usually the closest to valid)
+                best_failure = min(failures, key=lambda f: len(f[2]))
+            if time.monotonic() >= deadline:
+                result.timed_out = True
+                break
+            if best_failure is None:
+                # Nothing came back to repair; re-sending the same prompts is not a repair round
+                break
+            code, _, errors = best_failure
+            repair_prompt = build_repair_prompt(code, errors, language_ext, design_prompt)
+            payloads = [build_payload(repair_prompt, REPAIR_SYSTEM_MSG, model, temperature=candidate_temperature(i))
+                        for i in range(candidates)]
+
+        if result.code is None and best_failure is not None:
+            result.code, result.reply, result.message = best_failure
+        elif result.code is None and result.timed_out:
+            result.message = "No candidate was produced within the budget"
+        elif result.code is None:
+            reason = result.rounds[0].errors[0] if result.rounds[0].errors else "no reply"
+            result.message = f"Generation failed: {reason}"
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        result.seconds = time.monotonic() - start
+    return result
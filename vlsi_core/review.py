@@ -0,0 +1,243 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from vlsi_core.chunking import CHUNK_THRESHOLD, chunk_hdl, chunk_preamble, estimate_tokens
+from vlsi_core.lint import SEVERITIES
+from vlsi_core.metrics import REVIEW_ASPECT_SECONDS, span
+from vlsi_core.openrouter import DEFAULT_MODEL, build_payload, complete
+from vlsi_core.prompts import REVIEW_SYSTEM_MSG, build_aspect_review_prompt
+from vlsi_core.structured import structured_complete
+
+REVIEW_CONCURRENCY = int(os.environ.get("VLSI_REVIEW_CONCURRENCY", "6"))
+# Two findings on the same line are one issue when their messages share this
+# fraction of their words
+SIMILARITY = 0.5
+
+_FINDING_RE = re.compile(r"^[\s>*`\-]*(?:\d+[.)]\s*)?FINDING\s*\|", re.IGNORECASE)
+_SUMMARY_RE = re.compile(r"^[\s>*`\-#]*SUMMARY\s*:\**\s*", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\d+")
+_RULE_RE = re.compile(r"[^a-z0-9]+")
+_WORD_RE = re.compile(r"[a-z0-9_]{3,}")
+
+
+# "  12 | code" for every line, so the model can cite exact line numbers
+def number_lines(text, start=1):
+    lines = text.split("\n")
+    width = len(str(start + len(lines) - 1))
+    return "\n".join(f"{number:>{width}} | {line}" for number, line in enumerate(lines, start))
+
+
+# A chunk with its lines numbered as in the whole file; the module-header
+# context stays unnumbered since it comes from elsewhere in the file
+def number_chunk(chunk):
+    numbered = number_lines(chunk.text, chunk.start_line)
+    if not chunk.context:
+        return numbered
+    return f"{chunk.context}\n    // ... (earlier part of this module omitted) ...\n{numbered}"
+
+
+def _severity(text):
+    text = text.strip().lower()
+    if text.startswith("crit") or text.startswith("err"):
+        return "critical"
+    if text.startswith("warn"):
+        return "warning"
+    return "suggestion"
+
+
+def _rule(text, aspect):
+    return _RULE_RE.sub("-", text.lower()).strip("-") or _RULE_RE.sub("-", aspect.lower()).strip("-")
+
+
+# FINDING lines of one aspect reply as dicts; anything else the model wrote is ignored
+def parse_findings(reply, aspect):
+    findings = []
+    for raw in reply.splitlines():
+        if not _FINDING_RE.match(raw):
+            continue
+        fields = [field.strip(" `*") for field in raw.strip().rstrip("|").split("|")[1:]]
+        fields += [""] * (5 - len(fields))
+        line = _NUMBER_RE.search(fields[1])
+        message = fields[3]
+        if not message:
+            continue
+        findings.append({
+            "severity": _severity(fields[0]),
+            "line": int(line.group()) if line else None,
+            "rule": _rule(fields[2], aspect),
+            "message": message,
+            "fix": " | ".join(f for f in fields[4:] if f),
+            "aspects": [aspect]
+        })
+    return findings
+
+
+def parse_summary(reply):
+    for raw in reply.splitlines():
+        match = _SUMMARY_RE.match(raw)
+        if match:
+            return raw[match.end():].strip()
+    return ""
+
+
+# Findings of a structured ("review" schema) reply, already validated
+def structured_findings(data, aspect):
+    return [{"severity": f["severity"], "line": f["line"], "rule": _rule(f["rule"], aspect), "message": f["message"],
+             "fix": f.get("fix", ""), "aspects": [aspect]} for f in data["findings"]]
+
+
+# The static linter's findings in the same shape, so they take part in the dedupe
+def lint_findings(report):
+    return [{"severity": f["severity"], "line": f["line"], "rule": f["rule"], "message": f["message"], "fix": "",
+             "aspects": ["Lint"]} for f in (report or {}).get("findings", [])]
+
+
+def _words(text):
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def _same_issue(a, b):
+    if a["line"] != b["line"]:
+        return False
+    if a["rule"] in b["rule"] or b["rule"] in a["rule"]:
+        return True
+    words_a, words_b = _words(a["message"]), _words(b["message"])
+    return bool(words_a and words_b) and len(words_a & words_b) / len(words_a | words_b) >= SIMILARITY
+
+
+# One list from the findings of every aspect (and the linter): the same issue
+# reported by several aspects is kept once, at its highest severity, with the
+# aspects that found it. Ordered by severity, then line.
+def merge_findings(findings):
+    rank = {severity: i for i, severity in enumerate(SEVERITIES)}
+    merged, by_line = [], {}
+    for finding in sorted(findings, key=lambda f: rank[f["severity"]]):
+        candidates = by_line.setdefault(finding["line"], [])
+        existing = next((f for f in candidates if _same_issue(f, finding)), None)
+        if existing is None:
+            finding = dict(finding, aspects=list(finding["aspects"]))
+            candidates.append(finding)
+            merged.append(finding)
+            continue
+        existing["aspects"] += [a for a in finding["aspects"] if a not in existing["aspects"]]
+        if not existing["fix"]:
+            existing["fix"] = finding["fix"]
+    merged.sort(key=lambda f: (rank[f["severity"]], f["line"] is None, f["line"] or 0, f["rule"]))
+    return merged
+
+
+# The result of one focus area, over every part of the file. parts holds a
+# (reply, findings, summary) tuple per part, None for a part that failed.
+class AspectReview:
+    def __init__(self, aspect, order, parts, seconds, exception=None):
+        parts = [part for part in parts if part is not None]
+        self.aspect = aspect
+        self.order = order
+        self.seconds = seconds
+        self.exception = exception
+        self.reply = "\n\n".join(reply for reply, _, _ in parts if reply)
+        self.findings = [finding for _, findings, _ in parts for finding in findings]
+        self.summary = " ".join(summary for _, _, summary in parts if summary)
+
+    @property
+    def error(self):
+        return str(self.exception) if self.exception is not None else None
+
+    def as_dict(self):
+        return {"aspect": self.aspect, "seconds": round(self.seconds, 3), "findings": self.findings,
+                "summary": self.summary, "error": self.error}
+
+
+def _ask(api_key, prompt, model, route, aspect, structured):
+    with span("review.aspect", aspect=aspect):
+        if structured:
+            result = structured_complete(api_key, "review", prompt, REVIEW_SYSTEM_MSG, model, route=route)
+            return result["reply"], structured_findings(result["data"], aspect), result["data"]["summary"]
+        reply = complete(api_key, build_payload(prompt, REVIEW_SYSTEM_MSG, model), route=route)
+        return reply, parse_findings(reply, aspect), parse_summary(reply)
+
+
+# One prompt per focus area (per chunk of a large file), all in flight at once.
+# Yields an AspectReview as each area finishes, so callers can show it while the
+# rest are still running; a failed area is yielded with its exception set.
+# structured asks for JSON findings (vlsi_core.structured) instead of FINDING lines.
+def review_aspects(api_key, code, focus_areas, severity_level="Moderate", linted=None, model=DEFAULT_MODEL,
+                   route=None, language=None, concurrency=REVIEW_CONCURRENCY, structured=False):
+    focus_areas = list(dict.fromkeys(focus_areas))
+    if estimate_tokens(code) <= CHUNK_THRESHOLD:
+        parts = [number_lines(code)]
+    else:
+        parts = [chunk_preamble(chunk) + number_chunk(chunk) for chunk in chunk_hdl(code, language)]
+    answers = {aspect: [None] * len(parts) for aspect in focus_areas}
+    pending = {aspect: len(parts) for aspect in focus_areas}
+    errors = {}
+    jobs = len(focus_areas) * len(parts)
+    if not jobs:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, jobs)))
+    start = time.perf_counter()
+    futures = {}
+    try:
+        for aspect in focus_areas:
+            for index, part in enumerate(parts):
+                prompt = build_aspect_review_prompt(part, aspect, severity_level, linted, structured)
+                futures[pool.submit(_ask, api_key, prompt, model, route, aspect, structured)] = (aspect, index)
+        for future in as_completed(futures):
+            aspect, index = futures[future]
+            try:
+                answers[aspect][index] = future.result()
+            except Exception as e:
+                errors.setdefault(aspect, e)
+            pending[aspect] -= 1
+            if pending[aspect]:
+                continue
+            seconds = time.perf_counter() - start
+            REVIEW_ASPECT_SECONDS.observe(seconds, aspect=aspect)
+            yield AspectReview(aspect, focus_areas.index(aspect), answers[aspect], seconds, errors.get(aspect))
+    finally:
+        # A consumer that stops early cancels the requests not yet sent
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Merged result of a parallel review: the structured findings, per-aspect
+# latency and notes, and a Markdown report. Raises the first error when every
+# aspect failed, like a single-prompt review would.
+def combine_review(aspects, lint_report=None):
+    aspects = sorted(aspects, key=lambda a: a.order)
+    if aspects and all(a.exception is not None and not a.reply for a in aspects):
+        raise aspects[0].exception
+    findings = merge_findings(lint_findings(lint_report) + [f for a in aspects for f in a.findings])
+    return {
+        "reply": format_review(findings, aspects),
+        "findings": findings,
+        "aspects": [a.as_dict() for a in aspects],
+        "seconds": round(max((a.seconds for a in aspects), default=0.0), 3)
+    }
+
+
+def _cell(text):
+    return str(text).replace("|", "\\|").replace("\n", " ")
+
+
+def format_review(findings, aspects):
+    lines = ["## Findings", ""]
+    if findings:
+        lines += ["| Severity | Line | Rule | Issue | Suggested fix | Found by |", "|---|---|---|---|---|---|"]
+        lines += [
+            f"| {f['severity'].capitalize()} | {f['line'] if f['line'] is not None else '-'} | {_cell(f['rule'])} "
+            f"| {_cell(f['message'])} | {_cell(f['fix'])} | {', '.join(f['aspects'])} |"
+            for f in findings
+        ]
+    else:
+        lines.append("No issues found.")
+    lines += ["", "## Assessment by focus area", ""]
+    for aspect in aspects:
+        if aspect.exception is not None:
+            lines.append(f"- **{aspect.aspect}**: failed ({aspect.error})")
+        else:
+            lines.append(f"- **{aspect.aspect}** ({len(aspect.findings)} findings, {aspect.seconds:.1f}s): "
+                         f"{aspect.summary or 'No summary given.'}")
+    return "\n".join(lines)
@@ -0,0 +1,250 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from vlsi_core.openrouter import DEFAULT_MODEL, OpenRouterError, request_completion
+from vlsi_core.rate_limit import CircuitBreaker, CircuitOpenError
+
+# Ordered model list per tool: the first healthy model is tried first, the rest
+# are fallbacks. Override with e.g. VLSI_MODELS_EXPLAIN="model/a,model/b".
+SMALL_MODEL = "mistralai/mistral-small-3.2-24b-instruct:free"
+CODER_MODEL = "qwen/qwen-2.5-coder-32b-instruct:free"
+LARGE_MODEL = "deepseek/deepseek-chat-v3-0324:free"
+
+DEFAULT_ROUTES = {
+    "generate": [DEFAULT_MODEL, CODER_MODEL, LARGE_MODEL],
+    "document": [DEFAULT_MODEL, LARGE_MODEL, SMALL_MODEL],
+    "explain": [SMALL_MODEL, DEFAULT_MODEL, LARGE_MODEL],
+    "fix": [DEFAULT_MODEL, CODER_MODEL, LARGE_MODEL],
+    "review": [DEFAULT_MODEL, LARGE_MODEL, CODER_MODEL],
+    "testbench": [LARGE_MODEL, DEFAULT_MODEL, CODER_MODEL],
+}
+
+ROUTER_SLOW_SECONDS = float(os.environ.get("VLSI_ROUTER_SLOW_SECONDS", "30"))
+ROUTER_HEDGE_AFTER = float(os.environ.get("VLSI_ROUTER_HEDGE_AFTER", "0"))
+ROUTER_MAX_ATTEMPTS = int(os.environ.get("VLSI_ROUTER_MAX_ATTEMPTS", "5"))
+ROUTER_MAX_WAIT = float(os.environ.get("VLSI_ROUTER_MAX_WAIT", "30"))
+
+# Statuses that say something about the model rather than the request
+FAILOVER_STATUSES = (404, 408, 429)
+
+
+def routes_from_env(defaults=DEFAULT_ROUTES):
+    routes = {}
+    for tool, models in defaults.items():
+        override = os.environ.get(f"VLSI_MODELS_{tool.upper()}", "")
+        routes[tool] = [m.strip() for m in override.split(",") if m.strip()] or list(models)
+    return routes
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# Rolling health of one model: latencies of recent successes, outcome history
+# for the error rate, a cooldown after throttling, and its own circuit breaker so
+# one failing model does not open the circuit for the others
+class ModelStats:
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.cooldown_until = 0.0
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.environ.get("VLSI_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.environ.get("VLSI_BREAKER_RESET", "30"))
+        )
+        self.requests = 0
+        self.failures = 0
+        self.throttles = 0
+        self.hedges = 0
+
+    def record_success(self, seconds):
+        self.requests += 1
+        self.latencies.append(seconds)
+        self.outcomes.append(True)
+
+    def record_failure(self, error, now):
+        self.requests += 1
+        self.failures += 1
+        self.outcomes.append(False)
+        if error.status_code == 429:
+            self.throttles += 1
+            self.cooldown_until = now + (error.retry_after if error.retry_after is not None else 30.0)
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def unavailable_for(self, now):
+        open_for = self.breaker.retry_in() if self.breaker.state == CircuitBreaker.OPEN else 0.0
+        return max(self.cooldown_until - now, open_for, 0.0)
+
+    def summary(self, now):
+        p50, p95 = _percentile(self.latencies, 0.5), _percentile(self.latencies, 0.95)
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "throttles": self.throttles,
+            "hedges": self.hedges,
+            "error_rate": round(self.error_rate, 3),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "breaker": self.breaker.state,
+            "cooling_down_for": round(self.unavailable_for(now), 1)
+        }
+
+
+# Picks a model per tool from its ordered list, skipping models that are cooling
+# down and demoting ones that are slow (p95) or failing, then fails over down the
+# list. With hedge_after > 0 a backup request to the next model is fired when the
+# first has not answered in time; the first success wins. When every model is
+# cooling down the router sleeps until the first is free again (up to max_wait).
+class ModelRouter:
+    def __init__(self, routes=None, slow_seconds=ROUTER_SLOW_SECONDS, hedge_after=ROUTER_HEDGE_AFTER,
+                 max_attempts=ROUTER_MAX_ATTEMPTS, transport=None, max_wait=ROUTER_MAX_WAIT):
+        self.routes = routes if routes is not None else routes_from_env()
+        self.slow_seconds = slow_seconds
+        self.hedge_after = hedge_after
+        self.max_attempts = max_attempts
+        self.max_wait = max_wait
+        self.transport = transport or request_completion
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="model-hedge")
+
+    def primary_model(self, tool):
+        models = self.routes.get(tool)
+        return models[0] if models else DEFAULT_MODEL
+
+    # Healthy models in configured order, then slow/failing ones, then cooling down
+    def candidates(self, tool, preferred=None):
+        models = list(self.routes.get(tool) or [DEFAULT_MODEL])
+        if preferred and preferred in models:
+            models.remove(preferred)
+            models.insert(0, preferred)
+        elif preferred:
+            models.insert(0, preferred)
+        now = time.monotonic()
+        healthy, degraded, cooling = [], [], []
+        with self._lock:
+            for model in models:
+                stats = self._stats.get(model)
+                if stats is None:
+                    healthy.append(model)
+                elif stats.unavailable_for(now) > 0:
+                    cooling.append(model)
+                elif (len(stats.latencies) >= 5 and _percentile(stats.latencies, 0.95) > self.slow_seconds) \
+                        or (len(stats.outcomes) >= 5 and stats.error_rate > 0.5):
+                    degraded.append(model)
+                else:
+                    healthy.append(model)
+            cooling.sort(key=lambda m: self._stats[m].unavailable_for(now))
+        return healthy + degraded + cooling
+
+    # Caller must hold self._lock
+    def _model_stats(self, model):
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats[model] = ModelStats()
+        return stats
+
+    # One request to one model; the router, not request_completion, decides what to
+    # retry. A 429 cools down only this model, so the shared rate limiter is not
+    # throttled and the other models stay available for failover.
+    def _attempt(self, api_key, payload, model, **kwargs):
+        with self._lock:
+            breaker = self._model_stats(model).breaker
+        start = time.monotonic()
+        try:
+            result = self.transport(api_key, dict(payload, model=model), max_retries=1, breaker=breaker,
+                                    share_throttle=False, **kwargs)
+        except OpenRouterError as e:
+            with self._lock:
+                self._model_stats(model).record_failure(e, time.monotonic())
+            raise
+        with self._lock:
+            self._model_stats(model).record_success(time.monotonic() - start)
+        return result
+
+    @staticmethod
+    def _should_failover(error):
+        return error.retryable or error.status_code in FAILOVER_STATUSES
+
+    # Index of the first model from start on (wrapping around) that is not cooling
+    # down, with 0.0; when all are, the one free soonest and how long that takes
+    def _pick(self, models, start):
+        now = time.monotonic()
+        order = [(start + i) % len(models) for i in range(len(models))]
+        with self._lock:
+            waits = [self._stats[m].unavailable_for(now) if m in self._stats else 0.0 for m in models]
+        for index in order:
+            if waits[index] <= 0:
+                return index, 0.0
+        index = min(order, key=lambda i: waits[i])
+        return index, waits[index]
+
+    # Completion text (or the open stream when stream=True, which is never hedged)
+    def complete(self, api_key, payload, tool, stream=False, max_retries=None, **kwargs):
+        models = self.candidates(tool, payload.get("model"))
+        last_error = None
+        index = -1
+        for _ in range(max_retries or self.max_attempts):
+            index, delay = self._pick(models, index + 1)
+            if delay > self.max_wait:
+                break
+            if delay > 0:
+                time.sleep(delay)
+            model = models[index]
+            backup = models[(index + 1) % len(models)] if len(models) > 1 else None
+            try:
+                if self.hedge_after > 0 and backup and not stream:
+                    return self._hedged(api_key, payload, model, backup, **kwargs)
+                return self._attempt(api_key, payload, model, stream=stream, **kwargs)
+            except CircuitOpenError as e:
+                last_error = e
+            except OpenRouterError as e:
+                last_error = e
+                if not self._should_failover(e):
+                    raise
+        raise last_error or OpenRouterError("All models failed")
+
+    def _hedged(self, api_key, payload, model, backup, **kwargs):
+        primary = self._pool.submit(self._attempt, api_key, payload, model, **kwargs)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+        with self._lock:
+            self._model_stats(backup).hedges += 1
+        pending = {primary, self._pool.submit(self._attempt, api_key, payload, backup, **kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except (OpenRouterError, CircuitOpenError) as e:
+                    error = e
+        raise error
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            models = {model: stats.summary(now) for model, stats in self._stats.items()}
+        return {"routes": self.routes, "models": models, "hedge_after": self.hedge_after}
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter()
+        return _router
@@ -0,0 +1,349 @@
+# The six tools as plain functions: prompt building, the model call, response
+# parsing and validation, with no Streamlit dependency. The HTTP API, the CLI and
+# the Streamlit app are all clients of this module.
+from concurrent.futures import ThreadPoolExecutor
+
+from vlsi_core.chunking import (
+    CHUNK_CONCURRENCY, CHUNK_THRESHOLD, chunk_hdl, chunk_preamble, estimate_tokens, label_partials, map_chunks,
+    reduce_partials
+)
+from vlsi_core.lint import lint_descriptions, lint_report
+from vlsi_core.openrouter import build_chat_payload, build_payload, complete, supports_cache_control
+from vlsi_core.parsing import extract_code_block, split_code_and_explanation
+from vlsi_core.prompts import (
+    BUGFIX_SYSTEM_MSG, DEFAULT_REVIEW_FOCUS, DOCUMENTATION_SYSTEM_MSG, EXPLAIN_SYSTEM_MSG, REVIEW_SYSTEM_MSG,
+    RTL_SYSTEM_MSG, TESTBENCH_SYSTEM_MSG, build_bugfix_prompt, build_documentation_prompt, build_documentation_reduce_prompt,
+    build_explain_context, build_explain_messages, build_explain_prompt, build_explain_reduce_prompt,
+    build_review_prompt, build_review_reduce_prompt, build_rtl_prompt, build_testbench_prompt
+)
+from vlsi_core.review import combine_review, review_aspects
+from vlsi_core.routing import get_router
+from vlsi_core.simulation import SimulationError, get_simulation_runner, summarize
+from vlsi_core.snippets import outline, select_snippets
+from vlsi_core.structured import StructuredError, format_documentation, merge_documents, structured_complete
+from vlsi_core.triage import condense_log
+from vlsi_core.validation import LANGUAGE_EXTENSIONS, get_validation_service
+
+
+class ServiceError(ValueError):
+    pass
+
+
+def validate_code(code, language="Verilog"):
+    valid, message = get_validation_service().validate(code, LANGUAGE_EXTENSIONS.get(language, language))
+    return {"valid": valid, "message": message}
+
+
+# Local static checks; no API key or model involved
+def lint_code(code, language=None):
+    _check(code)
+    return lint_report(code, language)
+
+
+def _check(code):
+    if not code or not code.strip():
+        raise ServiceError("No HDL code provided")
+
+
+# Without an explicit model the tool's route decides (with failover between its
+# models); an explicit model is used as-is
+def _model_and_route(tool, model):
+    if model:
+        return model, None
+    return get_router().primary_model(tool), tool
+
+
+# Small inputs go out as a single prompt; large ones are map-reduced over chunks
+def _analyze(api_key, tool, code, build_prompt, build_reduce_prompt, system_message, model, language=None):
+    model, route = _model_and_route(tool, model)
+    if estimate_tokens(code) <= CHUNK_THRESHOLD:
+        return complete(api_key, build_payload(build_prompt(code), system_message, model), route=route)
+    chunks = chunk_hdl(code, language)
+    partials = map_chunks(api_key, chunks, lambda chunk: build_prompt(chunk_preamble(chunk) + chunk.prompt_text()),
+                          system_message, model=model, route=route)
+    if len(partials) == 1:
+        return partials[0]
+    partials = reduce_partials(api_key, label_partials(chunks, partials), build_reduce_prompt, system_message, model,
+                               route=route)
+    return complete(api_key, build_payload(build_reduce_prompt(partials), system_message, model, max_tokens=4096),
+                    route=route)
+
+
+# Structured mode: JSON matching vlsi_core.structured.SCHEMAS[tool], with
+# invalid fields re-asked individually. The parsed object is returned as "data".
+def structured_answer(api_key, tool, prompt, system_message, model=None):
+    model, route = _model_and_route(tool, model)
+    try:
+        answer = structured_complete(api_key, tool, prompt, system_message, model, route=route)
+    except StructuredError as e:
+        raise ServiceError(str(e))
+    return {"reply": answer["reply"], "data": answer["data"],
+            "structured": {"repaired": answer["repaired"], "dropped": answer["dropped"]}}
+
+
+# The design library needs numpy, so it is imported on first use; without it
+# generation simply runs without retrieval
+def design_library():
+    try:
+        from vlsi_core.library import get_design_library
+    except ImportError:
+        return None
+    return get_design_library()
+
+
+def _library():
+    store = design_library()
+    if store is None:
+        raise ServiceError("The design library needs numpy (pip install numpy)")
+    return store
+
+
+# Index every module in text as a known-good design (verified=False keeps it out
+# of the no-model-call reuse, but it can still serve as an example)
+def add_to_library(text, path="", language=None, description=None, verified=True):
+    _check(text)
+    entries = _library().add_source(text, path, language, description, verified)
+    if not entries:
+        raise ServiceError(f"No module or entity found in {path or 'the code'}")
+    return {"added": [entry.summary() for entry in entries]}
+
+
+def remove_from_library(ids=(), path=None, name=None):
+    return {"removed": _library().remove(ids, path, name)}
+
+
+def search_library(query, language=None, k=5):
+    if not query or not query.strip():
+        raise ServiceError("No search query provided")
+    store = _library()
+    return {"results": [dict(entry.summary(), score=round(score, 3)) for score, entry in store.search(query, language, k)],
+            "stats": store.stats()}
+
+
+def library_entries():
+    store = _library()
+    return {"entries": [entry.summary() for entry in store.entries()], "stats": store.stats()}
+
+
+# library: look the request up in the local design library first. A verified
+# module described in exactly the same words is returned as is, with no model call; otherwise
+# the most similar modules go into the prompt as examples.
+def generate_rtl(api_key, design_prompt, language="Verilog", add_comments=True, optimize=False, validate=True,
+                 model=None, structured=False, library=True):
+    if not design_prompt or not design_prompt.strip():
+        raise ServiceError("No design specification provided")
+    store = design_library() if library else None
+    examples = []
+    if store is not None:
+        entry = store.match(design_prompt, language)
+        if entry is not None:
+            code = store.source(entry.id)
+            result = {"reply": code, "code": code, "library": {"match": entry.summary(), "examples": []}}
+            if validate:
+                result["validation"] = validate_code(code, language)
+            return result
+        examples = store.examples(design_prompt, language)
+    prompt = build_rtl_prompt(design_prompt, language, add_comments, optimize,
+                              [(entry.description, source) for entry, source in examples])
+    if structured:
+        result = structured_answer(api_key, "generate", prompt, RTL_SYSTEM_MSG, model)
+        result.update(code=result["data"]["code"], explanation=result["data"]["explanation"])
+    else:
+        model, route = _model_and_route("generate", model)
+        reply = complete(api_key, build_payload(prompt, RTL_SYSTEM_MSG, model), route=route)
+        result = {"reply": reply, "code": extract_code_block(reply) or reply}
+    if store is not None:
+        result["library"] = {"match": None, "examples": [entry.summary() for entry, _ in examples]}
+    if validate:
+        result["validation"] = validate_code(result["code"], language)
+    return result
+
+
+def document_code(api_key, code, include_ports=True, include_signals=True, include_behavior=True,
+                  language=None, model=None, structured=False):
+    _check(code)
+    if structured:
+        return _document_structured(api_key, code, include_ports, include_signals, include_behavior, language, model)
+    reply = _analyze(
+        api_key, "document", code,
+        lambda part: build_documentation_prompt(part, include_ports, include_signals, include_behavior),
+        build_documentation_reduce_prompt, DOCUMENTATION_SYSTEM_MSG, model, language
+    )
+    return {"reply": reply}
+
+
+# Port and signal tables as data. A large file is documented chunk by chunk and
+# the parts merged locally (same module joined, entries deduplicated by name),
+# so no reduce call is needed.
+def _document_structured(api_key, code, include_ports, include_signals, include_behavior, language, model):
+    def document(part):
+        prompt = build_documentation_prompt(part, include_ports, include_signals, include_behavior)
+        return structured_answer(api_key, "document", prompt, DOCUMENTATION_SYSTEM_MSG, model)
+
+    if estimate_tokens(code) <= CHUNK_THRESHOLD:
+        parts = [document(code)]
+    else:
+        chunks = chunk_hdl(code, language)
+        with ThreadPoolExecutor(max_workers=max(1, min(CHUNK_CONCURRENCY, len(chunks)))) as pool:
+            parts = list(pool.map(lambda chunk: document(chunk_preamble(chunk) + chunk.prompt_text()), chunks))
+    data = merge_documents([part["data"] for part in parts])
+    return {
+        "reply": format_documentation(data),
+        "data": data,
+        "structured": {key: [path for part in parts for path in part["structured"][key]]
+                       for key in ("repaired", "dropped")}
+    }
+
+
+# Chat messages for one explainer turn. A small file is sent whole; a large one
+# is represented by its outline plus the blocks relevant to this question.
+# Returns (messages, selection); messages is None when nothing in a large file
+# matched the question, and the caller should map-reduce over the whole file.
+def explain_messages(code, question, language=None, summary=None, recent=None, model=None):
+    if estimate_tokens(code) <= CHUNK_THRESHOLD:
+        context, selection = build_explain_context(code), None
+    else:
+        selection = select_snippets(code, question, language)
+        if not selection.matched:
+            return None, selection
+        context = build_explain_context(code, outline(code, language))
+    messages = build_explain_messages(context, question, EXPLAIN_SYSTEM_MSG, summary, recent,
+                                      selection.text() if selection else None, supports_cache_control(model))
+    return messages, selection
+
+
+# history: earlier (role, text) turns about the same code, oldest first
+def explain_code(api_key, code, question="Explain this code", language=None, model=None, history=None):
+    _check(code)
+    chosen, route = _model_and_route("explain", model)
+    messages, _ = explain_messages(code, question, language, recent=history, model=chosen)
+    if messages is not None:
+        return {"reply": complete(api_key, build_chat_payload(messages, chosen), route=route)}
+    reply = _analyze(
+        api_key, "explain", code,
+        lambda part: build_explain_prompt(part, question),
+        lambda partials: build_explain_reduce_prompt(partials, question, recent=history),
+        EXPLAIN_SYSTEM_MSG, model, language
+    )
+    return {"reply": reply}
+
+
+# Waveform support needs numpy, so it is imported on first use
+def waveform_window(path, code=None, error_log=None, at=None, signals=None, reference=None):
+    try:
+        from vlsi_core.waveform import WaveformError, waveform_excerpt
+    except ImportError:
+        raise ServiceError("Reading waveform dumps needs numpy (pip install numpy)")
+    try:
+        return waveform_excerpt(path, code, error_log, at, signals, reference)
+    except WaveformError as e:
+        raise ServiceError(str(e))
+
+
+# error_log: text or a text stream; a long log is triaged into its top message
+# groups. waveform: path of a VCD/FST dump; only a window around the failure is sent
+def fix_code(api_key, code, error_log=None, model=None, waveform=None, at=None, structured=False):
+    _check(code)
+    error_log, triage = condense_log(error_log, code)
+    window = waveform_window(waveform, code, error_log, at) if waveform else None
+    prompt = build_bugfix_prompt(code, error_log, window["text"] if window else None)
+    if structured:
+        result = structured_answer(api_key, "fix", prompt, BUGFIX_SYSTEM_MSG, model)
+        result.update(code=result["data"]["code"], explanation=result["data"]["explanation"])
+    else:
+        model, route = _model_and_route("fix", model)
+        reply = complete(api_key, build_payload(prompt, BUGFIX_SYSTEM_MSG, model), route=route)
+        fixed_code, explanation = split_code_and_explanation(reply)
+        result = {"reply": reply, "code": fixed_code, "explanation": explanation}
+    if triage:
+        result["triage"] = {"summary": triage["summary"], "groups": triage["groups"]}
+    if window:
+        result["waveform"] = window
+    return result
+
+
+# With lint on, the static checks run first and the model is told to skip what they cover
+# parallel: one prompt per focus area, run concurrently and merged into
+# structured findings (see vlsi_core.review); otherwise a single combined prompt.
+# structured: findings come back as schema-checked JSON (a single pass is then
+# one JSON review covering all focus areas)
+def review_code(api_key, code, focus_areas=None, severity_level="Moderate", language=None, model=None, lint=True,
+                parallel=True, on_aspect=None, structured=False):
+    _check(code)
+    focus_areas = DEFAULT_REVIEW_FOCUS if focus_areas is None else focus_areas
+    report = lint_report(code, language) if lint else None
+    linted = lint_descriptions(report) if lint else None
+    if structured or (parallel and focus_areas):
+        areas = focus_areas if parallel and focus_areas else [", ".join(focus_areas) or "overall quality"]
+        model, route = _model_and_route("review", model)
+        aspects = []
+        for aspect in review_aspects(api_key, code, areas, severity_level, linted, model, route, language,
+                                     structured=structured):
+            aspects.append(aspect)
+            if on_aspect is not None:
+                on_aspect(aspect.as_dict())
+        try:
+            result = combine_review(aspects, report)
+        except StructuredError as e:
+            raise ServiceError(str(e))
+        if report is not None:
+            result["lint"] = report
+        return result
+    reply = _analyze(
+        api_key, "review", code,
+        lambda part: build_review_prompt(part, focus_areas, severity_level, linted),
+        lambda partials: build_review_reduce_prompt(partials, severity_level),
+        REVIEW_SYSTEM_MSG, model, language
+    )
+    if report is not None:
+        return {"reply": reply, "lint": report}
+    return {"reply": reply}
+
+
+# seeds > 0 also runs the generated testbench against the code with that many seeds
+def generate_testbench(api_key, code, language="Verilog", test_type="Basic Functional", clock_period=10,
+                       num_tests=50, include_coverage=False, include_waves=True, model=None, seeds=0,
+                       structured=False):
+    _check(code)
+    prompt = build_testbench_prompt(code, language, test_type, clock_period, num_tests, include_coverage,
+                                    include_waves)
+    if structured:
+        result = structured_answer(api_key, "testbench", prompt, TESTBENCH_SYSTEM_MSG, model)
+        result.update(code=result["data"]["code"], explanation=result["data"]["explanation"])
+    else:
+        model, route = _model_and_route("testbench", model)
+        reply = complete(api_key, build_payload(prompt, TESTBENCH_SYSTEM_MSG, model), route=route)
+        result = {"reply": reply, "code": extract_code_block(reply) or reply}
+    if seeds > 0:
+        try:
+            result["simulation"] = simulate_testbench(code, result["code"], language, seeds)
+        except ServiceError as e:
+            result["simulation"] = {"error": str(e)}
+    return result
+
+
+# Compile once, run seeds 1..seeds in parallel; on_result(run_dict) is called as each finishes
+def simulate_testbench(code, testbench, language="Verilog", seeds=8, timeout=None, on_result=None):
+    _check(code)
+    _check(testbench)
+    runs = []
+    try:
+        for run in get_simulation_runner().run(code, testbench, language, range(1, seeds + 1), timeout):
+            runs.append(run.as_dict())
+            if on_result is not None:
+                on_result(runs[-1])
+    except SimulationError as e:
+        raise ServiceError(f"{e}\n{e.log}".strip())
+    runs.sort(key=lambda run: run["seed"])
+    return {"summary": summarize(runs), "runs": runs}
+
+
+# Tool name -> function; every function takes the API key first and keyword options after
+TOOLS = {
+    "generate": generate_rtl,
+    "document": document_code,
+    "explain": explain_code,
+    "fix": fix_code,
+    "review": review_code,
+    "testbench": generate_testbench,
+}
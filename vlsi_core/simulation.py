@@ -0,0 +1,344 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR, DiskCache, LRUCache
+from vlsi_core.hdl_index import parse_vhdl
+from vlsi_core.metrics import SIMULATIONS, span
+from vlsi_core.validation import LANGUAGE_EXTENSIONS, scratch_root
+
+SIM_TIMEOUT = int(os.environ.get("VLSI_SIM_TIMEOUT", "60"))
+SIM_WORKERS = int(os.environ.get("VLSI_SIM_WORKERS", str(os.cpu_count() or 1)))
+COMPILE_TIMEOUT = 60
+KEEP_LINES = 20
+
+# Lines a self-checking testbench prints for a failed or passed check. "0 errors"
+# style summaries are not failures.
+FAIL_RE = re.compile(r"\b(fail(?:ed|ure|ures|s)?|errors?|mismatch(?:es)?|assertion)\b", re.IGNORECASE)
+ZERO_FAIL_RE = re.compile(
+    r"\b(?:fail(?:ed|ures?|s)?|errors?|mismatch(?:es)?)\s*[:=]?\s*0\b|\b(?:0|no)\s+(?:fail|error|mismatch)",
+    re.IGNORECASE
+)
+PASS_RE = re.compile(r"\b(pass(?:ed|es)?|ok)\b", re.IGNORECASE)
+_VHDL_SEED_RE = re.compile(r"\bgeneric\s*\([^;]*\bseed\b", re.IGNORECASE)
+
+
+# The whole process group, so children holding the output pipe die too
+def _kill(process):
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class SimulationError(Exception):
+    def __init__(self, message, log=""):
+        super().__init__(message)
+        self.log = log
+
+
+# Pass/fail counts and the interesting lines of one run's $display output,
+# parsed as it streams so memory stays flat however long the simulation prints
+class OutputParser:
+    def __init__(self, keep=KEEP_LINES):
+        self.lines = 0
+        self.passed = 0
+        self.failed = 0
+        self.failures = []
+        self.tail = deque(maxlen=keep)
+        self.keep = keep
+
+    def feed(self, line):
+        line = line.rstrip("\n")
+        self.lines += 1
+        self.tail.append(line)
+        if FAIL_RE.search(line) and not ZERO_FAIL_RE.search(line):
+            self.failed += 1
+            if len(self.failures) < self.keep:
+                self.failures.append(line)
+        elif PASS_RE.search(line):
+            self.passed += 1
+
+
+class SimulationRun:
+    def __init__(self, seed, status, seconds, returncode=None, parser=None, cached=False):
+        self.seed = seed
+        self.status = status
+        self.seconds = seconds
+        self.returncode = returncode
+        self.lines = parser.lines if parser else 0
+        self.passed = parser.passed if parser else 0
+        self.failed = parser.failed if parser else 0
+        self.failures = list(parser.failures) if parser else []
+        self.tail = list(parser.tail) if parser else []
+        self.cached = cached
+
+    def as_dict(self):
+        return {
+            "seed": self.seed, "status": self.status, "seconds": round(self.seconds, 3),
+            "returncode": self.returncode, "lines": self.lines, "passed": self.passed, "failed": self.failed,
+            "failures": self.failures, "tail": self.tail, "cached": self.cached
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        run = cls(data["seed"], data["status"], data["seconds"], data["returncode"], cached=True)
+        run.lines, run.passed, run.failed = data["lines"], data["passed"], data["failed"]
+        run.failures, run.tail = data["failures"], data["tail"]
+        return run
+
+
+def summarize(runs):
+    runs = [run if isinstance(run, dict) else run.as_dict() for run in runs]
+    statuses = {status: sum(1 for run in runs if run["status"] == status)
+                for status in ("pass", "fail", "error", "timeout")}
+    return dict(statuses, runs=len(runs), cached=sum(1 for run in runs if run["cached"]),
+                failing_seeds=[run["seed"] for run in runs if run["status"] != "pass"],
+                seconds=round(sum(run["seconds"] for run in runs), 3))
+
+
+# Compiles DUT + testbench once per source pair (iverilog, or GHDL analyse and
+# elaborate), then runs one simulator process per seed on a bounded pool, each
+# in its own directory so wave dumps do not collide. Seeds reach the testbench
+# as +seed=<n> (Verilog) or the SEED generic (VHDL, when declared). Finished
+# runs are cached by (tool version, source digest, seed, plusargs); timeouts
+# are not cached since they depend on the limit.
+class SimulationRunner:
+    def __init__(self, max_workers=SIM_WORKERS, timeout=SIM_TIMEOUT, cache=None, disk=None):
+        self.timeout = timeout
+        self.tools = {name: shutil.which(name) for name in ("iverilog", "vvp", "ghdl")}
+        self.versions = {}
+        self.cache = cache if cache is not None else LRUCache(max_entries=4096, ttl=0)
+        self.disk = disk
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hdl-simulate")
+        self._lock = threading.Lock()
+        self.compiled = 0
+        self.runs = 0
+        self.cache_hits = 0
+
+    def available(self, language):
+        if LANGUAGE_EXTENSIONS.get(language, language) == "vhd":
+            return self.tools["ghdl"] is not None
+        return self.tools["iverilog"] is not None and self.tools["vvp"] is not None
+
+    def _version(self, tool):
+        with self._lock:
+            if tool not in self.versions:
+                try:
+                    result = subprocess.run([self.tools[tool], "-V" if tool == "iverilog" else "--version"],
+                                            capture_output=True, text=True, timeout=10)
+                    output = (result.stdout or result.stderr).strip().splitlines()
+                    self.versions[tool] = output[0] if output else "unknown"
+                except (OSError, subprocess.TimeoutExpired):
+                    self.versions[tool] = "unknown"
+            return self.versions[tool]
+
+    def _digest(self, dut, testbench, language):
+        tool = "ghdl" if language == "vhd" else "iverilog"
+        data = "\0".join([language, self._version(tool), dut, testbench])
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _cache_key(self, digest, seed, plusargs):
+        return f"{digest}:{seed}:{' '.join(plusargs)}"
+
+    def _lookup(self, key):
+        result = self.cache.get(key)
+        if result is None and self.disk is not None:
+            try:
+                stored = self.disk.get(key)
+            except sqlite3.Error:
+                stored = None
+            if stored is not None:
+                result = json.loads(stored)
+                self.cache.put(key, result)
+        return result
+
+    def _store(self, key, result):
+        self.cache.put(key, result)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, json.dumps(result))
+            except sqlite3.Error:
+                pass
+
+    # Returns the command that runs one seed (minus the seed argument)
+    def _compile(self, dut, testbench, language, workdir):
+        ext = "sv" if language == "sv" else "vhd" if language == "vhd" else "v"
+        paths = []
+        for name, code in (("dut", dut), ("tb", testbench)):
+            paths.append(os.path.join(workdir, f"{name}.{ext}"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(code)
+
+        if language == "vhd":
+            tops = [entity.name for entity in parse_vhdl(testbench) if not entity.ports]
+            if not tops:
+                raise SimulationError("No testbench entity (an entity without ports) found")
+            ghdl = self.tools["ghdl"]
+            steps = [[ghdl, "-a", "--std=08", f"--workdir={workdir}"] + paths,
+                     [ghdl, "-e", "--std=08", f"--workdir={workdir}", tops[-1]]]
+            command = [ghdl, "-r", "--std=08", f"--workdir={workdir}", tops[-1]]
+        else:
+            image = os.path.join(workdir, "sim.vvp")
+            steps = [[self.tools["iverilog"]] + (["-g2012"] if language == "sv" else []) + ["-o", image] + paths]
+            command = [self.tools["vvp"], "-n", image]
+
+        with span("simulation.compile", language=language):
+            for step in steps:
+                try:
+                    result = subprocess.run(step, capture_output=True, text=True, timeout=COMPILE_TIMEOUT, cwd=workdir)
+                except subprocess.TimeoutExpired:
+                    raise SimulationError("Compilation timed out")
+                except OSError as e:
+                    raise SimulationError(f"Could not run {os.path.basename(step[0])}: {e}")
+                if result.returncode != 0:
+                    log = (result.stderr or result.stdout).replace(workdir + os.sep, "")
+                    raise SimulationError("Compilation failed", log)
+        with self._lock:
+            self.compiled += 1
+        return command
+
+    def _execute(self, command, seed, cwd, timeout, language, active, stop):
+        os.makedirs(cwd, exist_ok=True)
+        parser = OutputParser()
+        killed = threading.Event()
+        start = time.perf_counter()
+        with span("simulation.run", language=language, seed=seed):
+            try:
+                process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                           text=True, errors="replace", start_new_session=hasattr(os, "killpg"))
+            except OSError as e:
+                raise SimulationError(f"Could not run {os.path.basename(command[0])}: {e}")
+            active.add(process)
+            if stop.is_set():
+                _kill(process)
+
+            def kill():
+                killed.set()
+                _kill(process)
+
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    parser.feed(line)
+                process.wait()
+            finally:
+                timer.cancel()
+                process.stdout.close()
+                active.discard(process)
+        seconds = time.perf_counter() - start
+        if killed.is_set():
+            status = "timeout"
+        elif parser.failed:
+            status = "fail"
+        elif process.returncode != 0:
+            status = "error"
+        else:
+            status = "pass"
+        with self._lock:
+            self.runs += 1
+        SIMULATIONS.inc(language=language, status=status)
+        return SimulationRun(seed, status, seconds, process.returncode, parser)
+
+    def _seed_args(self, seed, language, testbench, plusargs):
+        if language == "vhd":
+            return [f"-gSEED={seed}"] if _VHDL_SEED_RE.search(testbench) else []
+        return [f"+seed={seed}"] + [f"+{arg.lstrip('+')}" for arg in plusargs]
+
+    # Yields a SimulationRun per seed as each finishes (cached ones first).
+    # Raises SimulationError if the simulator is missing or compilation fails.
+    def run(self, dut, testbench, language="Verilog", seeds=(1,), timeout=None, plusargs=()):
+        language = LANGUAGE_EXTENSIONS.get(language, language)
+        if not self.available(language):
+            raise SimulationError("Simulator not found. Install Icarus Verilog (iverilog, vvp) or GHDL.")
+        timeout = timeout or self.timeout
+        plusargs = tuple(plusargs)
+        digest = self._digest(dut, testbench, language)
+
+        pending = []
+        for seed in seeds:
+            cached = self._lookup(self._cache_key(digest, seed, plusargs))
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                yield SimulationRun.from_dict(cached)
+            else:
+                pending.append(seed)
+        if not pending:
+            return
+
+        workdir = tempfile.mkdtemp(prefix="vlsi_sim_", dir=scratch_root())
+        futures, active, stop = {}, set(), threading.Event()
+        try:
+            command = self._compile(dut, testbench, language, workdir)
+            for seed in pending:
+                args = self._seed_args(seed, language, testbench, plusargs)
+                future = self._pool.submit(self._execute, command + args, seed,
+                                           os.path.join(workdir, f"seed_{seed}"), timeout, language, active, stop)
+                futures[future] = seed
+            for future in as_completed(futures):
+                run = future.result()
+                if run.status != "timeout":
+                    self._store(self._cache_key(digest, run.seed, plusargs), run.as_dict())
+                yield run
+        finally:
+            # A consumer that stops early (closed generator) cancels the queued
+            # seeds and kills the running ones
+            stop.set()
+            for future in futures:
+                future.cancel()
+            for process in list(active):
+                _kill(process)
+            for future in futures:
+                if not future.cancelled():
+                    try:
+                        future.result()
+                    except Exception:
+                        pass
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def stats(self):
+        return {
+            "tools": {name: bool(path) for name, path in self.tools.items()},
+            "compiled": self.compiled,
+            "runs": self.runs,
+            "cache_hits": self.cache_hits,
+            "cached_results": len(self.cache)
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_simulation_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            disk = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    disk = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "simulation.sqlite3"), max_bytes=32 * 1024 * 1024)
+                except (OSError, sqlite3.Error):
+                    disk = None
+            _runner = SimulationRunner(disk=disk)
+            atexit.register(_runner.shutdown)
+        return _runner
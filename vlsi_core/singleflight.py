@@ -0,0 +1,133 @@
+import threading
+
+from vlsi_core.cache import payload_key
+
+
+class FlightAborted(Exception):
+    pass
+
+
+def _normalize_text(text):
+    return "\n".join(line.rstrip() for line in text.replace("\r\n", "\n").split("\n")).strip()
+
+
+# Payload key that ignores differences an LLM would not care about: line-ending
+# style and trailing whitespace in message text
+def flight_key(payload):
+    messages = [
+        dict(message, content=_normalize_text(message["content"])) if isinstance(message.get("content"), str)
+        else message
+        for message in payload.get("messages", [])
+    ]
+    return payload_key(dict(payload, messages=messages))
+
+
+# One upstream call that any number of callers can follow. Chunks are kept so a
+# caller that joins late still sees the whole reply, streamed or not.
+class Flight:
+    def __init__(self):
+        self._chunks = []
+        self._done = False
+        self._error = None
+        self._cond = threading.Condition()
+        self.followers = 0
+
+    def publish(self, chunk):
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    # Every chunk from the start, blocking for new ones until the flight finishes
+    def iter_chunks(self, timeout=None):
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self._done:
+                    if not self._cond.wait(timeout):
+                        raise FlightAborted("Timed out waiting for a shared request")
+                if index < len(self._chunks):
+                    chunk = self._chunks[index]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            index += 1
+            yield chunk
+
+    def result(self, timeout=None):
+        return "".join(self.iter_chunks(timeout))
+
+
+# Coalesces concurrent identical requests: the first caller for a key becomes
+# the leader and makes the upstream call, later callers follow its Flight.
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.max_followers = 0
+
+    # Returns (flight, is_leader). A leader must call end() when done.
+    def begin(self, key):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.coalesced += 1
+                self.max_followers = max(self.max_followers, flight.followers)
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def end(self, key, flight, error=None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.finish(error)
+
+    # Run fn() once for all concurrent callers with the same key
+    def do(self, key, fn):
+        flight, leader = self.begin(key)
+        if not leader:
+            return flight.result()
+        try:
+            value = fn()
+        except BaseException as e:
+            self.end(key, flight, e if isinstance(e, Exception) else FlightAborted("Leader was interrupted"))
+            raise
+        flight.publish(value)
+        self.end(key, flight)
+        return value
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._flights)
+        total = self.leaders + self.coalesced
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0,
+            "max_followers": self.max_followers,
+            "in_flight": in_flight
+        }
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
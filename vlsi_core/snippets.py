@@ -0,0 +1,151 @@
+import math
+import os
+import re
+from collections import Counter
+
+from vlsi_core.chunking import estimate_tokens, guess_language, hdl_blocks
+from vlsi_core.hdl_index import parse_source
+
+SNIPPET_TOKENS = int(os.environ.get("VLSI_SNIPPET_TOKENS", "2500"))
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*")
+
+# Words that appear in nearly every question or every block and say nothing about relevance
+STOPWORDS = frozenset("""
+a an and are as at be but by can could do does for from how i if in into is it its me my of on or
+should so that the then there these this those to was what when where which while who why will with
+would you your code module modules block blocks signal signals design explain describe line lines
+input output inout wire reg logic begin end endmodule assign parameter localparam integer
+entity architecture is of port signal std_logic std_logic_vector process
+""".split())
+
+# Question words that point at HDL constructs rather than at identifiers
+HINTS = {
+    "latch": ("always", "always_comb", "always_latch", "case", "if", "else"),
+    "latches": ("always", "always_comb", "always_latch", "case", "if", "else"),
+    "clock": ("posedge", "negedge", "clk", "clock"),
+    "clocked": ("posedge", "negedge", "always_ff"),
+    "timing": ("posedge", "negedge", "clk", "always_ff"),
+    "sequential": ("posedge", "negedge", "always_ff"),
+    "combinational": ("always_comb", "assign", "always"),
+    "reset": ("rst", "reset", "rst_n", "resetn", "areset"),
+    "fsm": ("state", "next_state", "case"),
+    "state": ("state", "next_state", "case"),
+    "counter": ("count", "cnt", "counter"),
+    "fifo": ("wr_ptr", "rd_ptr", "full", "empty", "fifo"),
+    "blocking": ("always", "posedge"),
+    "testbench": ("initial", "display", "finish"),
+}
+
+
+# Identifiers in text and their underscore-separated parts, minus stopwords
+def index_terms(text):
+    terms = []
+    for ident in _IDENT_RE.findall(text):
+        word = ident.lower()
+        if word not in STOPWORDS and len(word) > 1:
+            terms.append(word)
+        parts = [part for part in word.split("_") if part and part != word]
+        terms.extend(part for part in parts if part not in STOPWORDS and len(part) > 1)
+    return terms
+
+
+def query_terms(question):
+    terms = Counter(index_terms(question))
+    for word in list(terms):
+        for hint in HINTS.get(word, ()):
+            terms[hint] += 0.5
+    return terms
+
+
+class Selection:
+    def __init__(self, blocks, total_blocks, total_tokens, tokens=0):
+        self.blocks = blocks
+        self.total_blocks = total_blocks
+        self.total_tokens = total_tokens
+        self.tokens = tokens
+
+    @property
+    def matched(self):
+        return bool(self.blocks)
+
+    # Excerpts in file order; each module header is included once, before its first excerpt
+    def text(self):
+        parts, headers = [], set()
+        for block in self.blocks:
+            owner = block.modules[0] if block.modules else None
+            label = f"// lines {block.start_line}-{block.end_line}" + (f" ({owner})" if owner else "")
+            if block.context and owner not in headers:
+                headers.add(owner)
+                parts.append(f"{label}\n{block.context}\n    // ...\n{block.text.rstrip()}")
+            else:
+                parts.append(f"{label}\n{block.text.rstrip()}")
+        return "\n\n".join(parts)
+
+    def summary(self):
+        return (f"{len(self.blocks)} of {self.total_blocks} blocks, "
+                f"~{self.tokens} of {self.total_tokens} tokens")
+
+
+# BM25 over the file's module/always/process blocks, with identifiers named in
+# the question (exact, case-sensitive) weighted up. Picks the best-scoring blocks
+# that fit max_tokens and returns them in file order; blocks with no overlap
+# with the question are never sent.
+def select_snippets(code, question, language=None, max_tokens=SNIPPET_TOKENS, k1=1.2, b=0.75):
+    blocks = [block for block in hdl_blocks(code, language) if block.text.strip()]
+    total_tokens = estimate_tokens(code)
+    query = query_terms(question)
+    if not blocks or not query:
+        return Selection([], len(blocks), total_tokens)
+
+    block_terms = [Counter(index_terms(block.text)) for block in blocks]
+    lengths = [sum(terms.values()) or 1 for terms in block_terms]
+    average = sum(lengths) / len(lengths)
+    document_frequency = Counter(term for terms in block_terms for term in terms)
+    exact = {ident for ident in _IDENT_RE.findall(question) if ident.lower() not in STOPWORDS}
+
+    scores = []
+    for block, terms, length in zip(blocks, block_terms, lengths):
+        score = 0.0
+        for term, weight in query.items():
+            tf = terms.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(blocks) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += weight * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average))
+        if exact and any(re.search(rf"\b{re.escape(ident)}\b", block.text) for ident in exact):
+            score *= 2.0
+        scores.append(score)
+
+    # A module header is paid for once, with the first excerpt from that module
+    chosen, used, headers = [], 0, set()
+    for score, block in sorted(zip(scores, blocks), key=lambda pair: -pair[0]):
+        if score <= 0:
+            break
+        owner = block.modules[0] if block.modules else None
+        cost = estimate_tokens(block.text)
+        if block.context and owner not in headers:
+            cost += estimate_tokens(block.context)
+        if used + cost > max_tokens:
+            continue
+        chosen.append(block)
+        used += cost
+        if block.context:
+            headers.add(owner)
+    chosen.sort(key=lambda block: block.start_line)
+    return Selection(chosen, len(blocks), total_tokens, used)
+
+
+# Interfaces of every module in the file: small, and identical for every
+# question about the same file, so it can serve as the cached prefix
+def outline(code, language=None):
+    try:
+        modules = parse_source(code, "", language or guess_language(code))
+    except Exception:
+        modules = []
+    if not modules:
+        return ""
+    return "\n\n".join(
+        f"// {module.kind} {module.name}, lines {module.start_line}-{module.end_line}\n{module.interface()}"
+        for module in modules
+    )
@@ -0,0 +1,79 @@
+import json
+
+from vlsi_core.metrics import record_usage
+
+
+class StreamError(Exception):
+    pass
+
+
+# Yield content deltas from an OpenRouter server-sent-events response.
+# Lines look like "data: {...}", ": keep-alive comment" or "data: [DONE]".
+# Token usage, sent on the last event, is recorded in the metrics.
+def iter_sse_content(lines):
+    for raw in lines:
+        if not raw:
+            continue
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        line = line.strip()
+        if not line or line.startswith(":") or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+        if "error" in event:
+            error = event["error"]
+            message = error.get("message", error) if isinstance(error, dict) else error
+            raise StreamError(str(message))
+        if event.get("usage"):
+            record_usage(event.get("model"), event["usage"])
+        for choice in event.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+# Incrementally tracks the first fenced code block of a streamed reply, so the
+# code can be shown while the model is still writing it.
+class CodeFenceExtractor:
+    def __init__(self):
+        self.text = ""
+        self.code_start = -1
+        self.code_end = -1
+
+    def feed(self, chunk):
+        self.text += chunk
+        if self.code_start < 0:
+            fence = self.text.find("```")
+            newline = self.text.find("\n", fence + 3) if fence >= 0 else -1
+            if newline >= 0:
+                # Skip the info string ("verilog", "vhdl", ...) on the opening fence line
+                self.code_start = newline + 1
+        if self.code_start >= 0 and self.code_end < 0:
+            close = self.text.find("```", self.code_start)
+            if close >= 0:
+                self.code_end = close
+        return self.code
+
+    @property
+    def in_code(self):
+        return self.code_start >= 0 and self.code_end < 0
+
+    @property
+    def complete(self):
+        return self.code_end >= 0
+
+    @property
+    def code(self):
+        if self.code_start < 0:
+            return ""
+        end = self.code_end if self.code_end >= 0 else len(self.text)
+        code = self.text[self.code_start:end]
+        if self.code_end < 0:
+            # Hide a partially received closing fence
+            code = code.rstrip("`")
+        return code.rstrip()
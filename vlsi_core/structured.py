@@ -0,0 +1,376 @@
+# Structured (JSON) output: per-tool schemas, a validator for the small subset
+# of JSON Schema they use, and field-level repair of replies that do not
+# conform. A malformed or missing field is re-asked on its own; the rest of the
+# reply is kept, so a repair costs a few output tokens, not a regeneration.
+import json
+import os
+import re
+
+from vlsi_core.metrics import span
+from vlsi_core.openrouter import build_chat_payload, complete
+from vlsi_core.parsing import split_code_and_explanation
+
+STRUCTURED_REPAIRS = int(os.environ.get("VLSI_STRUCTURED_REPAIRS", "2"))
+
+_STRING = {"type": "string"}
+_TEXT_LIST = {"type": "array", "items": _STRING}
+_CODE = {"type": "string", "minLength": 1, "description": "the complete source code as plain text, no Markdown fence"}
+
+FINDING_SCHEMA = {
+    "type": "object",
+    "required": ["severity", "line", "rule", "message"],
+    "properties": {
+        "severity": {"enum": ["critical", "warning", "suggestion"]},
+        "line": {"type": ["integer", "null"], "description": "line number the issue is on"},
+        "rule": {"type": "string", "minLength": 1, "description": "short rule id, e.g. inferred-latch"},
+        "message": {"type": "string", "minLength": 1, "description": "what is wrong"},
+        "fix": {"type": "string", "description": "how to fix it"}
+    }
+}
+
+PORT_SCHEMA = {
+    "type": "object",
+    "required": ["name", "direction", "width"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "direction": {"enum": ["input", "output", "inout", "buffer"]},
+        "width": {"type": "string", "description": "e.g. 1, [7:0], WIDTH"},
+        "description": _STRING
+    }
+}
+
+SIGNAL_SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": {"type": "string", "minLength": 1}, "width": _STRING, "description": _STRING}
+}
+
+SCHEMAS = {
+    "generate": {
+        "type": "object",
+        "required": ["code", "explanation"],
+        "properties": {"code": _CODE, "explanation": _STRING, "optimizations": _TEXT_LIST}
+    },
+    "fix": {
+        "type": "object",
+        "required": ["code", "explanation", "changes"],
+        "properties": {"code": _CODE, "explanation": _STRING, "changes": _TEXT_LIST, "prevention": _TEXT_LIST}
+    },
+    "testbench": {
+        "type": "object",
+        "required": ["code", "explanation"],
+        "properties": {"code": _CODE, "explanation": _STRING}
+    },
+    "review": {
+        "type": "object",
+        "required": ["findings", "summary"],
+        "properties": {"findings": {"type": "array", "items": FINDING_SCHEMA}, "summary": _STRING}
+    },
+    "document": {
+        "type": "object",
+        "required": ["modules"],
+        "properties": {
+            "modules": {"type": "array", "items": {
+                "type": "object",
+                "required": ["name", "description"],
+                "properties": {
+                    "name": {"type": "string", "minLength": 1},
+                    "description": _STRING,
+                    "ports": {"type": "array", "items": PORT_SCHEMA},
+                    "signals": {"type": "array", "items": SIGNAL_SCHEMA},
+                    "behavior": _STRING,
+                    "timing": _STRING
+                }
+            }},
+            "notes": _STRING
+        }
+    }
+}
+
+_TYPES = {"string": str, "integer": int, "number": (int, float), "boolean": bool, "array": list, "object": dict}
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class StructuredError(ValueError):
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+
+# "findings[2].line" for ("findings", 2, "line")
+def format_path(path):
+    text = ""
+    for key in path:
+        text += f"[{key}]" if isinstance(key, int) else (f".{key}" if text else key)
+    return text or "$"
+
+
+def _is_type(value, name):
+    if name == "null":
+        return value is None
+    if name in ("integer", "number") and isinstance(value, bool):
+        return False
+    return isinstance(value, _TYPES[name])
+
+
+# Cheap fixes that need no model: numbers sent as strings, enum case, a single
+# string where a list of strings is expected
+def _coerce(value, schema):
+    if "enum" in schema:
+        if isinstance(value, str):
+            folded = {option.lower(): option for option in schema["enum"]}
+            return folded.get(value.strip().lower(), value)
+        return value
+    types = schema.get("type")
+    types = [types] if isinstance(types, str) else types or []
+    if isinstance(value, str) and "integer" in types:
+        match = re.fullmatch(r"\s*(?:line\s*)?(\d+)\s*", value, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+        if "null" in types and value.strip().lower() in ("", "null", "none", "n/a", "-"):
+            return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and "string" in types:
+        return str(value)
+    if isinstance(value, str) and "array" in types and schema.get("items", {}).get("type") == "string":
+        return [value] if value.strip() else []
+    return value
+
+
+# (value, errors): the value with cheap coercions applied, and [(path, problem)]
+# for what still does not match. Unknown object keys are kept as they are.
+def validate(value, schema, path=()):
+    value = _coerce(value, schema)
+    if "enum" in schema:
+        if value not in schema["enum"]:
+            return value, [(path, f"expected one of {', '.join(schema['enum'])}, got {json.dumps(value)[:60]}")]
+        return value, []
+    types = schema.get("type")
+    types = [types] if isinstance(types, str) else types or []
+    if types and not any(_is_type(value, name) for name in types):
+        return value, [(path, f"expected {' or '.join(types)}, got {json.dumps(value)[:60]}")]
+    errors = []
+    if isinstance(value, str) and len(value.strip()) < schema.get("minLength", 0):
+        errors.append((path, "must not be empty"))
+    elif isinstance(value, list) and "items" in schema:
+        items = []
+        for index, item in enumerate(value):
+            item, item_errors = validate(item, schema["items"], path + (index,))
+            items.append(item)
+            errors += item_errors
+        value = items
+    elif isinstance(value, dict) and "properties" in schema:
+        value = dict(value)
+        for key, subschema in schema["properties"].items():
+            if key not in value:
+                if key in schema.get("required", ()):
+                    errors.append((path + (key,), "missing"))
+                continue
+            value[key], key_errors = validate(value[key], subschema, path + (key,))
+            errors += key_errors
+    return value, errors
+
+
+def schema_at(schema, path):
+    for key in path:
+        schema = schema["items"] if isinstance(key, int) else schema["properties"][key]
+    return schema
+
+
+def _set(data, path, value):
+    target = data
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+
+
+# A compact example of the expected shape, cheaper in tokens than the schema itself
+def skeleton(schema):
+    if "enum" in schema:
+        return "|".join(schema["enum"])
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: skeleton(sub) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [skeleton(schema.get("items", _STRING))]
+    kinds = [kind] if isinstance(kind, str) else kind or ["string"]
+    note = schema.get("description")
+    return f"<{' or '.join(kinds)}{': ' + note if note else ''}>"
+
+
+def format_instructions(schema):
+    code_note = " Put code in its field as plain text with \\n line breaks." if "code" in schema["properties"] else ""
+    return (
+        "Reply with a single JSON object and nothing else (no Markdown, no code fence), shaped like:\n"
+        f"{json.dumps(skeleton(schema))}\n"
+        f"Required fields: {', '.join(schema.get('required', ()))}.{code_note}"
+    )
+
+
+# The JSON object in a reply, tolerating a ```json fence, prose around it and
+# trailing commas. Raises ValueError when there is none.
+def parse_json(text):
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("no JSON object in the reply")
+    decoder = json.JSONDecoder()
+    try:
+        value, _ = decoder.raw_decode(text, start)
+    except json.JSONDecodeError:
+        value, _ = decoder.raw_decode(_TRAILING_COMMA_RE.sub(r"\1", text[start:]))
+    if not isinstance(value, dict):
+        raise ValueError("the reply is not a JSON object")
+    return value
+
+
+# What can be recovered from a reply that is not JSON at all: the code block and
+# the prose around it, for the tools whose result is code
+def salvage(reply, schema):
+    properties = schema.get("properties", {})
+    if "code" not in properties:
+        return {}
+    code, explanation = split_code_and_explanation(reply)
+    if code is None:
+        return {}
+    return {"code": code, "explanation": explanation} if "explanation" in properties else {"code": code}
+
+
+def build_repair_request(errors, schema):
+    shape = {format_path(path): skeleton(schema_at(schema, path)) for path, _ in errors}
+    problems = "\n".join(f"- {format_path(path)}: {problem}" for path, problem in errors)
+    return (
+        f"These fields of your JSON reply are missing or invalid:\n{problems}\n\n"
+        "Reply with only a JSON object that maps each of these field paths to its corrected value, "
+        f"shaped like:\n{json.dumps(shape)}\nDo not repeat any other field."
+    )
+
+
+# Remaining errors after the repair rounds: invalid optional fields are removed,
+# required text fields that may be empty are set to "", list items with any
+# other invalid required field dropped; an invalid required top-level field fails
+def _prune(data, errors, schema):
+    dropped = []
+    removals = {}
+    for path, problem in errors:
+        if path and isinstance(path[-1], str):
+            field = schema_at(schema, path)
+            if path[-1] not in schema_at(schema, path[:-1]).get("required", ()):
+                target = data
+                for key in path[:-1]:
+                    target = target[key]
+                target.pop(path[-1], None)
+                dropped.append(format_path(path))
+                continue
+            if field.get("type") == "string" and not field.get("minLength"):
+                _set(data, path, "")
+                dropped.append(format_path(path))
+                continue
+        cut = max((i for i, key in enumerate(path) if isinstance(key, int)), default=None)
+        if cut is None:
+            raise StructuredError(f"Structured reply is invalid: {format_path(path)} {problem}", errors)
+        removals.setdefault(path[:cut], set()).add(path[cut])
+    for path, indices in sorted(removals.items(), key=lambda item: -len(item[0])):
+        items = data
+        for key in path:
+            items = items[key]
+        for index in sorted(indices, reverse=True):
+            del items[index]
+            dropped.append(format_path(path + (index,)))
+    return dropped
+
+
+# Ask for JSON matching SCHEMAS[tool]; fields that are missing or invalid are
+# re-asked in one follow-up turn (up to `repairs` rounds). Returns
+# {"data", "reply", "repaired": [paths], "dropped": [paths]}.
+def structured_complete(api_key, tool, prompt, system_message, model, route=None, max_tokens=4096,
+                        repairs=STRUCTURED_REPAIRS):
+    schema = SCHEMAS[tool]
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": f"{prompt}\n\n{format_instructions(schema)}"}
+    ]
+    payload = build_chat_payload(messages, model, max_tokens=max_tokens)
+    payload["response_format"] = {"type": "json_object"}
+    with span("structured.complete", tool=tool):
+        reply = complete(api_key, payload, route=route)
+    try:
+        data = parse_json(reply)
+    except ValueError:
+        data = salvage(reply, schema)
+
+    repaired = []
+    data, errors = validate(data, schema)
+    for _ in range(repairs):
+        if not errors:
+            break
+        request = build_repair_request(errors, schema)
+        followup = dict(payload, messages=messages + [{"role": "assistant", "content": reply},
+                                                      {"role": "user", "content": request}])
+        with span("structured.repair", tool=tool, fields=len(errors)):
+            answer = complete(api_key, followup, route=route)
+        try:
+            fixes = parse_json(answer)
+        except ValueError:
+            continue
+        applied = []
+        for path, _ in errors:
+            key = format_path(path)
+            if key in fixes:
+                _set(data, path, fixes[key])
+                applied.append(path)
+        data, errors = validate(data, schema)
+        # Only fixes that now validate count as repaired; the rest are re-asked
+        repaired += [format_path(path) for path in applied
+                     if not any(error[:len(path)] == path for error, _ in errors)]
+    dropped = _prune(data, errors, schema) if errors else []
+    return {"data": data, "reply": reply, "repaired": repaired, "dropped": dropped}
+
+
+def _cell(text):
+    return str(text if text is not None else "").replace("|", "\\|").replace("\n", " ")
+
+
+# Markdown for a structured "document" result
+def format_documentation(data):
+    sections = []
+    for module in data.get("modules", []):
+        lines = [f"## {module['name']}", "", module.get("description", "")]
+        if module.get("ports"):
+            lines += ["", "### Ports", "", "| Name | Direction | Width | Description |", "|---|---|---|---|"]
+            lines += [f"| {_cell(p['name'])} | {p['direction']} | {_cell(p['width'])} | {_cell(p.get('description'))} |"
+                      for p in module["ports"]]
+        if module.get("signals"):
+            lines += ["", "### Signals", "", "| Name | Width | Description |", "|---|---|---|"]
+            lines += [f"| {_cell(s['name'])} | {_cell(s.get('width'))} | {_cell(s.get('description'))} |"
+                      for s in module["signals"]]
+        for key, title in (("behavior", "Behavior"), ("timing", "Timing")):
+            if module.get(key):
+                lines += ["", f"### {title}", "", module[key]]
+        sections.append("\n".join(lines))
+    if data.get("notes"):
+        sections.append(f"## Notes\n\n{data['notes']}")
+    return "\n\n".join(sections)
+
+
+# Combine per-chunk "document" results: parts of the same module are merged,
+# ports and signals deduplicated by name
+def merge_documents(parts):
+    modules, notes = {}, []
+    for part in parts:
+        if part.get("notes"):
+            notes.append(part["notes"])
+        for module in part.get("modules", []):
+            merged = modules.get(module["name"])
+            if merged is None:
+                modules[module["name"]] = dict(module, ports=list(module.get("ports", [])),
+                                               signals=list(module.get("signals", [])))
+                continue
+            for key in ("ports", "signals"):
+                names = {item["name"] for item in merged[key]}
+                merged[key] += [item for item in module.get(key, []) if item["name"] not in names]
+            for key in ("description", "behavior", "timing"):
+                if module.get(key) and module[key] not in merged.get(key, ""):
+                    merged[key] = f"{merged[key]}\n\n{module[key]}" if merged.get(key) else module[key]
+    result = {"modules": list(modules.values())}
+    if notes:
+        result["notes"] = "\n\n".join(notes)
+    return result
@@ -0,0 +1,298 @@
+import gzip
+import io
+import itertools
+import os
+import re
+import time
+
+from vlsi_core.metrics import span
+from vlsi_core.simulation import ZERO_FAIL_RE
+
+TRIAGE_GROUPS = int(os.environ.get("VLSI_TRIAGE_GROUPS", "8"))
+TRIAGE_THRESHOLD = int(os.environ.get("VLSI_TRIAGE_THRESHOLD", "4000"))
+MAX_GROUPS = 2000
+MAX_LINE = 2000
+KEEP_LOCATIONS = 5
+KEEP_NAMES = 8
+CONTEXT_LINES = 2
+MAX_SPAN_LINES = 60
+
+SEVERITY_RANK = {"fatal": 0, "error": 1, "critical": 2, "warning": 3}
+
+# Message category -> pattern. The first four are the Debugging Assistant's
+# common error buttons (prompts.COMMON_ERRORS); the rest cover what Vivado,
+# Quartus, iverilog, GHDL, Verilator and self-checking testbenches print.
+LOG_CATEGORIES = {
+    "Latch Inference": r"latch",
+    "Blocking/Non-blocking": r"blocking assignment|\bBLKSEQ\b|\bCOMBDLY\b|procedural assignment",
+    "Syntax Error": r"syntax error|parse error|unexpected|expecting",
+    "Undefined Signal": r"undefined|undeclared|not declared|unable to bind|no declaration|can't find definition"
+                        r"|unknown identifier|not found in",
+    "Multiple Drivers": r"multi(?:ple)?[- ]driven|multiple drivers|more than one driver|\bMULTIDRIVEN\b",
+    "Width Mismatch": r"width|truncat|\bWIDTH\b|padding|port size|bits? to",
+    "Unconnected Port": r"unconnected|floating|no driver|undriven|\bPINMISSING\b|dangling",
+    "Timing Violation": r"\btiming\b|\bsetup\b|\bhold\b|\bslack\b|clock skew|unconstrained",
+    "Sensitivity List": r"sensitivity list|incomplete event",
+    "Simulation Failure": r"\bfail(?:ed|ure)?\b|mismatch|assert(?:ion)?|\$fatal|\$error|expected",
+}
+_CATEGORY_RES = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in LOG_CATEGORIES.items()]
+
+# Cheap substring filter first: most lines of a long log are progress/info output
+_TRIGGERS = ("error", "warn", "fail", "fatal", "mismatch", "assert")
+_SEVERITY_RE = re.compile(
+    r"\b(?P<severity>fatal|critical warning|error|warning)s?\b|%(?P<verilator>Error|Warning)"
+    r"|(?P<failure>\bFAIL(?:ED|URE)?\b|\bmismatch|\bassertion)",
+    re.IGNORECASE
+)
+# file.v:12 (Vivado in brackets, iverilog, GHDL, Verilator) or file.v(12) (Quartus),
+# found from the extension so the regex does not try a path at every position
+_LOCATION_RE = re.compile(r"\.(?:sv|svh|vh|v|vhd|vhdl|xdc|sdc|tcl)(?::(\d+)(?::\d+)?|\((\d+)\))")
+_LINE_RE = re.compile(r"\bline\s+(\d+)\b", re.IGNORECASE)
+_PATH_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_./\\$~+-")
+_MESSAGE_ID_RE = re.compile(r"\[(?P<vivado>[A-Za-z][\w ]*\d+-\d+)\]|\((?P<quartus>\d{4,6})\)|%\w+-(?P<verilator>[A-Z_]+)")
+_NAME_RE = re.compile(r"'([^'\s]{1,80})'|\"([^\"\s]{1,80})\"|`([^'\s]{1,80})'")
+# Quoted names and numbers, including sized literals (8'h0a) whose hex digits
+# would otherwise split repeats of one message into separate groups
+_NOISE_RE = re.compile(
+    r"\d*'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+\b(?!')|'[^'\s]*'|\"[^\"\s]*\"|`[^'\s]*'|0x[0-9a-fA-F]+|\d+(?:\.\d+)?"
+)
+_TIMESTAMP_RE = re.compile(r"^\s*(?:\[?\d{1,2}:\d{2}:\d{2}\]?|\d{4}-\d{2}-\d{2}[T ][\d:.]+)\s*")
+_TALLY_RE = re.compile(r"\b(?:\d+|no)\s+(?:critical\s+)?(?:errors?|warnings?)\b", re.IGNORECASE)
+
+
+# One root cause: every message with the same severity and tool message id (or,
+# without an id, the same text once names and numbers are blanked out)
+class LogGroup:
+    def __init__(self, severity, category, message_id, example, first_line):
+        self.severity = severity
+        self.category = category
+        self.message_id = message_id
+        self.example = example
+        self.first_line = first_line
+        self.count = 0
+        self.locations = []
+        self.names = []
+
+    def add(self, location, names):
+        self.count += 1
+        if location and location not in self.locations and len(self.locations) < KEEP_LOCATIONS:
+            self.locations.append(location)
+        for name in names:
+            if name not in self.names and len(self.names) < KEEP_NAMES:
+                self.names.append(name)
+
+    def rank(self):
+        return SEVERITY_RANK[self.severity], self.first_line
+
+    def as_dict(self):
+        return {
+            "severity": self.severity, "category": self.category, "id": self.message_id, "count": self.count,
+            "first_line": self.first_line, "example": self.example,
+            "locations": [{"file": f, "line": n} for f, n in self.locations], "names": self.names
+        }
+
+
+def _severity(match):
+    if match.group("severity"):
+        word = match.group("severity").lower()
+        return "critical" if word.startswith("critical") else word
+    if match.group("verilator"):
+        return match.group("verilator").lower()
+    return "error"
+
+
+# ((file, line), (start, end) of the reference in text), or (None, None)
+def _location(text):
+    match = _LOCATION_RE.search(text)
+    if match:
+        start = match.start()
+        while start and text[start - 1] in _PATH_CHARS:
+            start -= 1
+        path = text[start:match.end()].split(":", 1)[0].split("(", 1)[0]
+        line = int(match.group(1) or match.group(2))
+        return (os.path.basename(path.replace("\\", "/")), line), (start, match.end())
+    match = _LINE_RE.search(text)
+    if match:
+        return (None, int(match.group(1))), match.span()
+    return None, None
+
+
+# Classifies and groups log lines as they stream past. Only the groups (capped
+# at MAX_GROUPS, each with a few locations and names) are kept, so memory does
+# not depend on the length of the log.
+class LogTriage:
+    def __init__(self, max_groups=MAX_GROUPS):
+        self.max_groups = max_groups
+        self.groups = {}
+        self.lines = 0
+        self.messages = 0
+        self.dropped = 0
+        self.counts = dict.fromkeys(SEVERITY_RANK, 0)
+        self.files = set()
+
+    def feed(self, line):
+        self.lines += 1
+        low = line.lower()
+        if not any(word in low for word in _TRIGGERS):
+            return
+        match = _SEVERITY_RE.search(line)
+        if match is None:
+            return
+        text = _TIMESTAMP_RE.sub("", line.rstrip("\r\n")[:MAX_LINE])
+        location, where = _location(text)
+        # "0 errors, 2 warnings" style summaries are not messages
+        if location is None and (_TALLY_RE.search(text) or ZERO_FAIL_RE.search(text)):
+            return
+        severity = _severity(match)
+        self.messages += 1
+        self.counts[severity] += 1
+
+        if location and location[0] and len(self.files) < KEEP_LOCATIONS * 4:
+            self.files.add(location[0])
+        ident = _MESSAGE_ID_RE.search(text)
+        message_id = next((g for g in ident.groups() if g), None) if ident else None
+        if message_id:
+            key = (severity, message_id)
+        else:
+            body = text[:where[0]] + text[where[1]:] if where else text
+            key = (severity, " ".join(_NOISE_RE.sub("*", body).split())[:200])
+
+        group = self.groups.get(key)
+        if group is None:
+            if len(self.groups) >= self.max_groups:
+                self.dropped += 1
+                return
+            # Classified once per group, not per repeat
+            category = next((name for name, pattern in _CATEGORY_RES if pattern.search(text)), f"Other {severity}")
+            group = self.groups[key] = LogGroup(severity, category, message_id, text.strip(), self.lines)
+        names = [next(g for g in m.groups() if g) for m in _NAME_RE.finditer(text)] \
+            if len(group.names) < KEEP_NAMES else ()
+        group.add(location, names)
+
+    def feed_lines(self, lines):
+        for line in lines:
+            self.feed(line)
+        return self
+
+    # Errors before warnings; within a severity the earliest first, since later
+    # messages are usually fallout from the first ones
+    def top(self, limit=TRIAGE_GROUPS):
+        return sorted(self.groups.values(), key=LogGroup.rank)[:limit]
+
+    def summary(self):
+        return {"lines": self.lines, "messages": self.messages, "groups": len(self.groups),
+                "dropped": self.dropped, "counts": dict(self.counts)}
+
+
+def open_log(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+# Uploaded bytes (a file-like object) read as text one line at a time
+def text_lines(binary):
+    if getattr(binary, "name", "").endswith(".gz"):
+        binary = gzip.GzipFile(fileobj=binary)
+    return io.TextIOWrapper(binary, encoding="utf-8", errors="replace")
+
+
+def _declaration_line(lines, name):
+    word = re.compile(rf"(?<![\w$]){re.escape(name)}(?![\w$])")
+    declaration = re.compile(r"\b(?:input|output|inout|wire|reg|logic|signal|variable|port|parameter|localparam)\b",
+                             re.IGNORECASE)
+    first = None
+    for number, text in enumerate(lines, 1):
+        if word.search(text):
+            if declaration.search(text):
+                return number
+            if first is None:
+                first = number
+    return first
+
+
+# Source line numbers a group points at: its reported locations when they name
+# this file (or the log only ever names one file), else where its names appear
+def source_lines(group, code, filename=None, log_files=()):
+    lines = code.split("\n")
+    same_file = {filename} if filename else set()
+    if len(log_files) == 1:
+        same_file |= set(log_files)
+    numbers = [n for f, n in group.locations if (f is None or f in same_file) and 0 < n <= len(lines)]
+    if not numbers:
+        numbers = [n for n in (_declaration_line(lines, name) for name in group.names[:3]) if n]
+    return numbers
+
+
+def _spans(numbers, total, context=CONTEXT_LINES):
+    spans = []
+    for number in sorted(set(numbers)):
+        start, end = max(number - context, 1), min(number + context, total)
+        if spans and start <= spans[-1][1] + 1:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+    return spans
+
+
+# The text sent in place of the raw log: the top groups with counts, then the
+# code around the lines they point at
+def triage_report(triage, code=None, filename=None, limit=TRIAGE_GROUPS):
+    summary = triage.summary()
+    counts = summary["counts"]
+    top = triage.top(limit)
+    out = [f"Log triage: {summary['lines']:,} lines, {counts['fatal'] + counts['error']:,} errors, "
+           f"{counts['critical']:,} critical warnings, {counts['warning']:,} warnings in {summary['groups']:,} "
+           f"distinct groups. The {len(top)} most likely root causes (errors first, earliest first):"]
+    referenced = []
+    for i, group in enumerate(top, 1):
+        header = f"{i}. [{group.severity}] {group.category}"
+        if group.count > 1:
+            header += f" (x{group.count:,})"
+        out.append(f"{header}, first at log line {group.first_line:,}: {group.example}")
+        if len(group.names) > 1:
+            out.append(f"   names: {', '.join(group.names)}")
+        if code:
+            numbers = source_lines(group, code, filename, triage.files)
+            if numbers:
+                out.append(f"   source lines: {', '.join(map(str, numbers))}")
+                referenced.extend(numbers)
+    if code and referenced:
+        lines = code.split("\n")
+        out.append("\nReferenced code:")
+        shown = 0
+        for start, end in _spans(referenced, len(lines)):
+            if shown >= MAX_SPAN_LINES:
+                out.append("...")
+                break
+            out.extend(f"{n:>5} | {lines[n - 1]}" for n in range(start, end + 1))
+            out.append("")
+            shown += end - start + 1
+    return "\n".join(out).rstrip()
+
+
+def triage_log(lines, code=None, filename=None, limit=TRIAGE_GROUPS):
+    start = time.perf_counter()
+    with span("triage.run"):
+        triage = LogTriage().feed_lines(lines)
+        report = triage_report(triage, code, filename, limit)
+    return {"summary": triage.summary(), "groups": [g.as_dict() for g in triage.top(limit)], "report": report,
+            "seconds": round(time.perf_counter() - start, 3)}
+
+
+# Short logs go to the model as they are; longer ones (a string, or a text stream
+# read only as far as needed) are replaced by their triage report
+def condense_log(log, code=None, filename=None, threshold=TRIAGE_THRESHOLD, limit=TRIAGE_GROUPS):
+    if log is None:
+        return None, None
+    if isinstance(log, str):
+        if len(log) <= threshold:
+            return log, None
+        lines = io.StringIO(log)
+    else:
+        head = log.read(threshold + 1)
+        if len(head) <= threshold:
+            return head, None
+        lines = itertools.chain(io.StringIO(head + log.readline()), log)
+    result = triage_log(lines, code, filename, limit)
+    return result["report"], result
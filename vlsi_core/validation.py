@@ -0,0 +1,206 @@
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR, DiskCache, LRUCache
+from vlsi_core.metrics import VALIDATIONS, span
+
+VALIDATION_TIMEOUT = int(os.environ.get("VLSI_VALIDATION_TIMEOUT", "10"))
+VALIDATION_WORKERS = int(os.environ.get("VLSI_VALIDATION_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# language extension -> (tool, version flag)
+TOOLS = {
+    "v": ("iverilog", "-V"),
+    "sv": ("iverilog", "-V"),
+    "vhd": ("ghdl", "--version"),
+}
+TOOL_MISSING_MESSAGE = "Validation tool not found. Install it to enable this feature."
+
+# UI language name -> language extension used above
+LANGUAGE_EXTENSIONS = {"Verilog": "v", "SystemVerilog": "sv", "VHDL": "vhd"}
+
+
+# Prefer a RAM-backed scratch area when the OS provides one
+def scratch_root():
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def source_digest(code):
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+# Resolves compilers once, runs validations on a bounded pool of workers and
+# caches results by (language, tool version, source digest). The pool bounds how
+# many compiler processes run at once; each worker thread owns a scratch
+# directory that is reused for every file it checks.
+class ValidationService:
+    def __init__(self, max_workers=VALIDATION_WORKERS, timeout=VALIDATION_TIMEOUT, cache=None, disk=None):
+        self.timeout = timeout
+        self.tools = {}
+        for language, (tool, version_flag) in TOOLS.items():
+            path = shutil.which(tool)
+            self.tools[language] = (path, self._tool_version(path, version_flag) if path else None)
+        self.cache = cache if cache is not None else LRUCache(max_entries=1024, ttl=0)
+        self.disk = disk
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hdl-validate")
+        self._local = threading.local()
+        self._scratch_dirs = []
+        self._lock = threading.Lock()
+        self.compiled = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def _tool_version(path, version_flag):
+        try:
+            result = subprocess.run([path, version_flag], capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return "unknown"
+        output = (result.stdout or result.stderr).strip().splitlines()
+        return output[0] if output else "unknown"
+
+    def available(self, language):
+        path, _ = self.tools.get(language, (None, None))
+        return path is not None
+
+    def tool_versions(self):
+        return {language: version for language, (path, version) in self.tools.items() if path}
+
+    def _scratch_dir(self):
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None or not os.path.isdir(scratch):
+            scratch = tempfile.mkdtemp(prefix="vlsi_validate_", dir=scratch_root())
+            self._local.scratch = scratch
+            with self._lock:
+                self._scratch_dirs.append(scratch)
+        return scratch
+
+    def _cache_key(self, code, language):
+        _, version = self.tools.get(language, (None, None))
+        return f"{language}:{version}:{source_digest(code)}"
+
+    def _lookup(self, key):
+        result = self.cache.get(key)
+        if result is None and self.disk is not None:
+            try:
+                stored = self.disk.get(key)
+            except sqlite3.Error:
+                stored = None
+            if stored is not None:
+                result = tuple(json.loads(stored))
+                self.cache.put(key, result)
+        return result
+
+    def _store(self, key, result):
+        self.cache.put(key, result)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, json.dumps(result))
+            except sqlite3.Error:
+                pass
+
+    def _compile(self, code, language):
+        path, _ = self.tools[language]
+        scratch = self._scratch_dir()
+        src = os.path.join(scratch, f"design.{language}")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(code)
+        if language == "vhd":
+            cmd = [path, "-s", f"--workdir={scratch}", src]
+        else:
+            cmd = [path, "-t", "null", src]
+        with span("validation.compile", language=language, tool=os.path.basename(path)):
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout, cwd=scratch)
+        with self._lock:
+            self.compiled += 1
+        VALIDATIONS.inc(language=language, result="valid" if result.returncode == 0 else "invalid")
+        if result.returncode != 0:
+            # Strip the scratch path so identical sources give identical messages
+            return False, (result.stderr or result.stdout).replace(scratch + os.sep, "")
+        return True, "Syntax is valid"
+
+    def _run(self, code, language, key):
+        try:
+            result = self._compile(code, language)
+        except subprocess.TimeoutExpired:
+            return False, "Validation timed out"
+        except Exception as e:
+            return False, str(e)
+        self._store(key, result)
+        return result
+
+    # Returns a Future resolving to (is_valid, message); cache hits and trivial
+    # cases resolve immediately, everything else queues for a pool worker.
+    def submit(self, code, language):
+        if not code.strip():
+            return _done((False, "Empty code provided"))
+        if language not in self.tools:
+            return _done((True, "Syntax is valid"))
+        if not self.available(language):
+            return _done((False, TOOL_MISSING_MESSAGE))
+
+        key = self._cache_key(code, language)
+        cached = self._lookup(key)
+        if cached is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return _done(cached)
+        return self._pool.submit(self._run, code, language, key)
+
+    # Same contract as the original validate_hdl_code: (is_valid, message)
+    def validate(self, code, language):
+        return self.submit(code, language).result()
+
+    # Validate many (code, language) pairs concurrently, preserving order
+    def validate_many(self, items):
+        futures = [self.submit(code, language) for code, language in items]
+        return [f.result() for f in futures]
+
+    def stats(self):
+        return {
+            "tools": self.tool_versions(),
+            "compiled": self.compiled,
+            "cache_hits": self.cache_hits,
+            "cached_results": len(self.cache)
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for scratch in self._scratch_dirs:
+                shutil.rmtree(scratch, ignore_errors=True)
+            self._scratch_dirs = []
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_validation_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            disk = None
+            if os.environ.get("VLSI_CACHE_DISABLE_DISK", "") != "1":
+                try:
+                    disk = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "validation.sqlite3"), max_bytes=16 * 1024 * 1024)
+                except (OSError, sqlite3.Error):
+                    disk = None
+            _service = ValidationService(disk=disk)
+            atexit.register(_service.shutdown)
+        return _service
@@ -0,0 +1,702 @@
+# Waveform dumps (VCD, or FST through GTKWave's fst2vcd) streamed into a columnar
+# store on disk and queried through NumPy memory maps. Requires numpy:
+#   pip install numpy
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from array import array
+
+import numpy as np
+
+from vlsi_core.cache import DEFAULT_CACHE_DIR
+from vlsi_core.metrics import span
+
+WAVE_STORE_DIR = os.path.join(DEFAULT_CACHE_DIR, "waves")
+WAVE_STORE_MB = int(os.environ.get("VLSI_WAVE_STORE_MB", "2048"))
+WAVE_BUFFER_MB = int(os.environ.get("VLSI_WAVE_BUFFER_MB", "64"))
+BLOCK_BYTES = 1 << 20
+COMPARE_CHUNK = 1 << 20
+WINDOW_SIGNALS = 12
+WINDOW_CHANGES = 8
+RELEVANT_CANDIDATES = 1000
+WORD_MASK = (1 << 64) - 1
+
+# 4-state bits as VPI encodes them, (aval, bval): 0 = (0,0), 1 = (1,0), x = (1,1),
+# z = (0,1). std_logic U/W/- read as x, H/L as 1/0.
+_STATES = b"01xXzZuUwW-hHlL"
+_AVAL = bytes.maketrans(_STATES, b"011100111111100")
+_BVAL = bytes.maketrans(_STATES, b"001111111110000")
+_SCALARS = {state: (int(chr(_AVAL[state])), int(chr(_BVAL[state]))) for state in _STATES}
+_UNKNOWN = b"xXzZuUwW-"
+
+# Narrow vectors get a narrow column; wider ones are split into 64-bit words
+_COLUMNS = ((8, "B", np.uint8), (16, "H", np.uint16), (32, "I", np.uint32), (64, "Q", np.uint64))
+_TIME_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9, "ps": 1e-12, "fs": 1e-15}
+_LOG_TIME_RE = re.compile(
+    r"(?:\bat\s+(?:time\s+)?|\btime\s*[:=]?\s*|@\s*)(\d+(?:\.\d+)?)\s*(fs|ps|ns|us|ms|s)?\b", re.IGNORECASE
+)
+_IDENT_RE = re.compile(r"[A-Za-z_]\w*")
+
+
+class WaveformError(Exception):
+    pass
+
+
+def _column(width):
+    for bits, typecode, dtype in _COLUMNS:
+        if width <= bits:
+            return typecode, dtype, 1
+    return "Q", np.uint64, (width + 63) // 64
+
+
+def _words(value, count):
+    return [(value >> (64 * k)) & WORD_MASK for k in range(count)]
+
+
+def format_value(aval, bval, width):
+    if width == 1:
+        return "01zx"[(aval & 1) | ((bval & 1) << 1)]
+    if not bval:
+        return f"{width}'h{aval:x}"
+    bits = "".join("01zx"[((aval >> i) & 1) | (((bval >> i) & 1) << 1)] for i in range(width - 1, -1, -1))
+    return f"{width}'b{bits}"
+
+
+# An expected value: an int, a bit string of 0/1/x/z, 0x... hex or a Verilog
+# literal such as 8'hff / 4'b10x0
+def parse_value(value, width):
+    if isinstance(value, int):
+        return value & ((1 << width) - 1), 0
+    text = str(value).strip().replace("_", "")
+    literal = re.fullmatch(r"(?:\d+)?'([bhd])([0-9a-fA-FxXzZ]+)", text)
+    if literal:
+        base, digits = literal.groups()
+        if base == "d":
+            return int(digits) & ((1 << width) - 1), 0
+        if base == "h":
+            if not set(digits) & set("xXzZ"):
+                return int(digits, 16) & ((1 << width) - 1), 0
+            text = "".join(c * 4 if c in "xXzZ" else f"{int(c, 16):04b}" for c in digits)
+        else:
+            text = digits
+    elif text.lower().startswith("0x"):
+        return int(text, 16) & ((1 << width) - 1), 0
+    elif not re.fullmatch(r"[01xXzZ]+", text):
+        return int(text) & ((1 << width) - 1), 0
+    bits = text.encode()
+    if len(bits) < width:
+        bits = (bits[:1] if bits[:1] in _UNKNOWN else b"0") * (width - len(bits)) + bits
+    bits = bits[-width:]
+    return int(bits.translate(_AVAL), 2), int(bits.translate(_BVAL), 2)
+
+
+# One signal's changes: sorted times plus the value columns, (n,) or (n, words)
+class Signal:
+    def __init__(self, name, width, kind, times, aval, bval=None):
+        self.name = name
+        self.width = width
+        self.kind = kind
+        self.times = times
+        self.aval = aval
+        self.bval = bval
+
+    @classmethod
+    def constant(cls, name, width, value):
+        aval, bval = parse_value(value, width)
+        _, dtype, count = _column(width)
+        return cls(name, width, "constant", np.zeros(1, dtype=np.uint64),
+                   np.array([_words(aval, count)], dtype=dtype), np.array([_words(bval, count)], dtype=dtype))
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def real(self):
+        return self.kind == "real"
+
+    def index_at(self, t):
+        return int(np.searchsorted(self.times, t, side="right")) - 1
+
+    def format(self, index):
+        if index < 0:
+            return "x" if self.width == 1 else f"{self.width}'bx"
+        if self.real:
+            return f"{float(self.aval[index]):g}"
+        return format_value(self._int(self.aval[index]), self._int(self.bval[index]), self.width)
+
+    def unknown(self, start, end):
+        if self.real or self.bval is None or not len(self):
+            return False
+        lo = max(self.index_at(start), 0)
+        hi = int(np.searchsorted(self.times, end, side="right"))
+        return bool(np.any(self.bval[lo:hi]))
+
+    # Values at each of `times` as (defined, aval, bval) with 2-D value columns
+    def sample(self, times):
+        if not len(self):
+            empty = np.zeros((len(times), self.aval.shape[1] if self.aval.ndim == 2 else 1), dtype=self.aval.dtype)
+            return np.zeros(len(times), dtype=bool), empty, empty
+        index = np.searchsorted(self.times, times, side="right") - 1
+        defined = index >= 0
+        index = np.maximum(index, 0)
+        aval = self.aval[index].reshape(len(times), -1)
+        bval = self.bval[index].reshape(len(times), -1) if self.bval is not None else np.zeros_like(aval)
+        return defined, aval, bval
+
+    @staticmethod
+    def _int(words):
+        words = np.atleast_1d(words)
+        return sum(int(w) << (64 * k) for k, w in enumerate(words))
+
+
+def _pad(columns, count):
+    if columns.shape[1] == count:
+        return columns
+    return np.pad(columns.astype(np.uint64), ((0, 0), (0, count - columns.shape[1])))
+
+
+# Earliest time in [start, end] where the two signals hold different values,
+# walking both change lists a chunk at a time so memory stays bounded
+def first_difference(actual, expected, start=0, end=None):
+    if end is None:
+        end = max([start] + [int(s.times[-1]) for s in (actual, expected) if len(s)])
+    t = start
+    while t <= end:
+        ia = int(np.searchsorted(actual.times, t))
+        ib = int(np.searchsorted(expected.times, t))
+        ta = actual.times[ia:ia + COMPARE_CHUNK]
+        tb = expected.times[ib:ib + COMPARE_CHUNK]
+        hi = end
+        if len(ta) == COMPARE_CHUNK:
+            hi = min(hi, int(ta[-1]))
+        if len(tb) == COMPARE_CHUNK:
+            hi = min(hi, int(tb[-1]))
+        events = np.union1d(np.asarray(ta[ta <= hi]), np.asarray(tb[tb <= hi])).astype(np.uint64)
+        if not events.size or events[0] != t:
+            events = np.concatenate((np.array([t], dtype=np.uint64), events))
+        da, aa, ab = actual.sample(events)
+        db, ea, eb = expected.sample(events)
+        if actual.real or expected.real:
+            differs = aa[:, 0].astype(np.float64) != ea[:, 0].astype(np.float64)
+        else:
+            count = max(aa.shape[1], ea.shape[1])
+            differs = np.any(_pad(aa, count) != _pad(ea, count), axis=1) | \
+                np.any(_pad(ab, count) != _pad(eb, count), axis=1)
+        differs = (da != db) | (da & db & differs)
+        hits = np.flatnonzero(differs)
+        if hits.size:
+            return int(events[hits[0]])
+        if hi >= end:
+            return None
+        t = hi + 1
+    return None
+
+
+# Splits the value-change section into per-signal column buffers, spilling them
+# to append-only files whenever WAVE_BUFFER_MB is buffered
+class _Ingest:
+    def __init__(self, directory, codes, widths, kinds):
+        self.directory = directory
+        self.codes = codes
+        self.widths = widths
+        self.kinds = kinds
+        self.words = []
+        self.times, self.aval, self.bval = [], [], []
+        for width, kind in zip(widths, kinds):
+            typecode, _, count = ("d", None, 1) if kind == "real" else _column(width)
+            self.words.append(count)
+            self.times.append(array("Q"))
+            self.aval.append(array(typecode))
+            self.bval.append(array(typecode))
+        self.counts = [0] * len(widths)
+        # "1!"-style tokens -> bound appends and the decoded bit, filled on first sight
+        self.scalars = {}
+        self.time = 0
+        self.changes = 0
+        self.buffered = 0
+        self.in_comment = False
+        self.budget = WAVE_BUFFER_MB * 1024 * 1024
+
+    def feed(self, data):
+        codes, times, avals, bvals, words = self.codes, self.times, self.aval, self.bval, self.words
+        scalars = self.scalars
+        t = self.time
+        changes = 0
+        tokens = iter(data.split())
+        if self.in_comment:
+            for token in tokens:
+                if token == b"$end":
+                    self.in_comment = False
+                    break
+        for token in tokens:
+            scalar = scalars.get(token)
+            if scalar is not None:
+                append_time, append_aval, append_bval, aval, bval = scalar
+                append_time(t)
+                append_aval(aval)
+                append_bval(bval)
+                changes += 1
+                continue
+            c = token[0]
+            if c == 35:  # '#'
+                t = int(token[1:])
+                continue
+            if c in _SCALARS:
+                index = codes.get(token[1:])
+                if index is None:
+                    continue
+                aval, bval = _SCALARS[c]
+                if words[index] == 1 and self.kinds[index] != "real":
+                    scalars[token] = (times[index].append, avals[index].append, bvals[index].append, aval, bval)
+            elif c == 98 or c == 66:  # 'b' / 'B'
+                index = codes.get(next(tokens, b""))
+                if index is None:
+                    continue
+                bits = token[1:]
+                try:
+                    aval, bval = int(bits, 2), 0
+                except ValueError:
+                    width = self.widths[index]
+                    if len(bits) < width and bits[:1] in _UNKNOWN:
+                        bits = bits[:1] * (width - len(bits)) + bits
+                    aval, bval = int(bits.translate(_AVAL), 2), int(bits.translate(_BVAL), 2)
+            elif c == 114 or c == 82:  # 'r' / 'R'
+                index = codes.get(next(tokens, b""))
+                if index is None:
+                    continue
+                times[index].append(t)
+                avals[index].append(float(token[1:]))
+                changes += 1
+                continue
+            elif c == 36:  # '$': $dumpvars/$dumpall/$end only bracket ordinary changes
+                if token == b"$comment":
+                    self.in_comment = True
+                    for token in tokens:
+                        if token == b"$end":
+                            self.in_comment = False
+                            break
+                continue
+            elif c == 115 or c == 83:  # 's': string values are not stored
+                next(tokens, None)
+                continue
+            else:
+                continue
+            times[index].append(t)
+            count = words[index]
+            if count == 1:
+                avals[index].append(aval & WORD_MASK)
+                bvals[index].append(bval & WORD_MASK)
+            else:
+                avals[index].extend(_words(aval, count))
+                bvals[index].extend(_words(bval, count))
+            changes += 1
+        self.time = t
+        self.changes += changes
+        self.buffered += changes
+        if self.buffered * 24 >= self.budget:
+            self.flush()
+
+    def flush(self):
+        for index, times in enumerate(self.times):
+            if not times:
+                continue
+            self.counts[index] += len(times)
+            for suffix, column in (("t", times), ("a", self.aval[index]), ("b", self.bval[index])):
+                if column:
+                    with open(os.path.join(self.directory, f"{index}.{suffix}"), "ab") as f:
+                        column.tofile(f)
+                del column[:]
+        self.buffered = 0
+
+
+def _scope_name(scope, reference, select):
+    if b"[" in reference and not select:
+        reference, select = reference.split(b"[", 1)
+        select = b"[" + select
+    name = ".".join(scope + [reference.decode(errors="replace")])
+    # A bit select ([3]) keeps bit-blasted nets apart; a range ([7:0]) is just the width
+    if select and b":" not in select:
+        name += select.decode(errors="replace")
+    return name
+
+
+# $var declarations -> signal names, per-code widths and kinds
+def parse_header(header, wanted=None):
+    tokens = header.split()
+    scope, codes, widths, kinds, signals = [], {}, [], [], {}
+    timescale = "1s"
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        end = i + 1
+        while end < len(tokens) and tokens[end] != b"$end":
+            end += 1
+        if token == b"$scope":
+            scope.append(tokens[i + 2].decode(errors="replace") if i + 2 < end else "")
+        elif token == b"$upscope":
+            if scope:
+                scope.pop()
+        elif token == b"$timescale":
+            timescale = b"".join(tokens[i + 1:end]).decode() or timescale
+        elif token == b"$var" and end - i >= 5:
+            kind, size, code, reference = tokens[i + 1:i + 5]
+            name = _scope_name(scope, reference, b"".join(tokens[i + 5:end]))
+            if name not in signals and (wanted is None or any(fnmatch.fnmatchcase(name, p) for p in wanted)):
+                kind = "real" if kind in (b"real", b"realtime") else kind.decode()
+                if code not in codes:
+                    codes[code] = len(widths)
+                    widths.append(int(size) if size.isdigit() else 1)
+                    kinds.append(kind)
+                signals[name] = codes[code]
+        elif token == b"$enddefinitions":
+            break
+        i = end + 1
+    return timescale, codes, widths, kinds, signals
+
+
+def _tick_seconds(timescale):
+    match = re.fullmatch(r"(\d+)\s*(fs|ps|ns|us|ms|s)", timescale.strip())
+    return int(match.group(1)) * _TIME_UNITS[match.group(2)] if match else 1.0
+
+
+# Raw dump text in BLOCK_BYTES pieces: a mapped VCD, or fst2vcd's stdout
+def _blocks(path):
+    if path.lower().endswith(".fst"):
+        tool = shutil.which("fst2vcd")
+        if not tool:
+            raise WaveformError("FST dumps need fst2vcd (GTKWave) on PATH")
+        process = subprocess.Popen([tool, path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                block = process.stdout.read(BLOCK_BYTES)
+                if not block:
+                    break
+                yield block
+        finally:
+            process.stdout.close()
+            if process.wait() != 0:
+                raise WaveformError(f"fst2vcd failed on {os.path.basename(path)}")
+        return
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise WaveformError(f"{os.path.basename(path)} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            advise = hasattr(mapped, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+            if advise:
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            while True:
+                block = mapped.read(BLOCK_BYTES)
+                if not block:
+                    break
+                yield block
+                # Parsed pages are dropped from this mapping so resident memory stays flat
+                if advise:
+                    mapped.madvise(mmap.MADV_DONTNEED, 0, mapped.tell() // mmap.PAGESIZE * mmap.PAGESIZE)
+
+
+def ingest(path, directory, signals=None):
+    blocks = _blocks(path)
+    header = b""
+    rest = b""
+    for block in blocks:
+        header += block
+        marker = header.find(b"$enddefinitions")
+        end = header.find(b"$end", marker + len(b"$enddefinitions")) if marker >= 0 else -1
+        if end >= 0:
+            header, rest = header[:end + len(b"$end")], header[end + len(b"$end"):]
+            break
+    else:
+        raise WaveformError(f"{os.path.basename(path)} has no $enddefinitions; not a VCD dump")
+
+    timescale, codes, widths, kinds, names = parse_header(header, signals)
+    state = _Ingest(directory, codes, widths, kinds)
+    # Hand over whole lines only: a vector's value and its code share a line
+    for block in blocks:
+        rest += block
+        cut = rest.rfind(b"\n")
+        if cut >= 0:
+            state.feed(rest[:cut])
+            rest = rest[cut + 1:]
+    state.feed(rest)
+    state.flush()
+    return {
+        "source": os.path.basename(path),
+        "timescale": timescale,
+        "end_time": state.time,
+        "changes": state.changes,
+        "signals": names,
+        "codes": [{"width": w, "kind": k, "count": c} for w, k, c in zip(widths, kinds, state.counts)],
+        "filter": signals,
+        "ingested": time.time()
+    }
+
+
+# A dump's columnar store: manifest.json plus <code>.t/.a/.b column files, read
+# through memory maps so queries touch only the pages they need
+class Waveform:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.timescale = self.manifest["timescale"]
+        self.tick = _tick_seconds(self.timescale)
+        self.end_time = self.manifest["end_time"]
+        self.names = sorted(self.manifest["signals"])
+        self._signals = {}
+        self._lock = threading.Lock()
+
+    def summary(self):
+        return {
+            "source": self.manifest["source"],
+            "signals": len(self.names),
+            "changes": self.manifest["changes"],
+            "end_time": self.end_time,
+            "timescale": self.timescale
+        }
+
+    # Exact name, then unique hierarchical suffix (dut.count, count), then glob
+    def resolve(self, pattern):
+        if pattern in self.manifest["signals"]:
+            return [pattern]
+        suffix = [n for n in self.names if n.endswith("." + pattern)]
+        if suffix:
+            return suffix
+        return [n for n in self.names if fnmatch.fnmatchcase(n, pattern)]
+
+    def select(self, patterns):
+        codes = {}
+        for pattern in patterns:
+            for name in sorted(self.resolve(pattern), key=lambda n: (n.count("."), n)):
+                codes.setdefault(self.manifest["signals"][name], name)
+        return list(codes.values())
+
+    def signal(self, name):
+        with self._lock:
+            if name in self._signals:
+                return self._signals[name]
+        if name not in self.manifest["signals"]:
+            matches = self.resolve(name)
+            # Aliases of one net (tb.count, tb.dut.count) share a code and are the same signal
+            if len({self.manifest["signals"][m] for m in matches}) != 1:
+                raise WaveformError(f"{name!r} matches {len(matches)} signals in the dump")
+            name = min(matches, key=lambda n: (n.count("."), n))
+        index = self.manifest["signals"][name]
+        code = self.manifest["codes"][index]
+        width, kind, count = code["width"], code["kind"], code["count"]
+        if kind == "real":
+            dtype, words = np.float64, 1
+        else:
+            _, dtype, words = _column(width)
+        shape = (count,) if words == 1 else (count, words)
+        columns = [self._map(f"{index}.t", np.uint64, (count,))]
+        columns.append(self._map(f"{index}.a", dtype, shape))
+        columns.append(None if kind == "real" else self._map(f"{index}.b", dtype, shape))
+        signal = Signal(name, width, kind, *columns)
+        with self._lock:
+            self._signals[name] = signal
+        return signal
+
+    def _map(self, filename, dtype, shape):
+        if not shape[0]:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, filename), dtype=dtype, mode="r", shape=shape)
+
+    def value_at(self, name, t):
+        signal = self.signal(name)
+        return signal.format(signal.index_at(t))
+
+    def changes(self, name, start=0, end=None, limit=None):
+        signal = self.signal(name)
+        lo = int(np.searchsorted(signal.times, start))
+        hi = int(np.searchsorted(signal.times, self.end_time if end is None else end, side="right"))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [(int(signal.times[i]), signal.format(i)) for i in range(lo, hi)]
+
+    # expected: another signal name in this dump, a Signal (e.g. from a reference
+    # dump) or a constant value
+    def first_mismatch(self, name, expected, start=0, end=None):
+        actual = self.signal(name)
+        if isinstance(expected, Signal):
+            reference = expected
+        elif isinstance(expected, str) and self.resolve(expected):
+            reference = self.signal(expected)
+        else:
+            reference = Signal.constant(str(expected), actual.width, expected)
+        t = first_difference(actual, reference, start, self.end_time if end is None else end)
+        if t is None:
+            return None
+        return {"time": t, "signal": actual.name, "actual": actual.format(actual.index_at(t)),
+                "expected": reference.format(reference.index_at(t))}
+
+    # First mismatch of every signal the two dumps share (aliases once), earliest first
+    def compare(self, reference, names=None, start=0, end=None):
+        shared = set(reference.manifest["signals"])
+        codes = {}
+        for name in sorted(names or self.names, key=lambda n: (n.count("."), n)):
+            if name in shared:
+                codes.setdefault(self.manifest["signals"][name], name)
+        names = list(codes.values())
+        end = max(self.end_time, reference.end_time) if end is None else end
+        with span("waveform.compare", signals=len(names)):
+            mismatches = [m for m in (self.first_mismatch(n, reference.signal(n), start, end) for n in names) if m]
+        return sorted(mismatches, key=lambda m: (m["time"], m["signal"]))
+
+    # First time a failure message in a simulation log mentions, in dump ticks
+    def time_from_log(self, log):
+        for match in _LOG_TIME_RE.finditer(log or ""):
+            value, unit = float(match.group(1)), match.group(2)
+            if unit:
+                return int(round(value * _TIME_UNITS[unit.lower()] / self.tick))
+            return int(value)
+        return None
+
+    # Ticks either side of a failure: enough for a few edges of the busiest clock
+    def default_span(self):
+        for name in self.names:
+            if name.rsplit(".", 1)[-1].lower() in ("clk", "clock", "clk_i", "i_clk"):
+                signal = self.signal(name)
+                if len(signal) > 2:
+                    period = int(signal.times[2]) - int(signal.times[0])
+                    return max(period * 4, 1)
+        return max(self.end_time // 50, 1)
+
+    # Signals worth showing around `center`: those named in the code, preferring
+    # ones that are unknown or change within the window; aliases shown once
+    def relevant(self, code=None, center=None, before=None, after=None, limit=WINDOW_SIGNALS):
+        center = self.end_time if center is None else center
+        span_ticks = self.default_span()
+        start = max(center - (span_ticks if before is None else before), 0)
+        end = center + (span_ticks if after is None else after)
+        identifiers = set(_IDENT_RE.findall(code)) if code else None
+        seen, scored = set(), []
+        for name in sorted(self.names, key=lambda n: (n.count("."), n)):
+            leaf = name.rsplit(".", 1)[-1].split("[", 1)[0]
+            index = self.manifest["signals"][name]
+            if index in seen or (identifiers is not None and leaf not in identifiers):
+                continue
+            seen.add(index)
+            if len(seen) > RELEVANT_CANDIDATES:
+                break
+            signal = self.signal(name)
+            lo = int(np.searchsorted(signal.times, start))
+            hi = int(np.searchsorted(signal.times, end, side="right"))
+            scored.append((not signal.unknown(start, end), hi == lo, name.count("."), -(hi - lo), name))
+        return [entry[-1] for entry in sorted(scored)[:limit]]
+
+    # Compact text for the model: each signal's value entering the window, then
+    # up to max_changes changes nearest the failure time
+    def window(self, names, center, before=None, after=None, max_changes=WINDOW_CHANGES):
+        span_ticks = self.default_span()
+        start = max(center - (span_ticks if before is None else before), 0)
+        end = center + (span_ticks if after is None else after)
+        lines = [f"Time {start}..{end} in units of {self.timescale}, failure at {center}. "
+                 "Each line: value entering the window | time: new value"]
+        for name in names:
+            signal = self.signal(name)
+            lo = int(np.searchsorted(signal.times, start, side="right"))
+            hi = int(np.searchsorted(signal.times, end, side="right"))
+            middle = int(np.searchsorted(signal.times, center, side="right"))
+            first = max(lo, min(middle - max_changes // 2, hi - max_changes))
+            last = min(hi, first + max_changes)
+            parts = [signal.format(lo - 1)]
+            if first > lo:
+                parts.append(f"... {first - lo} changes")
+            parts.extend(f"{int(signal.times[i])}: {signal.format(i)}" for i in range(first, last))
+            if hi > last:
+                parts.append(f"... {hi - last} changes")
+            lines.append(f"{name} [{signal.width}]: " + " | ".join(parts))
+        return "\n".join(lines)
+
+
+def _digest(path, signals):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(sorted(signals) if signals else None).encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _prune(root, keep):
+    entries = []
+    for entry in os.scandir(root):
+        manifest = os.path.join(entry.path, "manifest.json")
+        if entry.is_dir() and entry.name != keep and os.path.exists(manifest):
+            size = sum(f.stat().st_size for f in os.scandir(entry.path))
+            entries.append((os.path.getmtime(manifest), size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= WAVE_STORE_MB * 1024 * 1024:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+_ingest_locks = {}
+_ingest_locks_guard = threading.Lock()
+
+
+# Store keyed by a digest of the dump (and signal filter); a dump seen before
+# opens straight from its columns. `signals` (glob patterns) limits ingestion
+# to matching signals, which keeps multi-GB dumps cheap.
+def open_waveform(path, signals=None, store_dir=None):
+    root = store_dir or WAVE_STORE_DIR
+    key = _digest(path, signals)
+    directory = os.path.join(root, key)
+    manifest = os.path.join(directory, "manifest.json")
+    with _ingest_locks_guard:
+        lock = _ingest_locks.setdefault(key, threading.Lock())
+    with lock:
+        if not os.path.exists(manifest):
+            os.makedirs(root, exist_ok=True)
+            partial = f"{directory}.{os.getpid()}.partial"
+            shutil.rmtree(partial, ignore_errors=True)
+            os.makedirs(partial)
+            try:
+                with span("waveform.ingest", source=os.path.basename(path)) as record:
+                    data = ingest(path, partial, signals)
+                    record["attributes"]["changes"] = data["changes"]
+                with open(os.path.join(partial, "manifest.json"), "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(partial, directory)
+            finally:
+                shutil.rmtree(partial, ignore_errors=True)
+            _prune(root, key)
+        else:
+            os.utime(manifest)
+    return Waveform(directory)
+
+
+def format_mismatches(mismatches, limit=WINDOW_SIGNALS):
+    return "First mismatches against the expected dump:\n" + "\n".join(
+        f"{m['time']}: {m['signal']} = {m['actual']}, expected {m['expected']}" for m in mismatches[:limit]
+    )
+
+
+# Waveform text for the debugging assistant: centred on an explicit time, the
+# first mismatch against a reference dump, a time named in the log, or the end
+def waveform_excerpt(path, code=None, log=None, at=None, signals=None, reference=None, limit=WINDOW_SIGNALS):
+    wave = open_waveform(path)
+    center, mismatches = at, []
+    if reference:
+        mismatches = wave.compare(open_waveform(reference))
+        if center is None and mismatches:
+            center = mismatches[0]["time"]
+    if center is None:
+        center = wave.time_from_log(log)
+    if center is None or center > wave.end_time:
+        center = wave.end_time
+    names = wave.select(signals) if signals else wave.relevant(code, center, limit=limit)
+    text = wave.window(names[:limit], center)
+    if mismatches:
+        text += "\n" + format_mismatches(mismatches, limit)
+    return {"text": text, "center": center, "signals": names[:limit], "mismatches": mismatches,
+            "summary": wave.summary()}